@@ -0,0 +1,127 @@
+"""
+Inferência da política em lote para backtest e avaliação.
+
+Em vez de chamar model.predict(obs) uma observação por vez, vários
+episódios/símbolos independentes avançam em lockstep: a cada step as
+observações dos environments ativos são empilhadas e passam pela política
+em um único forward (sem gradiente). O custo fixo por chamada do SB3
+(conversão para tensor, validação de shape, dispatch do torch) é pago uma
+vez por step do lote, não por environment.
+"""
+
+import copy
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+def configure_inference_threads(n_threads: Optional[int] = None) -> int:
+    """
+    Ajusta as threads de CPU do torch para inferência.
+
+    Args:
+        n_threads: Número de threads (None mantém o atual)
+
+    Returns:
+        Número de threads em uso
+    """
+    if n_threads is not None and n_threads > 0 and n_threads != torch.get_num_threads():
+        torch.set_num_threads(n_threads)
+        logger.info(f"Torch inference threads: {n_threads}")
+    return torch.get_num_threads()
+
+
+def predict_batch(model: Any, observations: np.ndarray, deterministic: bool = True) -> np.ndarray:
+    """
+    Ações para um lote de observações em um forward.
+
+    Args:
+        model: Modelo SB3 (ou qualquer objeto com predict vetorizado);
+            se tiver predict_batch (ex: ensemble), ele é usado
+        observations: Array (batch, *obs_shape)
+        deterministic: Usar política determinística
+
+    Returns:
+        Array (batch,) de ações
+    """
+    observations = np.asarray(observations)
+    with torch.no_grad():
+        if hasattr(model, 'predict_batch'):
+            actions = model.predict_batch(observations, deterministic=deterministic)
+        else:
+            actions, _ = model.predict(observations, deterministic=deterministic)
+    return np.asarray(actions).reshape(len(observations), -1).squeeze(-1)
+
+
+def spawn_env_copies(env: Any, n_copies: int) -> List[Any]:
+    """
+    Cópias independentes de um environment.
+
+    Dados e observações pré-computadas (data, market_observations) do
+    environment (ou do environment interno de um wrapper) são
+    compartilhados com o original, não copiados. As cópias herdam o estado
+    do RNG: use episode_seeds() no primeiro reset para não repetir episódios.
+
+    Args:
+        env: Environment de referência
+        n_copies: Número de cópias
+
+    Returns:
+        Lista de environments
+    """
+    memo_base = {}
+    for source in (env, getattr(env, 'unwrapped', env)):
+        for name in ('data', 'market_observations'):
+            obj = getattr(source, name, None)
+            if obj is not None:
+                memo_base[id(obj)] = obj
+    return [copy.deepcopy(env, dict(memo_base)) for _ in range(n_copies)]
+
+
+def episode_seeds(env: Any, n: int) -> List[int]:
+    """Seeds de reset derivadas do RNG do environment (determinísticas se ele tiver seed)."""
+    return [int(seed) for seed in env.np_random.integers(2**31 - 1, size=n)]
+
+
+def run_lockstep(envs: Sequence[Any], model: Any, deterministic: bool = True,
+                 seeds: Optional[Sequence[Optional[int]]] = None,
+                 on_step: Optional[Callable[[int, Any], None]] = None,
+                 n_threads: Optional[int] = None) -> List[Dict[str, float]]:
+    """
+    Roda um episódio em cada environment, com inferência em lote.
+
+    Args:
+        envs: Environments independentes (gymnasium API)
+        model: Política (ver predict_batch)
+        deterministic: Usar política determinística
+        seeds: Seed do reset de cada environment (None = sem reseed)
+        on_step: fn(índice do env, env) chamada após cada step
+        n_threads: Threads de CPU do torch (ver configure_inference_threads)
+
+    Returns:
+        [{'reward', 'steps'}] por environment, na ordem de envs
+    """
+    configure_inference_threads(n_threads)
+    seeds = list(seeds) if seeds is not None else [None] * len(envs)
+    obs = [env.reset(seed=seed)[0] for env, seed in zip(envs, seeds)]
+    results = [{'reward': 0.0, 'steps': 0} for _ in envs]
+    active = list(range(len(envs)))
+
+    while active:
+        actions = predict_batch(model, np.stack([obs[i] for i in active]), deterministic)
+        still_active = []
+        for i, action in zip(active, actions):
+            obs[i], reward, terminated, truncated, _ = envs[i].step(action)
+            results[i]['reward'] += reward
+            results[i]['steps'] += 1
+            if on_step is not None:
+                on_step(i, envs[i])
+            if not (terminated or truncated):
+                still_active.append(i)
+        active = still_active
+
+    return results
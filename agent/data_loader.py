@@ -142,20 +142,15 @@ class DataLoader:
             return None
 
         try:
-            # Carregar OHLCV de todos os timeframes
-            h1_df = self.db.get_ohlcv('h1', symbol, limit=10000)
-            h4_df = self.db.get_ohlcv('h4', symbol, limit=5000)
-            d1_df = self.db.get_ohlcv('d1', symbol, limit=365)
+            # Carregar OHLCV de todos os timeframes (colunas NumPy, sem dict por linha)
+            h1_data = self.db.get_ohlcv_frame('h1', symbol, limit=10000)
+            h4_data = self.db.get_ohlcv_frame('h4', symbol, limit=5000)
+            d1_data = self.db.get_ohlcv_frame('d1', symbol, limit=365)
 
-            if not h4_df or len(h4_df) < 100:
-                logger.warning(f"Insufficient H4 data: {len(h4_df) if h4_df else 0} candles")
+            if len(h4_data) < 100:
+                logger.warning(f"Insufficient H4 data: {len(h4_data)} candles")
                 return None
 
-            # Converter para DataFrames
-            h1_data = pd.DataFrame(h1_df) if h1_df else pd.DataFrame()
-            h4_data = pd.DataFrame(h4_df)
-            d1_data = pd.DataFrame(d1_df) if d1_df else pd.DataFrame()
-
             # Calcular indicadores
             if not h4_data.empty:
                 h4_data = self.tech_indicators.calculate_all(h4_data)
@@ -34,7 +34,9 @@ class CryptoFuturesEnv(gym.Env):
                  data: Dict[str, pd.DataFrame],
                  initial_capital: float = 10000,
                  risk_params: Optional[Dict[str, Any]] = None,
-                 episode_length: int = 500):
+                 episode_length: int = 500,
+                 precompute_observations: bool = False,
+                 market_observations: Optional[np.ndarray] = None):
         """
         Inicializa environment.
 
@@ -43,6 +45,10 @@ class CryptoFuturesEnv(gym.Env):
             initial_capital: Capital inicial
             risk_params: Parâmetros de risco customizados
             episode_length: Número de steps por episódio (H4 candles)
+            precompute_observations: Pré-computa as features de mercado de todos
+                os candles H4 uma vez; cada step só recalcula as features de posição
+            market_observations: Matriz (n_h4, 104) já pré-computada (ex.: em memória
+                compartilhada entre workers); dispensa precompute_observations
         """
         super().__init__()
 
@@ -59,6 +65,11 @@ class CryptoFuturesEnv(gym.Env):
         self.symbol = data.get('symbol', 'BTCUSDT')
         self.multi_tf_result = self._compute_multi_tf_result()
 
+        # Features de mercado (blocos 1-8) não dependem das ações do agente
+        self.market_observations = market_observations
+        if market_observations is None and precompute_observations:
+            self.market_observations = self._compute_market_observations()
+
         # Spaces
         self.observation_space = spaces.Box(
             low=-10.0,
@@ -487,91 +498,155 @@ class CryptoFuturesEnv(gym.Env):
 
         return None
 
+    def _observation_inputs(self) -> Dict[str, Any]:
+        """Dados estáticos da observação, com valores neutros no lugar de None."""
+        sentiment = self.data.get('sentiment')
+        macro = self.data.get('macro')
+        smc = self.data.get('smc')
+
+        # Garantir que sentiment não é None (valores neutros)
+        if sentiment is None:
+            sentiment = {
+                'long_short_ratio': 1.0,
+                'open_interest': 50000000.0,
+                'open_interest_change_pct': 0.0,
+                'funding_rate': 0.0001,
+                'long_account': 0.50,
+                'short_account': 0.50,
+                'liquidations_long_vol': 0.0,
+                'liquidations_short_vol': 0.0,
+            }
+
+        # Garantir que macro não é None (valores neutros)
+        if macro is None:
+            macro = {
+                'fear_greed_value': 50,
+                'fear_greed_classification': 'Neutral',
+                'btc_dominance': 48.0,
+                'dxy': 100.0,
+                'dxy_change_pct': 0.0,
+                'stablecoin_exchange_flow_net': 0.0,
+            }
+
+        # Garantir que smc não é None (estrutura vazia)
+        if smc is None:
+            smc = {
+                'structure': None,
+                'swings': [],
+                'bos': [],
+                'choch': [],
+                'order_blocks': [],
+                'fvgs': [],
+                'liquidity_levels': [],
+                'liquidity_sweeps': [],
+                'premium_discount': None,
+            }
+
+        return {
+            'h1_data': self.data.get('h1'),
+            'd1_data': self.data.get('d1'),
+            'sentiment': sentiment,
+            'macro': macro,
+            'smc': smc,
+        }
+
+    def _build_observation(self, h4_idx: int, position_state: Optional[Dict[str, Any]],
+                           inputs: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        """Constrói a observação do candle H4 h4_idx (sem tratamento de erro)."""
+        if inputs is None:
+            inputs = self._observation_inputs()
+
+        # Window de dados
+        h4_data = self.data.get('h4')
+        if h4_data is not None and h4_idx < len(h4_data):
+            h4_window = h4_data.iloc[max(0, h4_idx-30):h4_idx+1]
+        else:
+            h4_window = None
+
+        # Construir features
+        observation = self.feature_engineer.build_observation(
+            symbol=self.symbol,
+            h4_data=h4_window,
+            position_state=position_state,
+            multi_tf_result=self.multi_tf_result,
+            **inputs
+        )
+
+        return self._sanitize_observation(observation)
+
+    @staticmethod
+    def _sanitize_observation(observation: np.ndarray) -> np.ndarray:
+        """Remove NaN/inf e clipa para o observation space (elemento a elemento)."""
+        # Garantir que não há NaN - substituir por 0
+        observation = np.nan_to_num(observation, nan=0.0, posinf=0.0, neginf=0.0)
+
+        # Clippar valores extremos para evitar problemas
+        observation = np.clip(observation, -10.0, 10.0)
+
+        return observation.astype(np.float32)
+
+    def _compute_market_observations(self) -> np.ndarray:
+        """
+        Calcula a matriz (n_h4, 104) float32 de observações sem posição.
+
+        As colunas FeatureEngineer.POSITION_FEATURES ficam zeradas e são
+        preenchidas a cada step em _get_observation. Candles cuja observação
+        falha ficam com NaN (observações válidas nunca têm NaN) e retornam
+        zeros, como no cálculo por step.
+        """
+        h4_data = self.data.get('h4')
+        n_steps = len(h4_data) if h4_data is not None else 0
+        inputs = self._observation_inputs()
+
+        observations = np.zeros((n_steps, 104), dtype=np.float32)
+        for h4_idx in range(n_steps):
+            try:
+                observations[h4_idx] = self._build_observation(h4_idx, None, inputs)
+            except Exception as e:
+                logger.error(f"Error precomputing observation {h4_idx}: {e}")
+                observations[h4_idx] = np.nan
+
+        logger.info(f"Observações de mercado pré-computadas: {observations.shape}")
+        return observations
+
+    @classmethod
+    def precompute_market_observations(cls, data: Dict[str, Any]) -> np.ndarray:
+        """
+        Matriz de observações de mercado para um dicionário de dados.
+
+        Permite calcular a matriz uma vez e reaproveitá-la em vários
+        environments via o argumento market_observations.
+        """
+        return cls(data)._compute_market_observations()
+
     def _get_observation(self) -> np.ndarray:
         """
         Constrói observação atual.
 
+        Com observações pré-computadas, copia a linha do candle atual e
+        substitui apenas as features de posição.
+
         Returns:
             Array de 104 features
         """
         try:
-            h4_idx = self.current_step
-
-            # Pegar dados
-            h4_data = self.data.get('h4')
-            h1_data = self.data.get('h1')
-            d1_data = self.data.get('d1')
-            sentiment = self.data.get('sentiment')
-            macro = self.data.get('macro')
-            smc = self.data.get('smc')
-
-            # Garantir que sentiment não é None (valores neutros)
-            if sentiment is None:
-                sentiment = {
-                    'long_short_ratio': 1.0,
-                    'open_interest': 50000000.0,
-                    'open_interest_change_pct': 0.0,
-                    'funding_rate': 0.0001,
-                    'long_account': 0.50,
-                    'short_account': 0.50,
-                    'liquidations_long_vol': 0.0,
-                    'liquidations_short_vol': 0.0,
-                }
-
-            # Garantir que macro não é None (valores neutros)
-            if macro is None:
-                macro = {
-                    'fear_greed_value': 50,
-                    'fear_greed_classification': 'Neutral',
-                    'btc_dominance': 48.0,
-                    'dxy': 100.0,
-                    'dxy_change_pct': 0.0,
-                    'stablecoin_exchange_flow_net': 0.0,
-                }
-
-            # Garantir que smc não é None (estrutura vazia)
-            if smc is None:
-                smc = {
-                    'structure': None,
-                    'swings': [],
-                    'bos': [],
-                    'choch': [],
-                    'order_blocks': [],
-                    'fvgs': [],
-                    'liquidity_levels': [],
-                    'liquidity_sweeps': [],
-                    'premium_discount': None,
-                }
-
-            # Window de dados
-            if h4_data is not None and h4_idx < len(h4_data):
-                h4_window = h4_data.iloc[max(0, h4_idx-30):h4_idx+1]
-            else:
-                h4_window = None
-
-            # Estado da posição
+            # Estado da posição (também alimenta pnl_history)
             position_state = self._get_position_state()
 
-            # Construir features
-            observation = self.feature_engineer.build_observation(
-                symbol=self.symbol,
-                h1_data=h1_data,
-                h4_data=h4_window,
-                d1_data=d1_data,
-                sentiment=sentiment,
-                macro=macro,
-                smc=smc,
-                position_state=position_state,
-                multi_tf_result=self.multi_tf_result
-            )
-
-            # Garantir que não há NaN - substituir por 0
-            observation = np.nan_to_num(observation, nan=0.0, posinf=0.0, neginf=0.0)
-
-            # Clippar valores extremos para evitar problemas
-            observation = np.clip(observation, -10.0, 10.0)
-
-            return observation.astype(np.float32)
+            h4_idx = self.current_step
+            if self.market_observations is not None and h4_idx < len(self.market_observations):
+                observation = self.market_observations[h4_idx].copy()
+                if np.isnan(observation[0]):
+                    return np.zeros(104, dtype=np.float32)
+
+                position = np.clip(
+                    np.array(self.feature_engineer.position_features(position_state), dtype=np.float32),
+                    -10, 10
+                )
+                observation[FeatureEngineer.POSITION_FEATURES] = self._sanitize_observation(position)
+                return observation
+
+            return self._build_observation(h4_idx, position_state)
 
         except Exception as e:
             logger.error(f"Error building observation: {e}")
@@ -0,0 +1,350 @@
+"""
+Rollouts paralelos: N CryptoFuturesEnv em processos (SubprocVecEnv) com os
+dados de mercado em memória compartilhada.
+
+Os DataFrames OHLCV/indicadores e a matriz de observações de mercado são
+publicados uma vez em blocos multiprocessing.shared_memory; cada worker
+recebe apenas descritores (nome do segmento, shape, dtype) e monta
+DataFrames somente leitura sobre os mesmos buffers, sem pickle dos dados.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from stable_baselines3.common.vec_env import SubprocVecEnv
+
+from .environment import CryptoFuturesEnv
+
+logger = logging.getLogger(__name__)
+
+# Entradas do dicionário de dados publicadas em memória compartilhada
+SHARED_FRAME_KEYS = ('h1', 'h4', 'd1', 'btc_d1')
+
+# 'symbol': workers em rodízio pelos datasets, cada um com o histórico inteiro
+# 'time': workers do mesmo dataset dividem o histórico H4 em fatias contíguas
+ASSIGNMENT_MODES = ('symbol', 'time')
+
+# Segmentos abertos neste processo. Nunca são fechados explicitamente: arrays
+# e DataFrames apontam para o mapeamento, e fechá-lo com eles vivos derruba o
+# processo. O unlink do criador libera a memória quando os processos terminam.
+_ATTACHED: Dict[str, shared_memory.SharedMemory] = {}
+
+
+@dataclass(frozen=True)
+class SharedArraySpec:
+    """Descritor picklável de um array em memória compartilhada."""
+    shm_name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+@dataclass(frozen=True)
+class SharedFrameSpec:
+    """DataFrame publicado: um bloco (colunas, linhas) por dtype numérico."""
+    columns: Tuple[str, ...]
+    blocks: Tuple[Tuple[Tuple[str, ...], SharedArraySpec], ...]
+    index: pd.Index
+    # Colunas não numéricas (ex.: 'symbol') seguem por pickle
+    objects: Dict[str, np.ndarray] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class SharedDatasetSpec:
+    """Dataset de um símbolo: frames compartilhados + entradas pequenas (sentiment, smc...)."""
+    frames: Dict[str, SharedFrameSpec]
+    static: Dict[str, Any]
+    observations: Optional[SharedArraySpec] = None
+
+    @property
+    def n_h4(self) -> int:
+        h4 = self.frames.get('h4')
+        return len(h4.index) if h4 is not None else 0
+
+
+@dataclass(frozen=True)
+class WorkerAssignment:
+    """Dataset e fatia de candles H4 [start, stop) de um worker."""
+    key: str
+    start: int = 0
+    stop: Optional[int] = None
+
+
+def _attach_array(spec: SharedArraySpec) -> np.ndarray:
+    """Array somente leitura sobre um segmento compartilhado."""
+    shm = _ATTACHED.get(spec.shm_name)
+    if shm is None:
+        shm = shared_memory.SharedMemory(name=spec.shm_name)
+        _ATTACHED[spec.shm_name] = shm
+    array = np.ndarray(spec.shape, dtype=np.dtype(spec.dtype), buffer=shm.buf)
+    array.flags.writeable = False
+    return array
+
+
+def _attach_frame(spec: SharedFrameSpec) -> pd.DataFrame:
+    """Reconstrói o DataFrame sobre os blocos compartilhados (sem cópia)."""
+    parts = []
+    for columns, array_spec in spec.blocks:
+        block = _attach_array(array_spec)
+        parts.append(pd.DataFrame(block.T, index=spec.index, columns=list(columns), copy=False))
+    if spec.objects:
+        parts.append(pd.DataFrame(spec.objects, index=spec.index))
+    if not parts:
+        return pd.DataFrame(index=spec.index)
+
+    frame = pd.concat(parts, axis=1) if len(parts) > 1 else parts[0]
+    if tuple(frame.columns) != spec.columns:
+        frame = frame[list(spec.columns)]
+    return frame
+
+
+def attach_dataset(spec: SharedDatasetSpec,
+                   start: int = 0,
+                   stop: Optional[int] = None) -> Tuple[Dict[str, Any], Optional[np.ndarray]]:
+    """
+    Monta o dicionário de dados do CryptoFuturesEnv a partir do spec.
+
+    Args:
+        spec: Dataset publicado por SharedMarketData
+        start, stop: Fatia de candles H4 do worker
+
+    Returns:
+        (dados para o environment, matriz de observações da fatia ou None)
+    """
+    data = dict(spec.static)
+    for name, frame_spec in spec.frames.items():
+        data[name] = _attach_frame(frame_spec)
+
+    if 'h4' in data:
+        data['h4'] = data['h4'].iloc[start:stop]
+
+    observations = None
+    if spec.observations is not None:
+        observations = _attach_array(spec.observations)[start:stop]
+
+    return data, observations
+
+
+@dataclass
+class SharedEnvFactory:
+    """Callable picklável que cria um CryptoFuturesEnv sobre dados compartilhados."""
+    spec: SharedDatasetSpec
+    assignment: WorkerAssignment
+    env_kwargs: Dict[str, Any] = field(default_factory=dict)
+
+    def __call__(self) -> CryptoFuturesEnv:
+        data, observations = attach_dataset(
+            self.spec, self.assignment.start, self.assignment.stop
+        )
+        kwargs = dict(self.env_kwargs)
+        kwargs.pop('precompute_observations', None)
+        return CryptoFuturesEnv(data, market_observations=observations, **kwargs)
+
+
+class SharedMarketData:
+    """
+    Publica datasets de CryptoFuturesEnv em memória compartilhada.
+
+    Deve ser fechado (close/context manager) depois dos environments que
+    o usam; o processo criador é o dono dos segmentos e faz o unlink.
+    """
+
+    def __init__(self, datasets: Dict[str, Dict[str, Any]],
+                 precompute_observations: bool = True):
+        """
+        Args:
+            datasets: {nome (ex.: símbolo): dicionário de dados do CryptoFuturesEnv}
+            precompute_observations: Publica também a matriz de observações de
+                mercado de cada dataset (calculada uma vez, aqui)
+        """
+        if not datasets:
+            raise ValueError("Nenhum dataset para publicar")
+
+        self._segments: List[shared_memory.SharedMemory] = []
+        self.specs: Dict[str, SharedDatasetSpec] = {}
+
+        try:
+            for key, data in datasets.items():
+                self.specs[key] = self._publish_dataset(data, precompute_observations)
+        except Exception:
+            self.close()
+            raise
+
+        total_mb = sum(seg.size for seg in self._segments) / 1e6
+        logger.info(f"SharedMarketData: {len(self.specs)} datasets, "
+                    f"{len(self._segments)} segmentos, {total_mb:.1f} MB")
+
+    def _publish_array(self, array: np.ndarray) -> SharedArraySpec:
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self._segments.append(shm)
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+        view[...] = array
+        return SharedArraySpec(shm.name, array.shape, array.dtype.str)
+
+    def _publish_frame(self, df: pd.DataFrame) -> SharedFrameSpec:
+        by_dtype: Dict[np.dtype, List[str]] = {}
+        objects = {}
+        for col in df.columns:
+            dtype = df[col].dtype
+            if isinstance(dtype, np.dtype) and (dtype.kind in 'biuf'):
+                by_dtype.setdefault(dtype, []).append(col)
+            else:
+                objects[col] = df[col].to_numpy()
+
+        # Bloco (colunas, linhas) em ordem C: cada coluna é contígua
+        blocks = tuple(
+            (tuple(cols), self._publish_array(np.ascontiguousarray(df[cols].to_numpy(dtype=dtype).T)))
+            for dtype, cols in by_dtype.items()
+        )
+        return SharedFrameSpec(tuple(df.columns), blocks, df.index, objects)
+
+    def _publish_dataset(self, data: Dict[str, Any],
+                         precompute_observations: bool) -> SharedDatasetSpec:
+        frames = {}
+        static = {}
+        for name, value in data.items():
+            if name in SHARED_FRAME_KEYS and isinstance(value, pd.DataFrame):
+                frames[name] = self._publish_frame(value)
+            else:
+                static[name] = value
+
+        observations = None
+        if precompute_observations and isinstance(data.get('h4'), pd.DataFrame):
+            observations = self._publish_array(
+                CryptoFuturesEnv.precompute_market_observations(data)
+            )
+
+        return SharedDatasetSpec(frames, static, observations)
+
+    def close(self) -> None:
+        """Libera e remove todos os segmentos compartilhados."""
+        for shm in self._segments:
+            try:
+                shm.close()
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._segments = []
+
+    def __enter__(self) -> "SharedMarketData":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def assign_workers(self, n_envs: int, mode: str = 'symbol') -> List[WorkerAssignment]:
+        """
+        Distribui n_envs workers entre os datasets.
+
+        Args:
+            n_envs: Número de environments
+            mode: 'symbol' (histórico inteiro por worker) ou 'time' (fatias H4)
+
+        Returns:
+            Uma WorkerAssignment por worker
+        """
+        if mode not in ASSIGNMENT_MODES:
+            raise ValueError(f"assignment deve ser um de {ASSIGNMENT_MODES}, recebido {mode!r}")
+        if n_envs < 1:
+            raise ValueError("n_envs deve ser >= 1")
+
+        keys = list(self.specs)
+        worker_keys = [keys[i % len(keys)] for i in range(n_envs)]
+        if mode == 'symbol':
+            return [WorkerAssignment(key) for key in worker_keys]
+
+        assignments = []
+        for key in worker_keys:
+            same_key = worker_keys.count(key)
+            slot = sum(1 for a in assignments if a.key == key)
+            bounds = np.linspace(0, self.specs[key].n_h4, same_key + 1).astype(int)
+            assignments.append(WorkerAssignment(key, int(bounds[slot]), int(bounds[slot + 1])))
+        return assignments
+
+    def env_factories(self, n_envs: int, mode: str = 'symbol',
+                      env_kwargs: Optional[Dict[str, Any]] = None) -> List[SharedEnvFactory]:
+        """Factories picláveis (uma por worker) para SubprocVecEnv/DummyVecEnv."""
+        env_kwargs = dict(env_kwargs or {})
+        factories = []
+        for assignment in self.assign_workers(n_envs, mode):
+            spec = self.specs[assignment.key]
+            stop = spec.n_h4 if assignment.stop is None else assignment.stop
+            min_rows = env_kwargs.get('episode_length', 500) + 60
+            if stop - assignment.start < min_rows:
+                logger.warning(f"Fatia H4 curta para {assignment.key}: "
+                               f"{stop - assignment.start} candles (< {min_rows})")
+            factories.append(SharedEnvFactory(spec, assignment, env_kwargs))
+        return factories
+
+
+def make_parallel_vec_env(shared: SharedMarketData,
+                          n_envs: int,
+                          assignment: str = 'symbol',
+                          env_kwargs: Optional[Dict[str, Any]] = None,
+                          start_method: Optional[str] = None) -> SubprocVecEnv:
+    """
+    Cria SubprocVecEnv com n_envs workers sobre dados compartilhados.
+
+    Args:
+        shared: Dados publicados (fechar só depois do vec env)
+        n_envs: Número de processos/environments
+        assignment: 'symbol' ou 'time' (ver ASSIGNMENT_MODES)
+        env_kwargs: Argumentos do CryptoFuturesEnv (ex.: episode_length)
+        start_method: Método de multiprocessing (default do SB3: forkserver no Linux)
+
+    Returns:
+        SubprocVecEnv
+    """
+    factories = shared.env_factories(n_envs, assignment, env_kwargs)
+    return SubprocVecEnv(factories, start_method=start_method)
+
+
+def benchmark_rollout_throughput(shared: SharedMarketData,
+                                 worker_counts: Sequence[int] = (1, 2, 4),
+                                 n_steps: int = 1000,
+                                 assignment: str = 'symbol',
+                                 env_kwargs: Optional[Dict[str, Any]] = None,
+                                 seed: int = 0) -> Dict[int, Dict[str, float]]:
+    """
+    Mede steps/s de rollout (ações aleatórias) por número de workers.
+
+    Args:
+        shared: Dados publicados
+        worker_counts: Números de workers a medir
+        n_steps: Steps por environment em cada medição
+        assignment: Modo de distribuição dos workers
+        env_kwargs: Argumentos do CryptoFuturesEnv
+        seed: Semente das ações e dos environments
+
+    Returns:
+        {n_workers: {'steps_per_sec', 'steps_per_sec_per_worker', 'elapsed_s'}}
+    """
+    rng = np.random.default_rng(seed)
+    report = {}
+    for n_envs in worker_counts:
+        vec_env = make_parallel_vec_env(shared, n_envs, assignment, env_kwargs)
+        try:
+            vec_env.seed(seed)
+            vec_env.reset()
+            actions = rng.integers(0, vec_env.action_space.n, size=(n_steps, n_envs))
+
+            start = time.perf_counter()
+            for step_actions in actions:
+                vec_env.step(step_actions)
+            elapsed = time.perf_counter() - start
+        finally:
+            vec_env.close()
+
+        steps_per_sec = n_steps * n_envs / elapsed if elapsed > 0 else float('inf')
+        report[n_envs] = {
+            'steps_per_sec': steps_per_sec,
+            'steps_per_sec_per_worker': steps_per_sec / n_envs,
+            'elapsed_s': elapsed,
+        }
+        logger.info(f"Rollout {n_envs} workers: {steps_per_sec:.0f} steps/s "
+                    f"({steps_per_sec / n_envs:.0f} por worker)")
+    return report
@@ -11,9 +11,11 @@ from datetime import datetime
 import numpy as np
 from stable_baselines3 import PPO
 from stable_baselines3.common.callbacks import BaseCallback
-from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
+from stable_baselines3.common.vec_env import DummyVecEnv, VecEnv, VecNormalize
 
+from agent.batched_inference import episode_seeds, run_lockstep, spawn_env_copies
 from agent.environment import CryptoFuturesEnv
+from agent.parallel_env import SharedMarketData, make_parallel_vec_env
 from agent.data_loader import DataLoader
 from agent.sb3_utils import attach_safe_logger_to_model
 from config.ppo_config import get_ppo_config, PPOConfig
@@ -94,6 +96,7 @@ class Trainer:
         self.model = None
         self.env = None
         self.vec_env = None  # Armazenar vec_env com VecNormalize
+        self.shared_data: Optional[SharedMarketData] = None  # Dados dos workers paralelos
         self.config = config or get_ppo_config("phase4")
         logger.info(f"Trainer initialized, save_dir={save_dir}")
         logger.info(f"PPO Config loaded - learning_rate={self.config.learning_rate}, "
@@ -103,6 +106,9 @@ class Trainer:
         """
         Cria environment.
 
+        Observações de mercado são pré-computadas por padrão: o PPO percorre
+        os mesmos candles H4 em muitos episódios.
+
         Args:
             data: Dados para o environment
             **kwargs: Argumentos adicionais para o environment
@@ -110,18 +116,66 @@ class Trainer:
         Returns:
             Environment
         """
+        kwargs.setdefault('precompute_observations', True)
         env = CryptoFuturesEnv(data, **kwargs)
         return env
 
+    def create_vec_env(self, data: Dict[str, Any], n_envs: int = 1,
+                       assignment: str = 'symbol', **kwargs) -> VecEnv:
+        """
+        Cria o VecEnv de treinamento.
+
+        Com n_envs > 1 (ou vários datasets) os environments rodam em
+        processos (SubprocVecEnv) e leem OHLCV/indicadores e observações
+        de mercado de memória compartilhada.
+
+        Args:
+            data: Dados de um símbolo, ou {símbolo: dados} para vários datasets
+            n_envs: Número de environments/processos
+            assignment: 'symbol' (histórico inteiro por worker) ou 'time' (fatias H4)
+            **kwargs: Argumentos adicionais para o environment
+
+        Returns:
+            VecEnv (DummyVecEnv com um environment local, ou SubprocVecEnv)
+        """
+        self.close()
+
+        single_dataset = 'h4' in data
+        if n_envs <= 1 and single_dataset:
+            self.env = self.create_env(data, **kwargs)
+            return DummyVecEnv([lambda: self.env])
+
+        datasets = {data.get('symbol', 'BTCUSDT'): data} if single_dataset else data
+        self.shared_data = SharedMarketData(
+            datasets, precompute_observations=kwargs.pop('precompute_observations', True)
+        )
+        self.env = None
+        logger.info(f"Rollouts paralelos: {n_envs} workers, assignment={assignment}")
+        return make_parallel_vec_env(self.shared_data, n_envs, assignment, kwargs)
+
+    def close(self) -> None:
+        """Encerra workers paralelos e libera a memória compartilhada."""
+        if self.shared_data is None:
+            return
+        if self.vec_env is not None:
+            self.vec_env.close()
+            self.vec_env = None
+        self.shared_data.close()
+        self.shared_data = None
+
     def train_phase1_exploration(self, train_data: Dict[str, Any],
                                  total_timesteps: int = 500000,
+                                 n_envs: int = 1,
+                                 assignment: str = 'symbol',
                                  **env_kwargs) -> PPO:
         """
         Fase 1: Exploração inicial com alta entropia.
 
         Args:
-            train_data: Dados de treinamento
+            train_data: Dados de treinamento (ou {símbolo: dados})
             total_timesteps: Número total de timesteps
+            n_envs: Environments paralelos (ver create_vec_env)
+            assignment: Distribuição dos workers ('symbol' ou 'time')
             **env_kwargs: Argumentos para o environment
 
         Returns:
@@ -132,67 +186,69 @@ class Trainer:
         logger.info("="*60)
 
         # Criar environment
-        self.env = self.create_env(train_data, **env_kwargs)
-        vec_env = DummyVecEnv([lambda: self.env])
-
-        # Aplicar VecNormalize para estabilizar treinamento
-        vec_env = VecNormalize(
-            vec_env,
-            norm_obs=True,
-            norm_reward=True,
-            clip_obs=10.0,
-            clip_reward=10.0,
-            gamma=0.99
-        )
-        self.vec_env = vec_env
-
-        # Determinar tensorboard_log baseado na disponibilidade
-        # Nota: Desabilitar TensorBoard na fase 1 para evitar OSError windows file locking
-        tb_log = None  # f"{self.save_dir}/tensorboard/phase1" if TENSORBOARD_AVAILABLE else None
-
-        # Criar modelo PPO com hiperparâmetros de config
-        self.model = PPO(
-            "MlpPolicy",
-            vec_env,
-            learning_rate=self.config.learning_rate,
-            n_steps=self.config.n_steps,
-            batch_size=self.config.batch_size,
-            n_epochs=self.config.n_epochs,
-            gamma=self.config.gamma,
-            gae_lambda=self.config.gae_lambda,
-            clip_range=self.config.clip_range,
-            ent_coef=self.config.ent_coef,
-            vf_coef=self.config.vf_coef,
-            max_grad_norm=self.config.max_grad_norm,
-            normalize_advantage=True,
-            verbose=self.config.verbose,
-            tensorboard_log=tb_log
-        )
-        # Anexar logger seguro ao modelo (evita OSError [Errno 22] no Windows)
-        attach_safe_logger_to_model(self.model, use_stdout=False)
-        # Callback
-        callback = TrainingCallback(log_interval=1000)
-
-        # Treinar
-        logger.info(f"Starting Phase 1 training: {total_timesteps} timesteps")
-        logger.info(f"Config - lr={self.config.learning_rate}, nt={self.config.n_epochs}, "
-                   f"ent_coef={self.config.ent_coef}")
-        self.model.learn(
-            total_timesteps=total_timesteps,
-            callback=callback,
-            progress_bar=False
-        )
+        vec_env = self.create_vec_env(train_data, n_envs=n_envs, assignment=assignment, **env_kwargs)
+        try:
+            # Aplicar VecNormalize para estabilizar treinamento
+            vec_env = VecNormalize(
+                vec_env,
+                norm_obs=True,
+                norm_reward=True,
+                clip_obs=10.0,
+                clip_reward=10.0,
+                gamma=0.99
+            )
+            self.vec_env = vec_env
+
+            # Determinar tensorboard_log baseado na disponibilidade
+            # Nota: Desabilitar TensorBoard na fase 1 para evitar OSError windows file locking
+            tb_log = None  # f"{self.save_dir}/tensorboard/phase1" if TENSORBOARD_AVAILABLE else None
+
+            # Criar modelo PPO com hiperparâmetros de config
+            self.model = PPO(
+                "MlpPolicy",
+                vec_env,
+                learning_rate=self.config.learning_rate,
+                n_steps=self.config.n_steps,
+                batch_size=self.config.batch_size,
+                n_epochs=self.config.n_epochs,
+                gamma=self.config.gamma,
+                gae_lambda=self.config.gae_lambda,
+                clip_range=self.config.clip_range,
+                ent_coef=self.config.ent_coef,
+                vf_coef=self.config.vf_coef,
+                max_grad_norm=self.config.max_grad_norm,
+                normalize_advantage=True,
+                verbose=self.config.verbose,
+                tensorboard_log=tb_log
+            )
+            # Anexar logger seguro ao modelo (evita OSError [Errno 22] no Windows)
+            attach_safe_logger_to_model(self.model, use_stdout=False)
+            # Callback
+            callback = TrainingCallback(log_interval=1000)
+
+            # Treinar
+            logger.info(f"Starting Phase 1 training: {total_timesteps} timesteps")
+            logger.info(f"Config - lr={self.config.learning_rate}, nt={self.config.n_epochs}, "
+                       f"ent_coef={self.config.ent_coef}")
+            self.model.learn(
+                total_timesteps=total_timesteps,
+                callback=callback,
+                progress_bar=False
+            )
 
-        # Salvar
-        model_path = os.path.join(self.save_dir, "phase1_exploration.zip")
-        self.model.save(model_path)
+            # Salvar
+            model_path = os.path.join(self.save_dir, "phase1_exploration.zip")
+            self.model.save(model_path)
 
-        # Salvar estatísticas de normalização do VecNormalize
-        vec_normalize_path = os.path.join(self.save_dir, "phase1_vec_normalize.pkl")
-        self.vec_env.save(vec_normalize_path)
+            # Salvar estatísticas de normalização do VecNormalize
+            vec_normalize_path = os.path.join(self.save_dir, "phase1_vec_normalize.pkl")
+            self.vec_env.save(vec_normalize_path)
 
-        logger.info(f"Phase 1 model saved to {model_path}")
-        logger.info(f"VecNormalize stats saved to {vec_normalize_path}")
+            logger.info(f"Phase 1 model saved to {model_path}")
+            logger.info(f"VecNormalize stats saved to {vec_normalize_path}")
+        finally:
+            # Workers e memória compartilhada não sobrevivem à fase
+            self.close()
 
         # Rastreamento MLflow — nunca bloqueia execucao
         try:
@@ -216,14 +272,18 @@ class Trainer:
     def train_phase2_refinement(self, train_data: Dict[str, Any],
                                 total_timesteps: int = 1000000,
                                 load_phase1: bool = True,
+                                n_envs: int = 1,
+                                assignment: str = 'symbol',
                                 **env_kwargs) -> PPO:
         """
         Fase 2: Refinamento com menor entropia.
 
         Args:
-            train_data: Dados de treinamento
+            train_data: Dados de treinamento (ou {símbolo: dados})
             total_timesteps: Número total de timesteps
             load_phase1: Se deve carregar modelo da fase 1
+            n_envs: Environments paralelos (ver create_vec_env)
+            assignment: Distribuição dos workers ('symbol' ou 'time')
             **env_kwargs: Argumentos para o environment
 
         Returns:
@@ -234,37 +294,49 @@ class Trainer:
         logger.info("="*60)
 
         # Criar environment
-        self.env = self.create_env(train_data, **env_kwargs)
-        vec_env = DummyVecEnv([lambda: self.env])
-
-        # Aplicar VecNormalize
-        vec_env = VecNormalize(
-            vec_env,
-            norm_obs=True,
-            norm_reward=True,
-            clip_obs=10.0,
-            clip_reward=10.0,
-            gamma=0.99
-        )
+        vec_env = self.create_vec_env(train_data, n_envs=n_envs, assignment=assignment, **env_kwargs)
+        try:
+            # Aplicar VecNormalize
+            vec_env = VecNormalize(
+                vec_env,
+                norm_obs=True,
+                norm_reward=True,
+                clip_obs=10.0,
+                clip_reward=10.0,
+                gamma=0.99
+            )
 
-        if load_phase1 and self.model is None:
-            # Carregar modelo da fase 1
-            phase1_path = os.path.join(self.save_dir, "phase1_exploration.zip")
-            vec_normalize_path = os.path.join(self.save_dir, "phase1_vec_normalize.pkl")
+            if load_phase1 and self.model is None:
+                # Carregar modelo da fase 1
+                phase1_path = os.path.join(self.save_dir, "phase1_exploration.zip")
+                vec_normalize_path = os.path.join(self.save_dir, "phase1_vec_normalize.pkl")
 
-            if os.path.exists(phase1_path):
-                logger.info(f"Loading Phase 1 model from {phase1_path}")
+                if os.path.exists(phase1_path):
+                    logger.info(f"Loading Phase 1 model from {phase1_path}")
 
-                # Carregar estatísticas de normalização da fase 1
-                if os.path.exists(vec_normalize_path):
-                    logger.info(f"Loading VecNormalize stats from {vec_normalize_path}")
-                    vec_env = VecNormalize.load(vec_normalize_path, vec_env)
-                else:
-                    logger.warning("VecNormalize stats not found, using new normalization")
+                    # Carregar estatísticas de normalização da fase 1
+                    if os.path.exists(vec_normalize_path):
+                        logger.info(f"Loading VecNormalize stats from {vec_normalize_path}")
+                        vec_env = VecNormalize.load(vec_normalize_path, vec_env)
+                    else:
+                        logger.warning("VecNormalize stats not found, using new normalization")
 
-                self.model = PPO.load(phase1_path, env=vec_env)
-            else:
-                logger.warning("Phase 1 model not found, creating new model")
+                    self.model = PPO.load(phase1_path, env=vec_env)
+                else:
+                    logger.warning("Phase 1 model not found, creating new model")
+                    self.model = PPO(
+                        "MlpPolicy",
+                        vec_env,
+                        learning_rate=self.config.learning_rate,
+                        n_steps=self.config.n_steps,
+                        batch_size=self.config.batch_size,
+                        n_epochs=self.config.n_epochs,
+                        gamma=self.config.gamma,
+                        gae_lambda=self.config.gae_lambda,
+                        normalize_advantage=True,
+                        verbose=self.config.verbose
+                    )
+            elif self.model is None:
                 self.model = PPO(
                     "MlpPolicy",
                     vec_env,
@@ -277,53 +349,43 @@ class Trainer:
                     normalize_advantage=True,
                     verbose=self.config.verbose
                 )
-        elif self.model is None:
-            self.model = PPO(
-                "MlpPolicy",
-                vec_env,
-                learning_rate=self.config.learning_rate,
-                n_steps=self.config.n_steps,
-                batch_size=self.config.batch_size,
-                n_epochs=self.config.n_epochs,
-                gamma=self.config.gamma,
-                gae_lambda=self.config.gae_lambda,
-                normalize_advantage=True,
-                verbose=self.config.verbose
+            else:
+                # Atualizar environment
+                self.model.set_env(vec_env)
+
+            self.vec_env = vec_env
+
+            # Usar entropy coefficient de refinamento da config (reduzido para Phase 2)
+            refined_ent_coef = max(self.config.ent_coef * 0.5, 0.0001)  # Reduzir entropia para refinement
+            self.model.ent_coef = refined_ent_coef
+            logger.info(f"Phase 2 - Reduced entropy coefficient: {refined_ent_coef}")
+
+            # Callback
+            callback = TrainingCallback(log_interval=1000)
+
+            # Treinar
+            logger.info(f"Starting Phase 2 training: {total_timesteps} timesteps")
+            logger.info(f"Config - lr={self.config.learning_rate}, ent_coef={self.model.ent_coef}")
+            self.model.learn(
+                total_timesteps=total_timesteps,
+                callback=callback,
+                progress_bar=False,
+                reset_num_timesteps=False  # Continuar contagem
             )
-        else:
-            # Atualizar environment
-            self.model.set_env(vec_env)
-
-        self.vec_env = vec_env
-
-        # Usar entropy coefficient de refinamento da config (reduzido para Phase 2)
-        refined_ent_coef = max(self.config.ent_coef * 0.5, 0.0001)  # Reduzir entropia para refinement
-        self.model.ent_coef = refined_ent_coef
-        logger.info(f"Phase 2 - Reduced entropy coefficient: {refined_ent_coef}")
-
-        # Callback
-        callback = TrainingCallback(log_interval=1000)
-
-        # Treinar
-        logger.info(f"Starting Phase 2 training: {total_timesteps} timesteps")
-        logger.info(f"Config - lr={self.config.learning_rate}, ent_coef={self.model.ent_coef}")
-        self.model.learn(
-            total_timesteps=total_timesteps,
-            callback=callback,
-            progress_bar=False,
-            reset_num_timesteps=False  # Continuar contagem
-        )
 
-        # Salvar
-        model_path = os.path.join(self.save_dir, "phase2_refinement.zip")
-        self.model.save(model_path)
+            # Salvar
+            model_path = os.path.join(self.save_dir, "phase2_refinement.zip")
+            self.model.save(model_path)
 
-        # Salvar estatísticas de normalização do VecNormalize
-        vec_normalize_path = os.path.join(self.save_dir, "phase2_vec_normalize.pkl")
-        self.vec_env.save(vec_normalize_path)
+            # Salvar estatísticas de normalização do VecNormalize
+            vec_normalize_path = os.path.join(self.save_dir, "phase2_vec_normalize.pkl")
+            self.vec_env.save(vec_normalize_path)
 
-        logger.info(f"Phase 2 model saved to {model_path}")
-        logger.info(f"VecNormalize stats saved to {vec_normalize_path}")
+            logger.info(f"Phase 2 model saved to {model_path}")
+            logger.info(f"VecNormalize stats saved to {vec_normalize_path}")
+        finally:
+            # Workers e memória compartilhada não sobrevivem à fase
+            self.close()
 
         # Rastreamento MLflow — nunca bloqueia execucao
         try:
@@ -384,7 +446,8 @@ class Trainer:
         return metrics
 
     def evaluate(self, env: CryptoFuturesEnv, n_episodes: int = 100,
-                 deterministic: bool = True) -> Dict[str, float]:
+                 deterministic: bool = True, batch_envs: int = 1,
+                 inference_threads: Optional[int] = None) -> Dict[str, float]:
         """
         Avalia o modelo em um environment.
 
@@ -392,6 +455,9 @@ class Trainer:
             env: Environment para avaliação
             n_episodes: Número de episódios
             deterministic: Se deve usar política determinística
+            batch_envs: Episódios em lockstep com inferência em lote
+                (cópias de env; 1 = um episódio por vez)
+            inference_threads: Threads de CPU do torch no modo em lote
 
         Returns:
             Dicionário com métricas
@@ -403,7 +469,21 @@ class Trainer:
         episode_returns = []
         episode_capitals = []
 
-        for episode in range(n_episodes):
+        if batch_envs > 1:
+            envs = [env] + spawn_env_copies(env, min(batch_envs, n_episodes) - 1)
+            seeds = episode_seeds(env, len(envs))
+            while len(episode_returns) < n_episodes:
+                batch = envs[:n_episodes - len(episode_returns)]
+                results = run_lockstep(batch, self.model, deterministic, seeds=seeds[:len(batch)],
+                                       n_threads=inference_threads)
+                seeds = [None] * len(envs)
+                for batch_env, result in zip(batch, results):
+                    all_trades.extend(batch_env.episode_trades)
+                    episode_returns.append(result['reward'])
+                    episode_capitals.append(batch_env.capital)
+                logger.info(f"Evaluation episodes {len(episode_returns)}/{n_episodes} completed")
+
+        for episode in range(len(episode_returns), n_episodes):
             obs, info = env.reset()
             episode_reward = 0
             done = False
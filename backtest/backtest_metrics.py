@@ -11,6 +11,8 @@ import json
 import numpy as np
 import logging
 
+from backtest import metrics_kernel
+
 logger = logging.getLogger(__name__)
 
 
@@ -66,8 +68,7 @@ class BacktestMetrics:
             return BacktestMetrics()
 
         equity_array = np.array(equity_curve, dtype=float)
-        returns = np.diff(equity_array, prepend=equity_array[0])
-        returns_pct = (returns[1:] / equity_array[:-1]) * 100
+        returns_pct = metrics_kernel.returns_from_equity(equity_array) * 100
 
         # 1. SHARPE RATIO
         # Sharpe = (mean_return - risk_free_rate) / std_deviation
@@ -81,9 +82,7 @@ class BacktestMetrics:
         sharpe_annual = sharpe * np.sqrt(252)
 
         # 2. MAX DRAWDOWN
-        running_max = np.maximum.accumulate(equity_array)
-        drawdowns = (equity_array - running_max) / (running_max + 1e-8)
-        max_dd_pct = np.min(drawdowns) * 100 if len(drawdowns) > 0 else 0
+        max_dd_pct = -float(metrics_kernel.max_drawdown(equity_array, epsilon=1e-8)) * 100
 
         # 3-6. TRADES METRICS
         if trades is None or len(trades) == 0:
@@ -102,12 +101,12 @@ class BacktestMetrics:
             )
 
         # Separar wins e losses
-        pnls = [t.get('pnl_realized', 0) for t in trades]
-        wins = [p for p in pnls if p > 0]
-        losses = [p for p in pnls if p < 0]
+        pnls = np.fromiter((t.get('pnl_realized', 0) for t in trades),
+                           dtype=np.float64, count=len(trades))
+        stats = metrics_kernel.trade_metrics(pnls)
 
-        winning_trades = len(wins)
-        losing_trades = len(losses)
+        winning_trades = int(stats['winning_trades'])
+        losing_trades = int(stats['losing_trades'])
         total_trades = len(trades)
 
         # CALMAR RATIO = Annual Return / Max Drawdown
@@ -117,30 +116,23 @@ class BacktestMetrics:
         calmar = annual_return / (abs(max_dd_pct) + 1e-8) if max_dd_pct != 0 else 0
 
         # PROFIT FACTOR = sum(wins) / abs(sum(losses))
-        sum_wins = sum(wins) if wins else 1e-8
-        sum_losses = abs(sum(losses)) if losses else 1e-8
+        sum_wins = float(stats['gross_profit']) if winning_trades else 1e-8
+        sum_losses = float(stats['gross_loss']) if losing_trades else 1e-8
         profit_factor = sum_wins / (sum_losses + 1e-8)
 
         # WIN RATE = winning_trades / total_trades
         wr = (winning_trades / total_trades * 100) if total_trades > 0 else 0
 
         # EXPECTANCY = (wr% * avg_win) - ((1-wr%) * avg_loss)
-        avg_win = np.mean(wins) if wins else 0
-        avg_loss = abs(np.mean(losses)) if losses else 0
+        avg_win = float(stats['avg_win'])
+        avg_loss = abs(float(stats['avg_loss']))
         expectancy = (wr/100 * avg_win) - ((1 - wr/100) * avg_loss)
 
         # CONSECUTIVE LOSSES (máximo de perdas seguidas)
-        max_consecutive_losses = 0
-        current_consecutive = 0
-        for pnl in pnls:
-            if pnl < 0:
-                current_consecutive += 1
-                max_consecutive_losses = max(max_consecutive_losses, current_consecutive)
-            else:
-                current_consecutive = 0
+        max_consecutive_losses = int(stats['max_consecutive_losses'])
 
         # RECOVERY FACTOR = Total PnL / Max Drawdown
-        total_pnl = sum(pnls) if pnls else 0
+        total_pnl = float(stats['net_pnl'])
         max_dd_abs = abs(max_dd_pct / 100) * equity_array[0]  # Converter pct para absoluto
         recovery_factor = total_pnl / (max_dd_abs + 1e-8) if max_dd_abs > 0 else 0
 
@@ -156,8 +148,8 @@ class BacktestMetrics:
             winning_trades=winning_trades,
             losing_trades=losing_trades,
             total_return_pct=total_return * 100,
-            avg_win_pct=np.mean([p/equity_array[0]*100 for p in wins]) if wins else 0,
-            avg_loss_pct=np.mean([p/equity_array[0]*100 for p in losses]) if losses else 0,
+            avg_win_pct=avg_win / equity_array[0] * 100,
+            avg_loss_pct=-avg_loss / equity_array[0] * 100,
             expectancy_pct=expectancy / (equity_array[0] + 1e-8) * 100,
             recovery_factor=recovery_factor
         )
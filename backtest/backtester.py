@@ -10,6 +10,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import os
 
+from backtest import metrics_kernel
+
 logger = logging.getLogger(__name__)
 
 
@@ -81,29 +83,90 @@ class Backtester:
 
         # Coletar trades
         self.trades = env.trades_history
+        results = self._build_results(start_date, end_date, env, self.equity_curve)
+
+        logger.info(f"Backtest completed: {len(self.trades)} trades, "
+                   f"final capital=${env.capital:.2f}")
+        return results
+
+    def run_batch(
+        self,
+        start_date: str,
+        end_date: str,
+        model: Any,
+        datasets: Dict[str, Dict[str, pd.DataFrame]],
+        inference_threads: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Executa um backtest por dataset em lockstep, com inferência em lote.
+
+        Cada step empilha as observações dos símbolos ainda ativos e chama
+        a política uma vez (ver agent.batched_inference.run_lockstep).
+
+        Args:
+            start_date: Data inicial (YYYY-MM-DD)
+            end_date: Data final (YYYY-MM-DD)
+            model: Modelo treinado (PPO)
+            datasets: {símbolo: dados históricos}
+            inference_threads: Threads de CPU do torch
+
+        Returns:
+            {símbolo: resultados no formato de run()}
+        """
+        from agent.batched_inference import run_lockstep
+        from agent.environment import CryptoFuturesEnv
+
+        logger.info(f"Running batched backtest: {len(datasets)} datasets, {start_date} to {end_date}")
+
+        symbols = list(datasets)
+        envs = [
+            CryptoFuturesEnv(
+                data=datasets[symbol],
+                initial_capital=self.initial_capital,
+                episode_length=len(datasets[symbol].get('h4', [])) - 1
+            )
+            for symbol in symbols
+        ]
+        curves = [[self.initial_capital] for _ in envs]
+
+        run_lockstep(
+            envs, model, deterministic=True,
+            on_step=lambda i, env: curves[i].append(env.capital),
+            n_threads=inference_threads
+        )
+
+        results = {
+            symbol: self._build_results(start_date, end_date, env, curve)
+            for symbol, env, curve in zip(symbols, envs, curves)
+        }
+        logger.info("Batched backtest completed: " + ", ".join(
+            f"{symbol}={len(r['trades'])} trades" for symbol, r in results.items()
+        ))
+        return results
+
+    def _build_results(self, start_date: str, end_date: str, env: Any,
+                       equity_curve: List[float]) -> Dict[str, Any]:
+        """Monta o dicionário de resultados de um environment finalizado."""
+        trades = env.trades_history
 
         # Calcular métricas
         metrics = self._calculate_metrics(
-            self.trades,
-            self.equity_curve,
+            trades,
+            equity_curve,
             self.initial_capital
         )
 
-        results = {
+        return {
             'start_date': start_date,
             'end_date': end_date,
             'initial_capital': self.initial_capital,
             'final_capital': env.capital,
-            'total_trades': len(self.trades),
+            'total_trades': len(trades),
             'metrics': metrics,
-            'equity_curve': self.equity_curve,
-            'trades': self.trades
+            'equity_curve': equity_curve,
+            'trades': trades
         }
 
-        logger.info(f"Backtest completed: {len(self.trades)} trades, "
-                   f"final capital=${env.capital:.2f}")
-        return results
-
     def _calculate_metrics(
         self,
         trades: List[Dict[str, Any]],
@@ -136,36 +199,20 @@ class Backtester:
         final_capital = equity_curve[-1]
         total_return = (final_capital - initial_capital) / initial_capital * 100
 
-        # Win rate
-        winners = [t for t in trades if t['pnl'] > 0]
-        win_rate = len(winners) / len(trades)
-
-        # Profit factor
-        gross_profit = sum(t['pnl'] for t in winners)
-        losers = [t for t in trades if t['pnl'] <= 0]
-        gross_loss = abs(sum(t['pnl'] for t in losers))
-        profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
+        pnl = np.fromiter((t['pnl'] for t in trades), dtype=np.float64, count=len(trades))
+        stats = metrics_kernel.trade_metrics(pnl)
+        win_rate = float(stats['win_rate'])
+        gross_loss = float(stats['gross_loss'])
+        profit_factor = float(stats['gross_profit']) / gross_loss if gross_loss > 0 else 0
 
         # Sharpe ratio (assumindo daily returns)
-        returns = []
-        for i in range(1, len(equity_curve)):
-            daily_return = (equity_curve[i] - equity_curve[i-1]) / equity_curve[i-1]
-            returns.append(daily_return)
-
-        if len(returns) > 1 and np.std(returns) > 0:
-            sharpe_ratio = np.mean(returns) / np.std(returns) * np.sqrt(252)  # Anualizado
-        else:
-            sharpe_ratio = 0
-
-        # Max drawdown
-        peak = initial_capital
-        max_dd = 0
-        for capital in equity_curve:
-            if capital > peak:
-                peak = capital
-            dd = (peak - capital) / peak
-            if dd > max_dd:
-                max_dd = dd
+        equity = np.asarray(equity_curve, dtype=np.float64)
+        sharpe_ratio = float(metrics_kernel.sharpe_ratio(
+            metrics_kernel.returns_from_equity(equity), periods_per_year=252  # Anualizado
+        ))
+
+        # Max drawdown (pico parte do capital inicial)
+        max_dd = float(metrics_kernel.max_drawdown(np.concatenate(([initial_capital], equity))))
 
         # Avg R-multiple
         r_multiples = [t['r_multiple'] for t in trades if 'r_multiple' in t]
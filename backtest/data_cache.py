@@ -3,13 +3,17 @@ ParquetCache — Cache de dados históricos para backtesting (3-tier pipeline).
 
 Camadas:
 1. SQLite (db/crypto_agent.db) → Fonte de verdade
-2. Parquet (cache/) → Cached persistente (6-10x mais rápido)
-3. NumPy arrays → Memory residente durante backtest
+2. Parquet (cache/ohlcv/{symbol}/{timeframe}/{YYYY-MM}.parquet) → Cache
+   persistente particionado por mês, atualizado por append
+3. NumPy arrays → Memory residente durante backtest, ou .npy mapeados
+   (cache/arrays/) compartilhados entre processos via page cache
 
 Implementado em 22 FEV por SWE Senior.
 """
 
 import logging
+import time
+from contextlib import closing
 from typing import Dict, Optional, List, Tuple
 import pandas as pd
 import numpy as np
@@ -17,8 +21,23 @@ from pathlib import Path
 import sqlite3
 from datetime import datetime
 
+from backtest.frame_cache import FrameLRUCache
+from backtest.memmap_store import MemmapArrayStore
+from backtest.parquet_store import PartitionedParquetStore
+from data.database import read_ohlcv_arrays
+from indicators.technical import OHLCV_COLUMNS, TechnicalIndicators
+
 logger = logging.getLogger(__name__)
 
+# Timeframes do cache → tabelas OHLCV no SQLite
+SQLITE_TABLES = {
+    'h1': 'ohlcv_h1',
+    'h4': 'ohlcv_h4',
+    'd1': 'ohlcv_d1'
+}
+
+CACHE_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
 
 class ParquetCache:
     """
@@ -27,40 +46,94 @@ class ParquetCache:
     Carrega dados SQLite → converts para Parquet → loads como NumPy.
 
     Pipeline:
-    1. load_ohlcv_for_symbol(symbol) → check Parquet cache
-    2. Se cache existe: retorna DataFrame rápido
-    3. Se não: carrega SQLite, converte Parquet, salva cache
+    1. load_ohlcv_for_symbol(symbol) → confere frescor do Parquet contra o SQLite
+    2. Candles novos no SQLite são anexados às partições mensais
+    3. Janelas de datas leem só os meses/row groups necessários
     """
 
-    def __init__(self, db_path: str, cache_dir: str = "backtest/cache"):
+    def __init__(self, db_path: str, cache_dir: str = "backtest/cache",
+                 freshness_interval_s: float = 60.0, memory_budget_mb: float = 512.0):
         """
         Inicializa ParquetCache.
 
         Args:
             db_path: Path para SQLite database
             cache_dir: Diretório para armazenar arquivos Parquet
+            freshness_interval_s: Intervalo mínimo entre conferências de
+                frescor contra o SQLite por símbolo/timeframe (0 = sempre)
+            memory_budget_mb: Teto do memory cache (LRU por bytes)
         """
         self.db_path = db_path
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.store = PartitionedParquetStore(str(self.cache_dir / "ohlcv"))
+        self.arrays = MemmapArrayStore(str(self.cache_dir / "arrays"))
+        self.freshness_interval_s = freshness_interval_s
 
-        # Memory cache (opcional, 3-tier adicional)
-        self._memory_cache: Dict[str, pd.DataFrame] = {}
+        # Memory cache (3-tier adicional), LRU limitado por bytes
+        self._memory_cache = FrameLRUCache(int(memory_budget_mb * 1024 * 1024))
+        self._last_sync: Dict[str, float] = {}
 
         logger.info(f"ParquetCache initialized: cache_dir={self.cache_dir}")
 
-    def _get_parquet_path(self, symbol: str, timeframe: str) -> Path:
+    def refresh(self, symbol: str, timeframe: str) -> Dict[str, int]:
         """
-        Retorna path para arquivo Parquet de um símbolo/timeframe.
+        Sincroniza o Parquet do par com o SQLite.
 
-        Args:
-            symbol: Ex. 'BTCUSDT'
-            timeframe: 'h1', 'h4', 'd1'
+        Compara contagem, primeiro e último timestamp do SQLite com o
+        manifesto: se só há candles novos, anexa a cauda a partir do último
+        candle gravado (que pode ter mudado enquanto estava em formação);
+        se o histórico anterior mudou, reconstrói o par.
 
         Returns:
-            Path absoluto do arquivo Parquet
+            Dict com appended (linhas lidas do SQLite) e rebuilt (0/1)
         """
-        return self.cache_dir / f"{symbol}_{timeframe}.parquet"
+        table_name = SQLITE_TABLES.get(timeframe)
+        if not table_name:
+            raise ValueError(f"Unknown timeframe: {timeframe}")
+
+        cache_key = f"{symbol}_{timeframe}"
+        manifest = self.store.manifest(symbol, timeframe)
+        stored_max = manifest['max_timestamp'] if manifest else None
+
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            count, first, last, upto = conn.execute(
+                f"SELECT COUNT(*), MIN(timestamp), MAX(timestamp), "
+                f"COALESCE(SUM(timestamp <= ?), 0) FROM {table_name} WHERE symbol = ?",
+                (stored_max, symbol),
+            ).fetchone()
+
+            if count == 0:
+                return {'appended': 0, 'rebuilt': 0}
+            rebuild = manifest is None or first != manifest['min_timestamp'] or upto != manifest['rows']
+            if not rebuild and last <= stored_max:
+                return {'appended': 0, 'rebuilt': 0}
+
+            start_time = None if rebuild else stored_max
+            df = pd.DataFrame(
+                read_ohlcv_arrays(conn, timeframe, symbol, start_time=start_time, columns=CACHE_COLUMNS),
+                copy=False,
+            )
+
+        self.store.write(symbol, timeframe, df, replace=rebuild)
+        self._memory_cache.pop(cache_key)
+        logger.debug(
+            f"Parquet {'rebuilt' if rebuild else 'appended'}: {symbol} {timeframe} ({len(df)} candles)"
+        )
+        return {'appended': len(df), 'rebuilt': int(rebuild)}
+
+    def _ensure_fresh(self, symbol: str, timeframe: str) -> None:
+        cache_key = f"{symbol}_{timeframe}"
+        now = time.monotonic()
+        last = self._last_sync.get(cache_key)
+        if last is not None and now - last < self.freshness_interval_s:
+            return
+        try:
+            self.refresh(symbol, timeframe)
+        except Exception as e:
+            # Sem SQLite acessível, o Parquet existente continua servindo
+            logger.warning(f"Freshness check failed for {symbol} {timeframe}: {e}")
+        self._last_sync[cache_key] = now
 
     def load_ohlcv_for_symbol(self, symbol: str,
                               timeframe: str = 'h4',
@@ -70,10 +143,10 @@ class ParquetCache:
         Carrega OHLCV para símbolo, usando cache Parquet se disponível.
 
         Pipeline:
-        1. Tentar carregar do Parquet cache (rápido)
-        2. Se falhar, carregar do SQLite (lento mas authoritative)
-        3. Converter para Parquet se não existia
-        4. Aplicar filtros de data
+        1. Conferir frescor contra o SQLite (no máximo a cada freshness_interval_s)
+        2. Servir do memory cache, se houver (filtrando em memória)
+        3. Com filtro de datas: ler só os meses/row groups do intervalo
+        4. Sem filtro: ler o par inteiro e guardar no memory cache
         5. Retornar DataFrame
 
         Args:
@@ -92,44 +165,36 @@ class ParquetCache:
         try:
             cache_key = f"{symbol}_{timeframe}"
 
-            # 1. Tentar memory cache (mais rápido)
-            if cache_key in self._memory_cache:
+            # 1. Anexar candles novos do SQLite (fonte de verdade)
+            self._ensure_fresh(symbol, timeframe)
+
+            # 2. Tentar memory cache (mais rápido)
+            df = self._memory_cache.get(cache_key)
+            if df is not None:
                 logger.debug(f"Cache hit (memory): {cache_key}")
-                df = self._memory_cache[cache_key]
+            elif start_date or end_date:
+                # 3. Janela: predicate pushdown nas partições, sem carregar o par todo
+                df = self.store.read(symbol, timeframe, start=start_date or None, end=end_date or None)
+                if df.empty:
+                    logger.warning(f"No data found for {symbol} {timeframe}")
+                return df
             else:
-                # 2. Tentar Parquet cache
-                parquet_path = self._get_parquet_path(symbol, timeframe)
-
-                if parquet_path.exists():
-                    logger.debug(f"Cache hit (Parquet): {parquet_path}")
-                    df = pd.read_parquet(parquet_path)
-                else:
-                    # 3. Carregar do SQLite (fonte de verdade)
-                    logger.debug(f"Cache miss, loading from SQLite: {symbol} {timeframe}")
-                    df = self._load_from_sqlite(symbol, timeframe)
-
-                    if df.empty:
-                        logger.warning(f"No data found for {symbol} {timeframe}")
-                        return pd.DataFrame()
-
-                    # Salvar para Parquet cache
-                    try:
-                        df.to_parquet(parquet_path, index=False)
-                        logger.debug(f"Parquet cache created: {parquet_path}")
-                    except Exception as e:
-                        logger.warning(f"Failed to save Parquet cache: {e}")
+                # 4. Par inteiro
+                df = self.store.read(symbol, timeframe)
+                if df.empty:
+                    logger.warning(f"No data found for {symbol} {timeframe}")
+                    return pd.DataFrame()
 
                 # Armazenar em memory cache
-                self._memory_cache[cache_key] = df
+                self._memory_cache.put(cache_key, df)
 
-            # 4. Aplicar filtros de data
-            if start_date or end_date:
-                df = df.copy()
-                if 'timestamp' in df.columns:
-                    if start_date:
-                        df = df[df['timestamp'] >= start_date]
-                    if end_date:
-                        df = df[df['timestamp'] <= end_date]
+            # 5. Aplicar filtros de data: timestamps ordenados → fatia por
+            # posição, uma view (Copy-on-Write) em vez de máscara + cópia
+            if (start_date or end_date) and 'timestamp' in df.columns:
+                timestamps = df['timestamp'].to_numpy()
+                first = np.searchsorted(timestamps, start_date, side='left') if start_date else 0
+                last = np.searchsorted(timestamps, end_date, side='right') if end_date else len(df)
+                df = df.iloc[first:last]
 
             return df.reset_index(drop=True)
 
@@ -137,53 +202,40 @@ class ParquetCache:
             logger.error(f"Error loading OHLCV for {symbol}: {e}")
             return pd.DataFrame()
 
-    def _load_from_sqlite(self, symbol: str, timeframe: str) -> pd.DataFrame:
+    def get_memmap_columns(self, symbol: str, timeframe: str = 'h4') -> Dict[str, np.ndarray]:
         """
-        Carrega dados OHLCV do SQLite.
+        Colunas OHLCV (CACHE_COLUMNS) mapeadas do disco, somente leitura.
 
-        Args:
-            symbol: Ex. 'BTCUSDT'
-            timeframe: 'h1', 'h4', 'd1'
+        Os .npy são gerados a partir do Parquet na primeira chamada após
+        cada atualização do par; processos que abrem o mesmo par
+        compartilham as páginas do page cache em vez de copiar os dados.
 
         Returns:
-            DataFrame com dados históricos
+            Dict coluna -> np.memmap (vazio se não houver dados)
         """
-        try:
-            # Map timeframe para table no SQLite
-            table_map = {
-                'h1': 'ohlcv_h1',
-                'h4': 'ohlcv_h4',
-                'd1': 'ohlcv_d1'
-            }
-
-            table_name = table_map.get(timeframe)
-            if not table_name:
-                logger.error(f"Unknown timeframe: {timeframe}")
-                return pd.DataFrame()
-
-            # Query com ORDER BY para garantir continuidade
-            query = f"""
-            SELECT timestamp, open, high, low, close, volume
-            FROM {table_name}
-            WHERE symbol = ?
-            ORDER BY timestamp ASC
-            """
-
-            with sqlite3.connect(self.db_path) as conn:
-                df = pd.read_sql_query(query, conn, params=(symbol,))
-
-            logger.info(f"Loaded {len(df)} candles from SQLite: {symbol} {timeframe}")
-            return df
-
-        except Exception as e:
-            logger.error(f"Error loading from SQLite ({symbol} {timeframe}): {e}")
-            return pd.DataFrame()
-
-    def get_cached_data_as_arrays(self, symbol: str) -> Dict[str, np.ndarray]:
+        self._ensure_fresh(symbol, timeframe)
+        manifest = self.store.manifest(symbol, timeframe)
+        if manifest is None:
+            logger.warning(f"No data found for {symbol} {timeframe}")
+            return {}
+
+        key = f"{symbol}_{timeframe}"
+        version = f"{manifest['generation']}:{manifest['rows']}:{manifest['max_timestamp']}"
+        columns = self.arrays.open(key, version)
+        if columns is None:
+            df = self.store.read(symbol, timeframe, columns=CACHE_COLUMNS)
+            self.arrays.write(key, {col: df[col].to_numpy() for col in CACHE_COLUMNS}, version)
+            columns = self.arrays.open(key, version)
+        return columns or {}
+
+    def get_cached_data_as_arrays(self, symbol: str,
+                                  dtype: type = np.float32) -> Dict[str, np.ndarray]:
         """
         Retorna dados em formato NumPy arrays para performance máxima.
 
         Carrega H1, H4, D1 e retorna como arrays prontos para cálculos vetorizados.
+        Use dtype=np.float64 para alimentar TechnicalIndicators.calculate_all_matrix
+        sem perda de precisão.
 
         Returns:
             {
@@ -203,11 +255,11 @@ class ParquetCache:
 
                 if df.empty:
                     logger.warning(f"No data for {symbol} {timeframe}, using zeros")
-                    result[timeframe] = np.zeros((0, 5), dtype=np.float32)
+                    result[timeframe] = np.zeros((0, 5), dtype=dtype)
                 else:
                     # Extrair colunas e converter para array
                     cols = ['open', 'high', 'low', 'close', 'volume']
-                    arr = df[cols].values.astype(np.float32)
+                    arr = df[cols].to_numpy(dtype=dtype)
                     result[timeframe] = arr
                     logger.debug(f"Loaded {len(arr)} rows for {symbol} {timeframe}")
 
@@ -216,11 +268,38 @@ class ParquetCache:
         except Exception as e:
             logger.error(f"Error getting cached arrays for {symbol}: {e}")
             return {
-                'h1': np.zeros((0, 5), dtype=np.float32),
-                'h4': np.zeros((0, 5), dtype=np.float32),
-                'd1': np.zeros((0, 5), dtype=np.float32)
+                'h1': np.zeros((0, 5), dtype=dtype),
+                'h4': np.zeros((0, 5), dtype=dtype),
+                'd1': np.zeros((0, 5), dtype=dtype)
             }
 
+    def get_indicator_frames(self, symbol: str) -> Dict[str, pd.DataFrame]:
+        """
+        Retorna H1, H4, D1 com todos os indicadores técnicos.
+
+        As colunas OHLCV float64 do cache vão direto para o motor colunar
+        (TechnicalIndicators.calculate_all_arrays), sem passar por calculate_all.
+
+        Returns:
+            {'h1': DataFrame, 'h4': DataFrame, 'd1': DataFrame} com 'timestamp',
+            OHLCV e indicadores (DataFrame vazio quando não há dados)
+        """
+        frames = {}
+        for timeframe in ['h1', 'h4', 'd1']:
+            df = self.load_ohlcv_for_symbol(symbol, timeframe)
+            if df.empty:
+                frames[timeframe] = pd.DataFrame()
+                continue
+
+            frame = TechnicalIndicators.calculate_all_arrays(
+                *(df[col].to_numpy(dtype=np.float64) for col in OHLCV_COLUMNS)
+            )
+            if 'timestamp' in df.columns:
+                frame.insert(0, 'timestamp', df['timestamp'].to_numpy())
+            frames[timeframe] = frame
+
+        return frames
+
     def validate_candle_continuity(self, symbol: str, timeframe: str) -> Tuple[bool, Optional[str]]:
         """
         Validar que não há gaps nos dados OHLCV (continuidade de candles).
@@ -289,6 +368,10 @@ class ParquetCache:
         self._memory_cache.clear()
         logger.info("Memory cache cleared")
 
+    def memory_cache_stats(self) -> Dict[str, float]:
+        """Estatísticas do memory cache (ver FrameLRUCache.stats)."""
+        return self._memory_cache.stats()
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
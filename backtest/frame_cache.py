@@ -0,0 +1,115 @@
+"""
+Cache LRU de DataFrames com orçamento em bytes.
+
+Cada entrada é contabilizada por DataFrame.memory_usage(deep=True); ao
+inserir, as entradas menos usadas recentemente são descartadas até o
+total caber em max_bytes. Um DataFrame maior que o orçamento inteiro não
+é guardado (contado em rejections).
+
+Os DataFrames guardados não devem ser alterados in-place por quem os lê;
+com Copy-on-Write do pandas, fatias (iloc) e reset_index são views que
+copiam só se forem modificadas.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Bytes ocupados pelo DataFrame (inclui índice e objetos Python)."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class FrameLRUCache:
+    """LRU thread-safe de DataFrames limitado por bytes."""
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: Orçamento total das entradas em bytes
+        """
+        self.max_bytes = int(max_bytes)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._rejections = 0
+
+    def get(self, key: Hashable) -> Optional[pd.DataFrame]:
+        """DataFrame guardado (marcado como recente) ou None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, df: pd.DataFrame) -> bool:
+        """
+        Guarda o DataFrame, descartando entradas LRU se preciso.
+
+        Returns:
+            False se o DataFrame sozinho excede max_bytes (não é guardado)
+        """
+        nbytes = frame_nbytes(df)
+        with self._lock:
+            self._discard(key)
+            if nbytes > self.max_bytes:
+                self._rejections += 1
+                logger.debug(f"Frame {key} ({nbytes} bytes) excede o orçamento de {self.max_bytes} bytes")
+                return False
+            while self._entries and self._bytes + nbytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+                self._evictions += 1
+            self._entries[key] = (df, nbytes)
+            self._bytes += nbytes
+            return True
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def pop(self, key: Hashable) -> None:
+        """Remove a entrada, se existir."""
+        with self._lock:
+            self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """entries, bytes, max_bytes, hits, misses, hit_rate, evictions e rejections."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'rejections': self._rejections,
+            }
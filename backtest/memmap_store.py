@@ -0,0 +1,133 @@
+"""
+Arrays colunares em disco abertos com np.memmap.
+
+Layout:
+    {root}/{key}/manifest.json
+    {root}/{key}/v-{hash da versão}/{coluna}.npy
+
+Cada coluna é um .npy contíguo; abri-lo com mmap_mode='r' mapeia o arquivo
+sem copiá-lo, então processos de treino/backtest que abrem a mesma chave
+compartilham as páginas do page cache do SO em vez de manter cópias
+privadas. O manifesto aponta para o diretório da versão corrente e é
+trocado atomicamente (os.replace); versões antigas são removidas depois
+da troca — mapeamentos já abertos continuam válidos, pois o arquivo só é
+liberado quando o último mapeamento fecha.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _version_dir_name(version: str) -> str:
+    return "v-" + hashlib.sha1(version.encode('utf-8')).hexdigest()[:16]
+
+
+class MemmapArrayStore:
+    """Conjuntos de colunas NumPy versionados, lidos via memory map."""
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: Diretório base do store
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def manifest(self, key: str) -> Optional[Dict[str, Any]]:
+        """version, dir, rows e columns ({nome: dtype}) da chave, ou None."""
+        path = self.root / key / MANIFEST_NAME
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def write(self, key: str, columns: Mapping[str, np.ndarray], version: str) -> Path:
+        """
+        Grava as colunas como uma nova versão e a torna corrente.
+
+        Args:
+            key: Identificador do conjunto (ex: 'BTCUSDT_h4')
+            columns: Arrays 1-D de mesmo comprimento
+            version: Versão dos dados (ex: derivada do manifesto da fonte)
+
+        Returns:
+            Diretório da versão gravada
+        """
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Colunas com comprimentos diferentes: {lengths}")
+
+        key_dir = self.root / key
+        key_dir.mkdir(parents=True, exist_ok=True)
+        version_dir = key_dir / _version_dir_name(version)
+
+        if not version_dir.exists():
+            tmp_dir = key_dir / f"{version_dir.name}.tmp-{os.getpid()}-{time.monotonic_ns()}"
+            tmp_dir.mkdir()
+            for name, values in columns.items():
+                np.save(tmp_dir / f"{name}.npy", np.ascontiguousarray(values))
+            try:
+                os.rename(tmp_dir, version_dir)
+            except OSError:
+                # Outro processo gravou a mesma versão primeiro
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        manifest = {
+            'version': version,
+            'dir': version_dir.name,
+            'rows': lengths.pop() if lengths else 0,
+            'columns': {name: np.asarray(values).dtype.str for name, values in columns.items()},
+        }
+        tmp_manifest = key_dir / f"{MANIFEST_NAME}.tmp-{os.getpid()}"
+        with open(tmp_manifest, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_manifest, key_dir / MANIFEST_NAME)
+
+        for stale in key_dir.glob("v-*"):
+            if stale.name != version_dir.name and '.tmp-' not in stale.name:
+                shutil.rmtree(stale, ignore_errors=True)
+
+        logger.debug(f"Memmap {key}: versão {version} ({manifest['rows']} linhas)")
+        return version_dir
+
+    def open(self, key: str, version: Optional[str] = None) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Mapeia as colunas da versão corrente (somente leitura).
+
+        Args:
+            key: Identificador do conjunto
+            version: Se informado, só abre se for a versão corrente
+
+        Returns:
+            Dict coluna -> np.memmap, ou None se ausente/desatualizado
+        """
+        manifest = self.manifest(key)
+        if manifest is None or (version is not None and manifest['version'] != version):
+            return None
+        version_dir = self.root / key / manifest['dir']
+        # Arquivo vazio não pode ser mapeado
+        mmap_mode = 'r' if manifest['rows'] else None
+        try:
+            return {
+                name: np.load(version_dir / f"{name}.npy", mmap_mode=mmap_mode)
+                for name in manifest['columns']
+            }
+        except FileNotFoundError:
+            # Versão trocada entre a leitura do manifesto e a abertura
+            return None
+
+    def clear(self, key: str) -> None:
+        """Remove todas as versões da chave."""
+        shutil.rmtree(self.root / key, ignore_errors=True)
@@ -17,6 +17,8 @@ from typing import Dict, List, Optional, Tuple
 import numpy as np
 import pandas as pd
 
+from backtest import metrics_kernel
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,6 +41,7 @@ class MetricsCalculator:
         """
         self.trade_history = trade_history
         self.daily_returns = daily_returns if daily_returns is not None else np.array([])
+        self.pnl = trade_pnl_array(trade_history)
         self.thresholds = {
             'sharpe_min': 0.80,
             'sharpe_target': 1.20,
@@ -76,14 +79,11 @@ class MetricsCalculator:
             logger.warning("No daily returns to calculate Sharpe Ratio")
             return 0.0
         
-        mean_return = np.mean(self.daily_returns)
-        std_return = np.std(self.daily_returns)
-        
-        if std_return == 0:
+        if np.std(self.daily_returns) == 0:
             logger.warning("Std Dev = 0, cannot calculate Sharpe Ratio")
             return 0.0
         
-        sharpe = (mean_return - risk_free_rate) / std_return
+        sharpe = float(metrics_kernel.sharpe_ratio(self.daily_returns, risk_free_rate))
         logger.debug(f"Sharpe Ratio = {sharpe:.4f}")
         return sharpe
 
@@ -108,17 +108,8 @@ class MetricsCalculator:
             logger.warning("No daily returns to calculate Max Drawdown")
             return 0.0
         
-        # Build cumulative equity curve (starting at 1.0)
-        cumulative_returns = np.cumprod(1 + self.daily_returns)
-        
-        # Find running maximum
-        running_max = np.maximum.accumulate(cumulative_returns)
-        
-        # Calculate drawdown at each point
-        drawdown = (cumulative_returns - running_max) / running_max
-        
-        # Get maximum drawdown (minimum value, convert to positive)
-        max_dd = -np.min(drawdown)
+        # Equity acumulada (primeiro ponto ja inclui o primeiro retorno)
+        max_dd = float(metrics_kernel.max_drawdown(np.cumprod(1 + self.daily_returns)))
         logger.debug(f"Max Drawdown = {max_dd:.4f}")
         return max_dd
 
@@ -141,11 +132,9 @@ class MetricsCalculator:
             logger.warning("No trades to calculate Win Rate")
             return 0.0
         
-        winning_trades = sum(1 for trade in self.trade_history if trade.get('pnl_abs', 0) > 0)
-        total_trades = len(self.trade_history)
-        
-        win_rate = winning_trades / total_trades if total_trades > 0 else 0.0
-        logger.debug(f"Win Rate = {win_rate:.4f} ({winning_trades}/{total_trades})")
+        stats = metrics_kernel.trade_metrics(self.pnl)
+        win_rate = float(stats['win_rate'])
+        logger.debug(f"Win Rate = {win_rate:.4f} ({stats['winning_trades']}/{stats['total_trades']})")
         return win_rate
 
     def calculate_profit_factor(self) -> float:
@@ -169,10 +158,9 @@ class MetricsCalculator:
             logger.warning("No trades to calculate Profit Factor")
             return 0.0
         
-        total_wins = sum(trade.get('pnl_abs', 0) for trade in self.trade_history 
-                        if trade.get('pnl_abs', 0) > 0)
-        total_losses = abs(sum(trade.get('pnl_abs', 0) for trade in self.trade_history 
-                              if trade.get('pnl_abs', 0) < 0))
+        stats = metrics_kernel.trade_metrics(self.pnl)
+        total_wins = float(stats['gross_profit'])
+        total_losses = float(stats['gross_loss'])
         
         if total_losses == 0:
             logger.warning("No losses found, Profit Factor = 0")
@@ -200,15 +188,7 @@ class MetricsCalculator:
             logger.warning("No trades to calculate Consecutive Losses")
             return 0
         
-        max_consecutive_losses = 0
-        current_consecutive_losses = 0
-        
-        for trade in self.trade_history:
-            if trade.get('pnl_abs', 0) < 0:
-                current_consecutive_losses += 1
-                max_consecutive_losses = max(max_consecutive_losses, current_consecutive_losses)
-            else:
-                current_consecutive_losses = 0
+        max_consecutive_losses = int(metrics_kernel.max_consecutive(self.pnl < 0))
         
         logger.debug(f"Max Consecutive Losses = {max_consecutive_losses}")
         return max_consecutive_losses
@@ -297,13 +277,13 @@ def daily_returns_from_trade_history(trade_history: List[Dict],
     if not trade_history or initial_capital == 0:
         return np.array([])
     
-    returns = []
-    for trade in trade_history:
-        pnl = trade.get('pnl_abs', 0)
-        return_pct = pnl / initial_capital
-        returns.append(return_pct)
-    
-    return np.array(returns)
+    return trade_pnl_array(trade_history) / initial_capital
+
+
+def trade_pnl_array(trade_history: List[Dict], key: str = 'pnl_abs') -> np.ndarray:
+    """PnL das trades como array float (ausente = 0)."""
+    return np.fromiter((trade.get(key, 0) for trade in trade_history),
+                       dtype=np.float64, count=len(trade_history))
 
 
 def build_equity_curve(daily_returns: np.ndarray,
@@ -0,0 +1,251 @@
+"""
+Kernel NumPy de métricas de performance.
+
+Opera sobre arrays (equity, retornos, PnL por trade) em vez de listas de
+dicts. Toda função aceita 1D (um backtest) ou 2D (variantes x tempo, uma
+linha por variante) e reduz no último eixo: milhares de combinações de um
+sweep são pontuadas com um punhado de operações vetorizadas.
+
+Convenções:
+- equity 2D é retangular (todas as variantes no mesmo período)
+- PnL por trade 2D pode ter comprimentos diferentes: complete com NaN
+- Sharpe/Sortino usam desvio populacional (ddof=0) e valem 0 sem
+  variância; drawdown é fração positiva (0.12 = 12%)
+- profit factor é inf com lucro e sem perdas, 0 sem trades vencedoras
+
+MetricsCalculator, BacktestMetrics, Backtester e VectorBacktestResult
+calculam suas métricas por aqui, cada um mantendo as próprias regras de
+borda por cima dos valores brutos.
+"""
+
+from typing import Dict, Optional, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+ArrayOrFloat = Union[np.ndarray, float]
+
+
+def _reduce(values: np.ndarray) -> ArrayOrFloat:
+    """Escalar Python para entrada 1D, array para 2D."""
+    return values.item() if values.ndim == 0 else values
+
+
+def returns_from_equity(equity: np.ndarray) -> np.ndarray:
+    """Retornos simples período a período (um a menos que a equity)."""
+    equity = np.asarray(equity, dtype=np.float64)
+    returns: np.ndarray = np.diff(equity, axis=-1) / equity[..., :-1]
+    return returns
+
+
+def drawdown_series(equity: np.ndarray, epsilon: float = 0.0) -> np.ndarray:
+    """
+    Drawdown em cada ponto: (pico até ali - equity) / (pico + epsilon).
+
+    epsilon protege o denominador de pico zero (BacktestMetrics e o
+    backtest vetorizado usam 1e-8).
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    peak = np.maximum.accumulate(equity, axis=-1)
+    drawdown: np.ndarray = (peak - equity) / (peak + epsilon)
+    return drawdown
+
+
+def max_drawdown(equity: np.ndarray, epsilon: float = 0.0) -> ArrayOrFloat:
+    """Maior drawdown como fração (0 para equity vazia)."""
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.shape[-1] == 0:
+        return _reduce(np.zeros(equity.shape[:-1]))
+    return _reduce(drawdown_series(equity, epsilon).max(axis=-1))
+
+
+def sharpe_ratio(returns: np.ndarray, risk_free: float = 0.0,
+                 periods_per_year: Optional[float] = None) -> ArrayOrFloat:
+    """
+    (média - risk_free) / desvio dos retornos.
+
+    Args:
+        returns: Retornos por período
+        risk_free: Taxa livre de risco por período
+        periods_per_year: Se informado, anualiza por sqrt(periods_per_year)
+
+    Returns:
+        Sharpe (0 onde não há retornos ou o desvio é zero)
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.shape[-1] == 0:
+        return _reduce(np.zeros(returns.shape[:-1]))
+    mean = returns.mean(axis=-1)
+    std = returns.std(axis=-1)
+    safe_std = np.where(std > 0, std, 1.0)
+    sharpe = np.where(std > 0, (mean - risk_free) / safe_std, 0.0)
+    if periods_per_year is not None:
+        sharpe = sharpe * np.sqrt(periods_per_year)
+    return _reduce(sharpe)
+
+
+def sortino_ratio(returns: np.ndarray, risk_free: float = 0.0,
+                  periods_per_year: Optional[float] = None) -> ArrayOrFloat:
+    """Como sharpe_ratio, com o desvio só dos retornos abaixo de risk_free."""
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.shape[-1] == 0:
+        return _reduce(np.zeros(returns.shape[:-1]))
+    excess = returns - risk_free
+    downside = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2, axis=-1))
+    safe = np.where(downside > 0, downside, 1.0)
+    sortino = np.where(downside > 0, excess.mean(axis=-1) / safe, 0.0)
+    if periods_per_year is not None:
+        sortino = sortino * np.sqrt(periods_per_year)
+    return _reduce(sortino)
+
+
+def max_consecutive(mask: np.ndarray) -> ArrayOrFloat:
+    """Maior sequência de True no último eixo (ex: pnl < 0 → perdas seguidas)."""
+    mask = np.asarray(mask, dtype=bool)
+    if mask.shape[-1] == 0:
+        return _reduce(np.zeros(mask.shape[:-1], dtype=np.int64))
+    count = np.cumsum(mask, axis=-1)
+    # Contagem acumulada no último False zera a sequência corrente
+    base = np.maximum.accumulate(np.where(mask, 0, count), axis=-1)
+    return _reduce((count - base).max(axis=-1))
+
+
+def trade_metrics(pnl: np.ndarray) -> Dict[str, ArrayOrFloat]:
+    """
+    Métricas de trades a partir do PnL de cada trade.
+
+    Args:
+        pnl: PnL por trade, 1D ou 2D (variantes x trades, NaN = sem trade)
+
+    Returns:
+        Dict com total_trades, winning_trades, losing_trades, win_rate
+        (fração), gross_profit, gross_loss (positivo), net_pnl,
+        profit_factor, avg_win, avg_loss (negativo), expectancy
+        (PnL médio por trade) e max_consecutive_losses
+    """
+    pnl = np.asarray(pnl, dtype=np.float64)
+    valid = ~np.isnan(pnl)
+    wins = pnl > 0
+    losses = pnl < 0
+
+    total = valid.sum(axis=-1)
+    n_wins = wins.sum(axis=-1)
+    n_losses = losses.sum(axis=-1)
+    gross_profit = np.where(wins, pnl, 0.0).sum(axis=-1)
+    gross_loss = -np.where(losses, pnl, 0.0).sum(axis=-1)
+    net = gross_profit - gross_loss
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        win_rate = np.where(total > 0, n_wins / np.maximum(total, 1), 0.0)
+        profit_factor = np.where(
+            gross_loss > 0, gross_profit / np.where(gross_loss > 0, gross_loss, 1.0),
+            np.where(gross_profit > 0, np.inf, 0.0),
+        )
+        avg_win = np.where(n_wins > 0, gross_profit / np.maximum(n_wins, 1), 0.0)
+        avg_loss = np.where(n_losses > 0, -gross_loss / np.maximum(n_losses, 1), 0.0)
+        expectancy = np.where(total > 0, net / np.maximum(total, 1), 0.0)
+
+    return {
+        'total_trades': _reduce(total),
+        'winning_trades': _reduce(n_wins),
+        'losing_trades': _reduce(n_losses),
+        'win_rate': _reduce(win_rate),
+        'gross_profit': _reduce(gross_profit),
+        'gross_loss': _reduce(gross_loss),
+        'net_pnl': _reduce(net),
+        'profit_factor': _reduce(profit_factor),
+        'avg_win': _reduce(avg_win),
+        'avg_loss': _reduce(avg_loss),
+        'expectancy': _reduce(expectancy),
+        'max_consecutive_losses': max_consecutive(losses),
+    }
+
+
+def equity_metrics(equity: np.ndarray, risk_free: float = 0.0,
+                   periods_per_year: Optional[float] = None) -> Dict[str, ArrayOrFloat]:
+    """
+    Métricas da curva de equity.
+
+    Args:
+        equity: Equity por período, 1D ou 2D (variantes x tempo)
+        risk_free: Taxa livre de risco por período
+        periods_per_year: Anualização de Sharpe/Sortino (None = por período)
+
+    Returns:
+        Dict com total_return, mean_return, std_return, sharpe_ratio,
+        sortino_ratio e max_drawdown (frações)
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.shape[-1] < 2:
+        zeros = _reduce(np.zeros(equity.shape[:-1]))
+        return {
+            'total_return': zeros, 'mean_return': zeros, 'std_return': zeros,
+            'sharpe_ratio': zeros, 'sortino_ratio': zeros, 'max_drawdown': max_drawdown(equity),
+        }
+    returns = returns_from_equity(equity)
+    return {
+        'total_return': _reduce(equity[..., -1] / equity[..., 0] - 1.0),
+        'mean_return': _reduce(returns.mean(axis=-1)),
+        'std_return': _reduce(returns.std(axis=-1)),
+        'sharpe_ratio': sharpe_ratio(returns, risk_free, periods_per_year),
+        'sortino_ratio': sortino_ratio(returns, risk_free, periods_per_year),
+        'max_drawdown': max_drawdown(equity),
+    }
+
+
+def compute_metrics(equity: Optional[np.ndarray] = None, pnl: Optional[np.ndarray] = None,
+                    risk_free: float = 0.0,
+                    periods_per_year: Optional[float] = None) -> Dict[str, ArrayOrFloat]:
+    """equity_metrics e trade_metrics juntos (o que for informado)."""
+    metrics: Dict[str, ArrayOrFloat] = {}
+    if equity is not None:
+        metrics.update(equity_metrics(equity, risk_free, periods_per_year))
+    if pnl is not None:
+        metrics.update(trade_metrics(pnl))
+    return metrics
+
+
+def _windows(values: np.ndarray, window: int) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    if window < 1:
+        raise ValueError("window deve ser >= 1")
+    if values.shape[-1] < window:
+        return np.empty(values.shape[:-1] + (0, window))
+    return sliding_window_view(values, window, axis=-1)
+
+
+def _pad_front(values: np.ndarray, length: int) -> np.ndarray:
+    """Completa com NaN no início para alinhar com a série original."""
+    pad = length - values.shape[-1]
+    out = np.full(values.shape[:-1] + (length,), np.nan)
+    out[..., pad:] = values
+    return out
+
+
+def rolling_sharpe(returns: np.ndarray, window: int, risk_free: float = 0.0,
+                   periods_per_year: Optional[float] = None) -> np.ndarray:
+    """Sharpe em janela móvel; NaN até a janela completar."""
+    returns = np.asarray(returns, dtype=np.float64)
+    sharpe = sharpe_ratio(_windows(returns, window), risk_free, periods_per_year)
+    return _pad_front(np.asarray(sharpe), returns.shape[-1])
+
+
+def rolling_max_drawdown(equity: np.ndarray, window: int) -> np.ndarray:
+    """Maior drawdown dentro de cada janela móvel; NaN até completar."""
+    equity = np.asarray(equity, dtype=np.float64)
+    drawdown = drawdown_series(_windows(equity, window)).max(axis=-1, initial=0.0)
+    return _pad_front(drawdown, equity.shape[-1])
+
+
+def rolling_win_rate(pnl: np.ndarray, window: int) -> np.ndarray:
+    """Fração de trades vencedoras nas últimas `window` trades."""
+    pnl = np.asarray(pnl, dtype=np.float64)
+    win_rate = (_windows(pnl, window) > 0).mean(axis=-1)
+    return _pad_front(win_rate, pnl.shape[-1])
+
+
+def rolling_profit_factor(pnl: np.ndarray, window: int) -> np.ndarray:
+    """Profit factor nas últimas `window` trades (mesmas regras de trade_metrics)."""
+    pnl = np.asarray(pnl, dtype=np.float64)
+    pf = trade_metrics(_windows(pnl, window))['profit_factor']
+    return _pad_front(np.asarray(pf), pnl.shape[-1])
@@ -0,0 +1,233 @@
+"""
+Store Parquet particionado por símbolo/timeframe/mês.
+
+Layout:
+    {root}/{symbol}/{timeframe}/{YYYY-MM}.parquet
+    {root}/{symbol}/{timeframe}/_manifest.json
+
+O manifesto guarda, por mês, linhas e timestamps mínimo/máximo. Leituras
+com intervalo de datas abrem só os meses que o intersectam e, dentro
+deles, só os row groups (PARTITION_ROW_GROUP_SIZE linhas cada) cujas
+estatísticas min/max de timestamp intersectam o intervalo. Anexar
+candles reescreve apenas os meses afetados, com escrita atômica (arquivo
+temporário + os.replace).
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+PARTITION_ROW_GROUP_SIZE = 1024
+
+MANIFEST_NAME = "_manifest.json"
+
+
+def _tmp_path(path: Path) -> Path:
+    """Temporário exclusivo do escritor (processo e thread) ao lado de path."""
+    return path.with_name(f"{path.name}.tmp-{os.getpid()}-{threading.get_ident()}")
+
+
+def month_keys(timestamps: np.ndarray) -> np.ndarray:
+    """Partição "YYYY-MM" (UTC) de cada timestamp em ms."""
+    months = np.asarray(timestamps, dtype=np.int64).astype('datetime64[ms]').astype('datetime64[M]')
+    return months.astype(str)
+
+
+class PartitionedParquetStore:
+    """
+    Candles OHLCV em Parquet, um arquivo por (símbolo, timeframe, mês).
+
+    Os arquivos ficam ordenados por timestamp e sem timestamps repetidos;
+    em escritas sobrepostas prevalece a linha mais recente.
+    """
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: Diretório base do store
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / symbol / timeframe
+
+    def manifest(self, symbol: str, timeframe: str) -> Optional[Dict[str, Any]]:
+        """
+        Resumo do par: generation (incrementada a cada escrita), rows,
+        min_timestamp, max_timestamp e months
+        ({"YYYY-MM": {"rows", "min_timestamp", "max_timestamp"}}), ou None.
+        """
+        path = self._dir(symbol, timeframe) / MANIFEST_NAME
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        months = payload['months']
+        if not months:
+            return None
+        return {
+            'generation': payload.get('generation', 0),
+            'rows': sum(m['rows'] for m in months.values()),
+            'min_timestamp': min(m['min_timestamp'] for m in months.values()),
+            'max_timestamp': max(m['max_timestamp'] for m in months.values()),
+            'months': months,
+        }
+
+    def _write_manifest(
+        self,
+        symbol: str,
+        timeframe: str,
+        months: Dict[str, Dict[str, int]],
+        generation: int,
+    ) -> None:
+        directory = self._dir(symbol, timeframe)
+        manifest_path = directory / MANIFEST_NAME
+        tmp_path = _tmp_path(manifest_path)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'generation': generation, 'months': dict(sorted(months.items()))}, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+    def partitions(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> List[Path]:
+        """Arquivos mensais que intersectam [start, end], em ordem cronológica."""
+        manifest = self.manifest(symbol, timeframe)
+        if manifest is None:
+            return []
+        directory = self._dir(symbol, timeframe)
+        return [
+            directory / f"{month}.parquet"
+            for month, info in sorted(manifest['months'].items())
+            if (start is None or info['max_timestamp'] >= start)
+            and (end is None or info['min_timestamp'] <= end)
+        ]
+
+    def read(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Lê candles com timestamp em [start, end] (limites opcionais, inclusivos).
+
+        Returns:
+            DataFrame ordenado por timestamp (vazio se não houver partições)
+        """
+        tables = [
+            self._read_partition(path, start, end, columns)
+            for path in self.partitions(symbol, timeframe, start, end)
+        ]
+        if not tables:
+            return pd.DataFrame()
+        return pa.concat_tables(tables).to_pandas()
+
+    @staticmethod
+    def _read_partition(
+        path: Path,
+        start: Optional[int],
+        end: Optional[int],
+        columns: Optional[Sequence[str]],
+    ) -> pa.Table:
+        """Lê um mês pulando row groups cujo min/max de timestamp fica fora de [start, end]."""
+        parquet_file = pq.ParquetFile(path)
+        if start is None and end is None:
+            return parquet_file.read(columns=columns)
+
+        metadata = parquet_file.metadata
+        ts_index = parquet_file.schema_arrow.get_field_index('timestamp')
+        groups = []
+        for i in range(metadata.num_row_groups):
+            stats = metadata.row_group(i).column(ts_index).statistics
+            if stats is not None and stats.has_min_max and (
+                (start is not None and stats.max < start) or (end is not None and stats.min > end)
+            ):
+                continue
+            groups.append(i)
+
+        read_columns = None if columns is None else list(dict.fromkeys(['timestamp', *columns]))
+        table = parquet_file.read_row_groups(groups, columns=read_columns)
+        timestamps = table.column('timestamp')
+        mask = None
+        if start is not None:
+            mask = pc.greater_equal(timestamps, start)
+        if end is not None:
+            upper = pc.less_equal(timestamps, end)
+            mask = upper if mask is None else pc.and_(mask, upper)
+        table = table.filter(mask)
+        return table if columns is None else table.select(list(columns))
+
+    def write(self, symbol: str, timeframe: str, df: pd.DataFrame, replace: bool = False) -> int:
+        """
+        Grava candles, mesclando-os aos meses existentes.
+
+        Args:
+            df: Candles com coluna 'timestamp' (ms)
+            replace: Se True, descarta o conteúdo anterior do par
+
+        Returns:
+            Número de meses reescritos
+        """
+        directory = self._dir(symbol, timeframe)
+        previous = self.manifest(symbol, timeframe)
+        generation = previous['generation'] + 1 if previous else 1
+        if replace and directory.exists():
+            shutil.rmtree(directory)
+        if df.empty:
+            return 0
+        directory.mkdir(parents=True, exist_ok=True)
+
+        months = dict(previous['months']) if previous and not replace else {}
+
+        keys = month_keys(df['timestamp'].to_numpy())
+        for month in np.unique(keys):
+            part = df[keys == month]
+            path = directory / f"{month}.parquet"
+            if month in months:
+                part = pd.concat([pd.read_parquet(path), part], ignore_index=True)
+            part = (
+                part.drop_duplicates('timestamp', keep='last')
+                .sort_values('timestamp', kind='stable')
+                .reset_index(drop=True)
+            )
+
+            tmp_path = _tmp_path(path)
+            pq.write_table(
+                pa.Table.from_pandas(part, preserve_index=False),
+                tmp_path,
+                row_group_size=PARTITION_ROW_GROUP_SIZE,
+            )
+            os.replace(tmp_path, path)
+
+            timestamps = part['timestamp']
+            months[month] = {
+                'rows': len(part),
+                'min_timestamp': int(timestamps.iloc[0]),
+                'max_timestamp': int(timestamps.iloc[-1]),
+            }
+
+        self._write_manifest(symbol, timeframe, months, generation)
+        return len(np.unique(keys))
+
+    def clear(self, symbol: str, timeframe: str) -> None:
+        """Remove todas as partições do par."""
+        shutil.rmtree(self._dir(symbol, timeframe), ignore_errors=True)
@@ -15,6 +15,10 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Taxas aplicadas por close_position (entrada maker, saída taker)
+MAKER_FEE_RATE = 0.00075
+TAKER_FEE_RATE = 0.001
+
 
 class PositionState(Enum):
     """Estados da máquina de estados."""
@@ -147,8 +151,8 @@ class TradeStateMachine:
         # Calcular fees (entrada + saída, 0.075% maker + 0.1% taker)
         entry_cost = trade.entry_price * trade.entry_size
         exit_value = exit_price * trade.entry_size
-        entry_fee = entry_cost * 0.00075  # 0.075% maker
-        exit_fee = exit_value * 0.001      # 0.1% taker
+        entry_fee = entry_cost * MAKER_FEE_RATE  # 0.075% maker
+        exit_fee = exit_value * TAKER_FEE_RATE   # 0.1% taker
         total_fees = entry_fee + exit_fee
 
         # PnL líquido
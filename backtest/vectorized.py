@@ -0,0 +1,396 @@
+"""
+Backtest vetorizado para estratégias baseadas em regras.
+
+Recebe sinais pré-calculados (entrada/saída por candle) e níveis de stop e
+take profit, e calcula fills, fees, PnL, R-multiples e curva de equity com
+NumPy — sem percorrer o CryptoFuturesEnv candle a candle.
+
+Semântica (idêntica a dirigir TradeStateMachine candle a candle):
+    - entries[i] = +1 (LONG) / -1 (SHORT) abre no close do candle i se não
+      houver posição; stops[i]/takes[i] são os níveis dessa entrada
+    - a partir do candle seguinte, em cada candle: SL antes de TP
+      (check_exit_conditions), depois exits[i] (saída no close)
+    - SL/TP são preenchidos no próprio nível; NaN desativa o nível
+    - uma saída libera a posição no mesmo candle, que pode reabrir
+    - posição aberta no último candle fecha no close com motivo 'END'
+
+O primeiro candle que toca cada nível é encontrado por binary lifting sobre
+sparse tables de mínimos (low e -high), montadas uma vez por série e
+reaproveitadas por todas as combinações de parâmetros: O(log n) por entrada
+candidata. Só o encadeamento das trades (próxima entrada após cada saída)
+é sequencial, e percorre trades, não candles.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from backtest import metrics_kernel
+from backtest.trade_state_machine import MAKER_FEE_RATE, TAKER_FEE_RATE, Trade
+
+logger = logging.getLogger(__name__)
+
+ArrayLike = Union[float, np.ndarray]
+
+# Combinações pontuadas por chamada do kernel de métricas em sweep()
+SWEEP_SCORE_CHUNK = 256
+
+# Códigos de exit_reason nos arrays de resultado
+EXIT_REASONS = ('SL_HIT', 'TP_HIT', 'SIGNAL', 'END')
+SL_HIT, TP_HIT, SIGNAL, END = range(len(EXIT_REASONS))
+
+
+def _sparse_min_table(values: np.ndarray) -> List[np.ndarray]:
+    """table[k][i] = min(values[i:i + 2**k])."""
+    table = [values]
+    width = 1
+    while 2 * width <= len(values):
+        prev = table[-1]
+        table.append(np.minimum(prev[:-width], prev[width:]))
+        width *= 2
+    return table
+
+
+def _first_at_or_below(table: List[np.ndarray], start: np.ndarray, level: np.ndarray) -> np.ndarray:
+    """
+    Primeiro índice j >= start com values[j] <= level (len(values) se nenhum).
+
+    Salta, da maior para a menor potência de 2, blocos inteiramente acima
+    do nível.
+    """
+    n = len(table[0])
+    pos = start.copy()
+    for k in range(len(table) - 1, -1, -1):
+        width = 1 << k
+        fits = pos + width <= n
+        idx = np.where(fits, pos, 0)
+        skip = fits & (table[k][idx] > level)
+        pos += np.where(skip, width, 0)
+    return pos
+
+
+def _next_true_after(mask: np.ndarray) -> np.ndarray:
+    """out[i] = primeiro j > i com mask[j] (len(mask) se nenhum)."""
+    n = len(mask)
+    idx = np.where(mask, np.arange(n), n)
+    nxt = np.minimum.accumulate(idx[::-1])[::-1]
+    return np.append(nxt[1:], n)
+
+
+def _broadcast(values: ArrayLike, n: int, name: str) -> np.ndarray:
+    arr = np.asarray(values, dtype=np.float64)
+    if arr.ndim == 0:
+        arr = np.full(n, arr)
+    if arr.shape != (n,):
+        raise ValueError(f"{name} deve ter {n} valores, recebeu {arr.shape}")
+    return arr
+
+
+@dataclass
+class VectorBacktestResult:
+    """Trades (arrays alinhados, um elemento por trade) e curva de equity."""
+
+    symbol: str
+    initial_capital: float
+    timestamps: np.ndarray
+    entry_idx: np.ndarray
+    exit_idx: np.ndarray
+    direction: np.ndarray     # +1 LONG / -1 SHORT
+    entry_price: np.ndarray
+    exit_price: np.ndarray
+    size: np.ndarray
+    initial_stop: np.ndarray
+    take_profit: np.ndarray
+    exit_reason: np.ndarray   # índices em EXIT_REASONS
+    gross_pnl: np.ndarray
+    fees: np.ndarray
+    net_pnl: np.ndarray
+    pnl_pct: np.ndarray
+    r_multiple: np.ndarray
+    equity_curve: np.ndarray  # equity marcada a mercado no close de cada candle
+
+    def __len__(self) -> int:
+        return len(self.entry_idx)
+
+    def to_trades(self) -> List[Trade]:
+        """Converte para a lista de Trade produzida por TradeStateMachine."""
+        trades = []
+        for k in range(len(self)):
+            trade = Trade(
+                symbol=self.symbol,
+                direction="LONG" if self.direction[k] > 0 else "SHORT",
+                entry_price=float(self.entry_price[k]),
+                entry_size=float(self.size[k]),
+                entry_time=int(self.timestamps[self.entry_idx[k]]),
+                initial_stop=float(self.initial_stop[k]),
+                take_profit=float(self.take_profit[k]),
+            )
+            trade.exit_price = float(self.exit_price[k])
+            trade.exit_time = int(self.timestamps[self.exit_idx[k]])
+            trade.exit_reason = EXIT_REASONS[self.exit_reason[k]]
+            trade.gross_pnl = float(self.gross_pnl[k])
+            trade.pnl_pct = float(self.pnl_pct[k])
+            trade.r_multiple = float(self.r_multiple[k])
+            trade.fees = float(self.fees[k])
+            trade.net_pnl = float(self.net_pnl[k])
+            trades.append(trade)
+        return trades
+
+    def summary(self) -> Dict[str, float]:
+        """Métricas agregadas para comparar combinações de parâmetros."""
+        return summarize_results([self])[0]
+
+
+def summarize_results(results: List[VectorBacktestResult]) -> List[Dict[str, float]]:
+    """
+    summary() de vários resultados com uma chamada do kernel de métricas.
+
+    Curvas de equity da mesma série viram uma matriz (resultado x candle)
+    e os PnLs por trade uma matriz completada com NaN; resultados com
+    curvas de tamanhos diferentes são agrupados por tamanho.
+    """
+    rows: Dict[int, Dict[str, float]] = {}
+    by_length: Dict[int, List[int]] = {}
+    for i, result in enumerate(results):
+        by_length.setdefault(len(result.equity_curve), []).append(i)
+
+    for indices in by_length.values():
+        group = [results[i] for i in indices]
+        width = max(1, max(len(r) for r in group))
+        pnl = np.full((len(group), width), np.nan)
+        r_multiple = np.full((len(group), width), np.nan)
+        for row, result in enumerate(group):
+            pnl[row, :len(result)] = result.net_pnl
+            r_multiple[row, :len(result)] = result.r_multiple
+        stats = {key: np.asarray(value) for key, value in metrics_kernel.trade_metrics(pnl).items()}
+        max_dd = np.asarray(metrics_kernel.max_drawdown(
+            np.stack([r.equity_curve for r in group]), epsilon=1e-8
+        ))
+        with np.errstate(invalid='ignore'):
+            avg_r = np.where(stats['total_trades'] > 0, np.nanmean(r_multiple, axis=1), 0.0)
+
+        for row, (i, result) in enumerate(zip(indices, group)):
+            net = float(stats['net_pnl'][row])
+            rows[i] = {
+                'total_trades': len(result),
+                'winning_trades': int(stats['winning_trades'][row]),
+                'win_rate_pct': float(stats['win_rate'][row] * 100),
+                'net_pnl': net,
+                'total_return_pct': net / result.initial_capital * 100,
+                'profit_factor': float(stats['profit_factor'][row]),
+                'avg_r_multiple': float(avg_r[row]),
+                'max_drawdown_pct': float(max_dd[row] * 100),
+                'max_consecutive_losses': int(stats['max_consecutive_losses'][row]),
+            }
+    return [rows[i] for i in range(len(results))]
+
+
+class VectorizedBacktester:
+    """
+    Engine vetorizada sobre uma série OHLC fixa.
+
+    As sparse tables são montadas no construtor; cada run() custa
+    O(entradas candidatas * log n) mais O(n) para a curva de equity.
+    """
+
+    def __init__(self, ohlc: Mapping[str, Any], symbol: str = 'BTCUSDT',
+                 initial_capital: float = 10000):
+        """
+        Args:
+            ohlc: DataFrame ou dict de arrays com high, low, close
+                (e opcionalmente timestamp) — ex: get_memmap_columns()
+            symbol: Símbolo das trades geradas
+            initial_capital: Capital inicial (para % PnL e equity)
+        """
+        if initial_capital <= 0:
+            raise ValueError("initial_capital deve ser maior que zero")
+        if len(ohlc['close']) == 0:
+            raise ValueError("Série OHLC vazia")
+        self.symbol = symbol
+        self.initial_capital = initial_capital
+        self.high = np.asarray(ohlc['high'], dtype=np.float64)
+        self.low = np.asarray(ohlc['low'], dtype=np.float64)
+        self.close = np.asarray(ohlc['close'], dtype=np.float64)
+        self.n = len(self.close)
+        if 'timestamp' in ohlc:
+            self.timestamps = np.asarray(ohlc['timestamp'], dtype=np.int64)
+        else:
+            self.timestamps = np.arange(self.n, dtype=np.int64)
+
+        self._low_min = _sparse_min_table(self.low)
+        self._neg_high_min = _sparse_min_table(-self.high)
+        logger.debug(f"VectorizedBacktester {symbol}: {self.n} candles")
+
+    def run(self, entries: np.ndarray, stops: ArrayLike, takes: ArrayLike,
+            exits: Optional[np.ndarray] = None, size: ArrayLike = 1.0) -> VectorBacktestResult:
+        """
+        Executa o backtest de um conjunto de sinais.
+
+        Args:
+            entries: +1/-1/0 por candle (direção da entrada no close)
+            stops: Stop loss por candle (ou escalar), usado na entrada
+            takes: Take profit por candle (ou escalar), usado na entrada
+            exits: Máscara booleana de saída no close (opcional)
+            size: Tamanho em unidades base por candle (ou escalar)
+
+        Returns:
+            VectorBacktestResult
+        """
+        n = self.n
+        entries = np.asarray(entries)
+        if entries.shape != (n,):
+            raise ValueError(f"entries deve ter {n} valores, recebeu {entries.shape}")
+        stops = _broadcast(stops, n, 'stops')
+        takes = _broadcast(takes, n, 'takes')
+        sizes = _broadcast(size, n, 'size')
+
+        cand = np.flatnonzero(entries)
+        direction = np.sign(entries[cand]).astype(np.int8)
+        is_long = direction > 0
+        stop = stops[cand]
+        take = takes[cand]
+        start = cand + 1
+
+        # Nível NaN nunca é tocado
+        sl_level = np.where(is_long, stop, -stop)
+        sl_level = np.where(np.isnan(sl_level), -np.inf, sl_level)
+        tp_level = np.where(is_long, -take, take)
+        tp_level = np.where(np.isnan(tp_level), -np.inf, tp_level)
+
+        # LONG: SL em low <= stop, TP em high >= take; SHORT: o inverso
+        sl_idx = np.where(
+            is_long,
+            _first_at_or_below(self._low_min, start, sl_level),
+            _first_at_or_below(self._neg_high_min, start, sl_level),
+        )
+        tp_idx = np.where(
+            is_long,
+            _first_at_or_below(self._neg_high_min, start, tp_level),
+            _first_at_or_below(self._low_min, start, tp_level),
+        )
+        if exits is not None:
+            exit_mask = np.asarray(exits, dtype=bool)
+            if exit_mask.shape != (n,):
+                raise ValueError(f"exits deve ter {n} valores, recebeu {exit_mask.shape}")
+            sig_idx = _next_true_after(exit_mask)[cand]
+        else:
+            sig_idx = np.full(len(cand), n)
+
+        # Prioridade no mesmo candle: SL, TP, sinal
+        reason = np.select(
+            [(sl_idx < n) & (sl_idx <= tp_idx) & (sl_idx <= sig_idx),
+             (tp_idx < n) & (tp_idx <= sig_idx),
+             sig_idx < n],
+            [SL_HIT, TP_HIT, SIGNAL],
+            default=END,
+        ).astype(np.int8)
+        exit_at = np.minimum(np.minimum(sl_idx, tp_idx), np.minimum(sig_idx, n - 1))
+
+        # Encadeia: após sair no candle x, a próxima entrada é a primeira >= x
+        next_cand = np.searchsorted(cand, exit_at, side='left')
+        taken = []
+        k = 0
+        while k < len(cand):
+            taken.append(k)
+            if reason[k] == END:
+                break
+            k = next_cand[k]
+        taken = np.asarray(taken, dtype=np.intp)
+
+        entry_idx = cand[taken]
+        exit_idx = exit_at[taken]
+        trade_dir = direction[taken].astype(np.float64)
+        trade_reason = reason[taken]
+        entry_price = self.close[entry_idx]
+        trade_stop = stop[taken]
+        trade_take = take[taken]
+        trade_size = sizes[entry_idx]
+        exit_price = np.select(
+            [trade_reason == SL_HIT, trade_reason == TP_HIT],
+            [trade_stop, trade_take],
+            default=self.close[exit_idx],
+        )
+
+        # Mesmas operações, na mesma ordem, de TradeStateMachine.close_position
+        gross_pnl = np.where(
+            trade_dir > 0,
+            (exit_price - entry_price) * trade_size,
+            (entry_price - exit_price) * trade_size,
+        )
+        fees = entry_price * trade_size * MAKER_FEE_RATE + exit_price * trade_size * TAKER_FEE_RATE
+        net_pnl = gross_pnl - fees
+        pnl_pct = net_pnl / self.initial_capital * 100
+        initial_risk = np.abs(entry_price - trade_stop) * trade_size
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r_multiple = np.where(initial_risk > 0, gross_pnl / initial_risk, 0.0)
+
+        return VectorBacktestResult(
+            symbol=self.symbol,
+            initial_capital=self.initial_capital,
+            timestamps=self.timestamps,
+            entry_idx=entry_idx,
+            exit_idx=exit_idx,
+            direction=trade_dir.astype(np.int8),
+            entry_price=entry_price,
+            exit_price=exit_price,
+            size=trade_size,
+            initial_stop=trade_stop,
+            take_profit=trade_take,
+            exit_reason=trade_reason,
+            gross_pnl=gross_pnl,
+            fees=fees,
+            net_pnl=net_pnl,
+            pnl_pct=pnl_pct,
+            r_multiple=r_multiple,
+            equity_curve=self._equity_curve(entry_idx, exit_idx, trade_dir * trade_size,
+                                            entry_price, net_pnl),
+        )
+
+    def _equity_curve(self, entry_idx: np.ndarray, exit_idx: np.ndarray, signed_size: np.ndarray,
+                      entry_price: np.ndarray, net_pnl: np.ndarray) -> np.ndarray:
+        """Capital + PnL realizado (líquido) + PnL aberto (bruto) no close de cada candle."""
+        n = self.n
+        # Trades não se sobrepõem: posição/preço de entrada por candle via soma de degraus
+        position = np.zeros(n + 1)
+        np.add.at(position, entry_idx, signed_size)
+        np.add.at(position, exit_idx, -signed_size)
+        basis = np.zeros(n + 1)
+        np.add.at(basis, entry_idx, entry_price)
+        np.add.at(basis, exit_idx, -entry_price)
+        position = np.cumsum(position)[:n]
+        basis = np.cumsum(basis)[:n]
+
+        realized = np.zeros(n)
+        np.add.at(realized, exit_idx, net_pnl)
+        return self.initial_capital + np.cumsum(realized) + position * (self.close - basis)
+
+    def sweep(self, signal_fn: Callable[..., Tuple], grid: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Roda uma combinação de parâmetros por item do grid.
+
+        Args:
+            signal_fn: fn(**params) -> (entries, stops, takes[, exits[, size]])
+            grid: Combinações de parâmetros
+
+        Returns:
+            [{'params': ..., **summary}] na ordem do grid
+        """
+        rows: List[Dict[str, Any]] = []
+        pending: List[Tuple[Dict[str, Any], VectorBacktestResult]] = []
+
+        def _flush() -> None:
+            summaries = summarize_results([result for _, result in pending])
+            rows.extend({'params': params, **summary}
+                        for (params, _), summary in zip(pending, summaries))
+            pending.clear()
+
+        # Pontuação em blocos: uma chamada do kernel por bloco, memória limitada
+        for params in grid:
+            pending.append((dict(params), self.run(*signal_fn(**params))))
+            if len(pending) == SWEEP_SCORE_CHUNK:
+                _flush()
+        if pending:
+            _flush()
+        return rows
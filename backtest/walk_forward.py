@@ -2,8 +2,13 @@
 Walk-forward optimization e retreinamento.
 """
 
+import json
 import logging
-from typing import Dict, Any, Optional
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
@@ -11,28 +16,154 @@ import numpy as np
 logger = logging.getLogger(__name__)
 
 
+def _seed_everything(seed: int) -> None:
+    """Semeia random, NumPy e torch (se instalado)."""
+    random.seed(seed)
+    np.random.seed(seed)
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.manual_seed(seed)
+
+
+def _init_worker(threads: int) -> None:
+    """Initializer dos processos do pool."""
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(threads)
+
+
+def _json_default(value: Any) -> Any:
+    """Converte escalares/arrays NumPy para o checkpoint."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} não é serializável")
+
+
+def _run_window(trainer: Any, window: Dict[str, int], train_data: Dict[str, Any],
+                test_data: Dict[str, Any], seed: int, isolate_save_dir: bool = False) -> Dict[str, Any]:
+    """
+    Treina e avalia uma janela.
+
+    Args:
+        trainer: Trainer do agente
+        window: Janela de plan_windows()
+        train_data: Dados de treino fatiados
+        test_data: Dados de teste fatiados
+        seed: Semente da janela
+        isolate_save_dir: Salva os modelos em {save_dir}/window_NN (workers
+            paralelos não sobrescrevem os arquivos uns dos outros)
+
+    Returns:
+        window + {'metrics': ...}
+    """
+    num = window['window']
+    test_candles = window['test_end'] - window['test_start']
+    if isolate_save_dir and getattr(trainer, 'save_dir', None):
+        trainer.save_dir = os.path.join(trainer.save_dir, f"window_{num:02d}")
+        os.makedirs(trainer.save_dir, exist_ok=True)
+    _seed_everything(seed)
+
+    logger.info(f"Window {num}: train[{window['train_start']}:{window['train_end']}], "
+                f"test[{window['test_start']}:{window['test_end']}]")
+    try:
+        # Treinar modelo nesta janela
+        logger.info(f"Training on window {num}...")
+        trainer.train_phase1_exploration(
+            train_data=train_data,
+            total_timesteps=50000,  # Menos timesteps para walk-forward
+            episode_length=min(500, test_candles)
+        )
+
+        # Avaliar no período de teste
+        logger.info(f"Testing on window {num}...")
+        test_env = trainer.create_env(test_data, episode_length=test_candles-1)
+        metrics = trainer.evaluate(test_env, n_episodes=10, deterministic=True)
+    finally:
+        if isolate_save_dir and hasattr(trainer, 'close'):
+            trainer.close()
+
+    return {**window, 'metrics': metrics}
+
+
 class WalkForward:
     """Walk-forward optimization para retreinamento adaptativo."""
     
-    def __init__(self, train_window: int = 365, test_window: int = 30):
+    def __init__(self, train_window: int = 365, test_window: int = 30,
+                 n_workers: int = 1, seed: int = 42,
+                 checkpoint_path: Optional[str] = None,
+                 start_method: Optional[str] = None):
         """
         Inicializa walk-forward.
         
         Args:
             train_window: Janela de treinamento (dias)
             test_window: Janela de teste (dias)
+            n_workers: Processos para janelas em paralelo (1 = sequencial)
+            seed: Semente base; a janela N usa seed + N em qualquer modo
+            checkpoint_path: JSON com janelas concluídas (retomada após crash)
+            start_method: Método de multiprocessing dos workers (default da plataforma)
         """
+        if n_workers < 1:
+            raise ValueError("n_workers deve ser >= 1")
         self.train_window = train_window
         self.test_window = test_window
-        logger.info(f"Walk-Forward initialized: train={train_window}d, test={test_window}d")
+        self.n_workers = n_workers
+        self.seed = seed
+        self.checkpoint_path = checkpoint_path
+        self.start_method = start_method
+        logger.info(f"Walk-Forward initialized: train={train_window}d, test={test_window}d, "
+                    f"workers={n_workers}")
+    
+    def plan_windows(self, total_candles: int) -> List[Dict[str, int]]:
+        """
+        Janelas train/test sobre os candles H4.
+        
+        Args:
+            total_candles: Número de candles H4 disponíveis
+            
+        Returns:
+            Lista de {'window', 'train_start', 'train_end', 'test_start', 'test_end'}
+        """
+        # H4 = 4h, então 6 candles/dia
+        candles_per_day = 6  # 24h / 4h
+        train_candles = self.train_window * candles_per_day
+        test_candles = self.test_window * candles_per_day
+        window_step = test_candles  # Andar 1 test_window por vez
+        
+        windows = []
+        start_idx = 0
+        while start_idx + train_candles + test_candles <= total_candles:
+            train_end = start_idx + train_candles
+            windows.append({
+                'window': len(windows) + 1,
+                'train_start': start_idx,
+                'train_end': train_end,
+                'test_start': train_end,
+                'test_end': train_end + test_candles,
+            })
+            # Avançar para próxima janela
+            start_idx += window_step
+        return windows
     
     def run(self, data: Dict[str, pd.DataFrame], trainer: Any) -> Dict[str, Any]:
         """
         Executa walk-forward optimization.
         
+        Janelas são independentes: com n_workers > 1 cada uma roda em um
+        processo com uma cópia do trainer. Cada janela concluída é gravada
+        no checkpoint, e uma nova execução com a mesma configuração pula as
+        janelas já gravadas. Janelas com erro não são gravadas e rodam de
+        novo na retomada.
+        
         Args:
             data: Dados históricos completos
-            trainer: Trainer do agente
+            trainer: Trainer do agente (precisa ser picklable com n_workers > 1)
             
         Returns:
             Resultados agregados
@@ -44,63 +175,37 @@ class WalkForward:
             logger.error("No H4 data for walk-forward")
             return {'windows': [], 'avg_metrics': {}}
         
-        # Calcular número de janelas (H4 = 4h, então 6 candles/dia)
-        candles_per_day = 6  # 24h / 4h
-        train_candles = self.train_window * candles_per_day
-        test_candles = self.test_window * candles_per_day
-        window_step = test_candles  # Andar 1 test_window por vez
-        
         total_candles = len(h4_data)
-        windows_results = []
+        windows = self.plan_windows(total_candles)
+        done = self._load_checkpoint(total_candles)
+        pending = [w for w in windows if w['window'] not in done]
+        if done:
+            logger.info(f"Checkpoint: {len(done)} windows done, {len(pending)} pending")
         
-        # Iterar sobre janelas
-        start_idx = 0
-        window_num = 0
+        def on_result(result: Dict[str, Any]) -> None:
+            done[result['window']] = result
+            self._save_checkpoint(total_candles, done)
+            metrics = result['metrics']
+            logger.info(f"Window {result['window']} results: "
+                        f"Sharpe={metrics['sharpe_ratio']:.2f}, "
+                        f"WinRate={metrics['win_rate']*100:.2f}%")
         
-        while start_idx + train_candles + test_candles <= total_candles:
-            window_num += 1
-            train_end = start_idx + train_candles
-            test_start = train_end
-            test_end = test_start + test_candles
-            
-            logger.info(f"Window {window_num}: train[{start_idx}:{train_end}], test[{test_start}:{test_end}]")
-            
-            # Preparar dados de treino e teste para esta janela
-            train_data_window = self._slice_data(data, start_idx, train_end)
-            test_data_window = self._slice_data(data, test_start, test_end)
-            
-            # Treinar modelo nesta janela
-            try:
-                logger.info(f"Training on window {window_num}...")
-                trainer.train_phase1_exploration(
-                    train_data=train_data_window,
-                    total_timesteps=50000,  # Menos timesteps para walk-forward
-                    episode_length=min(500, test_candles)
-                )
-                
-                # Avaliar no período de teste
-                logger.info(f"Testing on window {window_num}...")
-                test_env = trainer.create_env(test_data_window, episode_length=test_candles-1)
-                metrics = trainer.evaluate(test_env, n_episodes=10, deterministic=True)
-                
-                windows_results.append({
-                    'window': window_num,
-                    'train_start': start_idx,
-                    'train_end': train_end,
-                    'test_start': test_start,
-                    'test_end': test_end,
-                    'metrics': metrics
-                })
-                
-                logger.info(f"Window {window_num} results: "
-                          f"Sharpe={metrics['sharpe_ratio']:.2f}, "
-                          f"WinRate={metrics['win_rate']*100:.2f}%")
-                
-            except Exception as e:
-                logger.error(f"Error in window {window_num}: {e}")
-            
-            # Avançar para próxima janela
-            start_idx += window_step
+        workers = min(self.n_workers, len(pending))
+        if workers > 1:
+            self._run_parallel(data, trainer, pending, workers, on_result)
+        else:
+            for window in pending:
+                try:
+                    on_result(_run_window(
+                        trainer, window,
+                        self._slice_data(data, window['train_start'], window['train_end']),
+                        self._slice_data(data, window['test_start'], window['test_end']),
+                        self.seed + window['window'],
+                    ))
+                except Exception as e:
+                    logger.error(f"Error in window {window['window']}: {e}")
+        
+        windows_results = [done[w['window']] for w in windows if w['window'] in done]
         
         # Calcular métricas agregadas
         if windows_results:
@@ -129,6 +234,68 @@ class WalkForward:
         
         return results
     
+    def _run_parallel(self, data: Dict[str, Any], trainer: Any, pending: List[Dict[str, int]],
+                      workers: int, on_result: Callable[[Dict[str, Any]], None]) -> None:
+        """Roda as janelas pendentes em um ProcessPoolExecutor."""
+        ctx = multiprocessing.get_context(self.start_method)
+        # Divide os cores entre os workers para o torch não disputar CPU
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        logger.info(f"Running {len(pending)} windows on {workers} workers ({threads} threads each)")
+        
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=_init_worker, initargs=(threads,)) as pool:
+            futures = {
+                pool.submit(
+                    _run_window, trainer, window,
+                    self._slice_data(data, window['train_start'], window['train_end']),
+                    self._slice_data(data, window['test_start'], window['test_end']),
+                    self.seed + window['window'],
+                    True,
+                ): window
+                for window in pending
+            }
+            for future in as_completed(futures):
+                try:
+                    on_result(future.result())
+                except Exception as e:
+                    logger.error(f"Error in window {futures[future]['window']}: {e}")
+    
+    def _checkpoint_config(self, total_candles: int) -> Dict[str, int]:
+        return {
+            'train_window': self.train_window,
+            'test_window': self.test_window,
+            'seed': self.seed,
+            'total_candles': total_candles,
+        }
+    
+    def _load_checkpoint(self, total_candles: int) -> Dict[int, Dict[str, Any]]:
+        """Janelas concluídas do checkpoint, se for da mesma configuração."""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return {}
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.checkpoint_path}: {e}")
+            return {}
+        if checkpoint.get('config') != self._checkpoint_config(total_candles):
+            logger.warning(f"Checkpoint {self.checkpoint_path} is from another configuration, ignoring")
+            return {}
+        return {int(num): result for num, result in checkpoint.get('windows', {}).items()}
+    
+    def _save_checkpoint(self, total_candles: int, done: Dict[int, Dict[str, Any]]) -> None:
+        """Grava o checkpoint atomicamente (tmp + os.replace)."""
+        if not self.checkpoint_path:
+            return
+        checkpoint = {
+            'config': self._checkpoint_config(total_candles),
+            'windows': {str(num): done[num] for num in sorted(done)},
+        }
+        tmp_path = f"{self.checkpoint_path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, indent=2, default=_json_default)
+        os.replace(tmp_path, self.checkpoint_path)
+    
     def _slice_data(
         self, 
         data: Dict[str, Any], 
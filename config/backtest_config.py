@@ -225,6 +225,9 @@ BACKTEST_PARAMS = {
     
     # Rebalance a cada X candles (0 = no rebalance)
     "rebalance_interval": 24,
+
+    # Teto do memory cache de candles do ParquetCache (MB, LRU por bytes)
+    "memory_cache_mb": 256,
 }
 
 # ============================================================================
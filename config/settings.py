@@ -101,6 +101,13 @@ M2_MAX_DAILY_ENTRIES = int(os.getenv("M2_MAX_DAILY_ENTRIES", "10"))
 M2_MAX_MARGIN_PER_POSITION_USD = float(os.getenv("M2_MAX_MARGIN_PER_POSITION_USD", "1.0"))
 M2_MAX_SIGNAL_AGE_MINUTES = int(os.getenv("M2_MAX_SIGNAL_AGE_MINUTES", "240"))
 M2_SYMBOL_COOLDOWN_MINUTES = int(os.getenv("M2_SYMBOL_COOLDOWN_MINUTES", "240"))
+# Runtime da politica PPO no live: "sb3" (PPO.load) ou "numpy" (artefato
+# exportado por scripts/model2/export_policy.py, sem torch).
+M2_INFERENCE_RUNTIME = os.getenv("M2_INFERENCE_RUNTIME", "sb3").strip().lower()
+# Porta local (127.0.0.1) do socket de controle de scripts/model2/live_daemon.py
+M2_DAEMON_CONTROL_PORT = int(os.getenv("M2_DAEMON_CONTROL_PORT", "8766"))
+# Token exigido pelo socket de controle; vazio = gerado na partida do daemon
+M2_DAEMON_CONTROL_TOKEN = os.getenv("M2_DAEMON_CONTROL_TOKEN", "").strip()
 
 # Trading Mode
 TRADING_MODE = os.getenv("TRADING_MODE", "paper")  # "paper" or "live"
@@ -1,8 +1,15 @@
 """
 Pacote core para orquestração do sistema.
+
+Os nomes reexportados são importados sob demanda (core.lazy_imports): importar
+core.model2 não carrega o scheduler nem o SDK da Binance.
 """
 
-from .scheduler import Scheduler
-from .layer_manager import LayerManager
+from .lazy_imports import lazy_exports
 
 __all__ = ['Scheduler', 'LayerManager']
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.scheduler': ['Scheduler'],
+    '.layer_manager': ['LayerManager'],
+})
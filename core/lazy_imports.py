@@ -0,0 +1,174 @@
+"""
+Importação sob demanda dos pacotes e medição do custo de import.
+
+Os __init__ de core, data e core.model2 reexportam dezenas de nomes; importá-los
+de forma ansiosa carregava o SDK da Binance, pandas e clientes de notificação
+em qualquer script que tocasse o pacote. lazy_exports() gera o __getattr__ de
+módulo (PEP 562) que só importa o submódulo quando o nome é usado.
+
+ImportProfiler mede quanto cada módulo custou para importar (tempo próprio e
+acumulado), usado pelo --profile-imports do live cycle.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import time
+from dataclasses import dataclass
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ModuleSpec
+from types import ModuleType
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+
+def lazy_exports(
+    package: str,
+    exports: Mapping[str, Iterable[str]],
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Cria __getattr__ e __dir__ de um pacote com reexportação preguiçosa.
+
+    Args:
+        package: __name__ do pacote
+        exports: Submódulo relativo (ex: '.scheduler') -> nomes reexportados
+
+    Returns:
+        (__getattr__, __dir__) para atribuir no módulo do pacote
+    """
+    owners = {name: module for module, names in exports.items() for name in names}
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str) -> Any:
+        module = owners.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(owners))
+
+    return __getattr__, __dir__
+
+
+@dataclass
+class ImportRecord:
+    """Custo de import de um módulo, em milissegundos."""
+
+    module: str
+    self_ms: float
+    cumulative_ms: float
+
+
+class _TimedLoader(Loader):
+    """Envolve o loader original medindo exec_module."""
+
+    def __init__(self, loader: Loader, profiler: "ImportProfiler") -> None:
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec: ModuleSpec) -> ModuleType | None:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        # O módulo fica com o loader original (importlib.resources, pkgutil etc.)
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        self._profiler._enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(module.__name__)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+
+class _TimedFinder(MetaPathFinder):
+    """Delega a busca aos demais finders e troca o loader pelo medido."""
+
+    def __init__(self, profiler: "ImportProfiler") -> None:
+        self._profiler = profiler
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None,
+        target: ModuleType | None = None,
+    ) -> ModuleSpec | None:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+
+class ImportProfiler:
+    """
+    Context manager que mede os imports feitos dentro do bloco.
+
+    Só vê módulos importados pela primeira vez enquanto ativo; o que já está
+    em sys.modules não custa nada e não aparece.
+    """
+
+    def __init__(self) -> None:
+        self._finder = _TimedFinder(self)
+        self._stack: list[list[float]] = []
+        self.records: list[ImportRecord] = []
+
+    def __enter__(self) -> "ImportProfiler":
+        sys.meta_path.insert(0, self._finder)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    def _enter(self) -> None:
+        # [inicio, tempo gasto em imports filhos]
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def _exit(self, module: str) -> None:
+        started, children = self._stack.pop()
+        cumulative = time.perf_counter() - started
+        if self._stack:
+            self._stack[-1][1] += cumulative
+        self.records.append(
+            ImportRecord(module, (cumulative - children) * 1000, cumulative * 1000)
+        )
+
+    @property
+    def total_ms(self) -> float:
+        """Tempo total de import (soma dos tempos próprios)."""
+        return sum(record.self_ms for record in self.records)
+
+    def top(self, limit: int = 20, by: str = "cumulative_ms") -> list[ImportRecord]:
+        """Módulos mais caros, ordenados por 'cumulative_ms' ou 'self_ms'."""
+        return sorted(self.records, key=lambda r: getattr(r, by), reverse=True)[:limit]
+
+    def report(self, limit: int = 20) -> dict[str, Any]:
+        """Resumo serializável em JSON."""
+        return {
+            "modules_imported": len(self.records),
+            "total_ms": round(self.total_ms, 1),
+            "top_cumulative": [
+                {
+                    "module": r.module,
+                    "cumulative_ms": round(r.cumulative_ms, 1),
+                    "self_ms": round(r.self_ms, 1),
+                }
+                for r in self.top(limit)
+            ],
+            "top_self": [
+                {"module": r.module, "self_ms": round(r.self_ms, 1)}
+                for r in self.top(limit, by="self_ms")
+            ],
+        }
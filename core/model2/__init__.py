@@ -1,131 +1,11 @@
-"""Core contracts for Model 2.0 domain logic."""
+"""Core contracts for Model 2.0 domain logic.
 
-from .thesis_state import (
-    ALLOWED_TRANSITIONS,
-    FINAL_THESIS_STATUSES,
-    INITIAL_THESIS_STATUS,
-    OFFICIAL_THESIS_STATUSES,
-    ThesisStatus,
-    is_valid_transition,
-)
-from .scanner import (
-    DetectorInput,
-    DetectionResult,
-    M2_002_RULE_ID,
-    M2_002_RULE_VERSION,
-    M2_002_THESIS_TYPE,
-    detect_initial_short_failure,
-)
-from .repository import (
-    ConsumeTechnicalSignalResult,
-    CreateStandardSignalResult,
-    CreateInitialThesisResult,
-    MarkTechnicalSignalExportErrorResult,
-    MarkTechnicalSignalExportResult,
-    M2_003_1_RULE_ID,
-    M2_003_2_RULE_ID,
-    M2_003_3_RULE_ID_EXPIRATION,
-    M2_003_3_RULE_ID_INVALIDATION,
-    Model2ThesisRepository,
-    TransitionToExpiredResult,
-    TransitionToInvalidatedResult,
-    TransitionToMonitoringResult,
-    TransitionToValidatedResult,
-)
-from .order_layer import (
-    M2_007_1_RULE_ID,
-    OrderLayerDecision,
-    OrderLayerInput,
-    evaluate_signal_for_order_layer,
-)
-from .signal_bridge import (
-    M2_006_1_RULE_ID,
-    SignalBridgeInput,
-    SignalBridgeResult,
-    build_standard_signal,
-)
-from .signal_adapter import (
-    ADAPTER_EXPORT_KEY,
-    ADAPTER_LAST_ERROR_KEY,
-    M2_007_2_RULE_ID,
-    SignalAdapterInput,
-    SignalAdapterResult,
-    build_legacy_trade_signal_payload,
-)
-from .resolver import (
-    RESOLUTION_ACTION_EXPIRED,
-    RESOLUTION_ACTION_INVALIDATED,
-    RESOLUTION_ACTION_NONE,
-    ResolutionDecision,
-    ResolutionInput,
-    evaluate_monitoring_resolution,
-)
-from .observability import (
-    AuditSnapshot,
-    DashboardSnapshot,
-    LiveExecutionSnapshot,
-    Model2ObservabilityService,
-    SignalFlowSnapshot,
-)
-from .live_execution import (
-    ENTRY_ORDER_TYPE_MARKET,
-    ACTIVE_SIGNAL_EXECUTION_STATUSES,
-    FINAL_SIGNAL_EXECUTION_STATUSES,
-    M2_009_1_RULE_ID,
-    M2_009_2_RULE_ID,
-    M2_009_3_RULE_ID,
-    M2_009_4_RULE_ID,
-    M2_010_1_RULE_ID,
-    OFFICIAL_SIGNAL_EXECUTION_STATUSES,
-    SIGNAL_EXECUTION_STATUS_BLOCKED,
-    SIGNAL_EXECUTION_STATUS_CANCELLED,
-    SIGNAL_EXECUTION_STATUS_ENTRY_FILLED,
-    SIGNAL_EXECUTION_STATUS_ENTRY_SENT,
-    SIGNAL_EXECUTION_STATUS_EXITED,
-    SIGNAL_EXECUTION_STATUS_FAILED,
-    SIGNAL_EXECUTION_STATUS_PROTECTED,
-    SIGNAL_EXECUTION_STATUS_READY,
-    LiveExecutionConfig,
-    LiveExecutionGateDecision,
-    LiveExecutionGateInput,
-    evaluate_live_execution_gate,
-    is_valid_signal_execution_transition,
-)
-from .model_decision import (
-    ACTION_CLOSE,
-    ACTION_HOLD,
-    ACTION_OPEN_LONG,
-    ACTION_OPEN_SHORT,
-    ACTION_REDUCE,
-    M2_020_1_RULE_ID,
-    OFFICIAL_MODEL_ACTIONS,
-    ModelDecision,
-    ModelDecisionInput,
-    ModelDecisionOutcome,
-    ModelDecisionValidationError,
-    evaluate_model_decision_payload,
-    parse_model_decision_payload,
-)
-from .model_inference_service import (
-    DEFAULT_MODEL_VERSION,
-    M2_020_2_RULE_ID,
-    InferenceServiceResult,
-    ModelInferenceService,
-    TechnicalSignalInferenceProvider,
-)
-from .model_state_builder import (
-    M2_020_3_RULE_ID,
-    M2_020_3_SCHEMA_VERSION,
-    StateBuilderResult,
-    build_model_decision_input,
-)
-from .live_exchange import Model2LiveExchange
-from .live_service import Model2LiveExecutionService
-from .validator import (
-    ValidationDecision,
-    ValidationInput,
-    evaluate_monitoring_validation,
-)
+Exports are imported on first access (core.lazy_imports): scripts that only
+need the repository or the contracts do not load the live service, the
+inference stack or the notification clients.
+"""
+
+from core.lazy_imports import lazy_exports
 
 __all__ = [
     "ALLOWED_TRANSITIONS",
@@ -229,3 +109,136 @@ __all__ = [
     "is_valid_signal_execution_transition",
     "is_valid_transition",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    ".thesis_state": [
+        "ALLOWED_TRANSITIONS",
+        "FINAL_THESIS_STATUSES",
+        "INITIAL_THESIS_STATUS",
+        "OFFICIAL_THESIS_STATUSES",
+        "ThesisStatus",
+        "is_valid_transition",
+    ],
+    ".scanner": [
+        "DetectorInput",
+        "DetectionResult",
+        "M2_002_RULE_ID",
+        "M2_002_RULE_VERSION",
+        "M2_002_THESIS_TYPE",
+        "detect_initial_short_failure",
+    ],
+    ".repository": [
+        "ConsumeTechnicalSignalResult",
+        "CreateStandardSignalResult",
+        "CreateInitialThesisResult",
+        "MarkTechnicalSignalExportErrorResult",
+        "MarkTechnicalSignalExportResult",
+        "M2_003_1_RULE_ID",
+        "M2_003_2_RULE_ID",
+        "M2_003_3_RULE_ID_EXPIRATION",
+        "M2_003_3_RULE_ID_INVALIDATION",
+        "Model2ThesisRepository",
+        "TransitionToExpiredResult",
+        "TransitionToInvalidatedResult",
+        "TransitionToMonitoringResult",
+        "TransitionToValidatedResult",
+    ],
+    ".order_layer": [
+        "M2_007_1_RULE_ID",
+        "OrderLayerDecision",
+        "OrderLayerInput",
+        "evaluate_signal_for_order_layer",
+    ],
+    ".signal_bridge": [
+        "M2_006_1_RULE_ID",
+        "SignalBridgeInput",
+        "SignalBridgeResult",
+        "build_standard_signal",
+    ],
+    ".signal_adapter": [
+        "ADAPTER_EXPORT_KEY",
+        "ADAPTER_LAST_ERROR_KEY",
+        "M2_007_2_RULE_ID",
+        "SignalAdapterInput",
+        "SignalAdapterResult",
+        "build_legacy_trade_signal_payload",
+    ],
+    ".resolver": [
+        "RESOLUTION_ACTION_EXPIRED",
+        "RESOLUTION_ACTION_INVALIDATED",
+        "RESOLUTION_ACTION_NONE",
+        "ResolutionDecision",
+        "ResolutionInput",
+        "evaluate_monitoring_resolution",
+    ],
+    ".observability": [
+        "AuditSnapshot",
+        "DashboardSnapshot",
+        "LiveExecutionSnapshot",
+        "Model2ObservabilityService",
+        "SignalFlowSnapshot",
+    ],
+    ".live_execution": [
+        "ENTRY_ORDER_TYPE_MARKET",
+        "ACTIVE_SIGNAL_EXECUTION_STATUSES",
+        "FINAL_SIGNAL_EXECUTION_STATUSES",
+        "M2_009_1_RULE_ID",
+        "M2_009_2_RULE_ID",
+        "M2_009_3_RULE_ID",
+        "M2_009_4_RULE_ID",
+        "M2_010_1_RULE_ID",
+        "OFFICIAL_SIGNAL_EXECUTION_STATUSES",
+        "SIGNAL_EXECUTION_STATUS_BLOCKED",
+        "SIGNAL_EXECUTION_STATUS_CANCELLED",
+        "SIGNAL_EXECUTION_STATUS_ENTRY_FILLED",
+        "SIGNAL_EXECUTION_STATUS_ENTRY_SENT",
+        "SIGNAL_EXECUTION_STATUS_EXITED",
+        "SIGNAL_EXECUTION_STATUS_FAILED",
+        "SIGNAL_EXECUTION_STATUS_PROTECTED",
+        "SIGNAL_EXECUTION_STATUS_READY",
+        "LiveExecutionConfig",
+        "LiveExecutionGateDecision",
+        "LiveExecutionGateInput",
+        "evaluate_live_execution_gate",
+        "is_valid_signal_execution_transition",
+    ],
+    ".model_decision": [
+        "ACTION_CLOSE",
+        "ACTION_HOLD",
+        "ACTION_OPEN_LONG",
+        "ACTION_OPEN_SHORT",
+        "ACTION_REDUCE",
+        "M2_020_1_RULE_ID",
+        "OFFICIAL_MODEL_ACTIONS",
+        "ModelDecision",
+        "ModelDecisionInput",
+        "ModelDecisionOutcome",
+        "ModelDecisionValidationError",
+        "evaluate_model_decision_payload",
+        "parse_model_decision_payload",
+    ],
+    ".model_inference_service": [
+        "DEFAULT_MODEL_VERSION",
+        "M2_020_2_RULE_ID",
+        "InferenceServiceResult",
+        "ModelInferenceService",
+        "TechnicalSignalInferenceProvider",
+    ],
+    ".model_state_builder": [
+        "M2_020_3_RULE_ID",
+        "M2_020_3_SCHEMA_VERSION",
+        "StateBuilderResult",
+        "build_model_decision_input",
+    ],
+    ".live_exchange": [
+        "Model2LiveExchange",
+    ],
+    ".live_service": [
+        "Model2LiveExecutionService",
+    ],
+    ".validator": [
+        "ValidationDecision",
+        "ValidationInput",
+        "evaluate_monitoring_validation",
+    ],
+})
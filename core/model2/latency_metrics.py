@@ -47,6 +47,24 @@ def record_latency(db_path: str, *, stage: str, elapsed_ms: int) -> None:
         pass
 
 
+def record_latency_samples(db_path: str, *, stage: str, samples: list[int]) -> None:
+    """Persiste varias amostras da mesma etapa em uma unica transacao."""
+    if not samples:
+        return
+    now_ms = _utc_now_ms()
+    try:
+        with sqlite3.connect(db_path, timeout=5) as conn:
+            _ensure_table(conn)
+            conn.executemany(
+                "INSERT INTO m2_latency_samples (stage, elapsed_ms, created_at) "
+                "VALUES (?, ?, ?)",
+                [(stage, int(elapsed_ms), now_ms) for elapsed_ms in samples],
+            )
+            conn.commit()
+    except sqlite3.OperationalError:
+        pass
+
+
 def compute_percentiles(samples: list[int | float]) -> dict[str, float]:
     """Calcula P50, P95 e P99 de uma lista de amostras (ms)."""
     if not samples:
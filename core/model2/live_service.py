@@ -60,8 +60,9 @@ from .model_decision import (
     ModelDecision,
     ModelDecisionInput,
 )
+from .latency_metrics import record_latency_samples
 from .model_inference_service import ModelInferenceService
-from .model_state_builder import M2_020_3_RULE_ID, build_model_decision_input
+from .model_state_builder import M2_020_3_RULE_ID, StateBuilderResult, build_model_decision_input
 from .repository import Model2ThesisRepository
 from .io_retry import exchange_retry_with_budget, ExchangeRetryBudgetError
 from .market_reader import RetryPolicy, read_market_with_retry
@@ -82,6 +83,8 @@ _PROTECTION_RETRY_BASE_DELAY_S = 1.0
 _BALANCE_RETRY_ATTEMPTS = 3
 _BALANCE_RETRY_DELAY_S = 0.4
 _TRAINING_STALE_MAX_HOURS = 6
+# Etapa das amostras por candidato em m2_latency_samples
+INFERENCE_LATENCY_STAGE = "inference"
 FAIL_SAFE_RETRY_TIMEOUT_POLICY: dict[str, float | int | str] = {
     "policy": "fail_safe",
     "max_retries": _PROTECTION_MAX_RETRIES,
@@ -174,9 +177,6 @@ class Model2LiveExecutionService:
         self._inference_service = ModelInferenceService()
         self._alert_publisher = alert_publisher or Model2LiveAlertPublisher()
         self._incremental_training_process: _IncrementalTrainingProcess | None = None
-        self._last_train_time = "N/A"
-        if self._rl_loader.checkpoint_timestamp:
-            self._last_train_time = posix_to_brt_str(self._rl_loader.checkpoint_timestamp)
         # Config para busca de dados de treino (BD)
         self._db_path = str(
             getattr(config, "db_path", "")
@@ -317,6 +317,13 @@ class Model2LiveExecutionService:
             "reason": "partial_fill_detected",
         }
 
+    @property
+    def _last_train_time(self) -> str:
+        """Horario (BRT) do checkpoint em uso; acompanha recargas do registro."""
+        loader = self.__dict__.get("_rl_loader")
+        timestamp = getattr(loader, "checkpoint_timestamp", None)
+        return posix_to_brt_str(timestamp) if timestamp else "N/A"
+
     def _incremental_training_is_running(self) -> bool:
         process = self._incremental_training_process
         if process is None:
@@ -1160,6 +1167,7 @@ class Model2LiveExecutionService:
     ) -> list[dict[str, Any]]:
         items: list[dict[str, Any]] = []
         print("[DEBUG] Staging candidates...", flush=True)
+        prepared: list[tuple[dict[str, Any], dict[str, Any], LiveExecutionGateInput, StateBuilderResult]] = []
         for candidate in self.repository.list_consumed_technical_signals(
             symbol=symbol,
             timeframe=timeframe,
@@ -1222,10 +1230,29 @@ class Model2LiveExecutionService:
                 },
             )
 
+            prepared.append((candidate, position_state, source_gate_input, builder_result))
+
+        # Todos os candidatos do ciclo em uma chamada: um forward por modelo
+        model_inputs = [
+            builder_result.model_input
+            for *_, builder_result in prepared
+            if builder_result.model_input is not None
+        ]
+        inference_results = self._inference_service.infer_batch(model_inputs)
+        inferences = iter(inference_results)
+        if inference_results:
+            # Uma amostra por candidato, com o custo amortizado do lote
+            record_latency_samples(
+                self._resolve_repository_db_path(),
+                stage=INFERENCE_LATENCY_STAGE,
+                samples=[int(result.inference_latency_ms) for result in inference_results],
+            )
+
+        for candidate, position_state, source_gate_input, builder_result in prepared:
             inference = None
             model_input: ModelDecisionInput | None = builder_result.model_input
             if model_input is not None:
-                inference = self._inference_service.infer(model_input)
+                inference = next(inferences)
 
             inference_model_version = (
                 str(inference.model_version)
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import logging
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Mapping, Protocol
+from typing import Any, Callable, Mapping, Protocol, Sequence
 
 import numpy as np
 
@@ -18,8 +19,11 @@ from .model_decision import (
     ModelDecisionInput,
     evaluate_model_decision_payload,
 )
+from .model_registry import ModelRegistry
 from .rl_model_loader import RLModelLoader
 
+logger = logging.getLogger(__name__)
+
 M2_020_2_RULE_ID = "M2-020.2-RULE-DECOUPLED-INFERENCE-SERVICE"
 DEFAULT_MODEL_VERSION = "m2-inference-v1"
 
@@ -48,11 +52,14 @@ class TechnicalSignalInferenceProvider:
     """Provider inicial para M2-020.2 com inferencia baseada no candidato atual.
 
     Mantem o comportamento estavel enquanto desacopla o ponto de decisao.
+    Os loaders por simbolo sao leves: o modelo de cada checkpoint vem do
+    registro compartilhado e e carregado uma unica vez no processo.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, registry: ModelRegistry | None = None) -> None:
         self._repo_root = Path(__file__).resolve().parents[2]
-        self._default_loader = RLModelLoader()
+        self._registry = registry
+        self._default_loader = RLModelLoader(registry=registry)
         self._loaders_by_symbol: dict[str, RLModelLoader] = {}
 
     @staticmethod
@@ -129,7 +136,7 @@ class TechnicalSignalInferenceProvider:
             / f"{normalized_symbol}_entry_ppo.zip"
         )
         if entry_checkpoint.exists():
-            loader = RLModelLoader(checkpoint_path=entry_checkpoint)
+            loader = RLModelLoader(checkpoint_path=entry_checkpoint, registry=self._registry)
         else:
             loader = self._default_loader
 
@@ -157,13 +164,50 @@ class TechnicalSignalInferenceProvider:
         return max(0.30, min(0.65, base)), "inference_from_symbol_model_divergence"
 
     def infer(self, model_input: ModelDecisionInput) -> Mapping[str, Any]:
-        signal_side = str(model_input.market_state.get("signal_side") or "").upper()
-        symbol = str(model_input.symbol).upper()
-        action = self._resolve_action_from_signal_side(signal_side)
+        return self.infer_batch([model_input])[0]
+
+    def infer_batch(self, model_inputs: Sequence[ModelDecisionInput]) -> list[Mapping[str, Any]]:
+        """Inferencia de varios candidatos com um forward por modelo.
+
+        Candidatos cujos simbolos resolvem para o mesmo modelo (ex: todos
+        no checkpoint padrao) sao pontuados em uma unica chamada de
+        predict_confidence_batch; o payload de cada item e o mesmo de infer().
+        """
+        prepared: list[tuple[ModelDecisionInput, str, str, RLModelLoader]] = []
+        pending: dict[int, list[int]] = {}
+        for index, model_input in enumerate(model_inputs):
+            signal_side = str(model_input.market_state.get("signal_side") or "").upper()
+            action = self._resolve_action_from_signal_side(signal_side)
+            loader = self._resolve_loader_for_symbol(str(model_input.symbol).upper())
+            prepared.append((model_input, signal_side, action, loader))
+            if action != ACTION_HOLD:
+                pending.setdefault(id(loader), []).append(index)
+
+        rl_outputs: dict[int, tuple[float, str]] = {}
+        for indices in pending.values():
+            loader = prepared[indices[0]][3]
+            outputs = loader.predict_confidence_batch(
+                [self._build_features(prepared[i][0]) for i in indices],
+                [prepared[i][1] for i in indices],
+            )
+            rl_outputs.update(zip(indices, outputs))
+
+        return [
+            self._build_payload(model_input, action, loader, rl_outputs.get(index))
+            for index, (model_input, _, action, loader) in enumerate(prepared)
+        ]
 
+    def _build_payload(
+        self,
+        model_input: ModelDecisionInput,
+        action: str,
+        loader: RLModelLoader,
+        rl_output: tuple[float, str] | None,
+    ) -> Mapping[str, Any]:
+        symbol = str(model_input.symbol).upper()
         sl_value = model_input.market_state.get("stop_loss")
         tp_value = model_input.market_state.get("take_profit")
-        if action == ACTION_HOLD:
+        if action == ACTION_HOLD or rl_output is None:
             size_fraction = 0.0
             sl_value = None
             tp_value = None
@@ -171,15 +215,9 @@ class TechnicalSignalInferenceProvider:
             reason = "inference_hold_signal"
             rl_confidence = confidence
             rl_action = "HOLD"
-            loader = self._resolve_loader_for_symbol(symbol)
         else:
             size_fraction = 1.0
-            loader = self._resolve_loader_for_symbol(symbol)
-            features = self._build_features(model_input)
-            rl_confidence, rl_action = loader.predict_confidence(
-                features=features,
-                signal_side=signal_side,
-            )
+            rl_confidence, rl_action = rl_output
             confidence, reason = self._confidence_from_rl(
                 action=action,
                 rl_confidence=float(rl_confidence),
@@ -268,7 +306,53 @@ class ModelInferenceService:
             )
 
         elapsed_ms = int((time.perf_counter() - started) * 1000)
+        return self._result_from_payload(model_input, raw_payload, elapsed_ms)
+
+    def infer_batch(self, model_inputs: Sequence[ModelDecisionInput]) -> list[InferenceServiceResult]:
+        """Inferencia de todos os candidatos de um ciclo de uma vez.
+
+        Com provider que implementa infer_batch, os candidatos sao pontuados
+        em lote e cada item recebe como inference_latency_ms o tempo do lote
+        dividido pelo numero de itens (custo amortizado; somado, volta ao
+        tempo do lote). Sem infer_batch, equivale a
+        chamar infer() item a item. Se o lote falhar, cada candidato e
+        reprocessado por infer(), para que so o item com erro seja rejeitado.
+        """
+        model_inputs = list(model_inputs)
+        if not model_inputs:
+            return []
+        infer_batch = getattr(self._provider, "infer_batch", None)
+        competent, _ = self.is_model_competent()
+        if not callable(infer_batch) or not competent:
+            return [self.infer(model_input) for model_input in model_inputs]
+
+        started = time.perf_counter()
+        try:
+            raw_payloads = list(infer_batch(model_inputs))
+            if len(raw_payloads) != len(model_inputs):
+                raise ValueError(
+                    f"infer_batch retornou {len(raw_payloads)} itens para {len(model_inputs)} entradas"
+                )
+        except Exception as exc:
+            logger.warning(
+                "infer_batch falhou para %d candidatos (%s); reprocessando item a item",
+                len(model_inputs),
+                exc,
+            )
+            return [self.infer(model_input) for model_input in model_inputs]
 
+        item_ms = round((time.perf_counter() - started) * 1000 / len(model_inputs))
+        return [
+            self._result_from_payload(model_input, raw_payload, item_ms)
+            for model_input, raw_payload in zip(model_inputs, raw_payloads)
+        ]
+
+    def _result_from_payload(
+        self,
+        model_input: ModelDecisionInput,
+        raw_payload: Mapping[str, Any],
+        elapsed_ms: int,
+    ) -> InferenceServiceResult:
         outcome = evaluate_model_decision_payload(model_input, raw_payload)
         return InferenceServiceResult(
             accepted=bool(outcome.allow_execution and outcome.decision is not None),
@@ -0,0 +1,207 @@
+"""Registro de modelos RL compartilhado pelo processo.
+
+Cada checkpoint e desserializado uma vez e compartilhado por todos os
+RLModelLoader que apontam para ele (loader padrao do live service, um por
+simbolo no provider de inferencia). Um watcher em thread daemon observa o
+mtime dos checkpoints registrados e, quando muda, carrega o novo modelo
+fora do caminho de predicao e troca a referencia de uma vez: decisoes em
+andamento terminam com o modelo que ja tinham e as seguintes usam o novo.
+Falha ao carregar (ex: arquivo ainda sendo escrito) mantem o modelo atual
+e e tentada de novo no proximo ciclo do watcher.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from .policy_runtime import ARTIFACT_SUFFIX, NumpyPolicy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL_SECONDS = 30.0
+
+
+def _load_model(path: Path) -> Any:
+    """Artefato NumPy exportado (.policy.npz) ou checkpoint SB3."""
+    if path.name.endswith(ARTIFACT_SUFFIX):
+        return NumpyPolicy.load(path)
+
+    from stable_baselines3 import PPO
+
+    return PPO.load(str(path))
+
+
+def _mtime(path: Path) -> float | None:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+@dataclass(frozen=True)
+class ModelSnapshot:
+    """Modelo carregado e mtime do checkpoint de origem (trocados juntos)."""
+
+    model: Any
+    checkpoint_timestamp: float | None
+    version: int
+
+
+class ModelHandle:
+    """Referencia estavel a um checkpoint; o snapshot muda a cada recarga."""
+
+    def __init__(self, path: Path | None, snapshot: ModelSnapshot | None = None) -> None:
+        self.path = path
+        self.error = ""
+        self._snapshot = snapshot
+        self._attempted_mtime: float | None = None
+        self._load_lock = threading.Lock()
+
+    @classmethod
+    def static(cls, model: Any) -> "ModelHandle":
+        """Handle fixo, fora do registro (sem checkpoint associado)."""
+        snapshot = ModelSnapshot(model, None, 1) if model is not None else None
+        return cls(None, snapshot)
+
+    @property
+    def snapshot(self) -> ModelSnapshot | None:
+        return self._snapshot
+
+    @property
+    def model(self) -> Any:
+        snapshot = self._snapshot
+        return snapshot.model if snapshot is not None else None
+
+    @property
+    def checkpoint_timestamp(self) -> float | None:
+        snapshot = self._snapshot
+        return snapshot.checkpoint_timestamp if snapshot is not None else None
+
+
+class ModelRegistry:
+    """Cache de modelos por checkpoint com recarga a quente."""
+
+    def __init__(
+        self,
+        load_fn: Callable[[Path], Any] | None = None,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        auto_watch: bool = True,
+    ) -> None:
+        """
+        Args:
+            load_fn: Desserializa um checkpoint (padrao PPO.load ou NumpyPolicy.load)
+            poll_interval_seconds: Intervalo do watcher de mtime
+            auto_watch: Iniciar o watcher no primeiro acquire()
+        """
+        self._load_fn = load_fn or _load_model
+        self._poll_interval_seconds = float(poll_interval_seconds)
+        self._auto_watch = auto_watch
+        self._handles: dict[Path, ModelHandle] = {}
+        self._lock = threading.Lock()
+        self._loads = 0
+        self._reloads = 0
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+
+    def acquire(self, path: Path | str) -> ModelHandle:
+        """Handle do checkpoint, carregando-o na primeira vez.
+
+        Sem modelo ainda (arquivo ausente ou carga com erro), tenta de novo
+        se o arquivo apareceu ou mudou desde a ultima tentativa.
+        """
+        key = Path(path).resolve()
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is None:
+                handle = ModelHandle(key)
+                self._handles[key] = handle
+        if handle.snapshot is None:
+            self._reload(handle)
+        if self._auto_watch and self._poll_interval_seconds > 0:
+            self.start_watcher()
+        return handle
+
+    def _reload(self, handle: ModelHandle) -> bool:
+        """Carrega o checkpoint se o mtime mudou; True se trocou o modelo."""
+        assert handle.path is not None
+        with handle._load_lock:
+            mtime = _mtime(handle.path)
+            if mtime is None:
+                if handle.snapshot is None:
+                    handle.error = f"checkpoint nao encontrado: {handle.path}"
+                return False
+            if mtime == handle._attempted_mtime:
+                return False
+            handle._attempted_mtime = mtime
+
+            try:
+                model = self._load_fn(handle.path)
+            except Exception as exc:
+                handle.error = f"erro ao carregar checkpoint: {exc}"
+                logger.warning("[RL] Falha ao carregar %s: %s", handle.path, exc)
+                return False
+
+            previous = handle.snapshot
+            version = previous.version + 1 if previous is not None else 1
+            handle._snapshot = ModelSnapshot(model, mtime, version)
+            handle.error = ""
+            with self._lock:
+                self._loads += 1
+                if previous is not None:
+                    self._reloads += 1
+            if previous is None:
+                logger.info("[RL] Modelo PPO carregado: %s", handle.path)
+            else:
+                logger.info("[RL] Modelo PPO recarregado (v%d): %s", version, handle.path)
+            return True
+
+    def refresh(self) -> list[Path]:
+        """Verifica todos os checkpoints uma vez; retorna os recarregados."""
+        with self._lock:
+            handles = list(self._handles.items())
+        return [path for path, handle in handles if self._reload(handle)]
+
+    def start_watcher(self) -> None:
+        """Inicia o watcher de mtime (idempotente)."""
+        with self._lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return
+            self._stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, name="model-registry-watcher", daemon=True
+            )
+            self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        with self._lock:
+            watcher, self._watcher = self._watcher, None
+        self._stop.set()
+        if watcher is not None:
+            watcher.join()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self._poll_interval_seconds):
+            try:
+                self.refresh()
+            except Exception as exc:  # pragma: no cover - watcher nao pode morrer
+                logger.error("[RL] Erro no watcher de checkpoints: %s", exc)
+
+    def clear(self) -> None:
+        """Esquece todos os modelos (proximo acquire carrega de novo)."""
+        with self._lock:
+            self._handles.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "models": sum(1 for h in self._handles.values() if h.snapshot is not None),
+                "loads": self._loads,
+                "reloads": self._reloads,
+            }
+
+
+MODEL_REGISTRY = ModelRegistry()
@@ -9,6 +9,8 @@ import time
 from dataclasses import dataclass, field
 from typing import Any
 
+from data.sqlite_pool import MODEL2_PROFILE, SQLITE_POOL, PragmaProfile
+
 from .cycle_snapshot import CycleSnapshotRepository
 from .signal_adapter import ADAPTER_EXPORT_KEY, ADAPTER_LAST_ERROR_KEY
 from .thesis_state import OFFICIAL_THESIS_STATUSES
@@ -195,14 +197,12 @@ class LiveExecutionSnapshot:
 class Model2ObservabilityService:
     """Creates queryable observability snapshots with retention policy."""
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, profile: PragmaProfile = MODEL2_PROFILE):
         self.db_path = db_path
+        self.profile = profile
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
+        return SQLITE_POOL.acquire(self.db_path, self.profile)
 
     @staticmethod
     def _retention_threshold(snapshot_timestamp: int, retention_days: int) -> int:
@@ -1,12 +1,40 @@
-"""Cache OHLCV read-through para fluxo Model 2.0."""
+"""Cache OHLCV read-through para fluxo Model 2.0.
+
+Guarda uma serie por (simbolo, timeframe) e atende qualquer ``limit`` como
+recorte da cauda da serie carregada. Para timeframes conhecidos a entrada
+expira no fechamento do proximo candle (nao em segundos fixos): entre dois
+fechamentos a serie so muda no candle em formacao. Cargas concorrentes da
+mesma serie sao deduplicadas (single-flight), chaves faltantes de um
+``get_many`` carregam em paralelo e o numero de series fica limitado por LRU.
+"""
 
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 from time import time
 from typing import Any, Callable, Mapping, Sequence
 
+# Duracao dos candles; timeframes fora do mapa usam TTL fixo
+TIMEFRAME_DURATION_MS: dict[str, int] = {
+    "M1": 60_000,
+    "M5": 300_000,
+    "M15": 900_000,
+    "M30": 1_800_000,
+    "H1": 3_600_000,
+    "H4": 14_400_000,
+    "D1": 86_400_000,
+    "W1": 604_800_000,
+}
+# Candles semanais da Binance abrem na segunda 00:00 UTC (epoch foi quinta)
+_TIMEFRAME_OFFSET_MS: dict[str, int] = {"W1": 4 * 86_400_000}
+
+# Carga single-flight de uma serie: candles, ou None se o loader falhou
+_LoadFuture = Future[list[dict[str, Any]] | None]
+
 
 def _utc_now_ms() -> int:
     return int(time() * 1000)
@@ -17,6 +45,21 @@ def build_cache_key(symbol: str, timeframe: str, limit: int) -> str:
     return f"{str(symbol).upper()}:{str(timeframe).upper()}:{int(limit)}"
 
 
+def build_series_key(symbol: str, timeframe: str) -> str:
+    """Gera chave da serie armazenada (independe do limite)."""
+    return f"{str(symbol).upper()}:{str(timeframe).upper()}"
+
+
+def next_candle_close_ms(timeframe: str, now_ms: int) -> int | None:
+    """Fechamento do candle em formacao (ms UTC), ou None se timeframe desconhecido."""
+    timeframe_upper = str(timeframe).upper()
+    duration = TIMEFRAME_DURATION_MS.get(timeframe_upper)
+    if duration is None:
+        return None
+    offset = _TIMEFRAME_OFFSET_MS.get(timeframe_upper, 0)
+    return ((int(now_ms) - offset) // duration + 1) * duration + offset
+
+
 class CacheFallbackReason(str, Enum):
     """Motivos de fallback do cache para trilha operacional."""
 
@@ -34,101 +77,223 @@ class OhlcvFetchResult:
     fallback_reason: str | None = None
 
 
+@dataclass
+class _SeriesEntry:
+    candles: list[dict[str, Any]]
+    loaded_limit: int
+    expires_at_ms: int
+
+    def covers(self, limit: int) -> bool:
+        # Loader devolveu menos que o pedido: serie completa, serve qualquer limite
+        return limit <= self.loaded_limit or len(self.candles) < self.loaded_limit
+
+
+@dataclass
+class _Flight:
+    limit: int
+    future: _LoadFuture
+
+
 class OhlcvCacheProvider:
-    """Provider read-through com TTL por timeframe."""
+    """Provider read-through com expiracao no fechamento do candle."""
 
     def __init__(
         self,
         default_ttl_seconds: int = 30,
         ttl_by_timeframe: Mapping[str, int] | None = None,
         now_ms: Callable[[], int] | None = None,
+        max_series: int = 256,
+        max_concurrent_loads: int = 8,
+        align_to_candle_close: bool = True,
     ) -> None:
+        """
+        Args:
+            default_ttl_seconds: TTL de timeframes sem duracao conhecida; com
+                alinhamento, tambem o intervalo de nova tentativa quando a
+                serie ainda nao tem o ultimo candle fechado
+            ttl_by_timeframe: Override de default_ttl_seconds por timeframe
+            now_ms: Relogio injetavel (ms UTC)
+            max_series: Series mantidas (LRU)
+            max_concurrent_loads: Cargas paralelas em get_many
+            align_to_candle_close: Expirar no fechamento do proximo candle
+        """
         self._default_ttl_ms = max(1, int(default_ttl_seconds)) * 1000
         self._ttl_by_timeframe = {
             str(k).upper(): max(1, int(v)) * 1000
             for k, v in (ttl_by_timeframe or {}).items()
         }
         self._now_ms = now_ms or _utc_now_ms
-        self._cache: dict[str, tuple[int, list[dict[str, Any]]]] = {}
+        self._max_series = max(1, int(max_series))
+        self._max_concurrent_loads = max(1, int(max_concurrent_loads))
+        self._align_to_candle_close = align_to_candle_close
+        self._cache: OrderedDict[str, _SeriesEntry] = OrderedDict()
+        self._inflight: dict[str, _Flight] = {}
+        self._lock = threading.Lock()
         self._hits = 0
         self._misses = 0
+        self._loads = 0
+        self._coalesced = 0
+        self._evictions = 0
 
     def _ttl_ms_for_timeframe(self, timeframe: str) -> int:
         return self._ttl_by_timeframe.get(str(timeframe).upper(), self._default_ttl_ms)
 
+    def _expires_at_ms(self, timeframe: str, candles: list[dict[str, Any]], now_ms: int) -> int:
+        ttl_ms = self._ttl_ms_for_timeframe(timeframe)
+        next_close = next_candle_close_ms(timeframe, now_ms) if self._align_to_candle_close else None
+        if next_close is None:
+            return now_ms + ttl_ms
+        # Ultimo candle fechado ainda nao chegou na fonte: tentar de novo antes
+        duration = TIMEFRAME_DURATION_MS[str(timeframe).upper()]
+        last_closed_open = next_close - 2 * duration
+        last_ts = candles[-1].get("timestamp") if candles else None
+        if last_ts is None or int(last_ts) < last_closed_open:
+            return min(next_close, now_ms + ttl_ms)
+        return next_close
+
     def invalidate(self, symbol: str | None = None, timeframe: str | None = None) -> None:
         """Invalida cache completo ou recorte por simbolo/timeframe."""
-        if symbol is None and timeframe is None:
-            self._cache.clear()
-            return
+        with self._lock:
+            if symbol is None and timeframe is None:
+                self._cache.clear()
+                return
 
-        symbol_upper = str(symbol).upper() if symbol is not None else None
-        timeframe_upper = str(timeframe).upper() if timeframe is not None else None
+            symbol_upper = str(symbol).upper() if symbol is not None else None
+            timeframe_upper = str(timeframe).upper() if timeframe is not None else None
 
-        keys_to_remove: list[str] = []
-        for key in self._cache:
-            key_symbol, key_timeframe, _ = key.split(":", 2)
-            if symbol_upper is not None and key_symbol != symbol_upper:
-                continue
-            if timeframe_upper is not None and key_timeframe != timeframe_upper:
-                continue
-            keys_to_remove.append(key)
+            keys_to_remove: list[str] = []
+            for key in self._cache:
+                key_symbol, key_timeframe = key.split(":", 1)
+                if symbol_upper is not None and key_symbol != symbol_upper:
+                    continue
+                if timeframe_upper is not None and key_timeframe != timeframe_upper:
+                    continue
+                keys_to_remove.append(key)
 
-        for key in keys_to_remove:
-            self._cache.pop(key, None)
+            for key in keys_to_remove:
+                self._cache.pop(key, None)
 
     def stats(self) -> dict[str, float]:
         """Retorna telemetria minima de hit/miss do cache."""
-        total = self._hits + self._misses
-        return {
-            "hits": float(self._hits),
-            "misses": float(self._misses),
-            "hit_rate": float(self._hits / total) if total else 0.0,
-        }
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": float(self._hits),
+                "misses": float(self._misses),
+                "hit_rate": float(self._hits / total) if total else 0.0,
+                "loads": float(self._loads),
+                "coalesced": float(self._coalesced),
+                "evictions": float(self._evictions),
+                "series": float(len(self._cache)),
+            }
 
     def get_many(
         self,
         requests: Sequence[tuple[str, str, int]],
         loader: Callable[[str, str, int], list[dict[str, Any]]],
     ) -> dict[str, OhlcvFetchResult]:
-        """Busca multiplas chaves em cache com fallback para loader."""
+        """Busca multiplas chaves em cache com fallback para loader.
+
+        Com mais de uma serie a carregar, o loader e chamado em threads
+        paralelas e precisa ser thread-safe; com uma so, roda na thread
+        chamadora.
+        """
         now_ms = self._now_ms()
         results: dict[str, OhlcvFetchResult] = {}
+        # serie -> (symbol, timeframe, maior limite pedido, requests)
+        missing: dict[str, tuple[str, str, int, list[tuple[str, int]]]] = {}
+        stale_series: set[str] = set()
 
-        for symbol, timeframe, limit in requests:
-            key = build_cache_key(symbol=symbol, timeframe=timeframe, limit=limit)
-            cached = self._cache.get(key)
-            ttl_ms = self._ttl_ms_for_timeframe(timeframe)
-            stale = False
-
-            if cached is not None:
-                cached_at_ms, cached_candles = cached
-                if now_ms - cached_at_ms <= ttl_ms:
+        with self._lock:
+            for symbol, timeframe, limit in requests:
+                key = build_cache_key(symbol=symbol, timeframe=timeframe, limit=limit)
+                series_key = build_series_key(symbol, timeframe)
+                entry = self._cache.get(series_key)
+                if entry is not None and now_ms < entry.expires_at_ms and entry.covers(int(limit)):
+                    self._cache.move_to_end(series_key)
                     self._hits += 1
                     results[key] = OhlcvFetchResult(
-                        candles=list(cached_candles),
+                        candles=_tail(entry.candles, int(limit)),
                         source="cache",
                         fetched_at_ms=now_ms,
                     )
                     continue
-                stale = True
 
-            self._misses += 1
-            fallback_reason: str | None = (
-                CacheFallbackReason.CACHE_STALE.value if stale else None
-            )
+                self._misses += 1
+                if entry is not None and now_ms >= entry.expires_at_ms:
+                    stale_series.add(series_key)
+                _, _, max_limit, waiting = missing.get(series_key, (symbol, timeframe, 0, []))
+                waiting.append((key, int(limit)))
+                missing[series_key] = (symbol, timeframe, max(max_limit, int(limit)), waiting)
+
+            # Single-flight: junta-se a carga em andamento que cubra o limite
+            owned: list[tuple[str, str, str, int, _LoadFuture]] = []
+            flights: dict[str, _LoadFuture] = {}
+            for series_key, (symbol, timeframe, limit, _) in missing.items():
+                flight = self._inflight.get(series_key)
+                if flight is not None and flight.limit >= limit:
+                    self._coalesced += 1
+                    flights[series_key] = flight.future
+                    continue
+                future: _LoadFuture = Future()
+                self._inflight[series_key] = _Flight(limit=limit, future=future)
+                flights[series_key] = future
+                owned.append((series_key, symbol, timeframe, limit, future))
+
+        def _load(item: tuple[str, str, str, int, _LoadFuture]) -> None:
+            series_key, symbol, timeframe, limit, future = item
             try:
                 candles = list(loader(symbol, timeframe, limit))
             except Exception:
-                fallback_reason = CacheFallbackReason.CACHE_BACKEND_ERROR.value
-                candles = []
+                future.set_result(None)
+            else:
+                self._store(series_key, timeframe, limit, candles)
+                future.set_result(candles)
+            finally:
+                with self._lock:
+                    self._loads += 1
+                    flight = self._inflight.get(series_key)
+                    if flight is not None and flight.future is future:
+                        del self._inflight[series_key]
 
-            self._cache[key] = (now_ms, candles)
-            results[key] = OhlcvFetchResult(
-                candles=candles,
-                source="live",
-                fetched_at_ms=now_ms,
-                fallback_reason=fallback_reason,
+        if len(owned) == 1:
+            _load(owned[0])
+        elif owned:
+            with ThreadPoolExecutor(max_workers=min(self._max_concurrent_loads, len(owned))) as pool:
+                list(pool.map(_load, owned))
+
+        for series_key, (_, _, _, waiting) in missing.items():
+            candles = flights[series_key].result()
+            fallback_reason: str | None = (
+                CacheFallbackReason.CACHE_STALE.value if series_key in stale_series else None
             )
+            if candles is None:
+                fallback_reason = CacheFallbackReason.CACHE_BACKEND_ERROR.value
+                candles = []
+            for key, limit in waiting:
+                results[key] = OhlcvFetchResult(
+                    candles=_tail(candles, limit),
+                    source="live",
+                    fetched_at_ms=now_ms,
+                    fallback_reason=fallback_reason,
+                )
 
         return results
+
+    def _store(self, series_key: str, timeframe: str, limit: int, candles: list[dict[str, Any]]) -> None:
+        now_ms = self._now_ms()
+        entry = _SeriesEntry(
+            candles=candles,
+            loaded_limit=limit,
+            expires_at_ms=self._expires_at_ms(timeframe, candles, now_ms),
+        )
+        with self._lock:
+            self._cache[series_key] = entry
+            self._cache.move_to_end(series_key)
+            while len(self._cache) > self._max_series:
+                self._cache.popitem(last=False)
+                self._evictions += 1
+
+
+def _tail(candles: list[dict[str, Any]], limit: int) -> list[dict[str, Any]]:
+    return candles[-limit:] if limit > 0 else []
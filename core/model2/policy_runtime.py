@@ -0,0 +1,253 @@
+"""Runtime leve de inferencia para politicas PPO exportadas em NumPy.
+
+O caminho de decisao so precisa do ator da politica PPO: FlattenExtractor,
+MLP do ator (Linear + ativacao) e action_net. export_policy() congela esses
+pesos num arquivo .npz ao lado do checkpoint e NumpyPolicy reproduz
+model.predict(deterministic=True) sem importar stable_baselines3 nem torch,
+o que reduz o tempo de inicio e a memoria do live cycle.
+
+A acao deterministica de uma politica Discrete e o argmax dos logits; o
+forward roda em float32 como no torch, entao as acoes coincidem com as do
+PPO carregado (os logits diferem no maximo por arredondamento).
+
+Selecao do runtime: M2_INFERENCE_RUNTIME=numpy (config.settings). O
+exportador e scripts/model2/export_policy.py; o treino incremental reexporta
+ao salvar um checkpoint novo. O artefato guarda mtime e tamanho do checkpoint
+de origem: se o checkpoint mudar depois da exportacao, artifact_is_current()
+devolve False e o loader volta para o checkpoint SB3.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_SUFFIX = ".policy.npz"
+ARTIFACT_FORMAT_VERSION = 1
+SUPPORTED_RUNTIMES = ("sb3", "numpy")
+
+_ACTIVATIONS: dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "Tanh": np.tanh,
+    "ReLU": lambda x: np.maximum(x, np.float32(0.0)),
+    "Identity": lambda x: x,
+}
+
+
+def artifact_path_for(checkpoint_path: Path | str) -> Path:
+    """Caminho do artefato NumPy de um checkpoint (ppo_model.zip -> ppo_model.policy.npz)."""
+    return Path(checkpoint_path).with_suffix(ARTIFACT_SUFFIX)
+
+
+def checkpoint_stamp(checkpoint_path: Path | str) -> dict[str, int]:
+    """mtime (ns) e tamanho do checkpoint, gravados no artefato exportado."""
+    stat = Path(checkpoint_path).stat()
+    return {"source_mtime_ns": int(stat.st_mtime_ns), "source_size": int(stat.st_size)}
+
+
+def read_artifact_metadata(path: Path | str) -> dict[str, Any]:
+    """Metadados de um artefato sem carregar os pesos."""
+    with np.load(Path(path), allow_pickle=False) as data:
+        return dict(json.loads(str(data["metadata"])))
+
+
+def artifact_is_current(artifact_path: Path | str, checkpoint_path: Path | str) -> bool:
+    """True se o artefato foi exportado da versao atual do checkpoint.
+
+    Artefato sem carimbo de origem, ilegivel ou de checkpoint com mtime ou
+    tamanho diferentes e considerado desatualizado.
+    """
+    try:
+        metadata = read_artifact_metadata(artifact_path)
+        stamp = checkpoint_stamp(checkpoint_path)
+    except (OSError, KeyError, ValueError) as exc:
+        logger.debug("[RL] Artefato %s nao verificavel: %s", artifact_path, exc)
+        return False
+    return all(metadata.get(key) == value for key, value in stamp.items())
+
+
+def resolve_runtime(runtime: str | None = None) -> str:
+    """Runtime de inferencia configurado ('sb3' ou 'numpy')."""
+    if runtime is None:
+        try:
+            from config.settings import M2_INFERENCE_RUNTIME
+            runtime = str(M2_INFERENCE_RUNTIME)
+        except Exception:
+            runtime = "sb3"
+    runtime = runtime.strip().lower()
+    if runtime not in SUPPORTED_RUNTIMES:
+        raise ValueError(
+            f"Runtime de inferencia '{runtime}' invalido. Validos: {list(SUPPORTED_RUNTIMES)}"
+        )
+    return runtime
+
+
+class _ObservationSpace:
+    """Subconjunto de gymnasium.spaces.Box usado pelo RLModelLoader (shape)."""
+
+    def __init__(self, shape: tuple[int, ...]) -> None:
+        self.shape = shape
+
+
+class NumpyPolicy:
+    """Ator PPO congelado: mesma interface predict() do modelo SB3."""
+
+    def __init__(
+        self,
+        layers: list[tuple[np.ndarray, np.ndarray, str]],
+        action_weight: np.ndarray,
+        action_bias: np.ndarray,
+        observation_shape: tuple[int, ...],
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Args:
+            layers: (peso, bias, ativacao) de cada camada do MLP do ator
+            action_weight: Peso do action_net (n_actions, n_hidden)
+            action_bias: Bias do action_net (n_actions,)
+            observation_shape: Shape do observation_space do checkpoint
+            metadata: Informacoes de origem gravadas no artefato
+        """
+        for _, _, activation in layers:
+            if activation not in _ACTIVATIONS:
+                raise ValueError(f"Ativacao nao suportada: {activation}")
+        self._layers = [
+            (np.ascontiguousarray(w.T, dtype=np.float32), b.astype(np.float32), _ACTIVATIONS[a])
+            for w, b, a in layers
+        ]
+        self._action_weight = np.ascontiguousarray(action_weight.T, dtype=np.float32)
+        self._action_bias = action_bias.astype(np.float32)
+        self.observation_space = _ObservationSpace(tuple(int(d) for d in observation_shape))
+        self.metadata = dict(metadata or {})
+
+    @classmethod
+    def load(cls, path: Path | str) -> "NumpyPolicy":
+        """Carrega um artefato gerado por export_policy()."""
+        with np.load(Path(path), allow_pickle=False) as data:
+            metadata = json.loads(str(data["metadata"]))
+            if metadata.get("format_version") != ARTIFACT_FORMAT_VERSION:
+                raise ValueError(
+                    f"Versao de artefato nao suportada: {metadata.get('format_version')}"
+                )
+            layers = [
+                (data[f"layer_{i}_weight"], data[f"layer_{i}_bias"], activation)
+                for i, activation in enumerate(metadata["activations"])
+            ]
+            return cls(
+                layers,
+                data["action_weight"],
+                data["action_bias"],
+                tuple(metadata["observation_shape"]),
+                metadata,
+            )
+
+    def logits(self, observations: np.ndarray) -> np.ndarray:
+        """Logits do action_net para um lote (N, *observation_shape)."""
+        x = np.asarray(observations, dtype=np.float32).reshape(len(observations), -1)
+        for weight, bias, activation in self._layers:
+            x = activation(x @ weight + bias)
+        return x @ self._action_weight + self._action_bias
+
+    def predict(self, observation: Any, deterministic: bool = True) -> tuple[np.ndarray, None]:
+        """Equivalente a PPO.predict para observacao unica ou lote.
+
+        Como no SB3, observacao unica devolve acao escalar (array 0-d) e
+        lote devolve (N,). So o modo deterministico e suportado.
+        """
+        if not deterministic:
+            raise ValueError("NumpyPolicy suporta apenas predict(deterministic=True)")
+        obs = np.asarray(observation, dtype=np.float32)
+        shape = self.observation_space.shape
+        if obs.shape == shape:
+            return self.logits(obs[np.newaxis]).argmax(axis=1).squeeze(axis=0), None
+        if obs.shape[1:] != shape:
+            raise ValueError(
+                f"Observacao com shape {obs.shape} incompativel com observation_space {shape}"
+            )
+        return self.logits(obs).argmax(axis=1), None
+
+
+def export_policy(
+    model: Any,
+    output_path: Path | str,
+    source: Path | str = "",
+    stamp: dict[str, int] | None = None,
+) -> Path:
+    """Congela o ator de um PPO (SB3, MlpPolicy, acoes Discrete) em .npz.
+
+    Args:
+        model: PPO carregado
+        output_path: Arquivo .policy.npz de saida
+        source: Checkpoint de origem (registrado nos metadados)
+        stamp: Carimbo de checkpoint_stamp(); padrao: o do arquivo em source,
+            se existir
+
+    Raises:
+        ValueError: Politica fora do formato suportado (recorrente, extrator
+            de features proprio, espaco de acoes nao Discrete, ativacao nova).
+    """
+    policy = model.policy
+    if hasattr(policy, "lstm_actor"):
+        raise ValueError("Politica recorrente (LSTM) nao suportada")
+    extractor = type(policy.pi_features_extractor).__name__
+    if extractor != "FlattenExtractor":
+        raise ValueError(f"Extrator de features nao suportado: {extractor}")
+    if not hasattr(model.action_space, "n"):
+        raise ValueError(f"Espaco de acoes nao suportado: {model.action_space}")
+
+    arrays: dict[str, np.ndarray] = {}
+    activations: list[str] = []
+    for module in policy.mlp_extractor.policy_net:
+        name = type(module).__name__
+        if name == "Linear":
+            index = len(activations)
+            arrays[f"layer_{index}_weight"] = module.weight.detach().cpu().numpy()
+            arrays[f"layer_{index}_bias"] = module.bias.detach().cpu().numpy()
+            activations.append("Identity")
+        elif name in _ACTIVATIONS and activations:
+            activations[-1] = name
+        else:
+            raise ValueError(f"Camada nao suportada no MLP do ator: {name}")
+
+    arrays["action_weight"] = policy.action_net.weight.detach().cpu().numpy()
+    arrays["action_bias"] = policy.action_net.bias.detach().cpu().numpy()
+    metadata = {
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "activations": activations,
+        "observation_shape": [int(d) for d in model.observation_space.shape],
+        "n_actions": int(model.action_space.n),
+        "source": str(source),
+    }
+    if stamp is None and source and Path(source).is_file():
+        stamp = checkpoint_stamp(source)
+    metadata.update(stamp or {})
+    arrays["metadata"] = np.array(json.dumps(metadata))
+
+    output = Path(output_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    # Escrita atomica: o watcher do registro nunca ve um artefato pela metade
+    tmp = output.with_name(output.name + ".tmp")
+    with tmp.open("wb") as fh:
+        np.savez(fh, allow_pickle=False, **arrays)
+    tmp.replace(output)
+    return output
+
+
+def export_checkpoint(checkpoint_path: Path | str, output_path: Path | str | None = None) -> Path:
+    """Carrega um checkpoint PPO com SB3 e exporta o artefato NumPy."""
+    from stable_baselines3 import PPO
+
+    checkpoint = Path(checkpoint_path)
+    # Carimbo lido antes da carga: se o checkpoint for trocado durante a
+    # exportacao, o artefato ja nasce desatualizado em vez de mascarar a troca
+    stamp = checkpoint_stamp(checkpoint)
+    model = PPO.load(str(checkpoint), device="cpu")
+    output = artifact_path_for(checkpoint) if output_path is None else Path(output_path)
+    export_policy(model, output, source=checkpoint, stamp=stamp)
+    logger.info("[RL] Politica exportada: %s -> %s", checkpoint, output)
+    return output
@@ -7,6 +7,8 @@ import sqlite3
 from dataclasses import dataclass
 from typing import Any, Mapping, cast
 
+from data.sqlite_pool import MODEL2_PROFILE, SQLITE_POOL, PragmaProfile
+
 from .order_layer import (
     OrderLayerInput,
     evaluate_signal_for_order_layer,
@@ -171,16 +173,12 @@ class CreateModelDecisionResult:
 class Model2ThesisRepository:
     """Repository that writes opportunities and initial events in one transaction."""
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, profile: PragmaProfile = MODEL2_PROFILE):
         self.db_path = db_path
+        self.profile = profile
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA journal_mode = WAL")
-        conn.execute("PRAGMA busy_timeout = 5000")
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
+        return SQLITE_POOL.acquire(self.db_path, self.profile)
 
     @staticmethod
     def _safe_json_dict(raw_value: Any) -> dict[str, Any]:
@@ -2269,16 +2267,12 @@ class Model2ExecutionRepository:
     M2-024.8: transicao OPEN->EXITED exige fill_external_confirmed=True.
     """
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, profile: PragmaProfile = MODEL2_PROFILE) -> None:
         self.db_path = db_path
+        self.profile = profile
 
     def _connect(self) -> sqlite3.Connection:
-        import sqlite3 as _sqlite3
-
-        conn = _sqlite3.connect(self.db_path)
-        conn.row_factory = _sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
+        return SQLITE_POOL.acquire(self.db_path, self.profile)
 
     def _insert_signal_execution(
         self,
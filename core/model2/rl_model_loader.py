@@ -2,19 +2,35 @@
 
 Implementa RF-RL-004: o agente PPO deve operar em modo degradado
 (fallback determinístico) caso o checkpoint não esteja disponível.
+
+O modelo vem do registro compartilhado (model_registry.MODEL_REGISTRY):
+loaders do mesmo checkpoint reutilizam a mesma instância e passam a usar
+a versão nova quando o arquivo é atualizado.
+
+Com M2_INFERENCE_RUNTIME=numpy o loader usa o artefato exportado ao lado
+do checkpoint (policy_runtime.NumpyPolicy) e não importa SB3/torch.
 """
 
 from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence
 
 import numpy as np
 
+from .model_registry import MODEL_REGISTRY, ModelHandle, ModelRegistry
+from .policy_runtime import (
+    ARTIFACT_SUFFIX,
+    artifact_is_current,
+    artifact_path_for,
+    resolve_runtime,
+)
+
 logger = logging.getLogger(__name__)
 
 _DEFAULT_FALLBACK_CONFIDENCE = 0.70
+_ACTION_MAP = {0: "HOLD", 1: "LONG", 2: "SHORT"}
 _PPO_AVAILABLE: bool | None = None
 
 
@@ -54,18 +70,38 @@ class RLModelLoader:
     """Carrega modelo PPO e provê predição com fallback determinístico.
 
     Quando o checkpoint não está disponível ou ocorre erro de carga,
-    o loader entra em modo fallback e retorna confiança padrão.
+    o loader entra em modo fallback e retorna confiança padrão. A carga
+    acontece no primeiro uso do modelo (predição, is_fallback), não no
+    construtor.
     """
 
-    def __init__(self, checkpoint_path: Path | str | None = None) -> None:
-        self._model: Any = None
+    def __init__(
+        self,
+        checkpoint_path: Path | str | None = None,
+        registry: ModelRegistry | None = None,
+        runtime: str | None = None,
+        lazy: bool = True,
+    ) -> None:
+        """
+        Args:
+            checkpoint_path: Checkpoint PPO (padrão: locais de _resolve_checkpoint).
+            registry: Registro de modelos (padrão MODEL_REGISTRY).
+            runtime: 'sb3' ou 'numpy' (padrão config.settings.M2_INFERENCE_RUNTIME).
+            lazy: Adiar import de SB3/torch e carga do checkpoint até o
+                primeiro uso do modelo (ciclos sem candidatos não pagam o
+                custo); False carrega já no construtor.
+        """
+        self._handle: ModelHandle | None = None
+        self._registry = registry or MODEL_REGISTRY
+        self._runtime = resolve_runtime(runtime)
         self._fallback_mode: bool = False
         self._fallback_reason: str = ""
         self._checkpoint_path: Path | None = (
             Path(checkpoint_path) if checkpoint_path else None
         )
-        self._checkpoint_timestamp: float | None = None
-        self._load()
+        self._pending_load = bool(lazy)
+        if not lazy:
+            self._load()
 
     # ------------------------------------------------------------------
     # Propriedades públicas
@@ -73,18 +109,53 @@ class RLModelLoader:
 
     @property
     def is_fallback(self) -> bool:
-        """True se o loader está em modo fallback determinístico."""
-        return self._fallback_mode
+        """True se o loader está em modo fallback determinístico.
+
+        Deixa de ser fallback se o checkpoint aparecer depois e o watcher
+        do registro carregá-lo.
+        """
+        return self._model is None
 
     @property
     def fallback_reason(self) -> str:
         """Motivo pelo qual o fallback foi ativado."""
-        return self._fallback_reason
+        return self._fallback_reason if self.is_fallback else ""
 
     @property
     def checkpoint_timestamp(self) -> float | None:
-        """Timestamp de modificação do arquivo de checkpoint carregado."""
-        return self._checkpoint_timestamp
+        """Timestamp de modificação do checkpoint de origem do modelo.
+
+        Com carga adiada ainda pendente, lê o mtime do checkpoint sem
+        carregá-lo. Com artefato NumPy carregado, devolve o mtime do
+        checkpoint gravado na exportação (não o do .npz).
+        """
+        if self.__dict__.get("_pending_load"):
+            path = self._resolve_checkpoint()
+            try:
+                return path.stat().st_mtime if path is not None else None
+            except OSError:
+                return None
+        handle: ModelHandle | None = self.__dict__.get("_handle")
+        if handle is None:
+            return None
+        metadata = getattr(handle.model, "metadata", None)
+        if isinstance(metadata, dict) and "source_mtime_ns" in metadata:
+            return int(metadata["source_mtime_ns"]) / 1e9
+        return handle.checkpoint_timestamp
+
+    @property
+    def _model(self) -> Any:
+        """Modelo atual do handle (lido uma vez por predição)."""
+        if self.__dict__.get("_pending_load"):
+            self._pending_load = False
+            self._load()
+        handle = self.__dict__.get("_handle")
+        return handle.model if handle is not None else None
+
+    @_model.setter
+    def _model(self, model: Any) -> None:
+        self._pending_load = False
+        self._handle = ModelHandle.static(model)
 
     # ------------------------------------------------------------------
     # Carregamento
@@ -92,25 +163,24 @@ class RLModelLoader:
 
     def _load(self) -> None:
         """Tenta carregar o checkpoint PPO; ativa fallback em caso de falha."""
-        if not _check_ppo_available():
+        path = self._resolve_model_path()
+        is_artifact = path is not None and path.name.endswith(ARTIFACT_SUFFIX)
+        if self._runtime == "numpy" and not is_artifact:
+            logger.warning(
+                "[RL] Runtime numpy sem artefato exportado para %s; usando checkpoint SB3", path
+            )
+        if not is_artifact and not _check_ppo_available():
             self._activate_fallback("stable_baselines3 nao disponivel")
             return
 
-        path = self._resolve_checkpoint()
-        if path is None or not path.exists():
-            self._activate_fallback(
-                f"checkpoint nao encontrado: {path}"
-            )
+        if path is None:
+            self._activate_fallback("checkpoint nao encontrado: None")
             return
 
-        try:
-            from stable_baselines3 import PPO  # type: ignore[import]
-
-            self._model = PPO.load(str(path))
-            self._checkpoint_timestamp = path.stat().st_mtime
-            logger.info("[RL] Modelo PPO carregado: %s", path)
-        except Exception as exc:
-            self._activate_fallback(f"erro ao carregar checkpoint: {exc}")
+        # Checkpoint ausente também é registrado: o watcher carrega quando surgir
+        self._handle = self._registry.acquire(path)
+        if self._handle.model is None:
+            self._activate_fallback(self._handle.error)
 
     def _resolve_checkpoint(self) -> Path | None:
         """Resolve o caminho do checkpoint procurando nos locais padrão."""
@@ -136,6 +206,31 @@ class RLModelLoader:
                 return candidate
         return candidates[0]
 
+    def _resolve_model_path(self) -> Path | None:
+        """Arquivo que o registro vai carregar (checkpoint ou artefato NumPy)."""
+        path = self._resolve_checkpoint()
+        if self._runtime == "numpy" and path is not None:
+            path = self._resolve_artifact(path)
+        return path
+
+    @staticmethod
+    def _resolve_artifact(checkpoint: Path) -> Path:
+        """Artefato NumPy do checkpoint; ausente ou desatualizado, segue com o SB3."""
+        if checkpoint.name.endswith(ARTIFACT_SUFFIX):
+            return checkpoint
+        artifact = artifact_path_for(checkpoint)
+        if not artifact.exists():
+            return checkpoint
+        if not checkpoint.exists() or artifact_is_current(artifact, checkpoint):
+            return artifact
+        logger.warning(
+            "[RL] Artefato %s desatualizado em relacao a %s; usando checkpoint SB3 "
+            "(reexporte com scripts/model2/export_policy.py)",
+            artifact,
+            checkpoint,
+        )
+        return checkpoint
+
     def _activate_fallback(self, reason: str) -> None:
         self._fallback_mode = True
         self._fallback_reason = reason
@@ -164,40 +259,104 @@ class RLModelLoader:
         Returns:
             Tupla (confiança [0.0–1.0], acao ['LONG'|'SHORT'|'HOLD']).
         """
-        if self._fallback_mode or self._model is None:
+        # Referência local: uma recarga concorrente não troca o modelo no meio
+        model = self._model
+        if model is None:
             return self._deterministic_fallback(signal_side)
 
         try:
-            adapted_features = self._adapt_features_for_model(features)
-            action_id, _states = self._model.predict(
+            adapted_features = self._adapt_features_for_model(features, model)
+            action_id, _states = model.predict(
                 adapted_features,
                 deterministic=True,
             )
-            action_map = {0: "HOLD", 1: "LONG", 2: "SHORT"}
-            action = action_map.get(int(action_id.flat[0]), "HOLD")
-
-            expected = (
-                "LONG"
-                if signal_side.upper() in {"BUY", "LONG"}
-                else "SHORT"
-                if signal_side.upper() in {"SELL", "SHORT"}
-                else ""
-            )
-            if action == expected:
-                confidence = 0.85
-            elif action == "HOLD":
-                confidence = 0.55
-            else:
-                confidence = 0.30
-            return confidence, action
+            action = _ACTION_MAP.get(int(action_id.flat[0]), "HOLD")
+            return self._confidence_for_action(action, signal_side), action
         except Exception as exc:
             logger.error("[RL] Erro em predict_confidence: %s", exc)
             return self._deterministic_fallback(signal_side)
 
-    def _adapt_features_for_model(self, features: np.ndarray) -> np.ndarray:
+    def predict_confidence_batch(
+        self,
+        features_matrix: np.ndarray | Sequence[np.ndarray],
+        sides: Sequence[str],
+    ) -> list[tuple[float, str]]:
+        """Versão em lote de predict_confidence: um único forward para N itens.
+
+        Cada linha passa pela mesma adaptação de shape de predict_confidence,
+        então o resultado é idêntico a chamar predict_confidence item a item.
+        Linha que falha na adaptação cai sozinha no fallback; as demais
+        seguem no forward. Se o forward do lote falhar, cada linha é refeita
+        por predict_confidence, isolando o item com erro.
+
+        Args:
+            features_matrix: Matriz (N, n_features) ou sequência de N vetores.
+            sides: signal_side de cada item (N).
+
+        Returns:
+            Lista de N tuplas (confiança, acao), na ordem da entrada.
+        """
+        sides = [str(side or "") for side in sides]
+        if len(features_matrix) != len(sides):
+            raise ValueError(
+                f"features_matrix e sides com tamanhos diferentes: {len(features_matrix)} != {len(sides)}"
+            )
+        if not sides:
+            return []
+
+        model = self._model
+        if model is None:
+            return [self._deterministic_fallback(side) for side in sides]
+
+        results: list[tuple[float, str] | None] = [None] * len(sides)
+        indices: list[int] = []
+        rows: list[np.ndarray] = []
+        for index, (features, side) in enumerate(zip(features_matrix, sides)):
+            try:
+                rows.append(self._adapt_features_for_model(features, model))
+            except Exception as exc:
+                logger.error("[RL] Erro em predict_confidence_batch (item %d): %s", index, exc)
+                results[index] = self._deterministic_fallback(side)
+                continue
+            indices.append(index)
+
+        if rows:
+            try:
+                if _observation_shape(model) is None:
+                    batch = np.concatenate(rows, axis=0)
+                else:
+                    batch = np.stack(rows)
+                action_ids, _states = model.predict(batch, deterministic=True)
+                action_ids = np.asarray(action_ids).reshape(len(rows), -1)[:, 0]
+            except Exception as exc:
+                logger.error("[RL] Erro em predict_confidence_batch: %s", exc)
+                for index in indices:
+                    results[index] = self.predict_confidence(features_matrix[index], sides[index])
+            else:
+                for index, action_id in zip(indices, action_ids):
+                    action = _ACTION_MAP.get(int(action_id), "HOLD")
+                    results[index] = (self._confidence_for_action(action, sides[index]), action)
+        return [result for result in results if result is not None]
+
+    @staticmethod
+    def _confidence_for_action(action: str, signal_side: str) -> float:
+        expected = (
+            "LONG"
+            if signal_side.upper() in {"BUY", "LONG"}
+            else "SHORT"
+            if signal_side.upper() in {"SELL", "SHORT"}
+            else ""
+        )
+        if action == expected:
+            return 0.85
+        if action == "HOLD":
+            return 0.55
+        return 0.30
+
+    def _adapt_features_for_model(self, features: np.ndarray, model: Any = None) -> np.ndarray:
         """Adapta o vetor de features ao shape esperado pelo checkpoint carregado."""
         features_array = np.asarray(features, dtype=np.float32)
-        expected_shape = _observation_shape(self._model)
+        expected_shape = _observation_shape(model if model is not None else self._model)
 
         if expected_shape is None:
             return features_array.reshape(1, -1) if features_array.ndim == 1 else features_array
@@ -1,13 +1,11 @@
 """
 Data collection and management package.
+
+Exports are imported on first access (core.lazy_imports), so importing
+data.database does not pull in the Binance SDK or the collectors.
 """
 
-from .database import DatabaseManager
-from .binance_client import BinanceClientFactory, create_binance_client
-from .collector import BinanceCollector
-from .sentiment_collector import SentimentCollector
-from .websocket_manager import WebSocketManager
-from .macro_collector import MacroCollector
+from core.lazy_imports import lazy_exports
 
 __all__ = [
     'DatabaseManager',
@@ -18,3 +16,12 @@ __all__ = [
     'WebSocketManager',
     'MacroCollector',
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.database': ['DatabaseManager'],
+    '.binance_client': ['BinanceClientFactory', 'create_binance_client'],
+    '.collector': ['BinanceCollector'],
+    '.sentiment_collector': ['SentimentCollector'],
+    '.websocket_manager': ['WebSocketManager'],
+    '.macro_collector': ['MacroCollector'],
+})
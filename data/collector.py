@@ -6,7 +6,7 @@ from __future__ import annotations
 
 import time
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 from datetime import datetime, timedelta
 import pandas as pd
 
@@ -226,6 +226,7 @@ class BinanceCollector:
         limit: int = 500,
         start_time: Optional[int] = None,
         end_time: Optional[int] = None,
+        before_request: Optional[Callable[[], Any]] = None,
     ) -> pd.DataFrame:
         """
         Fetch kline/candlestick data from Binance using SDK.
@@ -236,6 +237,8 @@ class BinanceCollector:
             limit: Number of klines to fetch (max 1000)
             start_time: Start time in milliseconds
             end_time: End time in milliseconds
+            before_request: Called before every attempt, retries included
+                (e.g. to reserve rate-limit weight)
 
         Returns:
             DataFrame with columns: timestamp, symbol, open, high, low, close,
@@ -250,6 +253,8 @@ class BinanceCollector:
         limit = min(limit, self.MAX_KLINES_PER_REQUEST)
 
         def _fetch():
+            if before_request is not None:
+                before_request()
             response = self._client.rest_api.kline_candlestick_data(
                 symbol=symbol,
                 interval=interval_enum,
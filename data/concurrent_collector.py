@@ -0,0 +1,286 @@
+"""
+Coleta concorrente de klines para backfill multi-símbolo.
+
+Distribui as páginas de todos os símbolos/intervalos num pool de threads
+limitado, compartilhando um único orçamento de peso (RateLimitManager), e
+entrega cada lote parseado assim que chega — por exemplo direto para
+DatabaseManager.insert_ohlcv — sem esperar o backfill inteiro terminar.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+from requests.adapters import DEFAULT_POOLSIZE
+
+from config.settings import HISTORICAL_PERIODS
+from data.collector import BinanceCollector
+from data.rate_limit_manager import RateLimitManager
+
+logger = logging.getLogger(__name__)
+
+# Intervalo da Binance -> timeframe das tabelas ohlcv_* do DatabaseManager
+TIMEFRAME_BY_INTERVAL = {"1d": "D1", "4h": "H4", "1h": "H1"}
+
+
+@dataclass(frozen=True)
+class KlinePage:
+    """Uma requisição de klines: intervalo [start_time, end_time] em ms."""
+
+    symbol: str
+    interval: str
+    start_time: int
+    end_time: int
+    limit: int
+
+
+@dataclass
+class BackfillReport:
+    """Resumo de um backfill concorrente."""
+
+    pages: int = 0
+    candles: int = 0
+    candles_by_symbol: Dict[Tuple[str, str], int] = field(default_factory=dict)
+    failed_pages: List[KlinePage] = field(default_factory=list)
+    rate_limit_wait_s: float = 0.0
+    elapsed_s: float = 0.0
+
+
+class ConcurrentKlineCollector:
+    """
+    Backfill de klines com páginas em paralelo num pool limitado.
+
+    Como o intervalo de cada página é conhecido de antemão
+    (limit * duração do candle), todas as páginas de todos os símbolos
+    são independentes e podem ser buscadas ao mesmo tempo. Cada worker
+    reserva o peso da requisição no RateLimitManager compartilhado antes
+    de cada tentativa de BinanceCollector.fetch_klines (retries incluídos).
+    """
+
+    def __init__(
+        self,
+        collector: BinanceCollector,
+        rate_limiter: Optional[RateLimitManager] = None,
+        max_workers: int = 8,
+        max_pending: Optional[int] = None,
+    ):
+        """
+        Args:
+            collector: BinanceCollector usado para cada página
+            rate_limiter: Orçamento de peso compartilhado (default: 2400/min,
+                limite de peso da Binance Futures)
+            max_workers: Requisições simultâneas (acima do pool HTTP padrão
+                do SDK, 10 conexões, as conexões extras não são reaproveitadas)
+            max_pending: Páginas em voo + prontas não consumidas
+                (default 2 * max_workers); limita memória quando o
+                consumidor (ex: SQLite) é mais lento que a rede
+        """
+        self.collector = collector
+        self.rate_limiter = rate_limiter or RateLimitManager(max_requests_per_minute=2400)
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(self.max_workers, max_pending or 2 * self.max_workers)
+        if self.max_workers > DEFAULT_POOLSIZE:
+            logger.warning(
+                f"max_workers={self.max_workers} excede o pool HTTP padrão do SDK "
+                f"({DEFAULT_POOLSIZE} conexões): conexões extras serão descartadas"
+            )
+
+    def plan_pages(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: int,
+        end_time: int,
+    ) -> List[KlinePage]:
+        """
+        Divide [start_time, end_time] em páginas de até MAX_KLINES_PER_REQUEST candles.
+
+        Args:
+            symbol: Símbolo
+            interval: Intervalo da Binance ("1h", "4h", "1d", ...)
+            start_time: Início em ms
+            end_time: Fim em ms (inclusivo)
+
+        Returns:
+            Lista de páginas em ordem cronológica
+        """
+        interval_ms = self.collector.INTERVAL_MS.get(interval)
+        if interval_ms is None:
+            raise ValueError(f"Invalid interval: {interval}")
+
+        span_ms = self.collector.MAX_KLINES_PER_REQUEST * interval_ms
+        pages = []
+        page_start = start_time
+        while page_start <= end_time:
+            page_end = min(page_start + span_ms - 1, end_time)
+            limit = min(
+                self.collector.MAX_KLINES_PER_REQUEST,
+                (page_end - page_start) // interval_ms + 1,
+            )
+            pages.append(KlinePage(symbol, interval, page_start, page_end, limit))
+            page_start += span_ms
+        return pages
+
+    def _fetch_page(self, page: KlinePage) -> Tuple[pd.DataFrame, float]:
+        weight = RateLimitManager.kline_request_weight(page.limit)
+        waited = 0.0
+
+        def _acquire() -> None:
+            nonlocal waited
+            waited += self.rate_limiter.acquire(weight)
+
+        df = self.collector.fetch_klines(
+            page.symbol,
+            page.interval,
+            limit=page.limit,
+            start_time=page.start_time,
+            end_time=page.end_time,
+            before_request=_acquire,
+        )
+        return df, waited
+
+    def iter_batches(
+        self,
+        pages: Iterable[KlinePage],
+        report: Optional[BackfillReport] = None,
+    ) -> Iterator[Tuple[KlinePage, pd.DataFrame]]:
+        """
+        Busca páginas em paralelo e produz cada lote assim que chega.
+
+        A ordem de chegada não é cronológica. Páginas que falham após os
+        retries do collector são registradas em report.failed_pages.
+
+        Args:
+            pages: Páginas a buscar (ver plan_pages)
+            report: Relatório atualizado durante a iteração (opcional)
+
+        Yields:
+            (página, DataFrame parseado) para páginas não vazias
+        """
+        report = report if report is not None else BackfillReport()
+        pages = iter(pages)
+        pending: Dict[Future, KlinePage] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="klines") as pool:
+            try:
+                while True:
+                    for page in pages:
+                        pending[pool.submit(self._fetch_page, page)] = page
+                        if len(pending) >= self.max_pending:
+                            break
+                    if not pending:
+                        return
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        page = pending.pop(future)
+                        report.pages += 1
+                        try:
+                            df, waited = future.result()
+                        except Exception as e:
+                            logger.error(
+                                f"Failed to fetch {page.symbol} {page.interval} "
+                                f"[{page.start_time}, {page.end_time}]: {e}"
+                            )
+                            report.failed_pages.append(page)
+                            continue
+
+                        report.rate_limit_wait_s += waited
+                        if df.empty:
+                            continue
+                        key = (page.symbol, page.interval)
+                        report.candles += len(df)
+                        report.candles_by_symbol[key] = report.candles_by_symbol.get(key, 0) + len(df)
+                        yield page, df
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def backfill(
+        self,
+        symbols: Iterable[str],
+        intervals: Iterable[str],
+        days: Optional[Union[int, Dict[str, int]]] = None,
+        end_time: Optional[int] = None,
+        db=None,
+        on_batch: Optional[Callable[[KlinePage, pd.DataFrame], None]] = None,
+    ) -> BackfillReport:
+        """
+        Backfill concorrente de vários símbolos e intervalos.
+
+        Args:
+            symbols: Símbolos a coletar
+            intervals: Intervalos ("1d", "4h", "1h")
+            days: Dias de histórico (int para todos, dict por intervalo ou
+                None para HISTORICAL_PERIODS, como fetch_historical)
+            end_time: Fim em ms (default: agora)
+            db: DatabaseManager; cada lote é inserido via insert_ohlcv ao chegar
+            on_batch: Callback(page, df) chamado para cada lote
+
+        Returns:
+            BackfillReport com páginas, candles e falhas (páginas cuja
+            gravação falhou também entram em failed_pages)
+        """
+        symbols = list(symbols)
+        intervals = list(intervals)
+        if db is not None:
+            unknown = [i for i in intervals if i not in TIMEFRAME_BY_INTERVAL]
+            if unknown:
+                raise ValueError(f"Intervals without OHLCV table: {unknown}")
+
+        if end_time is None:
+            end_time = int(datetime.now().timestamp() * 1000)
+
+        pages: List[KlinePage] = []
+        for interval in intervals:
+            interval_days = self._interval_days(interval, days)
+            start_time = end_time - int(timedelta(days=interval_days).total_seconds() * 1000)
+            for symbol in symbols:
+                pages.extend(self.plan_pages(symbol, interval, start_time, end_time))
+
+        logger.info(
+            f"Backfill concorrente: {len(symbols)} símbolos x {len(intervals)} intervalos "
+            f"= {len(pages)} páginas ({self.max_workers} workers)"
+        )
+
+        report = BackfillReport()
+        start = time.perf_counter()
+        for page, df in self.iter_batches(pages, report):
+            # Falha ao gravar uma página não interrompe as demais
+            try:
+                if db is not None:
+                    db.insert_ohlcv(TIMEFRAME_BY_INTERVAL[page.interval], df)
+                if on_batch is not None:
+                    on_batch(page, df)
+            except Exception as e:
+                logger.error(
+                    f"Failed to store {page.symbol} {page.interval} "
+                    f"[{page.start_time}, {page.end_time}]: {e}"
+                )
+                key = (page.symbol, page.interval)
+                report.candles -= len(df)
+                report.candles_by_symbol[key] -= len(df)
+                report.failed_pages.append(page)
+        report.elapsed_s = time.perf_counter() - start
+
+        logger.info(
+            f"Backfill concluído: {report.candles} candles em {report.pages} páginas, "
+            f"{len(report.failed_pages)} falhas, {report.elapsed_s:.1f}s "
+            f"(espera rate limit {report.rate_limit_wait_s:.1f}s)"
+        )
+        return report
+
+    @staticmethod
+    def _interval_days(interval: str, days: Optional[Union[int, Dict[str, int]]]) -> int:
+        if isinstance(days, dict):
+            days = days.get(interval)
+        if days is None:
+            key = TIMEFRAME_BY_INTERVAL.get(interval, "H1")
+            days = HISTORICAL_PERIODS.get(key, 90)
+        return days
@@ -5,14 +5,142 @@ Manages all data persistence including OHLCV, indicators, sentiment, macro data,
 
 import sqlite3
 import json
+import time
 from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
 from contextlib import contextmanager
 import logging
+import numpy as np
 import pandas as pd
 
+from data.sqlite_pool import DEFAULT_PROFILE, SQLITE_POOL, PragmaProfile
+
 logger = logging.getLogger(__name__)
 
+OHLCV_INSERT_COLUMNS = (
+    'timestamp', 'symbol', 'open', 'high', 'low', 'close',
+    'volume', 'quote_volume', 'trades_count',
+)
+
+# PRAGMAs por conexão para ingestão em lote: uma única transação dispensa
+# fsync a cada commit (synchronous=NORMAL) e o cache maior (64 MiB) evita
+# reler páginas do índice da PK durante INSERT OR REPLACE.
+BULK_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Colunas numéricas de leitura (sem symbol, constante por consulta) e dtype
+OHLCV_ARRAY_DTYPES = {
+    'timestamp': np.int64,
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.float64,
+    'quote_volume': np.float64,
+    'trades_count': np.int64,
+}
+
+# Linhas convertidas por vez em read_ohlcv_arrays (limita o pico de memória)
+OHLCV_FETCH_CHUNK = 16384
+
+
+def _ohlcv_query(
+    timeframe: str,
+    symbol: str,
+    columns: str,
+    start_time: Optional[int] = None,
+    end_time: Optional[int] = None,
+    limit: Optional[int] = None,
+    ordered: bool = True,
+) -> Tuple[str, List[Any]]:
+    """SELECT de OHLCV por símbolo, em ordem cronológica, e seus parâmetros."""
+    query = f"SELECT {columns} FROM ohlcv_{timeframe.lower()} WHERE symbol = ?"
+    params: List[Any] = [symbol]
+
+    if start_time:
+        query += " AND timestamp >= ?"
+        params.append(start_time)
+    if end_time:
+        query += " AND timestamp <= ?"
+        params.append(end_time)
+
+    if ordered:
+        query += " ORDER BY timestamp ASC"
+
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
+    return query, params
+
+
+def read_ohlcv_arrays(
+    conn: sqlite3.Connection,
+    timeframe: str,
+    symbol: str,
+    start_time: Optional[int] = None,
+    end_time: Optional[int] = None,
+    limit: Optional[int] = None,
+    columns: Tuple[str, ...] = tuple(OHLCV_ARRAY_DTYPES),
+) -> Dict[str, np.ndarray]:
+    """
+    Lê OHLCV direto para colunas NumPy pré-alocadas.
+
+    As linhas vêm como tuplas (sem row_factory) em blocos de
+    OHLCV_FETCH_CHUNK, convertidos de uma vez para float64 e copiados
+    para as colunas de saída; nenhum dict por linha é criado. Contagem e
+    leitura rodam no mesmo snapshot. Timestamps em ms e trades_count
+    cabem exatamente em float64 (< 2**53).
+
+    Args:
+        conn: Conexão SQLite com as tabelas ohlcv_*
+        timeframe: "D1", "H4", "H1" ou "M5"
+        symbol: Símbolo
+        start_time: Timestamp inicial opcional (inclusivo)
+        end_time: Timestamp final opcional (inclusivo)
+        limit: Máximo de candles (os mais antigos do intervalo, como get_ohlcv)
+        columns: Subconjunto de OHLCV_ARRAY_DTYPES, na ordem desejada
+
+    Returns:
+        Dict coluna -> np.ndarray (int64 para timestamp/trades_count, float64 no resto)
+    """
+    unknown = [col for col in columns if col not in OHLCV_ARRAY_DTYPES]
+    if unknown:
+        raise ValueError(f"Colunas OHLCV desconhecidas: {unknown}")
+
+    query, params = _ohlcv_query(timeframe, symbol, ', '.join(columns), start_time, end_time, limit)
+    # A contagem não depende da ordem: sem ORDER BY, o SQLite não ordena duas vezes
+    count_query, _ = _ohlcv_query(timeframe, symbol, "1", start_time, end_time, limit, ordered=False)
+    cursor = conn.cursor()
+    cursor.row_factory = None
+
+    own_snapshot = not conn.in_transaction
+    if own_snapshot:
+        cursor.execute("BEGIN")
+    try:
+        count = cursor.execute(f"SELECT COUNT(*) FROM ({count_query})", params).fetchone()[0]
+        arrays = {col: np.empty(count, dtype=OHLCV_ARRAY_DTYPES[col]) for col in columns}
+
+        cursor.execute(query, params)
+        filled = 0
+        while filled < count:
+            chunk = cursor.fetchmany(min(OHLCV_FETCH_CHUNK, count - filled))
+            if not chunk:
+                break
+            block = np.array(chunk, dtype=np.float64)
+            end = filled + len(block)
+            for j, col in enumerate(columns):
+                arrays[col][filled:end] = block[:, j]
+            filled = end
+    finally:
+        cursor.close()
+        if own_snapshot:
+            conn.rollback()
+
+    return arrays
+
 
 class DatabaseManager:
     """
@@ -20,21 +148,22 @@ class DatabaseManager:
     All tables use composite primary keys on [timestamp, symbol] where applicable.
     """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, profile: PragmaProfile = DEFAULT_PROFILE):
         """
         Initialize database manager.
 
         Args:
             db_path: Path to SQLite database file
+            profile: PRAGMA profile for pooled connections (data/sqlite_pool.py)
         """
         self.db_path = db_path
+        self.profile = profile
         self.init_db()
 
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Context manager for database connections (pooled per thread)."""
+        conn = SQLITE_POOL.acquire(self.db_path, self.profile)
         try:
             yield conn
             conn.commit()
@@ -45,6 +174,27 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    @contextmanager
+    def bulk_connection(self):
+        """
+        Conexão para escrita em lote: PRAGMAs de BULK_PRAGMAS e uma única
+        transação explícita (commit no fim, rollback em erro).
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            for pragma in BULK_PRAGMAS:
+                conn.execute(pragma)
+            conn.execute("BEGIN")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.error(f"Database error: {e}")
+            raise
+        finally:
+            conn.close()
+
     def init_db(self) -> None:
         """Create all database tables if they don't exist."""
         with self.get_connection() as conn:
@@ -557,30 +707,56 @@ class DatabaseManager:
             timeframe: "D1", "H4", ou "H1"
             data: Lista de dicts OHLCV ou pd.DataFrame
         """
-        table_name = f"ohlcv_{timeframe.lower()}"
+        self.bulk_insert_ohlcv(timeframe, data)
 
-        # Converter DataFrame para lista de dicts se necessário
-        if isinstance(data, pd.DataFrame):
-            if data.empty:
-                logger.debug(f"DataFrame vazio, nenhum dado para inserir em {timeframe}")
-                return
-            records = data.to_dict('records')
-        else:
-            records = data
+    def bulk_insert_ohlcv(
+        self,
+        timeframe: str,
+        data: Union[List[Dict[str, Any]], pd.DataFrame],
+    ) -> Dict[str, float]:
+        """
+        Ingestão em lote de OHLCV (INSERT OR REPLACE).
 
-        if not records:
-            logger.debug(f"Lista vazia, nenhum dado para inserir em {timeframe}")
-            return
+        DataFrames viram tuplas coluna a coluna (sem um dict por linha) e
+        todas as linhas entram num único executemany dentro de uma
+        transação com os PRAGMAs de BULK_PRAGMAS.
 
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.executemany(f"""
-                INSERT OR REPLACE INTO {table_name}
-                (timestamp, symbol, open, high, low, close, volume, quote_volume, trades_count)
-                VALUES (:timestamp, :symbol, :open, :high, :low, :close, :volume, :quote_volume, :trades_count)
-            """, records)
+        Args:
+            timeframe: "D1", "H4", "H1" ou "M5"
+            data: pd.DataFrame ou lista de dicts com OHLCV_INSERT_COLUMNS
+
+        Returns:
+            Dict com rows, seconds e rows_per_sec
+        """
+        table_name = f"ohlcv_{timeframe.lower()}"
+        n_rows = len(data)
+        if n_rows == 0:
+            logger.debug(f"Nenhum dado para inserir em {timeframe}")
+            return {'rows': 0, 'seconds': 0.0, 'rows_per_sec': 0.0}
+
+        start = time.perf_counter()
+        with self.bulk_connection() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {table_name} ({', '.join(OHLCV_INSERT_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(OHLCV_INSERT_COLUMNS))})",
+                self._ohlcv_rows(data),
+            )
+        seconds = time.perf_counter() - start
 
-        logger.debug(f"{len(records)} candles {timeframe} inseridos")
+        rows_per_sec = n_rows / seconds if seconds > 0 else float('inf')
+        logger.debug(f"{n_rows} candles {timeframe} inseridos ({rows_per_sec:,.0f} rows/s)")
+        return {'rows': n_rows, 'seconds': seconds, 'rows_per_sec': rows_per_sec}
+
+    @staticmethod
+    def _ohlcv_rows(data: Union[List[Dict[str, Any]], pd.DataFrame]):
+        """Iterador de tuplas na ordem de OHLCV_INSERT_COLUMNS."""
+        if isinstance(data, pd.DataFrame):
+            missing = [col for col in OHLCV_INSERT_COLUMNS if col not in data.columns]
+            if missing:
+                raise ValueError(f"Colunas OHLCV ausentes: {missing}")
+            # tolist() converte para tipos Python nativos em C, coluna a coluna
+            return zip(*(data[col].tolist() for col in OHLCV_INSERT_COLUMNS))
+        return (tuple(row[col] for col in OHLCV_INSERT_COLUMNS) for row in data)
 
     def get_ohlcv(self, timeframe: str, symbol: str, start_time: Optional[int] = None,
                    end_time: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -597,22 +773,7 @@ class DatabaseManager:
         Returns:
             List of OHLCV dictionaries
         """
-        table_name = f"ohlcv_{timeframe.lower()}"
-        query = f"SELECT * FROM {table_name} WHERE symbol = ?"
-        params = [symbol]
-
-        if start_time:
-            query += " AND timestamp >= ?"
-            params.append(start_time)
-        if end_time:
-            query += " AND timestamp <= ?"
-            params.append(end_time)
-
-        query += " ORDER BY timestamp ASC"
-
-        if limit:
-            query += " LIMIT ?"
-            params.append(limit)
+        query, params = _ohlcv_query(timeframe, symbol, "*", start_time, end_time, limit)
 
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -620,6 +781,33 @@ class DatabaseManager:
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
 
+    def get_ohlcv_arrays(self, timeframe: str, symbol: str, start_time: Optional[int] = None,
+                         end_time: Optional[int] = None, limit: Optional[int] = None,
+                         columns: Tuple[str, ...] = tuple(OHLCV_ARRAY_DTYPES)) -> Dict[str, np.ndarray]:
+        """
+        OHLCV como colunas NumPy (mesmos filtros de get_ohlcv).
+
+        Ver read_ohlcv_arrays; evita o dict por linha de get_ohlcv.
+
+        Returns:
+            Dict coluna -> np.ndarray
+        """
+        with self.get_connection() as conn:
+            return read_ohlcv_arrays(conn, timeframe, symbol, start_time, end_time, limit, columns)
+
+    def get_ohlcv_frame(self, timeframe: str, symbol: str, start_time: Optional[int] = None,
+                        end_time: Optional[int] = None, limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        OHLCV como DataFrame, com as mesmas colunas de pd.DataFrame(get_ohlcv(...)).
+
+        Returns:
+            DataFrame (vazio, com as colunas, se não houver candles)
+        """
+        arrays = self.get_ohlcv_arrays(timeframe, symbol, start_time, end_time, limit)
+        df = pd.DataFrame(arrays, copy=False)
+        df.insert(1, 'symbol', symbol)
+        return df
+
     def insert_indicators(self, data: List[Dict[str, Any]]) -> None:
         """Insert technical indicators into the database."""
         with self.get_connection() as conn:
@@ -0,0 +1,273 @@
+"""
+Índice de cobertura OHLCV por (símbolo, timeframe).
+
+Guarda, por par, o conjunto de intervalos [start, end) de open_time já
+baixados da exchange — inclusive trechos em que ela não tem candles
+(ex: antes da listagem) — para que a sincronização busque exatamente as
+lacunas do intervalo pedido. Cada página gravada avança a cobertura e o
+cursor da lacuna na mesma transação; após uma queda, a próxima execução
+retoma do último lote confirmado.
+
+O timeframe é a string de intervalo da Binance ("1d", "4h", "1h", "5m"),
+compartilhada entre o banco legado (ohlcv_*) e o cache de klines.
+"""
+
+import logging
+import sqlite3
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Interval = Tuple[int, int]
+
+# fetch(start_ms, end_ms) -> (linhas gravadas, open_time do último candle ou None)
+PageFetcher = Callable[[int, int], Tuple[int, Optional[int]]]
+
+COVERAGE_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS ohlcv_coverage (
+    symbol TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    start_ms INTEGER NOT NULL,
+    end_ms INTEGER NOT NULL,
+    PRIMARY KEY (symbol, timeframe, start_ms)
+);
+
+CREATE TABLE IF NOT EXISTS ohlcv_sync_cursor (
+    symbol TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    gap_start_ms INTEGER NOT NULL,
+    gap_end_ms INTEGER NOT NULL,
+    position_ms INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    PRIMARY KEY (symbol, timeframe)
+);
+"""
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """União de intervalos [start, end): ordena e junta sobrepostos/adjacentes."""
+    merged: List[List[int]] = []
+    for start, end in sorted(i for i in intervals if i[1] > i[0]):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def subtract_intervals(start: int, end: int, covered: Sequence[Interval]) -> List[Interval]:
+    """Partes de [start, end) não cobertas por `covered` (já mesclado)."""
+    gaps = []
+    position = start
+    for cov_start, cov_end in covered:
+        if cov_end <= position:
+            continue
+        if cov_start >= end:
+            break
+        if cov_start > position:
+            gaps.append((position, cov_start))
+        position = max(position, cov_end)
+    if position < end:
+        gaps.append((position, end))
+    return gaps
+
+
+def runs_from_timestamps(timestamps: Sequence[int], interval_ms: int) -> List[Interval]:
+    """Trechos contíguos [primeiro, último + intervalo) de open_times ordenados."""
+    ts = np.unique(np.asarray(timestamps, dtype=np.int64))
+    if len(ts) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(ts) != interval_ms)
+    starts = np.concatenate(([ts[0]], ts[breaks + 1]))
+    ends = np.concatenate((ts[breaks], [ts[-1]])) + interval_ms
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+class CoverageIndex:
+    """
+    Conjunto persistido de intervalos cobertos por (símbolo, timeframe).
+
+    As tabelas ficam no mesmo SQLite dos candles, de modo que o índice
+    acompanha o banco que descreve.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        """
+        Args:
+            conn: Conexão SQLite onde ficam ohlcv_coverage/ohlcv_sync_cursor
+        """
+        self.conn = conn
+        self.conn.executescript(COVERAGE_SCHEMA_SQL)
+        self.conn.commit()
+
+    @classmethod
+    def from_path(cls, db_path: str) -> "CoverageIndex":
+        """Abre (ou cria) o índice no banco SQLite indicado."""
+        return cls(sqlite3.connect(db_path))
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def covered(self, symbol: str, timeframe: str) -> List[Interval]:
+        """Intervalos cobertos, mesclados e ordenados."""
+        rows = self.conn.execute(
+            "SELECT start_ms, end_ms FROM ohlcv_coverage "
+            "WHERE symbol = ? AND timeframe = ? ORDER BY start_ms",
+            (symbol, timeframe),
+        ).fetchall()
+        return [(int(start), int(end)) for start, end in rows]
+
+    def missing(self, symbol: str, timeframe: str, start_ms: int, end_ms: int) -> List[Interval]:
+        """Lacunas de [start_ms, end_ms) ainda não cobertas."""
+        return subtract_intervals(start_ms, end_ms, self.covered(symbol, timeframe))
+
+    def mark_covered(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_ms: int,
+        end_ms: int,
+        cursor: Optional[Tuple[int, int, int]] = None,
+    ) -> None:
+        """
+        Adiciona [start_ms, end_ms) à cobertura.
+
+        Args:
+            cursor: (gap_start, gap_end, position) gravado na mesma transação
+        """
+        merged = merge_intervals(self.covered(symbol, timeframe) + [(start_ms, end_ms)])
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM ohlcv_coverage WHERE symbol = ? AND timeframe = ?",
+                (symbol, timeframe),
+            )
+            self.conn.executemany(
+                "INSERT INTO ohlcv_coverage (symbol, timeframe, start_ms, end_ms) VALUES (?, ?, ?, ?)",
+                [(symbol, timeframe, start, end) for start, end in merged],
+            )
+            if cursor is not None:
+                self._write_cursor(symbol, timeframe, *cursor)
+
+    def seed_from_timestamps(
+        self,
+        symbol: str,
+        timeframe: str,
+        timestamps: Sequence[int],
+        interval_ms: int,
+    ) -> bool:
+        """
+        Inicializa a cobertura a partir de candles já gravados.
+
+        Só atua quando o par ainda não tem cobertura. O candle mais recente
+        fica de fora: pode ter sido gravado ainda em formação.
+
+        Returns:
+            True se a cobertura foi semeada
+        """
+        if self.covered(symbol, timeframe) or len(timestamps) == 0:
+            return False
+        runs = runs_from_timestamps(timestamps, interval_ms)
+        last_start, last_end = runs[-1]
+        runs[-1] = (last_start, last_end - interval_ms)
+        for start, end in runs:
+            if end > start:
+                self.mark_covered(symbol, timeframe, start, end)
+        return True
+
+    def get_cursor(self, symbol: str, timeframe: str) -> Optional[Dict[str, int]]:
+        """Cursor de uma sincronização interrompida (ou None)."""
+        row = self.conn.execute(
+            "SELECT gap_start_ms, gap_end_ms, position_ms FROM ohlcv_sync_cursor "
+            "WHERE symbol = ? AND timeframe = ?",
+            (symbol, timeframe),
+        ).fetchone()
+        if row is None:
+            return None
+        return {'gap_start_ms': row[0], 'gap_end_ms': row[1], 'position_ms': row[2]}
+
+    def _write_cursor(self, symbol: str, timeframe: str, gap_start: int, gap_end: int, position: int) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO ohlcv_sync_cursor "
+            "(symbol, timeframe, gap_start_ms, gap_end_ms, position_ms, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (symbol, timeframe, gap_start, gap_end, position, int(time.time() * 1000)),
+        )
+
+    def clear_cursor(self, symbol: str, timeframe: str) -> None:
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM ohlcv_sync_cursor WHERE symbol = ? AND timeframe = ?",
+                (symbol, timeframe),
+            )
+
+    def fill_gaps(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_ms: int,
+        end_ms: int,
+        interval_ms: int,
+        fetch: PageFetcher,
+        now_ms: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Busca apenas as lacunas de [start_ms, end_ms) e atualiza a cobertura.
+
+        `fetch(start, end)` grava uma página a partir de `start` (até `end`,
+        inclusivo) e devolve (linhas, open_time do último candle ou None).
+        Só candles fechados entram na cobertura, então o candle em formação
+        é rebuscado a cada execução.
+
+        Args:
+            symbol: Símbolo
+            timeframe: Intervalo da Binance ("4h", ...)
+            start_ms: Início desejado (alinhado para baixo ao intervalo)
+            end_ms: Fim desejado, exclusivo (limitado ao candle em formação)
+            interval_ms: Duração do candle em ms
+            fetch: Busca e grava uma página
+            now_ms: Relógio (default: agora)
+
+        Returns:
+            Dict com gaps, requests, rows e resumed (0/1)
+        """
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        forming_open = now_ms - now_ms % interval_ms
+        start_ms -= start_ms % interval_ms
+        end_ms = min(end_ms, forming_open + interval_ms)
+
+        cursor = self.get_cursor(symbol, timeframe)
+        if cursor is not None:
+            logger.info(
+                f"[{symbol} {timeframe}] Retomando sincronização interrompida em {cursor['position_ms']}"
+            )
+
+        gaps = self.missing(symbol, timeframe, start_ms, end_ms)
+        stats = {'gaps': len(gaps), 'requests': 0, 'rows': 0, 'resumed': int(cursor is not None)}
+
+        for gap_start, gap_end in gaps:
+            position = gap_start
+            while position < gap_end:
+                rows, last_open = fetch(position, gap_end - 1)
+                stats['requests'] += 1
+                stats['rows'] += rows
+
+                page_end = gap_end if last_open is None else min(last_open + interval_ms, gap_end)
+                covered_end = min(page_end, forming_open)
+                if covered_end > position:
+                    self.mark_covered(
+                        symbol, timeframe, position, covered_end,
+                        cursor=(gap_start, gap_end, page_end),
+                    )
+                if page_end <= position:
+                    break
+                position = page_end
+        self.clear_cursor(symbol, timeframe)
+
+        logger.debug(
+            f"[{symbol} {timeframe}] {stats['gaps']} lacunas, {stats['requests']} requisições, "
+            f"{stats['rows']} candles"
+        )
+        return stats
@@ -3,9 +3,15 @@ Gerenciador de Rate Limiting para Binance API.
 
 Garante que <1200 requisições por minuto sejam respeitadas.
 Implementa backoff exponencial e throttling inteligente.
+
+O orçamento é contado em peso (weight) da Binance: cada requisição
+consome 1 por padrão, e endpoints pesados (ex: klines com limit=1000)
+podem registrar o peso real. acquire() é thread-safe e permite que
+vários workers compartilhem o mesmo orçamento.
 """
 
 import logging
+import threading
 import time
 from datetime import datetime, timedelta
 from collections import deque
@@ -20,6 +26,7 @@ class RateLimitManager:
 
     Binance Futures limita a 1200 requisições por minuto.
     Este manager implementa janelas deslizantes de 60 segundos.
+    O limite é aplicado sobre a soma dos pesos registrados na janela.
     """
 
     def __init__(
@@ -37,8 +44,11 @@ class RateLimitManager:
         self.max_requests_per_minute = max_requests_per_minute
         self.window_size_seconds = window_size_seconds
 
-        # Janela deslizante: deque com timestamps das requisições
+        # Janela deslizante: deque com timestamps das requisições e seus pesos
         self._request_timestamps: Deque[float] = deque()
+        self._request_weights: Deque[int] = deque()
+        self._used_weight = 0
+        self._lock = threading.RLock()
 
         # Rastreamento de período
         self._window_start = datetime.now()
@@ -61,16 +71,82 @@ class RateLimitManager:
         """
         return self.max_requests_per_minute / 60.0
 
-    def record_request(self) -> None:
+    @staticmethod
+    def kline_request_weight(limit: int) -> int:
+        """
+        Peso de GET /fapi/v1/klines conforme o limit pedido.
+
+        Args:
+            limit: Número de candles solicitados
+
+        Returns:
+            Peso cobrado pela Binance (1, 2, 5 ou 10)
+        """
+        if limit < 100:
+            return 1
+        if limit < 500:
+            return 2
+        if limit <= 1000:
+            return 5
+        return 10
+
+    def record_request(self, weight: int = 1) -> None:
         """
         Registrar nova requisição.
 
         Adiciona timestamp ao histórico de requisições.
+
+        Args:
+            weight: Peso da requisição (default 1)
         """
-        current_time = time.time()
-        self._refresh_window(current_time)
-        self._request_timestamps.append(current_time)
-        self._request_count_in_window += 1
+        with self._lock:
+            current_time = time.time()
+            self._refresh_window(current_time)
+            self._request_timestamps.append(current_time)
+            self._request_weights.append(weight)
+            self._used_weight += weight
+            self._request_count_in_window += 1
+
+    def acquire(self, weight: int = 1) -> float:
+        """
+        Reservar peso no orçamento, bloqueando até haver espaço.
+
+        Thread-safe: workers concorrentes compartilham a mesma janela.
+
+        Args:
+            weight: Peso da requisição que será feita
+
+        Returns:
+            Segundos bloqueados aguardando orçamento
+        """
+        weight = min(weight, self.max_requests_per_minute)
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                current_time = time.time()
+                self._refresh_window(current_time)
+                if self._used_weight + weight <= self.max_requests_per_minute:
+                    self._request_timestamps.append(current_time)
+                    self._request_weights.append(weight)
+                    self._used_weight += weight
+                    self._request_count_in_window += 1
+                    return waited
+                wait_time = self._wait_time_for(weight, current_time)
+
+            logger.debug(f"[RATE_LIMIT] Aguardando {wait_time:.2f}s por peso {weight}")
+            time.sleep(wait_time)
+            waited += wait_time
+
+    def _wait_time_for(self, weight: int, current_time: float) -> float:
+        """Tempo até pesos antigos saírem da janela e liberarem `weight`."""
+        excess = self._used_weight + weight - self.max_requests_per_minute
+        released = 0
+        for timestamp, request_weight in zip(self._request_timestamps, self._request_weights):
+            released += request_weight
+            if released >= excess:
+                return max(0.01, timestamp + self.window_size_seconds - current_time)
+        return 0.01
 
     def _refresh_window(self, current_time: float) -> None:
         """Atualiza a janela deslizante e limpa estado expirado."""
@@ -78,11 +154,14 @@ class RateLimitManager:
             self._window_start = datetime.now()
             self._request_count_in_window = 0
             self._request_timestamps.clear()
+            self._request_weights.clear()
+            self._used_weight = 0
             return
 
         cutoff_time = current_time - self.window_size_seconds
         while self._request_timestamps and self._request_timestamps[0] < cutoff_time:
             self._request_timestamps.popleft()
+            self._used_weight -= self._request_weights.popleft()
 
     def is_rate_limited(self) -> bool:
         """
@@ -92,11 +171,12 @@ class RateLimitManager:
             True se limite foi atingido
         """
         # Limpar timestamps antigos (> 60s)
-        current_time = time.time()
-        self._refresh_window(current_time)
+        with self._lock:
+            current_time = time.time()
+            self._refresh_window(current_time)
 
-        # Verificar se reached limit
-        current_requests = len(self._request_timestamps)
+            # Verificar se reached limit
+            current_requests = self._used_weight
 
         if current_requests >= self.max_requests_per_minute:
             logger.warning(
@@ -114,10 +194,22 @@ class RateLimitManager:
             Número de requisições na janela deslizante
         """
         # Limpar timestamps antigos
-        current_time = time.time()
-        self._refresh_window(current_time)
+        with self._lock:
+            current_time = time.time()
+            self._refresh_window(current_time)
+
+            return len(self._request_timestamps)
+
+    def get_current_minute_weight(self) -> int:
+        """
+        Obter peso consumido no minuto atual.
 
-        return len(self._request_timestamps)
+        Returns:
+            Soma dos pesos na janela deslizante
+        """
+        with self._lock:
+            self._refresh_window(time.time())
+            return self._used_weight
 
     def get_wait_time(self) -> float:
         """
@@ -158,7 +250,7 @@ class RateLimitManager:
         Returns:
             Número de requisições disponíveis
         """
-        current_requests = self.get_current_minute_requests()
+        current_requests = self.get_current_minute_weight()
         remaining = self.max_requests_per_minute - current_requests
         return max(0, remaining)
 
@@ -180,9 +272,12 @@ class RateLimitManager:
 
         Útil para sincronizar com servidor Binance.
         """
-        self._request_timestamps.clear()
-        self._request_count_in_window = 0
-        self._window_start = datetime.now()
+        with self._lock:
+            self._request_timestamps.clear()
+            self._request_weights.clear()
+            self._used_weight = 0
+            self._request_count_in_window = 0
+            self._window_start = datetime.now()
         logger.info("RateLimitManager resetado manualmente")
 
 
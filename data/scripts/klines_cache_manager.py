@@ -16,8 +16,15 @@ from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import logging
+import sys
 import requests
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from data.ohlcv_coverage import CoverageIndex
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -71,6 +78,15 @@ CREATE TABLE IF NOT EXISTS sync_log (
 CREATE INDEX IF NOT EXISTS idx_sync_symbol ON sync_log(symbol);
 """
 
+INTERVAL_MS = {
+    "1m": 60 * 1000,
+    "5m": 5 * 60 * 1000,
+    "15m": 15 * 60 * 1000,
+    "1h": 60 * 60 * 1000,
+    "4h": 4 * 60 * 60 * 1000,
+    "1d": 24 * 60 * 60 * 1000,
+}
+
 
 def init_database(db_path: str) -> sqlite3.Connection:
     """Inicializa schema SQLite."""
@@ -201,7 +217,10 @@ class BinanceKlinesFetcher:
                 retry_after = int(response.headers.get("Retry-After", "60"))
                 logger.warning(f"⚠️  Rate limited (429). Retry-After: {retry_after}s")
                 self.rate_limiter.handle_429_backoff(retry_after)
-                return []
+                # Lista vazia seria lida como "sem candles" e marcaria cobertura
+                raise requests.exceptions.HTTPError(
+                    f"429 Rate Limited fetching {symbol} {interval}", response=response
+                )
 
             response.raise_for_status()
             data = response.json()
@@ -466,6 +485,7 @@ class KlinesOrchestrator:
         self.db_conn = init_database(db_path)
         self.cache_mgr = KlinesCacheManager(self.db_conn)
         self.fetcher = BinanceKlinesFetcher()
+        self.coverage = CoverageIndex(self.db_conn)
         self.symbols = self._load_symbols(symbols_file)
         self.metadata = {
             "last_full_sync": None,
@@ -491,9 +511,14 @@ class KlinesOrchestrator:
         from_days_ago: int = 365
     ) -> Dict:
         """
-        Faz download de 1 ano completo para múltiplos símbolos.
+        Mantém 1 ano coberto para múltiplos símbolos.
+
+        Usa o índice de cobertura (data/ohlcv_coverage.py): só as lacunas
+        ainda não baixadas são buscadas, então execuções repetidas (ex:
+        sync diário) custam poucas requisições por símbolo, e um download
+        interrompido retoma do último lote gravado.
 
-        Estimativa: 15-20 minutos para 60 símbolos
+        Estimativa: 15-20 minutos para 60 símbolos (primeira execução)
         """
         if symbols is None:
             symbols = self.symbols
@@ -503,6 +528,7 @@ class KlinesOrchestrator:
 
         start_ms = int(from_date.timestamp() * 1000)
         end_ms = int(to_date.timestamp() * 1000)
+        interval_ms = INTERVAL_MS[interval]
 
         logger.info(f"🚀 Iniciando fetch de 1 ano para {len(symbols)} símbolos")
         logger.info(f"   Período: {from_date} até {to_date}")
@@ -511,55 +537,51 @@ class KlinesOrchestrator:
         start_time = time.time()
 
         for symbol in symbols:
-            logger.info(f"\n📊 [{symbol}] Iniciando downlo (1 year, {interval})...")
+            logger.info(f"\n📊 [{symbol}] Sincronizando lacunas (1 year, {interval})...")
 
-            current_time = start_ms
             candles_count = 0
-            sync_start_ms = start_ms
+            incremental = bool(self.coverage.covered(symbol, interval))
+
+            def _fetch_page(page_start_ms: int, page_end_ms: int) -> Tuple[int, Optional[int]]:
+                nonlocal candles_count
+                klines = self.fetcher.fetch_klines(
+                    symbol=symbol,
+                    interval=interval,
+                    start_time_ms=page_start_ms,
+                    end_time_ms=page_end_ms,
+                    limit=1500
+                )
+                if not klines:
+                    return 0, None
+
+                stats = self.cache_mgr.insert_klines_batch(symbol, klines, validate=True)
+                candles_count += stats["inserted"]
+                logger.info(f"[{symbol}] {candles_count} candles sofar...")
+                return stats["inserted"], int(klines[-1][0])
 
             try:
-                while current_time < end_ms:
-                    # Fetch batch
-                    klines = self.fetcher.fetch_klines(
-                        symbol=symbol,
-                        interval=interval,
-                        start_time_ms=current_time,
-                        limit=1500
-                    )
-
-                    if not klines:
-                        logger.info(f"[{symbol}] Nenhum dado retornado (fim?)")
-                        break
-
-                    # Insert em cache
-                    stats = self.cache_mgr.insert_klines_batch(
-                        symbol,
-                        klines,
-                        validate=True
-                    )
-                    candles_count += stats["inserted"]
-
-                    # Move window forward
-                    last_time = int(klines[-1][0])
-                    current_time = last_time + (4 * 60 * 60 * 1000)  # +4h
-
-                    logger.info(f"[{symbol}] {candles_count} candles sofar...")
+                gap_stats = self.coverage.fill_gaps(
+                    symbol, interval, start_ms, end_ms, interval_ms, _fetch_page
+                )
 
                 # Log sync event
                 duration = time.time() - start_time
                 self.cache_mgr.log_sync(
                     symbol=symbol,
-                    sync_type="FULL",
+                    sync_type="INCREMENTAL" if incremental else "FULL",
                     inserted=candles_count,
                     updated=0,
-                    start_time_ms=sync_start_ms,
+                    start_time_ms=start_ms,
                     end_time_ms=end_ms,
                     duration_sec=duration,
                     status="SUCCESS"
                 )
 
                 full_stats[symbol] = candles_count
-                logger.info(f"✅ [{symbol}] Concluído: {candles_count} candles")
+                logger.info(
+                    f"✅ [{symbol}] Concluído: {candles_count} candles "
+                    f"({gap_stats['requests']} requisições)"
+                )
 
             except Exception as e:
                 logger.error(f"❌ [{symbol}] Erro: {e}")
@@ -661,5 +683,6 @@ if __name__ == "__main__":
 
     elif args.action == "sync_daily":
         logger.info("📅 Executando SYNC diário...")
-        # TODO: Implementar lógica de sync incremental
-        logger.info("(Em desenvolvimento)")
+        # Incremental: o índice de cobertura limita o fetch às lacunas
+        stats = orch.fetch_full_year()
+        logger.info(f"Resultado: {json.dumps(stats, indent=2)}")
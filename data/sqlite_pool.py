@@ -0,0 +1,227 @@
+"""
+Pool de conexões SQLite por thread.
+
+Abrir sqlite3.connect e reemitir PRAGMAs a cada chamada custa mais que a
+maioria das consultas de um ciclo live. O pool mantém, por thread e por
+(banco, perfil de PRAGMAs), conexões longas prontas para reuso; como a
+conexão sobrevive entre chamadas, o cache de prepared statements do
+sqlite3 (cached_statements) passa a ser aproveitado.
+
+As conexões entregues são PooledConnection: close() e o fim de um bloco
+`with` devolvem a conexão ao pool em vez de fechá-la (close() ainda
+descarta uma transação não confirmada, como o close real). Assim o
+código existente — `with self._connect() as conn:` ou
+`conn = self._connect(); ... conn.close()` — passa a reutilizar
+conexões sem mudanças, e blocos aninhados continuam recebendo conexões
+distintas.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PragmaProfile:
+    """PRAGMAs e opções aplicados uma vez por conexão nova."""
+
+    name: str
+    pragmas: Tuple[str, ...] = ()
+    row_factory: Optional[Callable] = sqlite3.Row
+    cached_statements: int = 256
+
+
+# DatabaseManager (crypto_agent.db): sem PRAGMAs extras, como antes
+DEFAULT_PROFILE = PragmaProfile("default")
+
+# Repositórios Model2 (modelo2.db): WAL + espera por lock + FKs
+MODEL2_PROFILE = PragmaProfile(
+    "model2",
+    (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA busy_timeout = 5000",
+        "PRAGMA foreign_keys = ON",
+    ),
+)
+
+PRAGMA_PROFILES = {profile.name: profile for profile in (DEFAULT_PROFILE, MODEL2_PROFILE)}
+
+_MEMORY_PATHS = {":memory:", ""}
+
+
+def _file_id(db_path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(db_path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+class PooledConnection(sqlite3.Connection):
+    """Conexão que volta ao pool em close() e ao sair de um bloco `with`."""
+
+    _release: Optional[Callable[["PooledConnection"], None]] = None
+    _checked_out = False
+    _file_id: Optional[Tuple[int, int]] = None
+
+    def close(self) -> None:
+        if self._release is None:
+            super().close()
+            return
+        if self.in_transaction:
+            self.rollback()
+        self._return_to_pool()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        result = super().__exit__(exc_type, exc_value, traceback)
+        if self._release is not None:
+            self._return_to_pool()
+        return result
+
+    def _return_to_pool(self) -> None:
+        if self._checked_out:
+            self._checked_out = False
+            self._release(self)
+
+    def close_connection(self) -> None:
+        """Fecha de fato a conexão (usado pelo pool)."""
+        self._release = None
+        super().close()
+
+
+class SQLiteConnectionPool:
+    """
+    Conexões SQLite reutilizáveis por thread.
+
+    Cada thread tem sua própria lista de conexões ociosas por
+    (db_path, perfil), então não há contenção entre threads nem uso de
+    conexão fora da thread que a criou. Bancos em memória não entram no
+    pool: cada conexão a ":memory:" é um banco novo.
+    """
+
+    def __init__(self, max_idle_per_key: int = 4):
+        """
+        Args:
+            max_idle_per_key: Conexões ociosas mantidas por thread e por
+                (banco, perfil); excedentes são fechadas ao serem devolvidas
+        """
+        self.max_idle_per_key = max_idle_per_key
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], Dict[str, float]] = {}
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self) -> None:
+        # Conexões SQLite não podem atravessar fork
+        self._local = threading.local()
+
+    def _idle(self, key: Tuple[str, str]) -> List[PooledConnection]:
+        idle = getattr(self._local, 'idle', None)
+        if idle is None:
+            idle = self._local.idle = {}
+        return idle.setdefault(key, [])
+
+    def acquire(self, db_path: Any, profile: PragmaProfile = DEFAULT_PROFILE) -> PooledConnection:
+        """
+        Obtém uma conexão da thread atual (reutilizada ou nova).
+
+        Args:
+            db_path: Caminho do banco
+            profile: Perfil de PRAGMAs/row_factory
+
+        Returns:
+            PooledConnection pronta; close() a devolve ao pool
+        """
+        start = time.perf_counter()
+        db_path = str(db_path)
+        key = (db_path, profile.name)
+
+        if db_path in _MEMORY_PATHS:
+            return self._connect(db_path, profile)
+
+        idle = self._idle(key)
+        file_id = _file_id(db_path)
+        while idle and idle[-1]._file_id != file_id:
+            # Arquivo removido/substituído: conexão ociosa aponta para o antigo
+            idle.pop().close_connection()
+        reused = bool(idle)
+        if reused:
+            conn = idle.pop()
+        else:
+            conn = self._connect(db_path, profile)
+            conn._file_id = _file_id(db_path)
+        conn._release = self._release_to(idle)
+        conn._checked_out = True
+
+        self._record(key, time.perf_counter() - start, reused)
+        return conn
+
+    def _release_to(self, idle: List[PooledConnection]) -> Callable[[PooledConnection], None]:
+        def release(conn: PooledConnection) -> None:
+            if len(idle) < self.max_idle_per_key:
+                idle.append(conn)
+            else:
+                conn.close_connection()
+        return release
+
+    @staticmethod
+    def _connect(db_path: str, profile: PragmaProfile) -> PooledConnection:
+        conn = sqlite3.connect(
+            db_path,
+            factory=PooledConnection,
+            cached_statements=profile.cached_statements,
+        )
+        if profile.row_factory is not None:
+            conn.row_factory = profile.row_factory
+        for pragma in profile.pragmas:
+            conn.execute(pragma)
+        return conn
+
+    def _record(self, key: Tuple[str, str], wait_s: float, reused: bool) -> None:
+        wait_ms = wait_s * 1000.0
+        with self._stats_lock:
+            stats = self._stats.setdefault(key, {
+                'acquires': 0, 'connects': 0, 'reuses': 0,
+                'wait_ms_total': 0.0, 'wait_ms_max': 0.0,
+            })
+            stats['acquires'] += 1
+            stats['reuses' if reused else 'connects'] += 1
+            stats['wait_ms_total'] += wait_ms
+            stats['wait_ms_max'] = max(stats['wait_ms_max'], wait_ms)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Métricas por "db_path|perfil": acquires, connects, reuses,
+        wait_ms_total, wait_ms_max e wait_ms_avg (tempo gasto em acquire,
+        incluindo connect + PRAGMAs quando não há conexão ociosa).
+        """
+        with self._stats_lock:
+            report = {}
+            for (db_path, profile), stats in self._stats.items():
+                row = dict(stats)
+                row['wait_ms_avg'] = row['wait_ms_total'] / row['acquires']
+                report[f"{db_path}|{profile}"] = row
+            return report
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._stats.clear()
+
+    def close_idle(self) -> int:
+        """Fecha as conexões ociosas da thread atual. Retorna quantas."""
+        closed = 0
+        for idle in getattr(self._local, 'idle', {}).values():
+            while idle:
+                idle.pop().close_connection()
+                closed += 1
+        return closed
+
+
+# Pool compartilhado pelo processo
+SQLITE_POOL = SQLiteConnectionPool()
@@ -4,7 +4,11 @@ Pacote de indicadores técnicos e SMC.
 
 from .technical import TechnicalIndicators
 from .smc import SmartMoneyConcepts
+from .smc_incremental import IncrementalSMC, IncrementalSMCRegistry
 from .multi_timeframe import MultiTimeframeAnalysis
 from .features import FeatureEngineer
 
-__all__ = ['TechnicalIndicators', 'SmartMoneyConcepts', 'MultiTimeframeAnalysis', 'FeatureEngineer']
+__all__ = [
+    'TechnicalIndicators', 'SmartMoneyConcepts', 'IncrementalSMC', 'IncrementalSMCRegistry',
+    'MultiTimeframeAnalysis', 'FeatureEngineer',
+]
@@ -4,10 +4,12 @@ Constrói vetor de observação de ~104 features normalizadas.
 """
 
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 import numpy as np
 import pandas as pd
 
+from .technical import TechnicalIndicators
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,6 +19,10 @@ class FeatureEngineer:
     ~104 features normalizadas entre [-1, 1] ou [0, 1].
     """
 
+    # Posição do bloco 9 (features de posição) no vetor de 104 features;
+    # blocos 1-8 (60 features) dependem apenas dos dados de mercado
+    POSITION_FEATURES = slice(60, 65)
+
     @staticmethod
     def _safe_get(d: dict, key: str, default=0.0):
         """
@@ -73,12 +79,27 @@ class FeatureEngineer:
             return np.full_like(values, 0.5)
         return (values - min_val) / (max_val - min_val)
 
+    @staticmethod
+    def as_indicator_frame(
+        data: Optional[Union[pd.DataFrame, np.ndarray]]
+    ) -> Optional[pd.DataFrame]:
+        """
+        Normaliza a entrada de um timeframe para DataFrame com indicadores.
+
+        Arrays (N, 5) [open, high, low, close, volume] — o formato de
+        ParquetCache.get_cached_data_as_arrays — passam pelo motor colunar
+        de TechnicalIndicators. DataFrames e None são retornados como estão.
+        """
+        if isinstance(data, np.ndarray):
+            return TechnicalIndicators.calculate_all_matrix(data)
+        return data
+
     @staticmethod
     def build_observation(
         symbol: str,
-        h1_data: Optional[pd.DataFrame],
-        h4_data: Optional[pd.DataFrame],
-        d1_data: Optional[pd.DataFrame],
+        h1_data: Optional[Union[pd.DataFrame, np.ndarray]],
+        h4_data: Optional[Union[pd.DataFrame, np.ndarray]],
+        d1_data: Optional[Union[pd.DataFrame, np.ndarray]],
         sentiment: Optional[Dict[str, Any]],
         macro: Optional[Dict[str, Any]],
         smc: Optional[Dict[str, Any]],
@@ -90,9 +111,9 @@ class FeatureEngineer:
 
         Args:
             symbol: Símbolo
-            h1_data: DataFrame H1
-            h4_data: DataFrame H4
-            d1_data: DataFrame D1
+            h1_data: DataFrame H1 (ou array OHLCV (N, 5), ver as_indicator_frame)
+            h4_data: DataFrame H4 (ou array OHLCV (N, 5))
+            d1_data: DataFrame D1 (ou array OHLCV (N, 5))
             sentiment: Dados de sentimento
             macro: Dados macro
             smc: Estruturas SMC
@@ -106,6 +127,10 @@ class FeatureEngineer:
         Returns:
             Array numpy de 104 features normalizadas
         """
+        h1_data = FeatureEngineer.as_indicator_frame(h1_data)
+        h4_data = FeatureEngineer.as_indicator_frame(h4_data)
+        d1_data = FeatureEngineer.as_indicator_frame(d1_data)
+
         features = []
 
         # --- BLOCO 1: Preço (11 features) ---
@@ -438,28 +463,7 @@ class FeatureEngineer:
         features.extend([d1_bias_score, regime_score])
 
         # --- BLOCO 9: Posição (5 features) ---
-        if position_state and position_state.get('has_position', False):
-            # Direção (1 long, -1 short, 0 flat)
-            direction = 1.0 if position_state.get('direction') == 'LONG' else -1.0
-            features.append(direction)
-
-            # PnL %
-            pnl_pct = FeatureEngineer._safe_get(position_state, 'pnl_pct', 0)
-            features.append(np.clip(pnl_pct / 10, -1, 1))
-
-            # Tempo na posição (normalizado 0-1, máx 100 horas)
-            time_in_pos = FeatureEngineer._safe_get(position_state, 'time_in_position_hours', 0)
-            features.append(min(time_in_pos / 100, 1.0))
-
-            # Distância do stop
-            stop_distance = FeatureEngineer._safe_get(position_state, 'stop_distance_pct', 2)
-            features.append(min(stop_distance / 5, 1.0))
-
-            # Distância do TP
-            tp_distance = FeatureEngineer._safe_get(position_state, 'tp_distance_pct', 6)
-            features.append(min(tp_distance / 10, 1.0))
-        else:
-            features.extend([0.0] * 5)
+        features.extend(FeatureEngineer.position_features(position_state))
 
         # Garantir exatamente 104 features
         if len(features) < 104:
@@ -477,6 +481,47 @@ class FeatureEngineer:
 
         return observation
 
+    @staticmethod
+    def position_features(position_state: Optional[Dict[str, Any]]) -> List[float]:
+        """
+        Bloco 9 da observação (5 features de posição).
+
+        Único bloco que depende das ações do agente; ocupa
+        POSITION_FEATURES no vetor de build_observation.
+
+        Args:
+            position_state: Estado da posição atual (None ou sem posição -> zeros)
+
+        Returns:
+            Lista com 5 features
+        """
+        if not (position_state and position_state.get('has_position', False)):
+            return [0.0] * 5
+
+        features = []
+
+        # Direção (1 long, -1 short, 0 flat)
+        direction = 1.0 if position_state.get('direction') == 'LONG' else -1.0
+        features.append(direction)
+
+        # PnL %
+        pnl_pct = FeatureEngineer._safe_get(position_state, 'pnl_pct', 0)
+        features.append(np.clip(pnl_pct / 10, -1, 1))
+
+        # Tempo na posição (normalizado 0-1, máx 100 horas)
+        time_in_pos = FeatureEngineer._safe_get(position_state, 'time_in_position_hours', 0)
+        features.append(min(time_in_pos / 100, 1.0))
+
+        # Distância do stop
+        stop_distance = FeatureEngineer._safe_get(position_state, 'stop_distance_pct', 2)
+        features.append(min(stop_distance / 5, 1.0))
+
+        # Distância do TP
+        tp_distance = FeatureEngineer._safe_get(position_state, 'tp_distance_pct', 6)
+        features.append(min(tp_distance / 10, 1.0))
+
+        return features
+
     @staticmethod
     def get_feature_names() -> List[str]:
         """
@@ -5,10 +5,11 @@ Inclui: Swing Points, BOS, CHoCH, Order Blocks, FVGs, Liquidity, Premium/Discoun
 
 import logging
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 from enum import Enum
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +63,60 @@ class SwingPoint:
     index: int
 
 
+# Códigos inteiros de SwingType usados na representação colunar
+SWING_CODE_HH = 0
+SWING_CODE_HL = 1
+SWING_CODE_LH = 2
+SWING_CODE_LL = 3
+
+_SWING_TYPES_BY_CODE = (SwingType.HH, SwingType.HL, SwingType.LH, SwingType.LL)
+_SWING_CODES_BY_TYPE = {swing_type: code for code, swing_type in enumerate(_SWING_TYPES_BY_CODE)}
+
+
+@dataclass
+class SwingArrays:
+    """Swing points em formato colunar (arrays paralelos ordenados por índice)."""
+    index: np.ndarray      # int64
+    timestamp: np.ndarray  # int64
+    price: np.ndarray      # float64
+    type: np.ndarray       # int8 (SWING_CODE_*)
+
+    def __len__(self) -> int:
+        return int(self.index.shape[0])
+
+    @property
+    def is_high(self) -> np.ndarray:
+        """Máscara dos swing highs (HH/LH)."""
+        return (self.type == SWING_CODE_HH) | (self.type == SWING_CODE_LH)
+
+    def to_swing_points(self) -> List[SwingPoint]:
+        """Converte para a lista de SwingPoint equivalente."""
+        return [
+            SwingPoint(
+                timestamp=timestamp,
+                price=price,
+                type=_SWING_TYPES_BY_CODE[code],
+                index=index,
+            )
+            for index, timestamp, price, code in zip(
+                self.index.tolist(),
+                self.timestamp.tolist(),
+                self.price.tolist(),
+                self.type.tolist(),
+            )
+        ]
+
+    @classmethod
+    def from_swing_points(cls, swings: List[SwingPoint]) -> 'SwingArrays':
+        """Constrói a representação colunar a partir de SwingPoints."""
+        return cls(
+            index=np.array([s.index for s in swings], dtype=np.int64),
+            timestamp=np.array([s.timestamp for s in swings], dtype=np.int64),
+            price=np.array([s.price for s in swings], dtype=np.float64),
+            type=np.array([_SWING_CODES_BY_TYPE[s.type] for s in swings], dtype=np.int8),
+        )
+
+
 @dataclass
 class MarketStructure:
     """Estrutura de mercado."""
@@ -155,71 +210,91 @@ class SmartMoneyConcepts:
     """
 
     @staticmethod
-    def detect_swing_points(df: pd.DataFrame, lookback: int = 5) -> List[SwingPoint]:
+    def _fractal_mask(values: np.ndarray, lookback: int, highs: bool) -> np.ndarray:
         """
-        Detecta swing highs e lows usando fractals.
+        Marca os centros de janela que são fractais estritos.
+
+        Usa uma view strided (n - 2*lookback, 2*lookback + 1) sobre os
+        valores; um centro é fractal se nenhum vizinho o iguala ou supera
+        (highs) / iguala ou fica abaixo (lows). Comparações com NaN são
+        falsas, preservando a semântica do loop original.
+
+        Returns:
+            Máscara booleana alinhada aos índices lookback..n-lookback-1
+        """
+        window = 2 * lookback + 1
+        if values.shape[0] < window:
+            return np.zeros(0, dtype=bool)
+
+        windows = sliding_window_view(values, window)
+        center = windows[:, lookback][:, None]
+        beaten = windows >= center if highs else windows <= center
+        beaten[:, lookback] = False
+        return ~beaten.any(axis=1)
+
+    @staticmethod
+    def detect_swing_point_arrays(df: pd.DataFrame, lookback: int = 5) -> SwingArrays:
+        """
+        Detecta swing highs e lows (fractals) de forma vetorizada.
+
+        Mesma semântica de detect_swing_points, mas devolve arrays
+        paralelos em vez de dataclasses.
 
         Args:
             df: DataFrame com 'high', 'low', 'timestamp'
             lookback: Número de velas para cada lado do fractal
 
         Returns:
-            Lista de SwingPoints
+            SwingArrays ordenado por índice (swing high antes do low no mesmo índice)
         """
-        swings = []
-
-        for i in range(lookback, len(df) - lookback):
-            # Swing High: high[i] > todos os highs ao redor
-            is_swing_high = True
-            for j in range(i - lookback, i + lookback + 1):
-                if j != i and df['high'].iloc[j] >= df['high'].iloc[i]:
-                    is_swing_high = False
-                    break
+        highs = df['high'].to_numpy(dtype=np.float64)
+        lows = df['low'].to_numpy(dtype=np.float64)
 
-            if is_swing_high:
-                # Determinar tipo de swing high
-                if len(swings) > 0 and swings[-1].price < df['high'].iloc[i]:
-                    swing_type = SwingType.HH
-                elif len(swings) > 0:
-                    swing_type = SwingType.LH
-                else:
-                    swing_type = SwingType.HH
+        high_idx = np.flatnonzero(SmartMoneyConcepts._fractal_mask(highs, lookback, True)) + lookback
+        low_idx = np.flatnonzero(SmartMoneyConcepts._fractal_mask(lows, lookback, False)) + lookback
 
-                swings.append(SwingPoint(
-                    timestamp=int(df['timestamp'].iloc[i]),
-                    price=float(df['high'].iloc[i]),
-                    type=swing_type,
-                    index=i
-                ))
+        index = np.concatenate([high_idx, low_idx]).astype(np.int64)
+        is_high = np.concatenate([
+            np.ones(high_idx.shape[0], dtype=bool),
+            np.zeros(low_idx.shape[0], dtype=bool),
+        ])
+        # Ordena por índice; no mesmo índice o swing high vem primeiro
+        order = np.lexsort((~is_high, index))
+        index = index[order]
+        is_high = is_high[order]
 
-            # Swing Low: low[i] < todos os lows ao redor
-            is_swing_low = True
-            for j in range(i - lookback, i + lookback + 1):
-                if j != i and df['low'].iloc[j] <= df['low'].iloc[i]:
-                    is_swing_low = False
-                    break
+        price = np.where(is_high, highs[index], lows[index])
 
-            if is_swing_low:
-                # Determinar tipo de swing low
-                if len(swings) > 0 and swings[-1].price > df['low'].iloc[i]:
-                    swing_type = SwingType.LL
-                elif len(swings) > 0:
-                    swing_type = SwingType.HL
-                else:
-                    swing_type = SwingType.LL
+        # Classificação HH/LH/HL/LL relativa ao swing imediatamente anterior
+        prev_price = np.empty_like(price)
+        prev_price[1:] = price[:-1]
+        is_first = np.zeros(price.shape[0], dtype=bool)
+        is_first[:1] = True
 
-                swings.append(SwingPoint(
-                    timestamp=int(df['timestamp'].iloc[i]),
-                    price=float(df['low'].iloc[i]),
-                    type=swing_type,
-                    index=i
-                ))
+        swing_type = np.where(
+            is_high,
+            np.where(is_first | (prev_price < price), SWING_CODE_HH, SWING_CODE_LH),
+            np.where(is_first | (prev_price > price), SWING_CODE_LL, SWING_CODE_HL),
+        ).astype(np.int8)
+
+        timestamp = np.asarray(df['timestamp'].to_numpy()[index]).astype(np.int64)
+
+        logger.debug(f"Detected {index.shape[0]} swing points")
+        return SwingArrays(index=index, timestamp=timestamp, price=price, type=swing_type)
+
+    @staticmethod
+    def detect_swing_points(df: pd.DataFrame, lookback: int = 5) -> List[SwingPoint]:
+        """
+        Detecta swing highs e lows usando fractals.
 
-        # Ordenar por índice
-        swings.sort(key=lambda x: x.index)
+        Args:
+            df: DataFrame com 'high', 'low', 'timestamp'
+            lookback: Número de velas para cada lado do fractal
 
-        logger.debug(f"Detected {len(swings)} swing points")
-        return swings
+        Returns:
+            Lista de SwingPoints
+        """
+        return SmartMoneyConcepts.detect_swing_point_arrays(df, lookback).to_swing_points()
 
     @staticmethod
     def detect_market_structure(swings: List[SwingPoint]) -> MarketStructure:
@@ -263,13 +338,13 @@ class SmartMoneyConcepts:
         )
 
     @staticmethod
-    def detect_bos(df: pd.DataFrame, swings: List[SwingPoint]) -> List[BOS]:
+    def detect_bos(df: pd.DataFrame, swings: Union[List[SwingPoint], SwingArrays]) -> List[BOS]:
         """
         Detecta Break of Structure.
 
         Args:
             df: DataFrame com OHLC
-            swings: Lista de swing points
+            swings: Lista de swing points ou SwingArrays
 
         Returns:
             Lista de BOS
@@ -279,6 +354,27 @@ class SmartMoneyConcepts:
         if len(swings) < 3:
             return bos_list
 
+        if isinstance(swings, SwingArrays):
+            is_high = swings.is_high
+            current_high = is_high[2:]
+            prev_prev_high = is_high[:-2]
+            current_price = swings.price[2:]
+            prev_prev_price = swings.price[:-2]
+
+            bullish = current_high & prev_prev_high & (current_price > prev_prev_price)
+            bearish = ~current_high & ~prev_prev_high & (current_price < prev_prev_price)
+
+            for pos in (np.flatnonzero(bullish | bearish) + 2).tolist():
+                bos_list.append(BOS(
+                    timestamp=int(swings.timestamp[pos]),
+                    price=float(swings.price[pos]),
+                    direction="bullish" if is_high[pos] else "bearish",
+                    index=int(swings.index[pos])
+                ))
+
+            logger.debug(f"Detected {len(bos_list)} BOS")
+            return bos_list
+
         for i in range(2, len(swings)):
             current = swings[i]
             prev = swings[i-1]
@@ -312,13 +408,13 @@ class SmartMoneyConcepts:
         return bos_list
 
     @staticmethod
-    def detect_choch(df: pd.DataFrame, swings: List[SwingPoint]) -> List[CHoCH]:
+    def detect_choch(df: pd.DataFrame, swings: Union[List[SwingPoint], SwingArrays]) -> List[CHoCH]:
         """
         Detecta Change of Character.
 
         Args:
             df: DataFrame com OHLC
-            swings: Lista de swing points
+            swings: Lista de swing points ou SwingArrays
 
         Returns:
             Lista de CHoCH
@@ -328,6 +424,24 @@ class SmartMoneyConcepts:
         if len(swings) < 3:
             return choch_list
 
+        if isinstance(swings, SwingArrays):
+            current = swings.type[2:]
+            prev = swings.type[1:-1]
+
+            bullish = (prev == SWING_CODE_LL) & (current == SWING_CODE_HL)
+            bearish = (prev == SWING_CODE_HH) & (current == SWING_CODE_LH)
+
+            for pos in (np.flatnonzero(bullish | bearish) + 2).tolist():
+                choch_list.append(CHoCH(
+                    timestamp=int(swings.timestamp[pos]),
+                    price=float(swings.price[pos]),
+                    direction="bullish" if swings.type[pos] == SWING_CODE_HL else "bearish",
+                    index=int(swings.index[pos])
+                ))
+
+            logger.debug(f"Detected {len(choch_list)} CHoCH")
+            return choch_list
+
         for i in range(2, len(swings)):
             current = swings[i]
             prev = swings[i-1]
@@ -746,15 +860,20 @@ class SmartMoneyConcepts:
             return {}
 
         # Detect swings se não fornecidos
+        # (BOS/CHoCH consomem a forma colunar diretamente)
+        swing_source: Union[List[SwingPoint], SwingArrays]
         if swings is None:
-            swings = cls.detect_swing_points(df)
+            swing_source = cls.detect_swing_point_arrays(df)
+            swings = swing_source.to_swing_points()
+        else:
+            swing_source = swings
 
         # Market structure
         structure = cls.detect_market_structure(swings)
 
         # BOS e CHoCH
-        bos_list = cls.detect_bos(df, swings)
-        choch_list = cls.detect_choch(df, swings)
+        bos_list = cls.detect_bos(df, swing_source)
+        choch_list = cls.detect_choch(df, swing_source)
 
         # Order Blocks
         order_blocks = cls.detect_order_blocks(df, swings, bos_list)
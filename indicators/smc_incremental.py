@@ -0,0 +1,688 @@
+"""
+Smart Money Concepts incremental (streaming).
+
+Mantém o estado de estrutura de uma série (symbol, timeframe) e o atualiza
+a cada candle fechado, em vez de recalcular todo o histórico como
+SmartMoneyConcepts.calculate_all_smc.
+
+Equivalência com o pipeline batch:
+- Swings, BOS, CHoCH, FVGs e Premium/Discount são idênticos aos de
+  calculate_all_smc sobre o mesmo histórico.
+- Order Blocks usam a SMA de volume do histórico contínuo; window(n, frame)
+  os recalcula sobre o recorte para reproduzir o batch (ver window).
+- Status de zonas (TESTED/MITIGATED/FILLED) é atualizado candle a candle
+  quando track_zone_status=True; o batch sempre devolve FRESH/OPEN.
+- Liquidity sweeps são causais: um nível só é varrido por candles que
+  fecharam depois de o nível existir (o batch aplica os níveis finais a
+  todo o histórico).
+
+O histórico de estruturas (swings, BOS, CHoCH, sweeps e grupos de
+liquidez) é limitado aos últimos max_history candles, então o estado de um
+processo de longa duração não cresce sem limite. window(n) devolve o estado
+recortado aos últimos n candles com a semântica do batch sobre esse recorte
+e índices relativos a ele.
+"""
+
+import logging
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Any, Deque, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .smc import (
+    BOS,
+    CHoCH,
+    FairValueGap,
+    LiquidityLevel,
+    LiquiditySweep,
+    LiquidityType,
+    OrderBlock,
+    SmartMoneyConcepts,
+    SwingPoint,
+    SwingType,
+    ZoneStatus,
+)
+
+logger = logging.getLogger(__name__)
+
+# Alcance da busca retroativa de Order Blocks (igual a detect_order_blocks)
+_OB_SEARCH_WINDOW = 20
+
+# Mínimo de candles para o snapshot (igual a calculate_all_smc)
+_MIN_CANDLES = 10
+
+_HIGH_TYPES = (SwingType.HH, SwingType.LH)
+_LOW_TYPES = (SwingType.LL, SwingType.HL)
+
+# Candles de histórico de estruturas mantidos por série
+_DEFAULT_MAX_HISTORY = 5_000
+
+
+@dataclass
+class SMCDelta:
+    """Mudanças produzidas por um ou mais candles fechados."""
+    new_swings: List[SwingPoint] = field(default_factory=list)
+    new_bos: List[BOS] = field(default_factory=list)
+    new_choch: List[CHoCH] = field(default_factory=list)
+    new_order_blocks: List[OrderBlock] = field(default_factory=list)
+    mitigated_order_blocks: List[OrderBlock] = field(default_factory=list)
+    new_fvgs: List[FairValueGap] = field(default_factory=list)
+    filled_fvgs: List[FairValueGap] = field(default_factory=list)
+    new_liquidity_levels: List[LiquidityLevel] = field(default_factory=list)
+    new_sweeps: List[LiquiditySweep] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not any(getattr(self, name) for name in self.__dataclass_fields__)
+
+    def merge(self, other: 'SMCDelta') -> None:
+        """Acumula outro delta neste (ordem cronológica preservada)."""
+        for name in self.__dataclass_fields__:
+            getattr(self, name).extend(getattr(other, name))
+
+
+class _LiquidityGroup:
+    """Grupo de swings com preço similar (chave = preço do primeiro swing)."""
+
+    __slots__ = ("price", "touch_count", "is_high", "level", "index", "seq", "bucket")
+
+    def __init__(self, swing: SwingPoint, seq: int, bucket: int):
+        self.price = swing.price
+        self.touch_count = 1
+        self.is_high = swing.type in _HIGH_TYPES
+        self.level: Optional[LiquidityLevel] = None
+        self.index = swing.index
+        self.seq = seq
+        self.bucket = bucket
+
+
+def _since(items: Sequence[Any], min_index: int) -> List[Any]:
+    """Itens (ordenados por index) com index >= min_index."""
+    tail = []
+    for item in reversed(items):
+        if item.index < min_index:
+            break
+        tail.append(item)
+    tail.reverse()
+    return tail
+
+
+def _bos_choch(current: SwingPoint, prev: SwingPoint,
+               prev_prev: SwingPoint) -> Tuple[Optional[BOS], Optional[CHoCH]]:
+    """BOS e CHoCH do swing atual (mesmas regras de detect_bos/detect_choch)."""
+    bos = None
+    if (current.type in _HIGH_TYPES and prev_prev.type in _HIGH_TYPES
+            and current.price > prev_prev.price):
+        bos = BOS(timestamp=current.timestamp, price=current.price,
+                  direction="bullish", index=current.index)
+    elif (current.type in _LOW_TYPES and prev_prev.type in _LOW_TYPES
+            and current.price < prev_prev.price):
+        bos = BOS(timestamp=current.timestamp, price=current.price,
+                  direction="bearish", index=current.index)
+
+    choch = None
+    if prev.type == SwingType.LL and current.type == SwingType.HL:
+        choch = CHoCH(timestamp=current.timestamp, price=current.price,
+                      direction="bullish", index=current.index)
+    elif prev.type == SwingType.HH and current.type == SwingType.LH:
+        choch = CHoCH(timestamp=current.timestamp, price=current.price,
+                      direction="bearish", index=current.index)
+    return bos, choch
+
+
+class IncrementalSMC:
+    """
+    Estado SMC de uma série, atualizado por candle fechado.
+
+    O custo de update() é O(lookback) por candle, independente do tamanho do
+    histórico (a verificação de sweeps é linear nos níveis de liquidez ativos
+    e o agrupamento de liquidez consulta só os grupos de preço vizinho).
+    """
+
+    def __init__(self, lookback: int = 5, max_obs: int = 10, max_fvgs: int = 10,
+                 volume_lookback: int = 20, volume_threshold: float = 1.5,
+                 liquidity_tolerance_pct: float = 0.001,
+                 track_zone_status: bool = True,
+                 max_history: int = _DEFAULT_MAX_HISTORY):
+        """
+        Args:
+            lookback: Velas de cada lado do fractal (detect_swing_points)
+            max_obs: Máximo de Order Blocks mantidos
+            max_fvgs: Máximo de FVGs mantidos
+            volume_lookback: Período da SMA de volume dos Order Blocks
+            volume_threshold: Multiplicador da SMA de volume para validar OB
+            liquidity_tolerance_pct: Tolerância de agrupamento de liquidez
+            track_zone_status: Atualiza status de OBs/FVGs a cada candle
+            max_history: Candles de histórico mantidos para swings, BOS,
+                CHoCH, sweeps e grupos de liquidez
+        """
+        self.lookback = lookback
+        self.max_obs = max_obs
+        self.max_fvgs = max_fvgs
+        self.volume_lookback = volume_lookback
+        self.volume_threshold = volume_threshold
+        self.liquidity_tolerance_pct = liquidity_tolerance_pct
+        self.track_zone_status = track_zone_status
+        self.max_history = max(int(max_history), _MIN_CANDLES)
+
+        # (timestamp, open, high, low, close, volume, volume_sma)
+        history = max(2 * lookback + 1, lookback + _OB_SEARCH_WINDOW + 1, 3)
+        self._candles: Deque[Tuple[int, float, float, float, float, float, float]] = deque(maxlen=history)
+        self._volumes: Deque[float] = deque(maxlen=volume_lookback)
+
+        self.candle_count = 0
+        self.last_timestamp: Optional[int] = None
+        self.last_close: Optional[float] = None
+
+        self.swings: Deque[SwingPoint] = deque()
+        self.bos: Deque[BOS] = deque()
+        self.choch: Deque[CHoCH] = deque()
+        self.order_blocks: List[OrderBlock] = []
+        self.fvgs: List[FairValueGap] = []
+        self.liquidity_sweeps: Deque[LiquiditySweep] = deque()
+        # Grupos em ordem de criação + índice por faixa de preço (log)
+        self._liquidity_groups: Deque[_LiquidityGroup] = deque()
+        self._liquidity_buckets: Dict[int, List[_LiquidityGroup]] = {}
+        self._liquidity_seq = 0
+        self._bucket_width = math.log1p(liquidity_tolerance_pct) if liquidity_tolerance_pct > 0 else 0.0
+        self._active_levels: List[LiquidityLevel] = []
+        self._recent_highs: Deque[float] = deque(maxlen=3)
+        self._recent_lows: Deque[float] = deque(maxlen=3)
+
+    # ------------------------------------------------------------------
+    # Atualização
+    # ------------------------------------------------------------------
+
+    def update(self, candle: Mapping[str, Any]) -> SMCDelta:
+        """
+        Processa um candle fechado.
+
+        Candles com timestamp menor ou igual ao último processado são
+        ignorados (delta vazio), tornando update() idempotente.
+
+        Args:
+            candle: Mapping com timestamp, open, high, low, close e volume (opcional)
+
+        Returns:
+            SMCDelta com as estruturas criadas/invalidadas por este candle
+        """
+        delta = SMCDelta()
+        timestamp = int(candle['timestamp'])
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return delta
+
+        open_ = float(candle['open'])
+        high = float(candle['high'])
+        low = float(candle['low'])
+        close = float(candle['close'])
+        raw_volume = candle.get('volume')
+        volume = float(raw_volume) if raw_volume is not None else math.nan
+
+        self._volumes.append(volume)
+        if len(self._volumes) == self.volume_lookback:
+            volume_sma = math.fsum(self._volumes) / self.volume_lookback
+        else:
+            volume_sma = math.nan
+
+        index = self.candle_count
+        self._candles.append((timestamp, open_, high, low, close, volume, volume_sma))
+        self.candle_count += 1
+        self.last_timestamp = timestamp
+        self.last_close = close
+
+        if self.track_zone_status:
+            self._update_zone_status(close, high, low, delta)
+
+        self._detect_fvg(index, timestamp, high, low, delta)
+        self._detect_swings(delta)
+        if index >= 1:
+            self._detect_sweeps(index, timestamp, high, low, close, delta)
+        self._prune_history()
+
+        return delta
+
+    def sync(self, df: pd.DataFrame, skip_last: bool = False) -> SMCDelta:
+        """
+        Alimenta o estado com os candles de df ainda não processados.
+
+        Se df não se sobrepõe ao estado atual (janela posterior ao último
+        candle processado, ou histórico que retrocedeu), o estado é
+        reconstruído a partir de df.
+
+        Args:
+            df: DataFrame OHLCV ordenado por timestamp
+            skip_last: Ignora a última linha (candle ainda em formação)
+
+        Returns:
+            SMCDelta acumulado dos candles novos
+        """
+        delta = SMCDelta()
+        if skip_last:
+            df = df.iloc[:-1]
+        if df.empty:
+            return delta
+
+        timestamps = df['timestamp'].to_numpy()
+        first_ts = int(timestamps[0])
+        last_ts = int(timestamps[-1])
+        if self.last_timestamp is not None and (
+            first_ts > self.last_timestamp or last_ts < self.last_timestamp
+        ):
+            logger.debug("IncrementalSMC: janela sem sobreposição, reconstruindo estado")
+            self.reset()
+
+        start = 0
+        if self.last_timestamp is not None:
+            start = int((timestamps > self.last_timestamp).argmax()) if last_ts > self.last_timestamp else len(df)
+
+        has_volume = 'volume' in df.columns
+        columns = ['timestamp', 'open', 'high', 'low', 'close'] + (['volume'] if has_volume else [])
+        for row in df.iloc[start:][columns].itertuples(index=False, name=None):
+            candle = dict(zip(columns, row))
+            delta.merge(self.update(candle))
+
+        return delta
+
+    def reset(self) -> None:
+        """Descarta todo o estado acumulado."""
+        self.__init__(
+            lookback=self.lookback,
+            max_obs=self.max_obs,
+            max_fvgs=self.max_fvgs,
+            volume_lookback=self.volume_lookback,
+            volume_threshold=self.volume_threshold,
+            liquidity_tolerance_pct=self.liquidity_tolerance_pct,
+            track_zone_status=self.track_zone_status,
+            max_history=self.max_history,
+        )
+
+    # ------------------------------------------------------------------
+    # Snapshot
+    # ------------------------------------------------------------------
+
+    @property
+    def liquidity_levels(self) -> List[LiquidityLevel]:
+        """Níveis de liquidez (grupos com 2+ swings) em ordem de criação do grupo."""
+        return [group.level for group in self._liquidity_groups if group.level is not None]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Estado atual no mesmo formato de SmartMoneyConcepts.calculate_all_smc.
+
+        Returns:
+            Dicionário com todas as estruturas SMC (vazio se < 10 candles)
+        """
+        if self.candle_count < _MIN_CANDLES:
+            return {}
+
+        swings = list(self.swings)
+        premium_discount = None
+        if len(swings) >= 2 and self._recent_highs and self._recent_lows and self.last_close is not None:
+            premium_discount = SmartMoneyConcepts.calculate_premium_discount(
+                max(self._recent_highs), min(self._recent_lows), self.last_close
+            )
+
+        return {
+            'swings': swings,
+            'structure': SmartMoneyConcepts.detect_market_structure(swings),
+            'bos': list(self.bos),
+            'choch': list(self.choch),
+            'order_blocks': list(self.order_blocks),
+            'fvgs': list(self.fvgs),
+            'liquidity_levels': self.liquidity_levels,
+            'liquidity_sweeps': list(self.liquidity_sweeps),
+            'premium_discount': premium_discount,
+        }
+
+    def window(self, n_candles: int, frame: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """
+        Estado restrito aos últimos n_candles processados.
+
+        Equivale a calculate_all_smc sobre o mesmo recorte para swings,
+        estrutura, BOS, CHoCH, FVGs, níveis de liquidez e Premium/Discount
+        (o primeiro swing do recorte é reclassificado como no batch). Com
+        frame, os Order Blocks são recalculados por detect_order_blocks sobre
+        o recorte e ficam idênticos aos do batch; sem frame, vêm do estado
+        contínuo (SMA de volume completa, sem o aquecimento do recorte)
+        filtrados a ele. Sweeps são sempre os causais do estado contínuo.
+        Índices são relativos ao recorte (0 = primeiro candle).
+
+        Args:
+            n_candles: Tamanho do recorte (limitado a max_history)
+            frame: Candles OHLCV cujo último candle é o último processado
+
+        Returns:
+            Dicionário no formato de calculate_all_smc (vazio se < 10 candles)
+
+        Raises:
+            ValueError: Se o último candle de frame não for o último processado
+        """
+        n = min(int(n_candles), self.candle_count, self.max_history)
+        if n < _MIN_CANDLES:
+            return {}
+        start = self.candle_count - n
+        if frame is not None:
+            if len(frame) < n:
+                raise ValueError(f"frame tem {len(frame)} candles; recorte pede {n}")
+            last_ts = int(frame['timestamp'].iloc[-1])
+            if last_ts != self.last_timestamp:
+                raise ValueError(
+                    f"frame termina em {last_ts}, estado em {self.last_timestamp}"
+                )
+
+        swings: List[SwingPoint] = []
+        for swing in _since(self.swings, start + self.lookback):
+            is_high = swing.type in _HIGH_TYPES
+            if not swings:
+                swing_type = SwingType.HH if is_high else SwingType.LL
+            else:
+                swing_type = swing.type
+            swings.append(replace(swing, type=swing_type, index=swing.index - start))
+
+        bos_list: List[BOS] = []
+        choch_list: List[CHoCH] = []
+        for i in range(2, len(swings)):
+            bos, choch = _bos_choch(swings[i], swings[i - 1], swings[i - 2])
+            if bos is not None:
+                bos_list.append(bos)
+            if choch is not None:
+                choch_list.append(choch)
+
+        premium_discount = None
+        if len(swings) >= 2 and self.last_close is not None:
+            highs = [s.price for s in swings if s.type in _HIGH_TYPES]
+            lows = [s.price for s in swings if s.type in _LOW_TYPES]
+            if highs and lows:
+                premium_discount = SmartMoneyConcepts.calculate_premium_discount(
+                    max(highs[-3:]), min(lows[-3:]), self.last_close
+                )
+
+        if frame is not None:
+            order_blocks = SmartMoneyConcepts.detect_order_blocks(
+                frame.iloc[-n:], swings, bos_list, max_obs=self.max_obs,
+                lookback=self.volume_lookback, volume_threshold=self.volume_threshold,
+            )
+        else:
+            order_blocks = [replace(ob, index=ob.index - start)
+                            for ob in self.order_blocks if ob.index >= start]
+
+        return {
+            'swings': swings,
+            'structure': SmartMoneyConcepts.detect_market_structure(swings),
+            'bos': bos_list,
+            'choch': choch_list,
+            'order_blocks': order_blocks,
+            'fvgs': [replace(fvg, index=fvg.index - start)
+                     for fvg in _since(self.fvgs, start + 2)],
+            'liquidity_levels': SmartMoneyConcepts.detect_liquidity_levels(
+                swings, self.liquidity_tolerance_pct
+            ),
+            'liquidity_sweeps': [replace(sweep, index=sweep.index - start)
+                                 for sweep in _since(self.liquidity_sweeps, start)],
+            'premium_discount': premium_discount,
+        }
+
+    # ------------------------------------------------------------------
+    # Detectores por candle
+    # ------------------------------------------------------------------
+
+    def _candle_at(self, index: int) -> Tuple[int, float, float, float, float, float, float]:
+        return self._candles[index - (self.candle_count - len(self._candles))]
+
+    def _update_zone_status(self, close: float, high: float, low: float, delta: SMCDelta) -> None:
+        for ob in self.order_blocks:
+            if ob.status == ZoneStatus.MITIGATED:
+                continue
+            SmartMoneyConcepts.update_order_block_status(ob, close, high, low)
+            if ob.status == ZoneStatus.MITIGATED:
+                delta.mitigated_order_blocks.append(ob)
+
+        for fvg in self.fvgs:
+            if fvg.status == ZoneStatus.FILLED:
+                continue
+            SmartMoneyConcepts.update_fvg_status(fvg, close, high, low)
+            if fvg.status == ZoneStatus.FILLED:
+                delta.filled_fvgs.append(fvg)
+
+    def _detect_fvg(self, index: int, timestamp: int, high: float, low: float,
+                    delta: SMCDelta) -> None:
+        if index < 2:
+            return
+
+        _, _, high_2, low_2, _, _, _ = self._candle_at(index - 2)
+        if low > high_2:
+            fvg = FairValueGap(timestamp=timestamp, zone_high=low, zone_low=high_2,
+                               type="bullish", status=ZoneStatus.OPEN, index=index)
+        elif high < low_2:
+            fvg = FairValueGap(timestamp=timestamp, zone_high=low_2, zone_low=high,
+                               type="bearish", status=ZoneStatus.OPEN, index=index)
+        else:
+            return
+
+        self.fvgs.append(fvg)
+        if len(self.fvgs) > self.max_fvgs:
+            del self.fvgs[0]
+        delta.new_fvgs.append(fvg)
+
+    def _detect_swings(self, delta: SMCDelta) -> None:
+        lookback = self.lookback
+        center = self.candle_count - 1 - lookback
+        if center < lookback:
+            return
+
+        window = [self._candle_at(j) for j in range(center - lookback, center + lookback + 1)]
+        timestamp, _, center_high, center_low, _, _, _ = window[lookback]
+
+        is_swing_high = not any(
+            offset != lookback and candle[2] >= center_high
+            for offset, candle in enumerate(window)
+        )
+        if is_swing_high:
+            if self.swings and self.swings[-1].price < center_high:
+                swing_type = SwingType.HH
+            elif self.swings:
+                swing_type = SwingType.LH
+            else:
+                swing_type = SwingType.HH
+            self._add_swing(SwingPoint(timestamp=timestamp, price=center_high,
+                                       type=swing_type, index=center), delta)
+
+        is_swing_low = not any(
+            offset != lookback and candle[3] <= center_low
+            for offset, candle in enumerate(window)
+        )
+        if is_swing_low:
+            if self.swings and self.swings[-1].price > center_low:
+                swing_type = SwingType.LL
+            elif self.swings:
+                swing_type = SwingType.HL
+            else:
+                swing_type = SwingType.LL
+            self._add_swing(SwingPoint(timestamp=timestamp, price=center_low,
+                                       type=swing_type, index=center), delta)
+
+    def _add_swing(self, swing: SwingPoint, delta: SMCDelta) -> None:
+        self.swings.append(swing)
+        delta.new_swings.append(swing)
+
+        if swing.type in _HIGH_TYPES:
+            self._recent_highs.append(swing.price)
+        else:
+            self._recent_lows.append(swing.price)
+
+        self._detect_bos_choch(delta)
+        self._add_to_liquidity(swing, delta)
+
+    def _detect_bos_choch(self, delta: SMCDelta) -> None:
+        if len(self.swings) < 3:
+            return
+
+        bos, choch = _bos_choch(self.swings[-1], self.swings[-2], self.swings[-3])
+        if bos is not None:
+            self.bos.append(bos)
+            delta.new_bos.append(bos)
+            self._detect_order_block(bos, delta)
+
+        if choch is not None:
+            self.choch.append(choch)
+            delta.new_choch.append(choch)
+
+    def _detect_order_block(self, bos: BOS, delta: SMCDelta) -> None:
+        bos_idx = bos.index
+        if bos_idx < self.volume_lookback:
+            return
+
+        for i in range(bos_idx - 1, max(0, bos_idx - _OB_SEARCH_WINDOW), -1):
+            timestamp, open_, high, low, close, volume, vol_mean = self._candle_at(i)
+            if bos.direction == "bullish" and not close < open_:
+                continue
+            if bos.direction == "bearish" and not close > open_:
+                continue
+
+            if vol_mean > 0 and volume < vol_mean * self.volume_threshold:
+                continue
+
+            strength = 1.0
+            if vol_mean > 0:
+                strength = min(2.0, volume / (vol_mean * self.volume_threshold))
+
+            ob = OrderBlock(timestamp=timestamp, zone_high=high, zone_low=low,
+                            type=bos.direction, status=ZoneStatus.FRESH,
+                            strength=strength, index=i)
+            self.order_blocks.append(ob)
+            if len(self.order_blocks) > self.max_obs:
+                del self.order_blocks[0]
+            delta.new_order_blocks.append(ob)
+            return
+
+    def _price_bucket(self, price: float) -> int:
+        if price <= 0 or self._bucket_width <= 0:
+            return 0
+        return math.floor(math.log(price) / self._bucket_width)
+
+    def _add_to_liquidity(self, swing: SwingPoint, delta: SMCDelta) -> None:
+        # Preços dentro da tolerância caem no máximo 2 faixas de distância;
+        # entre os candidatos vale o grupo mais antigo, como no batch
+        bucket = self._price_bucket(swing.price)
+        group = None
+        for key in range(bucket - 2, bucket + 3):
+            for candidate in self._liquidity_buckets.get(key, ()):
+                if group is not None and candidate.seq > group.seq:
+                    continue
+                if abs(swing.price - candidate.price) / candidate.price < self.liquidity_tolerance_pct:
+                    group = candidate
+
+        if group is None:
+            group = _LiquidityGroup(swing, self._liquidity_seq, bucket)
+            self._liquidity_seq += 1
+            self._liquidity_groups.append(group)
+            self._liquidity_buckets.setdefault(bucket, []).append(group)
+            return
+
+        group.touch_count += 1
+        group.is_high = group.is_high or swing.type in _HIGH_TYPES
+        liq_type = LiquidityType.BSL if group.is_high else LiquidityType.SSL
+
+        if group.level is None:
+            group.level = LiquidityLevel(price=group.price, type=liq_type,
+                                         touch_count=group.touch_count, swept=False,
+                                         strength=group.touch_count / 2.0)
+            self._active_levels.append(group.level)
+            delta.new_liquidity_levels.append(group.level)
+        else:
+            group.level.type = liq_type
+            group.level.touch_count = group.touch_count
+            group.level.strength = group.touch_count / 2.0
+
+    def _detect_sweeps(self, index: int, timestamp: int, high: float, low: float,
+                       close: float, delta: SMCDelta) -> None:
+        if not self._active_levels:
+            return
+
+        for level in self._active_levels:
+            if level.type == LiquidityType.BSL:
+                if high > level.price and close < level.price:
+                    sweep = LiquiditySweep(timestamp=timestamp, level=level.price,
+                                           direction="up", index=index)
+                else:
+                    continue
+            else:
+                if low < level.price and close > level.price:
+                    sweep = LiquiditySweep(timestamp=timestamp, level=level.price,
+                                           direction="down", index=index)
+                else:
+                    continue
+            level.swept = True
+            self.liquidity_sweeps.append(sweep)
+            delta.new_sweeps.append(sweep)
+
+        self._active_levels = [level for level in self._active_levels if not level.swept]
+
+    def _prune_history(self) -> None:
+        """Descarta estruturas anteriores aos últimos max_history candles."""
+        cutoff = self.candle_count - self.max_history
+        if cutoff <= 0:
+            return
+        for items in (self.swings, self.bos, self.choch, self.liquidity_sweeps):
+            while items and items[0].index < cutoff:
+                items.popleft()
+
+        groups = self._liquidity_groups
+        while groups and groups[0].index < cutoff:
+            group = groups.popleft()
+            bucket = self._liquidity_buckets[group.bucket]
+            bucket.remove(group)
+            if not bucket:
+                del self._liquidity_buckets[group.bucket]
+            if group.level is not None and not group.level.swept:
+                self._active_levels.remove(group.level)
+
+
+class IncrementalSMCRegistry:
+    """Estados IncrementalSMC por (symbol, timeframe), thread-safe."""
+
+    def __init__(self, **smc_kwargs: Any):
+        """
+        Args:
+            **smc_kwargs: Parâmetros repassados a cada IncrementalSMC criado
+        """
+        self._smc_kwargs = smc_kwargs
+        self._states: Dict[Tuple[str, str], IncrementalSMC] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(symbol: str, timeframe: str) -> Tuple[str, str]:
+        return str(symbol).upper(), str(timeframe).upper()
+
+    def get(self, symbol: str, timeframe: str) -> IncrementalSMC:
+        """Retorna (criando se preciso) o estado da série."""
+        key = self._key(symbol, timeframe)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = IncrementalSMC(**self._smc_kwargs)
+                self._states[key] = state
+            return state
+
+    def sync(self, symbol: str, timeframe: str, df: pd.DataFrame,
+             skip_last: bool = False) -> IncrementalSMC:
+        """Sincroniza o estado da série com df e o retorna."""
+        state = self.get(symbol, timeframe)
+        state.sync(df, skip_last=skip_last)
+        return state
+
+    def reset(self, symbol: Optional[str] = None, timeframe: Optional[str] = None) -> None:
+        """Descarta estados (todos ou recorte por símbolo/timeframe)."""
+        with self._lock:
+            if symbol is None and timeframe is None:
+                self._states.clear()
+                return
+            for key in list(self._states):
+                if symbol is not None and key[0] != str(symbol).upper():
+                    continue
+                if timeframe is not None and key[1] != str(timeframe).upper():
+                    continue
+                del self._states[key]
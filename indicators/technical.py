@@ -4,12 +4,32 @@ Inclui EMAs, RSI, MACD, Bollinger Bands, Volume Profile, OBV, ATR, ADX.
 """
 
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 logger = logging.getLogger(__name__)
 
+# Bordas de preço do Volume Profile (49 faixas por janela)
+_VP_EDGES = 50
+
+EMA_PERIODS = (17, 34, 72, 144, 305, 610)
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Colunas float do motor colunar, na ordem de calculate_all
+_FLOAT_INDICATOR_COLUMNS = tuple(f'ema_{period}' for period in EMA_PERIODS) + (
+    'rsi_14',
+    'macd_line', 'macd_signal', 'macd_histogram',
+    'bb_upper', 'bb_middle', 'bb_lower', 'bb_bandwidth', 'bb_percent_b',
+    'vp_poc', 'vp_vah', 'vp_val',
+    'obv',
+    'atr_14',
+    'adx_14', 'di_plus', 'di_minus',
+)
+INDICATOR_COLUMNS = _FLOAT_INDICATOR_COLUMNS + ('ema_alignment_score',)
+_BOLLINGER_COLUMNS = ('bb_upper', 'bb_middle', 'bb_lower', 'bb_bandwidth', 'bb_percent_b')
+
 
 class TechnicalIndicators:
     """
@@ -29,10 +49,17 @@ class TechnicalIndicators:
         Returns:
             Série com valores da EMA
         """
-        if len(data) < period:
-            return pd.Series([np.nan] * len(data), index=data.index)
+        return pd.Series(
+            TechnicalIndicators._ema_array(data.to_numpy(dtype=np.float64), period),
+            index=data.index, name=data.name,
+        )
 
-        return data.ewm(span=period, adjust=False).mean()
+    @staticmethod
+    def _ema_array(values: np.ndarray, period: int) -> np.ndarray:
+        """EMA sobre array (NaN com menos de period valores)."""
+        if len(values) < period:
+            return np.full(len(values), np.nan)
+        return pd.Series(values, copy=False).ewm(span=period, adjust=False).mean().to_numpy()
 
     @staticmethod
     def calculate_rsi(data: pd.Series, period: int = 14) -> pd.Series:
@@ -46,17 +73,26 @@ class TechnicalIndicators:
         Returns:
             Série com valores do RSI (0-100)
         """
-        if len(data) < period + 1:
-            return pd.Series([np.nan] * len(data), index=data.index)
+        return pd.Series(
+            TechnicalIndicators._rsi_array(data.to_numpy(dtype=np.float64), period),
+            index=data.index, name=data.name,
+        )
 
-        delta = data.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-
-        return rsi
+    @staticmethod
+    def _rsi_array(close: np.ndarray, period: int = 14) -> np.ndarray:
+        """RSI sobre array (NaN com menos de period + 1 valores)."""
+        n = len(close)
+        if n < period + 1:
+            return np.full(n, np.nan)
+
+        delta = np.empty(n)
+        delta[:1] = np.nan
+        delta[1:] = close[1:] - close[:-1]
+        # Delta NaN (primeiro candle) conta como zero, como no where do pandas
+        gain = pd.Series(np.where(delta > 0, delta, 0.0)).rolling(window=period).mean().to_numpy()
+        loss = pd.Series(-np.where(delta < 0, delta, 0.0)).rolling(window=period).mean().to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return 100 - (100 / (1 + gain / loss))
 
     @staticmethod
     def calculate_macd(data: pd.Series, fast: int = 12, slow: int = 26,
@@ -73,24 +109,28 @@ class TechnicalIndicators:
         Returns:
             DataFrame com 'macd_line', 'macd_signal', 'macd_histogram'
         """
-        if len(data) < slow:
-            return pd.DataFrame({
-                'macd_line': [np.nan] * len(data),
-                'macd_signal': [np.nan] * len(data),
-                'macd_histogram': [np.nan] * len(data)
-            }, index=data.index)
-
-        ema_fast = data.ewm(span=fast, adjust=False).mean()
-        ema_slow = data.ewm(span=slow, adjust=False).mean()
-        macd_line = ema_fast - ema_slow
-        macd_signal = macd_line.ewm(span=signal, adjust=False).mean()
-        macd_histogram = macd_line - macd_signal
-
+        macd_line, macd_signal, macd_histogram = TechnicalIndicators._macd_arrays(
+            data.to_numpy(dtype=np.float64), fast, slow, signal
+        )
         return pd.DataFrame({
             'macd_line': macd_line,
             'macd_signal': macd_signal,
             'macd_histogram': macd_histogram
-        })
+        }, index=data.index)
+
+    @staticmethod
+    def _macd_arrays(close: np.ndarray, fast: int = 12, slow: int = 26,
+                     signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(linha, sinal, histograma) do MACD; NaN com menos de slow valores."""
+        n = len(close)
+        if n < slow:
+            return np.full(n, np.nan), np.full(n, np.nan), np.full(n, np.nan)
+
+        close_s = pd.Series(close, copy=False)
+        macd_line = (close_s.ewm(span=fast, adjust=False).mean().to_numpy()
+                     - close_s.ewm(span=slow, adjust=False).mean().to_numpy())
+        macd_signal = pd.Series(macd_line).ewm(span=signal, adjust=False).mean().to_numpy()
+        return macd_line, macd_signal, macd_line - macd_signal
 
     @staticmethod
     def calculate_bollinger(data: pd.Series, period: int = 20,
@@ -106,35 +146,37 @@ class TechnicalIndicators:
         Returns:
             DataFrame com 'bb_upper', 'bb_middle', 'bb_lower', 'bb_bandwidth', 'bb_percent_b'
         """
-        if len(data) < period:
-            return pd.DataFrame({
-                'bb_upper': [np.nan] * len(data),
-                'bb_middle': [np.nan] * len(data),
-                'bb_lower': [np.nan] * len(data),
-                'bb_bandwidth': [np.nan] * len(data),
-                'bb_percent_b': [np.nan] * len(data)
-            }, index=data.index)
-
-        bb_middle = data.rolling(window=period).mean()
-        bb_std = data.rolling(window=period).std()
+        bands = TechnicalIndicators._bollinger_arrays(data.to_numpy(dtype=np.float64), period, std_dev)
+        return pd.DataFrame(dict(zip(_BOLLINGER_COLUMNS, bands)), index=data.index)
+
+    @staticmethod
+    def _bollinger_arrays(close: np.ndarray, period: int = 20,
+                          std_dev: float = 2.0) -> Tuple[np.ndarray, ...]:
+        """Bandas na ordem de _BOLLINGER_COLUMNS; NaN com menos de period valores."""
+        n = len(close)
+        if n < period:
+            return tuple(np.full(n, np.nan) for _ in _BOLLINGER_COLUMNS)
+
+        rolling = pd.Series(close, copy=False).rolling(window=period)
+        bb_middle = rolling.mean().to_numpy()
+        bb_std = rolling.std().to_numpy()
         bb_upper = bb_middle + (bb_std * std_dev)
         bb_lower = bb_middle - (bb_std * std_dev)
-        bb_bandwidth = (bb_upper - bb_lower) / bb_middle
-        bb_percent_b = (data - bb_lower) / (bb_upper - bb_lower)
-
-        return pd.DataFrame({
-            'bb_upper': bb_upper,
-            'bb_middle': bb_middle,
-            'bb_lower': bb_lower,
-            'bb_bandwidth': bb_bandwidth,
-            'bb_percent_b': bb_percent_b
-        })
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bb_bandwidth = (bb_upper - bb_lower) / bb_middle
+            bb_percent_b = (close - bb_lower) / (bb_upper - bb_lower)
+        return bb_upper, bb_middle, bb_lower, bb_bandwidth, bb_percent_b
 
     @staticmethod
     def calculate_volume_profile(df: pd.DataFrame, lookback: int = 120) -> pd.DataFrame:
         """
         Calcula Volume Profile (POC, VAH, VAL).
 
+        Cada janela usa 49 faixas de preço entre o mínimo e o máximo da própria
+        janela. O volume de cada candle é distribuído igualmente pelas faixas
+        que ele cobre e acumulado na mesma ordem do cálculo candle a candle,
+        mas todas as janelas são processadas em blocos NumPy.
+
         Args:
             df: DataFrame com 'high', 'low', 'close', 'volume'
             lookback: Período de lookback
@@ -142,88 +184,125 @@ class TechnicalIndicators:
         Returns:
             DataFrame com 'vp_poc', 'vp_vah', 'vp_val'
         """
-        if len(df) < lookback:
-            return pd.DataFrame({
-                'vp_poc': [np.nan] * len(df),
-                'vp_vah': [np.nan] * len(df),
-                'vp_val': [np.nan] * len(df)
-            }, index=df.index)
-
-        poc_list = []
-        vah_list = []
-        val_list = []
-
-        for i in range(len(df)):
-            if i < lookback - 1:
-                poc_list.append(np.nan)
-                vah_list.append(np.nan)
-                val_list.append(np.nan)
-                continue
-
-            window = df.iloc[i-lookback+1:i+1]
-
-            # Simplified Volume Profile calculation
-            # Create price bins and aggregate volume
-            price_min = window['low'].min()
-            price_max = window['high'].max()
-
-            if price_max == price_min:
-                poc_list.append(window['close'].iloc[-1])
-                vah_list.append(price_max)
-                val_list.append(price_min)
-                continue
-
-            bins = np.linspace(price_min, price_max, 50)
-            volume_at_price = np.zeros(len(bins) - 1)
-
-            for _, row in window.iterrows():
-                # Distribute volume across the price range of the candle
-                low_idx = np.digitize(row['low'], bins) - 1
-                high_idx = np.digitize(row['high'], bins) - 1
-
-                if low_idx == high_idx:
-                    if 0 <= low_idx < len(volume_at_price):
-                        volume_at_price[low_idx] += row['volume']
-                else:
-                    for j in range(max(0, low_idx), min(len(volume_at_price), high_idx + 1)):
-                        volume_at_price[j] += row['volume'] / (high_idx - low_idx + 1)
-
-            # POC: Point of Control (price with highest volume)
-            poc_idx = np.argmax(volume_at_price)
-            poc = (bins[poc_idx] + bins[poc_idx + 1]) / 2
-
-            # VAH/VAL: Value Area High/Low (70% of volume)
-            total_volume = volume_at_price.sum()
-            target_volume = total_volume * 0.7
-
-            accumulated = 0
-            val_idx = poc_idx
-            vah_idx = poc_idx
-
-            # Expand from POC until 70% volume
-            while accumulated < target_volume:
-                if val_idx > 0:
-                    accumulated += volume_at_price[val_idx - 1]
-                    val_idx -= 1
-                if accumulated < target_volume and vah_idx < len(volume_at_price) - 1:
-                    accumulated += volume_at_price[vah_idx + 1]
-                    vah_idx += 1
-                if val_idx == 0 and vah_idx == len(volume_at_price) - 1:
-                    break
-
-            val = (bins[val_idx] + bins[val_idx + 1]) / 2
-            vah = (bins[vah_idx] + bins[vah_idx + 1]) / 2
-
-            poc_list.append(poc)
-            vah_list.append(vah)
-            val_list.append(val)
+        poc, vah, val = TechnicalIndicators._volume_profile_arrays(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+            df['volume'].to_numpy(dtype=np.float64),
+            lookback,
+        )
 
         return pd.DataFrame({
-            'vp_poc': poc_list,
-            'vp_vah': vah_list,
-            'vp_val': val_list
+            'vp_poc': poc,
+            'vp_vah': vah,
+            'vp_val': val
         }, index=df.index)
 
+    @staticmethod
+    def _volume_profile_arrays(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                               volume: np.ndarray, lookback: int = 120):
+        """POC/VAH/VAL (float64, NaN antes da primeira janela completa)."""
+        n = len(close)
+        poc = np.full(n, np.nan)
+        vah = np.full(n, np.nan)
+        val = np.full(n, np.nan)
+        if n < lookback:
+            return poc, vah, val
+
+        n_windows = n - lookback + 1
+
+        # Blocos de janelas limitam a matriz (janela, candle, borda) a ~4M células
+        chunk = max(1, 4_000_000 // (lookback * _VP_EDGES))
+        for start in range(0, n_windows, chunk):
+            stop = min(n_windows, start + chunk)
+            rows = slice(start + lookback - 1, stop + lookback - 1)
+            poc[rows], vah[rows], val[rows] = TechnicalIndicators._volume_profile_windows(
+                high[start:stop + lookback - 1],
+                low[start:stop + lookback - 1],
+                close[start:stop + lookback - 1],
+                volume[start:stop + lookback - 1],
+                lookback,
+            )
+
+        return poc, vah, val
+
+    @staticmethod
+    def _volume_profile_windows(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                                volume: np.ndarray, lookback: int):
+        """POC/VAH/VAL de todas as janelas completas dos arrays recebidos."""
+        n_bins = _VP_EDGES - 1
+        high_w = sliding_window_view(high, lookback)
+        low_w = sliding_window_view(low, lookback)
+        volume_w = sliding_window_view(volume, lookback)
+        n_windows = high_w.shape[0]
+
+        # min()/max() do pandas ignoram NaN: fmin/fmax fazem o mesmo
+        price_min = np.fmin.reduce(low_w, axis=1)
+        price_max = np.fmax.reduce(high_w, axis=1)
+        # Mesma aritmética de np.linspace escalar (start + k * step, última borda = stop)
+        step = (price_max - price_min) / n_bins
+        bins = np.arange(_VP_EDGES, dtype=np.float64)[None, :] * step[:, None] + price_min[:, None]
+        bins[:, -1] = price_max
+
+        # np.digitize por janela: nº de bordas <= preço (NaN cai após a última borda)
+        def _digitize(values: np.ndarray) -> np.ndarray:
+            idx = (bins[:, None, :] <= values[:, :, None]).sum(axis=2)
+            return np.where(np.isnan(values), _VP_EDGES, idx) - 1
+
+        low_idx = _digitize(low_w)
+        high_idx = _digitize(high_w)
+
+        # Faixas cobertas por candle: [max(0, low_idx), min(n_bins, high_idx + 1))
+        first = np.maximum(0, low_idx)
+        counts = np.maximum(0, np.minimum(n_bins, high_idx + 1) - first).ravel()
+        span = (high_idx - low_idx + 1).astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            share = (volume_w / np.where(span == 0, 1.0, span)).ravel()
+
+        # bincount soma na ordem de entrada (janela, candle, faixa), igual ao loop original
+        offsets = np.repeat(np.cumsum(counts) - counts, counts)
+        bin_of = np.repeat(first.ravel(), counts) + (np.arange(counts.sum()) - offsets)
+        window_of = np.repeat(np.arange(n_windows * lookback) // lookback, counts)
+        volume_at_price = np.bincount(
+            window_of * n_bins + bin_of,
+            weights=np.repeat(share, counts),
+            minlength=n_windows * n_bins,
+        ).reshape(n_windows, n_bins)
+
+        rows = np.arange(n_windows)
+        poc_idx = np.argmax(volume_at_price, axis=1)
+
+        # Value Area (70%): expansão alternada abaixo/acima do POC
+        target_volume = volume_at_price.sum(axis=1) * 0.7
+        accumulated = np.zeros(n_windows)
+        val_idx = poc_idx.copy()
+        vah_idx = poc_idx.copy()
+        active = accumulated < target_volume
+        while active.any():
+            step_down = active & (val_idx > 0)
+            accumulated[step_down] += volume_at_price[rows[step_down], val_idx[step_down] - 1]
+            val_idx[step_down] -= 1
+
+            step_up = active & (accumulated < target_volume) & (vah_idx < n_bins - 1)
+            accumulated[step_up] += volume_at_price[rows[step_up], vah_idx[step_up] + 1]
+            vah_idx[step_up] += 1
+
+            exhausted = (val_idx == 0) & (vah_idx == n_bins - 1)
+            active &= ~exhausted & (accumulated < target_volume)
+
+        def _bin_center(idx: np.ndarray) -> np.ndarray:
+            return (bins[rows, idx] + bins[rows, idx + 1]) / 2
+
+        poc = _bin_center(poc_idx)
+        vah = _bin_center(vah_idx)
+        val = _bin_center(val_idx)
+
+        flat = price_max == price_min
+        poc = np.where(flat, close[lookback - 1:], poc)
+        vah = np.where(flat, price_max, vah)
+        val = np.where(flat, price_min, val)
+        return poc, vah, val
+
     @staticmethod
     def calculate_obv(df: pd.DataFrame) -> pd.Series:
         """
@@ -235,17 +314,25 @@ class TechnicalIndicators:
         Returns:
             Série com valores do OBV
         """
-        obv = [0]
+        return pd.Series(
+            TechnicalIndicators._obv_array(df['close'].to_numpy(), df['volume'].to_numpy()),
+            index=df.index,
+        )
+
+    @staticmethod
+    def _obv_array(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+        """OBV sobre arrays (zeros int64 quando o preço nunca se move)."""
+        up = np.zeros(len(close), dtype=bool)
+        down = np.zeros(len(close), dtype=bool)
+        up[1:] = close[1:] > close[:-1]
+        down[1:] = close[1:] < close[:-1]
 
-        for i in range(1, len(df)):
-            if df['close'].iloc[i] > df['close'].iloc[i-1]:
-                obv.append(obv[-1] + df['volume'].iloc[i])
-            elif df['close'].iloc[i] < df['close'].iloc[i-1]:
-                obv.append(obv[-1] - df['volume'].iloc[i])
-            else:
-                obv.append(obv[-1])
+        if not (up | down).any():
+            return np.zeros(len(close), dtype=np.int64)
 
-        return pd.Series(obv, index=df.index)
+        # cumsum acumula em sequência: mesmo resultado da soma candle a candle
+        signed_volume = np.where(up, volume, np.where(down, -volume, 0))
+        return np.cumsum(signed_volume)
 
     @staticmethod
     def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
@@ -259,17 +346,28 @@ class TechnicalIndicators:
         Returns:
             Série com valores do ATR
         """
-        if len(df) < period + 1:
-            return pd.Series([np.nan] * len(df), index=df.index)
-
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
+        true_range = TechnicalIndicators._true_range(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+        )
+        return pd.Series(TechnicalIndicators._atr_array(true_range, period), index=df.index)
 
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = true_range.rolling(window=period).mean()
+    @staticmethod
+    def _atr_array(true_range: np.ndarray, period: int = 14) -> np.ndarray:
+        """ATR (média simples do True Range); NaN com menos de period + 1 valores."""
+        if len(true_range) < period + 1:
+            return np.full(len(true_range), np.nan)
+        return pd.Series(true_range).rolling(window=period).mean().to_numpy()
 
-        return atr
+    @staticmethod
+    def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        """True Range; no primeiro candle (sem close anterior) vale high - low."""
+        prev_close = np.empty_like(close)
+        prev_close[:1] = np.nan
+        prev_close[1:] = close[:-1]
+        # fmax ignora NaN como o max(axis=1) do pandas
+        return np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
 
     @staticmethod
     def calculate_adx(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
@@ -283,43 +381,42 @@ class TechnicalIndicators:
         Returns:
             DataFrame com 'adx_14', 'di_plus', 'di_minus'
         """
-        if len(df) < period * 2:
-            return pd.DataFrame({
-                'adx_14': [np.nan] * len(df),
-                'di_plus': [np.nan] * len(df),
-                'di_minus': [np.nan] * len(df)
-            }, index=df.index)
-
-        # Calculate True Range
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-
-        # Calculate Directional Movement
-        up_move = df['high'] - df['high'].shift()
-        down_move = df['low'].shift() - df['low']
-
-        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0)
-        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0)
-
-        plus_dm = pd.Series(plus_dm, index=df.index)
-        minus_dm = pd.Series(minus_dm, index=df.index)
-
-        # Smooth with EMA
-        atr = true_range.ewm(span=period, adjust=False).mean()
-        plus_di = 100 * (plus_dm.ewm(span=period, adjust=False).mean() / atr)
-        minus_di = 100 * (minus_dm.ewm(span=period, adjust=False).mean() / atr)
-
-        # Calculate ADX
-        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
-        adx = dx.ewm(span=period, adjust=False).mean()
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        true_range = TechnicalIndicators._true_range(high, low, df['close'].to_numpy(dtype=np.float64))
+        adx, plus_di, minus_di = TechnicalIndicators._adx_arrays(high, low, true_range, period)
 
         return pd.DataFrame({
             'adx_14': adx,
             'di_plus': plus_di,
             'di_minus': minus_di
-        })
+        }, index=df.index)
+
+    @staticmethod
+    def _adx_arrays(high: np.ndarray, low: np.ndarray, true_range: np.ndarray,
+                    period: int = 14) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(ADX, DI+, DI-) sobre arrays; NaN com menos de 2 * period valores."""
+        n = len(high)
+        if n < period * 2:
+            return np.full(n, np.nan), np.full(n, np.nan), np.full(n, np.nan)
+
+        # Directional Movement
+        up_move = np.empty(n)
+        down_move = np.empty(n)
+        up_move[:1] = down_move[:1] = np.nan
+        up_move[1:] = high[1:] - high[:-1]
+        down_move[1:] = low[:-1] - low[1:]
+        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0)
+        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0)
+
+        # Suavização por EMA
+        atr = pd.Series(true_range).ewm(span=period, adjust=False).mean().to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            plus_di = 100 * (pd.Series(plus_dm).ewm(span=period, adjust=False).mean().to_numpy() / atr)
+            minus_di = 100 * (pd.Series(minus_dm).ewm(span=period, adjust=False).mean().to_numpy() / atr)
+            dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+        adx = pd.Series(dx).ewm(span=period, adjust=False).mean().to_numpy()
+        return adx, plus_di, minus_di
 
     @staticmethod
     def calculate_ema_alignment_score(df: pd.DataFrame) -> pd.Series:
@@ -337,54 +434,42 @@ class TechnicalIndicators:
         if not all(col in df.columns for col in emas):
             return pd.Series([0] * len(df), index=df.index)
 
-        scores = []
-
-        for i in range(len(df)):
-            # Check if all EMAs are aligned in ascending order (bullish)
-            bullish = True
-            bearish = True
-
-            for j in range(len(emas) - 1):
-                if pd.isna(df[emas[j]].iloc[i]) or pd.isna(df[emas[j+1]].iloc[i]):
-                    bullish = False
-                    bearish = False
-                    break
-
-                if df[emas[j]].iloc[i] <= df[emas[j+1]].iloc[i]:
-                    bullish = False
-                if df[emas[j]].iloc[i] >= df[emas[j+1]].iloc[i]:
-                    bearish = False
-
-            if bullish:
-                scores.append(6)
-            elif bearish:
-                scores.append(-6)
-            else:
-                # Partial alignment - count aligned pairs
-                aligned_up = 0
-                aligned_down = 0
-                for j in range(len(emas) - 1):
-                    if pd.isna(df[emas[j]].iloc[i]) or pd.isna(df[emas[j+1]].iloc[i]):
-                        continue
-                    if df[emas[j]].iloc[i] > df[emas[j+1]].iloc[i]:
-                        aligned_up += 1
-                    elif df[emas[j]].iloc[i] < df[emas[j+1]].iloc[i]:
-                        aligned_down += 1
-
-                if aligned_up > aligned_down:
-                    scores.append(aligned_up)
-                elif aligned_down > aligned_up:
-                    scores.append(-aligned_down)
-                else:
-                    scores.append(0)
-
-        return pd.Series(scores, index=df.index)
+        ema_matrix = np.column_stack([df[col].to_numpy(dtype=np.float64) for col in emas])
+        return pd.Series(TechnicalIndicators._ema_alignment_array(ema_matrix), index=df.index)
+
+    @staticmethod
+    def _ema_alignment_array(ema_matrix: np.ndarray) -> np.ndarray:
+        """Score de alinhamento para uma matriz (N, 6) de EMAs da mais rápida à mais lenta."""
+        faster = ema_matrix[:, :-1]
+        slower = ema_matrix[:, 1:]
+
+        # Comparações com NaN são falsas: pares com NaN não contam para nenhum lado
+        aligned_up = faster > slower
+        aligned_down = faster < slower
+        up_count = aligned_up.sum(axis=1)
+        down_count = aligned_down.sum(axis=1)
+
+        scores = np.where(
+            aligned_up.all(axis=1), 6,
+            np.where(
+                aligned_down.all(axis=1), -6,
+                np.where(
+                    up_count > down_count, up_count,
+                    np.where(down_count > up_count, -down_count, 0)
+                )
+            )
+        ).astype(np.int64)
+
+        return scores
 
     @classmethod
     def calculate_all(cls, df: pd.DataFrame) -> pd.DataFrame:
         """
         Calcula todos os indicadores técnicos.
 
+        Os indicadores vêm do motor colunar (calculate_indicator_block) e são
+        anexados ao DataFrame original em uma única concatenação.
+
         Args:
             df: DataFrame com OHLCV ('open', 'high', 'low', 'close', 'volume')
 
@@ -394,41 +479,141 @@ class TechnicalIndicators:
         if df.empty or len(df) < 2:
             return df
 
-        result = df.copy()
+        close = df['close'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy()
+        indicators = cls._indicator_frame(
+            (),
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            close,
+            volume.astype(np.float64, copy=False),
+            index=df.index,
+        )
+        # OBV segue o dtype de calculate_obv: int64 com volume inteiro ou preço parado
+        obv = cls._obv_array(close, volume)
+        if obv.dtype.kind in 'iu':
+            indicators['obv'] = obv
+
+        # Recalcular sobre um DataFrame já enriquecido substitui as colunas antigas
+        stale = [col for col in INDICATOR_COLUMNS if col in df.columns]
+        base = df.drop(columns=stale) if stale else df
 
-        # EMAs
-        ema_periods = [17, 34, 72, 144, 305, 610]
-        for period in ema_periods:
-            result[f'ema_{period}'] = cls.calculate_ema(df['close'], period)
+        # No verbose log here; summary is handled in main pipeline
 
-        # RSI
-        result['rsi_14'] = cls.calculate_rsi(df['close'], 14)
+        return pd.concat([base, indicators], axis=1)
 
-        # MACD
-        macd_df = cls.calculate_macd(df['close'])
-        result = pd.concat([result, macd_df], axis=1)
+    @classmethod
+    def calculate_all_arrays(cls, open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                             close: np.ndarray, volume: np.ndarray,
+                             index: Optional[pd.Index] = None) -> pd.DataFrame:
+        """
+        Calcula todos os indicadores direto de arrays OHLCV.
 
-        # Bollinger Bands
-        bb_df = cls.calculate_bollinger(df['close'])
-        result = pd.concat([result, bb_df], axis=1)
+        Um único bloco float64 guarda OHLCV e indicadores; o DataFrame é
+        montado sobre ele sem cópia. Mesmos valores de calculate_all.
 
-        # Volume Profile
-        vp_df = cls.calculate_volume_profile(df)
-        result = pd.concat([result, vp_df], axis=1)
+        Args:
+            open_, high, low, close, volume: Arrays 1-D do mesmo tamanho
+            index: Índice do DataFrame (default RangeIndex)
 
-        # OBV
-        result['obv'] = cls.calculate_obv(df)
+        Returns:
+            DataFrame com OHLCV_COLUMNS + INDICATOR_COLUMNS
+        """
+        ohlcv = (open_, high, low, close, volume)
+        high, low, close, volume = (np.asarray(a, dtype=np.float64) for a in ohlcv[1:])
+        return cls._indicator_frame(
+            tuple(zip(OHLCV_COLUMNS, ohlcv)), high, low, close, volume, index=index
+        )
 
-        # ATR
-        result['atr_14'] = cls.calculate_atr(df, 14)
+    @classmethod
+    def calculate_all_matrix(cls, ohlcv: np.ndarray,
+                             index: Optional[pd.Index] = None) -> pd.DataFrame:
+        """
+        Versão de calculate_all_arrays para matrizes (N, 5) [open, high, low, close, volume].
 
-        # ADX
-        adx_df = cls.calculate_adx(df, 14)
-        result = pd.concat([result, adx_df], axis=1)
+        Formato de ParquetCache.get_cached_data_as_arrays; float32 é promovido a float64.
+        """
+        ohlcv = np.asarray(ohlcv)
+        if ohlcv.ndim != 2 or ohlcv.shape[1] != len(OHLCV_COLUMNS):
+            raise ValueError(f"Esperado array (N, 5) OHLCV, recebido {ohlcv.shape}")
 
-        # EMA Alignment Score
-        result['ema_alignment_score'] = cls.calculate_ema_alignment_score(result)
+        columns = [np.ascontiguousarray(ohlcv[:, j], dtype=np.float64) for j in range(ohlcv.shape[1])]
+        return cls.calculate_all_arrays(*columns, index=index)
 
-        # No verbose log here; summary is handled in main pipeline
+    @classmethod
+    def calculate_all_structured(cls, open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                                 close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+        """
+        Mesmo cálculo de calculate_all_arrays, retornado como structured array.
 
+        Campos float64 com os nomes das colunas; 'ema_alignment_score' é int64.
+        """
+        high, low, close, volume = (np.asarray(a, dtype=np.float64) for a in (high, low, close, volume))
+        names, block, score = cls.calculate_indicator_block(high, low, close, volume)
+
+        dtype = [(name, np.float64) for name in OHLCV_COLUMNS + names]
+        dtype.append(('ema_alignment_score', np.int64))
+        result = np.empty(len(close), dtype=dtype)
+        for name, values in zip(OHLCV_COLUMNS, (open_, high, low, close, volume)):
+            result[name] = values
+        for j, name in enumerate(names):
+            result[name] = block[:, j]
+        result['ema_alignment_score'] = score
         return result
+
+    @classmethod
+    def _indicator_frame(cls, leading, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                         volume: np.ndarray, index: Optional[pd.Index] = None) -> pd.DataFrame:
+        """Monta o DataFrame (colunas leading + indicadores) sobre o bloco do motor."""
+        names, block, score = cls.calculate_indicator_block(high, low, close, volume, leading=leading)
+        frame = pd.DataFrame(block, index=index, columns=list(names), copy=False)
+        # Única coluna inteira: bloco próprio, sem consolidar o bloco float
+        frame['ema_alignment_score'] = score
+        return frame
+
+    @classmethod
+    def calculate_indicator_block(cls, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                                  volume: np.ndarray, leading=()):
+        """
+        Motor colunar: calcula todos os indicadores em uma passada planejada.
+
+        Usa os mesmos helpers de array dos métodos individuais (mesmos
+        valores e regras de NaN). O True Range é calculado uma vez para ATR
+        e ADX, e as EMAs alimentam o score de alinhamento. Cada indicador é
+        escrito direto na sua coluna de um bloco float64 (N, K) em ordem
+        Fortran.
+
+        Args:
+            high, low, close, volume: Arrays float64 1-D do mesmo tamanho
+            leading: Pares (nome, array) copiados para as primeiras colunas do bloco
+
+        Returns:
+            (nomes das colunas, bloco float64 (N, K), score de alinhamento int64)
+        """
+        n = len(close)
+        names = tuple(name for name, _ in leading) + _FLOAT_INDICATOR_COLUMNS
+        block = np.full((n, len(names)), np.nan, order='F')
+        col = {name: block[:, j] for j, name in enumerate(names)}
+        for name, values in leading:
+            col[name][:] = values
+
+        # True Range compartilhado por ATR e ADX
+        true_range = cls._true_range(high, low, close)
+
+        for period in EMA_PERIODS:
+            col[f'ema_{period}'][:] = cls._ema_array(close, period)
+        col['rsi_14'][:] = cls._rsi_array(close, 14)
+        col['macd_line'][:], col['macd_signal'][:], col['macd_histogram'][:] = cls._macd_arrays(close)
+        for name, values in zip(_BOLLINGER_COLUMNS, cls._bollinger_arrays(close)):
+            col[name][:] = values
+        col['vp_poc'][:], col['vp_vah'][:], col['vp_val'][:] = \
+            cls._volume_profile_arrays(high, low, close, volume)
+        col['obv'][:] = cls._obv_array(close, volume)
+        col['atr_14'][:] = cls._atr_array(true_range, 14)
+        col['adx_14'][:], col['di_plus'][:], col['di_minus'][:] = cls._adx_arrays(high, low, true_range, 14)
+
+        # EMA Alignment Score (colunas ema_* são contíguas no bloco)
+        first_ema = names.index('ema_17')
+        score = cls._ema_alignment_array(block[:, first_ema:first_ema + len(EMA_PERIODS)])
+
+        return names, block, score
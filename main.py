@@ -23,6 +23,7 @@ from config.symbols import ALL_SYMBOLS
 from data.database import DatabaseManager
 from data.binance_client import create_binance_client
 from data.collector import BinanceCollector
+from data.concurrent_collector import BackfillReport, ConcurrentKlineCollector
 from data.sentiment_collector import SentimentCollector
 from data.macro_collector import MacroCollector
 from data.background_data_collector import start_background_collector
@@ -73,32 +74,37 @@ def collect_historical_data(db: DatabaseManager, client) -> None:
     logger.info(f"  H1: {h1_days} dias")
     logger.info("")
 
+    # OHLCV: páginas de todos os símbolos em paralelo, gravadas conforme chegam.
+    # Falhas por página ficam no relatório; uma falha geral marca todos os
+    # símbolos sem candles, mas não interrompe sentimento e macro.
+    try:
+        backfill = ConcurrentKlineCollector(collector).backfill(
+            ALL_SYMBOLS,
+            ["1d", "4h", "1h"],
+            days={"1d": d1_days, "4h": h4_days, "1h": h1_days},
+            db=db,
+        )
+    except Exception as e:
+        logger.error(f"Backfill concorrente falhou: {e}")
+        backfill = BackfillReport()
+
     for symbol in ALL_SYMBOLS:
         status = "OK"
         details = []
         try:
-            d1_data = collector.fetch_historical(symbol, "1d", d1_days)
-            h4_data = collector.fetch_historical(symbol, "4h", h4_days)
-            h1_data = collector.fetch_historical(symbol, "1h", h1_days)
-            sentiment = sentiment_collector.fetch_all_sentiment(symbol)
-            if d1_data is None or d1_data.empty:
-                status = "WARNING"
-                details.append("D1 missing")
-            if h4_data is None or h4_data.empty:
+            for interval, label in (("1d", "D1"), ("4h", "H4"), ("1h", "H1")):
+                if not backfill.candles_by_symbol.get((symbol, interval)):
+                    status = "WARNING"
+                    details.append(f"{label} missing")
+            failed = sum(1 for page in backfill.failed_pages if page.symbol == symbol)
+            if failed:
                 status = "WARNING"
-                details.append("H4 missing")
-            if h1_data is None or h1_data.empty:
-                status = "WARNING"
-                details.append("H1 missing")
+                details.append(f"{failed} pages failed")
+            sentiment = sentiment_collector.fetch_all_sentiment(symbol)
             if not sentiment:
-                status = "INFO"
+                if status == "OK":
+                    status = "INFO"
                 details.append("Sentiment missing")
-            if d1_data is not None and not d1_data.empty:
-                db.insert_ohlcv("d1", d1_data)
-            if h4_data is not None and not h4_data.empty:
-                db.insert_ohlcv("h4", h4_data)
-            if h1_data is not None and not h1_data.empty:
-                db.insert_ohlcv("h1", h1_data)
             if sentiment:
                 db.insert_sentiment([sentiment])
         except Exception as e:
@@ -134,12 +140,11 @@ def calculate_indicators(db: DatabaseManager) -> None:
         status = "OK"
         details = []
         try:
-            h4_data = db.get_ohlcv("h4", symbol)
-            if h4_data is None or len(h4_data) == 0:
+            df = db.get_ohlcv_frame("h4", symbol)
+            if df.empty:
                 status = "WARNING"
                 details.append("No H4 data")
             else:
-                df = pd.DataFrame(h4_data)
                 df = TechnicalIndicators.calculate_all(df)
                 indicators_data = []
                 for _, row in df.iterrows():
@@ -23,6 +23,7 @@ from data.collector import BinanceCollector
 from data.sentiment_collector import SentimentCollector
 from indicators.technical import TechnicalIndicators
 from indicators.smc import SmartMoneyConcepts, SwingType
+from indicators.smc_incremental import IncrementalSMCRegistry
 from agent.risk_manager import RiskManager
 from monitoring.alerts import AlertManager
 from monitoring.logger import AgentLogger
@@ -72,6 +73,9 @@ class PositionMonitor:
         self.sentiment_collector = SentimentCollector(client)
         self.technical = TechnicalIndicators()
         self.smc = SmartMoneyConcepts()
+        # Estado SMC incremental por (symbol, timeframe): cada ciclo processa
+        # apenas os candles fechados desde o ciclo anterior
+        self.smc_state = IncrementalSMCRegistry()
         self.risk_manager = RiskManager()
         self.alert_manager = AlertManager()
         self._running = False
@@ -429,18 +433,15 @@ class PositionMonitor:
             if not timeframe_db:
                 raise ValueError(f"Timeframe não suportado: {timeframe}. Use '1h', '4h' ou '1d'")
 
-            db_records = self.db.get_ohlcv(
+            df_historical = self.db.get_ohlcv_frame(
                 timeframe=timeframe_db,
                 symbol=symbol,
                 limit=min_candles
             )
 
-            # Converter para DataFrame
-            if db_records:
-                df_historical = pd.DataFrame(db_records)
+            if not df_historical.empty:
                 logger.debug(f"Banco: {len(df_historical)} candles {timeframe} para {symbol}")
             else:
-                df_historical = pd.DataFrame()
                 logger.debug(f"Banco vazio para {symbol} {timeframe}")
 
             # 2. Buscar candles frescos da API
@@ -541,8 +542,12 @@ class PositionMonitor:
             # Calcular SMC no H1
             df_h1 = market_data.get('h1')
             if df_h1 is not None and not df_h1.empty:
-                # 1. Detectar swing points primeiro
-                swings = self.smc.detect_swing_points(df_h1, lookback=5)
+                # 1. Atualizar estado SMC incremental (último candle ainda em formação)
+                # e recortar aos candles fechados do frame: flags, liquidez e
+                # índices ficam relativos à janela, como no cálculo batch
+                smc_state = self.smc_state.sync(symbol, 'H1', df_h1, skip_last=True)
+                smc_window = smc_state.window(len(df_h1) - 1, frame=df_h1.iloc[:-1])
+                swings = smc_window.get('swings', [])
 
                 # 2. Detectar estrutura de mercado (precisa de lista de swings, não DataFrame)
                 if swings:
@@ -552,15 +557,15 @@ class PositionMonitor:
                 else:
                     indicators['market_structure'] = 'range'
 
-                # 3. Detectar BOS e CHoCH
-                bos_list = self.smc.detect_bos(df_h1, swings) if swings else []
-                choch_list = self.smc.detect_choch(df_h1, swings) if swings else []
+                # 3. BOS e CHoCH
+                bos_list = smc_window.get('bos', [])
+                choch_list = smc_window.get('choch', [])
 
                 indicators['bos_recent'] = 1 if bos_list else 0
                 indicators['choch_recent'] = 1 if choch_list else 0
 
-                # 4. Order Blocks (precisa de df, swings, bos_list)
-                obs = self.smc.detect_order_blocks(df_h1, swings, bos_list) if swings else []
+                # 4. Order Blocks
+                obs = smc_window.get('order_blocks', [])
                 current_price = df_h1.iloc[-1]['close']
 
                 # Calcular distância até OB mais próximo
@@ -574,8 +579,8 @@ class PositionMonitor:
                 else:
                     indicators['nearest_ob_distance_pct'] = None
 
-                # 5. Fair Value Gaps (método correto é detect_fvg)
-                fvgs = self.smc.detect_fvg(df_h1)
+                # 5. Fair Value Gaps
+                fvgs = smc_window.get('fvgs', [])
 
                 # FVGs também são dataclasses - usar zone_high e zone_low
                 if fvgs:
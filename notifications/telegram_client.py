@@ -10,7 +10,6 @@ import json
 import logging
 from typing import Optional, Dict, Any
 from datetime import datetime
-import requests
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +50,9 @@ class TelegramClient:
             logger.warning("Rate limit atingido, mensagem enfileirada")
             return False
 
+        # requests só é importado no envio: importar o módulo continua barato
+        import requests
+
         try:
             url = f"{self.base_url}/sendMessage"
             payload = {
@@ -242,6 +244,8 @@ class TelegramClient:
             logger.error("Telegram credentials missing")
             return False
 
+        import requests
+
         try:
             url = f"{self.base_url}/getMe"
             response = requests.get(url, timeout=5)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Compara caminhos de carga de OHLCV: SQLite, Parquet particionado e .npy
+mapeados (np.memmap), com page cache frio e quente.
+
+"Frio" descarta as páginas dos arquivos envolvidos do page cache
+(posix_fadvise DONTNEED) antes de cada carga; "quente" repete a carga com
+os arquivos já em cache. Cada carga toca todos os valores de close para
+que o memmap pague a leitura das páginas.
+
+Exemplos:
+    python scripts/benchmark_array_loaders.py --db db/crypto_agent.db --symbols BTCUSDT ETHUSDT
+    python scripts/benchmark_array_loaders.py --candles 100000 --timeframe h1
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest.data_cache import CACHE_COLUMNS, ParquetCache
+from data.database import DatabaseManager, read_ohlcv_arrays
+
+logger = logging.getLogger(__name__)
+
+INTERVAL_MS = {'h1': 3_600_000, 'h4': 14_400_000, 'd1': 86_400_000}
+
+
+def drop_page_cache(paths: Iterable[Path]) -> None:
+    """Pede ao kernel para descartar as páginas limpas dos arquivos (Linux)."""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def _files(root: Path) -> List[Path]:
+    return [path for path in root.rglob('*') if path.is_file()]
+
+
+def benchmark_loaders(cache: ParquetCache, symbol: str, timeframe: str, repeats: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Mede carga fria/quente de um par pelos três caminhos.
+
+    Returns:
+        {caminho: {'rows', 'cold_ms', 'warm_ms'}} (medianas em ms)
+    """
+    cache.get_memmap_columns(symbol, timeframe)  # gera Parquet e .npy
+    db_files = [Path(cache.db_path), Path(f"{cache.db_path}-wal")]
+    loaders: Dict[str, tuple] = {
+        'sqlite': (db_files, lambda: _load_sqlite(cache.db_path, symbol, timeframe)),
+        'parquet': (_files(cache.store.root / symbol / timeframe),
+                    lambda: cache.store.read(symbol, timeframe, columns=CACHE_COLUMNS)['close'].to_numpy()),
+        'memmap': (_files(cache.arrays.root / f"{symbol}_{timeframe}"),
+                   lambda: cache.arrays.open(f"{symbol}_{timeframe}")['close']),
+    }
+
+    report = {}
+    for name, (files, load) in loaders.items():
+        cold, warm = [], []
+        for _ in range(repeats):
+            drop_page_cache(files)
+            cold.append(_timed(load))
+            warm.append(_timed(load))
+        report[name] = {
+            'rows': len(load()),
+            'cold_ms': float(np.median(cold)) * 1000,
+            'warm_ms': float(np.median(warm)) * 1000,
+        }
+    return report
+
+
+def _load_sqlite(db_path: str, symbol: str, timeframe: str) -> np.ndarray:
+    with closing(sqlite3.connect(db_path)) as conn:
+        return read_ohlcv_arrays(conn, timeframe, symbol, columns=CACHE_COLUMNS)['close']
+
+
+def _timed(load: Callable[[], np.ndarray]) -> float:
+    start = time.perf_counter()
+    float(np.sum(load()))
+    return time.perf_counter() - start
+
+
+def _synthetic_db(path: Path, symbols: List[str], timeframe: str, n_candles: int) -> None:
+    db = DatabaseManager(str(path))
+    for seed, symbol in enumerate(symbols):
+        rng = np.random.default_rng(seed)
+        close = 30000 + np.cumsum(rng.normal(0, 150, n_candles))
+        db.bulk_insert_ohlcv(timeframe, pd.DataFrame({
+            'timestamp': 1_600_000_000_000 + np.arange(n_candles, dtype=np.int64) * INTERVAL_MS[timeframe],
+            'symbol': symbol,
+            'open': close,
+            'high': close + 50,
+            'low': close - 50,
+            'close': close,
+            'volume': rng.lognormal(8, 0.5, n_candles),
+            'quote_volume': 0.0,
+            'trades_count': 0,
+        }))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('--db', help='SQLite com OHLCV (default: dados sintéticos)')
+    parser.add_argument('--symbols', nargs='+', default=['BTCUSDT'])
+    parser.add_argument('--timeframe', choices=sorted(INTERVAL_MS), default='h4')
+    parser.add_argument('--candles', type=int, default=50_000,
+                        help='Candles sintéticos por símbolo (sem --db)')
+    parser.add_argument('--cache-dir', help='Diretório do ParquetCache (default: temporário)')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--json', help='Salva o relatório neste arquivo')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        if not db_path:
+            db_path = str(Path(tmp) / "synthetic.db")
+            _synthetic_db(Path(db_path), args.symbols, args.timeframe, args.candles)
+        cache = ParquetCache(db_path, cache_dir=args.cache_dir or str(Path(tmp) / "cache"))
+
+        reports = {}
+        print(f"\n{'symbol':>10} {'loader':>8} {'rows':>9} {'cold ms':>9} {'warm ms':>9}")
+        for symbol in args.symbols:
+            reports[symbol] = benchmark_loaders(cache, symbol, args.timeframe, args.repeats)
+            for name, row in reports[symbol].items():
+                print(f"{symbol:>10} {name:>8} {row['rows']:>9} {row['cold_ms']:>9.2f} {row['warm_ms']:>9.2f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(reports, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Mede steps/s de rollout do CryptoFuturesEnv por número de workers.
+
+Usa SubprocVecEnv com dados em memória compartilhada (agent/parallel_env.py)
+para dimensionar máquinas de treinamento (CPU, Linux).
+
+Exemplos:
+    python scripts/benchmark_parallel_envs.py --workers 1 2 4 8
+    python scripts/benchmark_parallel_envs.py --db db/crypto_agent.db --symbols BTCUSDT ETHUSDT
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agent.parallel_env import ASSIGNMENT_MODES, SharedMarketData, benchmark_rollout_throughput
+from backtest.data_cache import ParquetCache
+from indicators.technical import TechnicalIndicators
+
+logger = logging.getLogger(__name__)
+
+
+def _synthetic_dataset(symbol: str, n_candles: int, seed: int) -> dict:
+    """Random walk H4 com indicadores (quando não há banco disponível)."""
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 150, n_candles))
+    open_ = close + rng.normal(0, 60, n_candles)
+    h4 = TechnicalIndicators.calculate_all(pd.DataFrame({
+        'timestamp': 1_700_000_000_000 + np.arange(n_candles, dtype=np.int64) * 14_400_000,
+        'open': open_,
+        'high': np.maximum(open_, close) + np.abs(rng.normal(0, 80, n_candles)),
+        'low': np.minimum(open_, close) - np.abs(rng.normal(0, 80, n_candles)),
+        'close': close,
+        'volume': rng.lognormal(8, 0.5, n_candles),
+    }))
+    return {'symbol': symbol, 'h4': h4, 'h1': h4, 'd1': h4.iloc[::6].reset_index(drop=True)}
+
+
+def _load_datasets(args) -> dict:
+    if not args.db:
+        return {
+            symbol: _synthetic_dataset(symbol, args.candles, seed)
+            for seed, symbol in enumerate(args.symbols)
+        }
+
+    cache = ParquetCache(args.db)
+    datasets = {}
+    for symbol in args.symbols:
+        frames = cache.get_indicator_frames(symbol)
+        if frames['h4'].empty:
+            logger.warning(f"Sem dados H4 para {symbol}, ignorando")
+            continue
+        datasets[symbol] = {'symbol': symbol, **frames}
+    return datasets
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                        help='Números de workers a medir')
+    parser.add_argument('--steps', type=int, default=2000, help='Steps por worker')
+    parser.add_argument('--symbols', nargs='+', default=['BTCUSDT'])
+    parser.add_argument('--assignment', choices=ASSIGNMENT_MODES, default='time')
+    parser.add_argument('--episode-length', type=int, default=500)
+    parser.add_argument('--candles', type=int, default=3000,
+                        help='Candles H4 sintéticos por símbolo (sem --db)')
+    parser.add_argument('--db', help='SQLite com OHLCV (via ParquetCache)')
+    parser.add_argument('--json', help='Salva o relatório neste arquivo')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+
+    datasets = _load_datasets(args)
+    if not datasets:
+        logger.error("Nenhum dataset carregado")
+        return 1
+
+    with SharedMarketData(datasets) as shared:
+        report = benchmark_rollout_throughput(
+            shared,
+            worker_counts=args.workers,
+            n_steps=args.steps,
+            assignment=args.assignment,
+            env_kwargs={'episode_length': args.episode_length},
+        )
+
+    print(f"\nCPUs: {os.cpu_count()}  datasets: {', '.join(datasets)}  assignment: {args.assignment}")
+    print(f"{'workers':>8} {'steps/s':>10} {'steps/s/worker':>15} {'speedup':>8}")
+    base = report[args.workers[0]]['steps_per_sec'] / args.workers[0]
+    for n_envs, row in report.items():
+        print(f"{n_envs:>8} {row['steps_per_sec']:>10.0f} "
+              f"{row['steps_per_sec_per_worker']:>15.0f} {row['steps_per_sec'] / base:>8.2f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({str(k): v for k, v in report.items()}, f, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
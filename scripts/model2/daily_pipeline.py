@@ -15,6 +15,8 @@ REPO_ROOT = Path(__file__).resolve().parents[2]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from core.model2.ohlcv_cache import OhlcvCacheProvider
+from indicators.smc_incremental import IncrementalSMCRegistry
 from scripts.model2.bridge import run_bridge
 from scripts.model2.export_dashboard import run_export_dashboard
 from scripts.model2.export_signals import run_export_signals
@@ -117,6 +119,8 @@ def run_daily_pipeline(
     continue_on_error: bool,
     retention_days: int,
     output_dir: str | Path,
+    cache_provider: OhlcvCacheProvider | None = None,
+    smc_state: IncrementalSMCRegistry | None = None,
 ) -> dict[str, Any]:
     resolved_source_db = _resolve_repo_path(source_db_path)
     resolved_model2_db = _resolve_repo_path(model2_db_path)
@@ -137,6 +141,8 @@ def run_daily_pipeline(
 
     stage_summaries: dict[str, dict[str, Any]] = {}
     stage_errors: list[dict[str, Any]] = []
+    # scan/validate/resolve leem as mesmas series: uma carga por serie e candle
+    ohlcv_cache = cache_provider if cache_provider is not None else OhlcvCacheProvider()
 
     stage_definitions: list[tuple[str, Callable[..., dict[str, Any]], dict[str, Any]]] = [
         (
@@ -166,6 +172,8 @@ def run_daily_pipeline(
                 "symbols": symbols_to_use,
                 "timeframe": timeframe,
                 "candles_limit": int(scan_candles_limit),
+                "cache_provider": ohlcv_cache,
+                "smc_state": smc_state,
                 "dry_run": bool(dry_run),
                 "output_dir": resolved_output_dir,
             },
@@ -193,6 +201,7 @@ def run_daily_pipeline(
                 "timeframe": timeframe,
                 "limit": int(limit),
                 "candles_limit": int(validation_candles_limit),
+                "cache_provider": ohlcv_cache,
                 "dry_run": bool(dry_run),
                 "output_dir": resolved_output_dir,
             },
@@ -207,6 +216,7 @@ def run_daily_pipeline(
                 "timeframe": timeframe,
                 "limit": int(limit),
                 "candles_limit": int(resolution_candles_limit),
+                "cache_provider": ohlcv_cache,
                 "dry_run": bool(dry_run),
                 "output_dir": resolved_output_dir,
             },
@@ -27,6 +27,7 @@ from stable_baselines3 import PPO
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from agent.batched_inference import episode_seeds, run_lockstep, spawn_env_copies
 from agent.lstm_environment import LSTMSignalEnvironment
 from config import settings
 
@@ -177,6 +178,45 @@ class EnsembleVotingPPO:
         else:
             raise ValueError(f"Metodo de voting desconhecido: {self.voting_method}")
 
+    def predict_batch(
+        self,
+        observations: np.ndarray,
+        deterministic: bool = True
+    ) -> np.ndarray:
+        """
+        Predicao ensemble para um lote de observacoes.
+
+        Cada membro faz um unico forward sobre o mesmo lote; a votacao
+        (mesmas regras de predict_soft_voting/predict_hard_voting) e
+        vetorizada.
+
+        Args:
+            observations: Array (batch, *obs_shape)
+            deterministic: Use deterministic policy
+
+        Returns:
+            Array (batch,) de acoes
+        """
+        mlp_actions = np.asarray(
+            self.mlp_model.predict(observations, deterministic=deterministic)[0]
+        ).reshape(len(observations))
+        lstm_actions = np.asarray(
+            self.lstm_model.predict(observations, deterministic=deterministic)[0]
+        ).reshape(len(observations))
+
+        if self.voting_method == 'soft':
+            # Discordancia: prevalece o modelo de maior peso
+            preferred = lstm_actions if self.lstm_weight > self.mlp_weight else mlp_actions
+            return np.where(mlp_actions == lstm_actions, mlp_actions, preferred).astype(np.int64)
+        elif self.voting_method == 'hard':
+            mlp_vote = mlp_actions.astype(np.int64)
+            lstm_vote = lstm_actions.astype(np.int64)
+            score_0 = (1 - mlp_vote) * self.mlp_weight + (1 - lstm_vote) * self.lstm_weight
+            score_1 = mlp_vote * self.mlp_weight + lstm_vote * self.lstm_weight
+            return (score_1 > score_0).astype(np.int64)
+        else:
+            raise ValueError(f"Metodo de voting desconhecido: {self.voting_method}")
+
     def get_config(self) -> Dict[str, Any]:
         """Retorna configuracao do ensemble para logging."""
         return {
@@ -192,7 +232,8 @@ def evaluate_ensemble(
     ensemble: EnsembleVotingPPO,
     env: LSTMSignalEnvironment,
     n_episodes: int = 10,
-    deterministic: bool = True
+    deterministic: bool = True,
+    batch_envs: int = 1
 ) -> Dict[str, float]:
     """
     Avalia ensemble em ambiente.
@@ -202,6 +243,8 @@ def evaluate_ensemble(
         env: Environment para avaliacao
         n_episodes: Numero de episodios
         deterministic: Use deterministic policy
+        batch_envs: Episodios em lockstep com inferencia em lote
+            (copias de env; 1 = um episodio por vez)
 
     Returns:
         Dicionario com metricas (mean_reward, std_reward, etc)
@@ -209,7 +252,18 @@ def evaluate_ensemble(
     episode_rewards = []
     episode_lengths = []
 
-    for episode in range(n_episodes):
+    if batch_envs > 1:
+        envs = [env] + spawn_env_copies(env, min(batch_envs, n_episodes) - 1)
+        seeds = episode_seeds(env, len(envs))
+        while len(episode_rewards) < n_episodes:
+            batch = envs[:n_episodes - len(episode_rewards)]
+            results = run_lockstep(batch, ensemble, deterministic, seeds=seeds[:len(batch)])
+            seeds = [None] * len(envs)
+            for result in results:
+                episode_rewards.append(result['reward'])
+                episode_lengths.append(result['steps'])
+
+    for episode in range(len(episode_rewards), n_episodes):
         obs, info = env.reset()
         done = False
         total_reward = 0
@@ -0,0 +1,72 @@
+"""Exporta checkpoints PPO para o runtime NumPy de inferencia (M2_INFERENCE_RUNTIME=numpy)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from core.model2.policy_runtime import export_checkpoint
+
+DEFAULT_CHECKPOINT_DIR = REPO_ROOT / "checkpoints"
+
+
+def _resolve_repo_path(value: str | Path) -> Path:
+    path = Path(value)
+    if path.is_absolute():
+        return path
+    return (REPO_ROOT / path).resolve()
+
+
+def run_export_policy(*, checkpoints: list[str | Path]) -> dict[str, Any]:
+    """Exporta cada checkpoint; sem lista, todos os .zip em checkpoints/."""
+    if checkpoints:
+        paths = [_resolve_repo_path(item) for item in checkpoints]
+    else:
+        paths = sorted(DEFAULT_CHECKPOINT_DIR.rglob("*.zip"))
+
+    exported: list[dict[str, str]] = []
+    failed: list[dict[str, str]] = []
+    for path in paths:
+        try:
+            artifact = export_checkpoint(path)
+        except Exception as exc:
+            failed.append({"checkpoint": str(path), "error": str(exc)})
+            continue
+        exported.append({"checkpoint": str(path), "artifact": str(artifact)})
+
+    return {
+        "status": "ok" if not failed else "partial" if exported else "error",
+        "exported_count": len(exported),
+        "failed_count": len(failed),
+        "exported": exported,
+        "failed": failed,
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Model 2.0 PPO policy exporter (NumPy runtime)")
+    parser.add_argument(
+        "--checkpoint",
+        action="append",
+        default=[],
+        help="PPO checkpoint to export (repeatable). Default: every .zip under checkpoints/.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    summary = run_export_policy(checkpoints=args.checkpoint)
+    print(json.dumps(summary, indent=2, ensure_ascii=True))
+    return 0 if summary["status"] != "error" else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
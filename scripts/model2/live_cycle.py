@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import sys
 import traceback
@@ -26,12 +27,10 @@ from config.settings import (
     M2_SYMBOL_COOLDOWN_MINUTES,
     MODEL2_DB_PATH,
 )
-from core.model2.cycle_report import format_cycle_summary
-from scripts.model2.live_dashboard import run_live_dashboard
-from scripts.model2.live_execute import run_live_execute
-from scripts.model2.live_reconcile import run_live_reconcile
+from core.lazy_imports import ImportProfiler
 
 DEFAULT_OUTPUT_DIR = REPO_ROOT / "results" / "model2" / "runtime"
+IMPORT_PROFILE_TOP = 25
 
 
 def run_live_cycle(
@@ -50,7 +49,19 @@ def run_live_cycle(
     short_only: bool,
     funding_rate_max_for_short: float,
     leverage: int,
+    execute_service: Any | None = None,
+    reconcile_service: Any | None = None,
 ) -> dict[str, Any]:
+    """Executa execute -> reconcile -> dashboard.
+
+    execute_service/reconcile_service: servicos ja montados (live_daemon os
+    mantem entre ciclos); sem eles, cada etapa monta o seu.
+    """
+    # Cada etapa importa o que usa: o custo aparece no --profile-imports
+    from scripts.model2.live_dashboard import run_live_dashboard
+    from scripts.model2.live_execute import run_live_execute
+    from scripts.model2.live_reconcile import run_live_reconcile
+
     run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     execute_summary = run_live_execute(
         model2_db_path=model2_db_path,
@@ -67,6 +78,7 @@ def run_live_cycle(
         short_only=short_only,
         funding_rate_max_for_short=funding_rate_max_for_short,
         leverage=leverage,
+        service=execute_service,
     )
     reconcile_summary = run_live_reconcile(
         model2_db_path=model2_db_path,
@@ -83,6 +95,7 @@ def run_live_cycle(
         short_only=short_only,
         funding_rate_max_for_short=funding_rate_max_for_short,
         leverage=leverage,
+        service=reconcile_service,
     )
     dashboard_summary = run_live_dashboard(
         model2_db_path=model2_db_path,
@@ -111,6 +124,8 @@ def render_live_cycle_summary(
 ) -> str:
     """Renderizar summary do ciclo live em formato estruturado."""
     try:
+        from core.model2.cycle_report import format_cycle_summary
+
         return format_cycle_summary(
             run_id=run_id,
             execution_mode=execution_mode,
@@ -139,36 +154,43 @@ def _parse_args() -> argparse.Namespace:
     parser.add_argument("--short-only", action="store_true", default=M2_SHORT_ONLY)
     parser.add_argument("--funding-rate-max-for-short", type=float, default=M2_FUNDING_RATE_MAX_FOR_SHORT)
     parser.add_argument("--leverage", type=int, default=M2_CANARY_LEVERAGE)
+    parser.add_argument(
+        "--profile-imports",
+        action="store_true",
+        help="Report per-module import cost of the cycle in the summary (import_profile).",
+    )
     return parser.parse_args()
 
 
 def main() -> int:
     args = _parse_args()
     live_symbols = tuple(symbol.upper() for symbol in (args.live_symbol or M2_LIVE_SYMBOLS) if symbol)
+    profiler = ImportProfiler() if args.profile_imports else None
     try:
-        summary = run_live_cycle(
-            model2_db_path=args.model2_db_path,
-            symbol=args.symbol,
-            timeframe=args.timeframe,
-            limit=int(args.limit),
-            output_dir=args.output_dir,
-            execution_mode=args.execution_mode,
-            live_symbols=live_symbols,
-            max_daily_entries=int(args.max_daily_entries),
-            max_margin_per_position_usd=float(args.max_margin_per_position_usd),
-            max_signal_age_minutes=int(args.max_signal_age_minutes),
-            symbol_cooldown_minutes=int(args.symbol_cooldown_minutes),
-            short_only=bool(args.short_only),
-            funding_rate_max_for_short=float(args.funding_rate_max_for_short),
-            leverage=int(args.leverage),
-        )
-        # Renderizar summary estruturado
-        structured_output = render_live_cycle_summary(
-            run_id=summary.get("run_id", ""),
-            execution_mode=summary.get("execution_mode", ""),
-            summary=summary,
-            output_dir=args.output_dir,
-        )
+        with profiler or contextlib.nullcontext():
+            summary = run_live_cycle(
+                model2_db_path=args.model2_db_path,
+                symbol=args.symbol,
+                timeframe=args.timeframe,
+                limit=int(args.limit),
+                output_dir=args.output_dir,
+                execution_mode=args.execution_mode,
+                live_symbols=live_symbols,
+                max_daily_entries=int(args.max_daily_entries),
+                max_margin_per_position_usd=float(args.max_margin_per_position_usd),
+                max_signal_age_minutes=int(args.max_signal_age_minutes),
+                symbol_cooldown_minutes=int(args.symbol_cooldown_minutes),
+                short_only=bool(args.short_only),
+                funding_rate_max_for_short=float(args.funding_rate_max_for_short),
+                leverage=int(args.leverage),
+            )
+            # Renderizar summary estruturado
+            structured_output = render_live_cycle_summary(
+                run_id=summary.get("run_id", ""),
+                execution_mode=summary.get("execution_mode", ""),
+                summary=summary,
+                output_dir=args.output_dir,
+            )
         if structured_output:
             print(structured_output, flush=True)
     except Exception as exc:
@@ -178,6 +200,8 @@ def main() -> int:
             "error": str(exc),
             "traceback": tb,
         }
+    if profiler is not None:
+        summary["import_profile"] = profiler.report(limit=IMPORT_PROFILE_TOP)
     print(json.dumps(summary, indent=2, ensure_ascii=True))
     return 0
 
@@ -0,0 +1,703 @@
+"""Model 2.0 live daemon: pipeline + live cycle in one long-running process.
+
+O loop do iniciar.bat sobe um processo novo por etapa e por ciclo, pagando
+interpretador, imports, carga do modelo, cliente da exchange e cache OHLCV
+frio a cada rodada. O daemon mantem tudo isso vivo:
+
+1. Cliente da exchange (compartilhado por execute e reconcile) e o modelo RL
+   do MODEL_REGISTRY.
+2. Um OhlcvCacheProvider unico entre ciclos (expira no fechamento do candle)
+   e o estado SMC incremental do scan (so os candles novos sao processados).
+3. Conexoes SQLite do SQLITE_POOL: os ciclos rodam sempre na mesma thread
+   de trabalho, e o pool e por thread.
+
+Ciclos disparam no fechamento dos candles dos timeframes configurados (mais
+uma folga para a fonte publicar o candle): em cada fechamento roda o
+daily_pipeline dos timeframes que fecharam e, em seguida, o live cycle.
+
+Os Model2LiveExecutionService sao montados a cada ciclo (~0.4ms), como no
+processo por ciclo: RiskGate e CircuitBreaker voltam a semear o pico de saldo
+no inicio de cada ciclo, em vez de medir drawdown contra o pico do inicio do
+daemon.
+
+Um socket de controle local (TCP em 127.0.0.1, uma linha JSON por pedido)
+atende ``status``/``health``, ``run`` (ciclo sob demanda) e ``stop``. Todo
+pedido leva o token do daemon (M2_DAEMON_CONTROL_TOKEN ou o gerado na
+partida e gravado em ``model2_live_daemon.token`` no diretorio de saida).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hmac
+import json
+import logging
+import os
+import queue
+import secrets
+import socket
+import socketserver
+import sys
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Iterable
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from config.settings import (
+    DB_PATH,
+    M2_CANARY_LEVERAGE,
+    M2_DAEMON_CONTROL_PORT,
+    M2_DAEMON_CONTROL_TOKEN,
+    M2_EXECUTION_MODE,
+    M2_FUNDING_RATE_MAX_FOR_SHORT,
+    M2_LIVE_SYMBOLS,
+    M2_MAX_DAILY_ENTRIES,
+    M2_MAX_MARGIN_PER_POSITION_USD,
+    M2_MAX_SIGNAL_AGE_MINUTES,
+    M2_SHORT_ONLY,
+    M2_SYMBOL_COOLDOWN_MINUTES,
+    MODEL2_DB_PATH,
+)
+from core.model2.ohlcv_cache import (
+    TIMEFRAME_DURATION_MS,
+    OhlcvCacheProvider,
+    next_candle_close_ms,
+)
+from indicators.smc_incremental import IncrementalSMCRegistry
+from scripts.model2.daily_pipeline import run_daily_pipeline
+from scripts.model2.io_utils import atomic_write_json
+from scripts.model2.live_cycle import run_live_cycle
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_DIR = REPO_ROOT / "results" / "model2" / "runtime"
+DEFAULT_CONTROL_HOST = "127.0.0.1"
+DEFAULT_TIMEFRAMES = ("D1", "H4", "H1", "M5")
+DEFAULT_GRACE_SECONDS = 5.0
+STATUS_FILE_NAME = "model2_live_daemon_status.json"
+TOKEN_FILE_NAME = "model2_live_daemon.token"
+MAX_CONTROL_REQUEST_BYTES = 64 * 1024
+CONTROL_COMMANDS = ("status", "health", "run", "stop")
+
+
+def _utc_now_ms() -> int:
+    return int(datetime.now(timezone.utc).timestamp() * 1000)
+
+
+def _resolve_repo_path(value: str | Path) -> Path:
+    path = Path(value)
+    if path.is_absolute():
+        return path
+    return (REPO_ROOT / path).resolve()
+
+
+def read_control_token(output_dir: str | Path = DEFAULT_OUTPUT_DIR) -> str:
+    """Token do socket de controle: M2_DAEMON_CONTROL_TOKEN ou o arquivo do daemon."""
+    if M2_DAEMON_CONTROL_TOKEN:
+        return M2_DAEMON_CONTROL_TOKEN
+    token_file = _resolve_repo_path(output_dir) / TOKEN_FILE_NAME
+    try:
+        return token_file.read_text(encoding="utf-8").strip()
+    except OSError:
+        return ""
+
+
+def next_boundary_ms(timeframes: Iterable[str], after_ms: int) -> int:
+    """Proximo fechamento de candle (estritamente depois de after_ms) entre os timeframes."""
+    return min(int(next_candle_close_ms(timeframe, after_ms)) for timeframe in timeframes)  # type: ignore[arg-type]
+
+
+def due_timeframes(timeframes: Iterable[str], boundary_ms: int) -> tuple[str, ...]:
+    """Timeframes cujo candle fecha exatamente em boundary_ms."""
+    return tuple(
+        timeframe
+        for timeframe in timeframes
+        if next_candle_close_ms(timeframe, int(boundary_ms) - 1) == int(boundary_ms)
+    )
+
+
+@dataclass
+class _CycleRequest:
+    reason: str
+    timeframes: tuple[str, ...]
+    done: threading.Event = field(default_factory=threading.Event)
+    result: dict[str, Any] | None = None
+
+
+class _ControlServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int], live_daemon: "Model2LiveDaemon") -> None:
+        self.live_daemon = live_daemon
+        super().__init__(address, _ControlHandler)
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    """Uma linha JSON de pedido, uma linha JSON de resposta."""
+
+    def handle(self) -> None:
+        raw = self.rfile.readline(MAX_CONTROL_REQUEST_BYTES)
+        try:
+            request = json.loads(raw or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as exc:
+            reply: dict[str, Any] = {"status": "error", "error": f"invalid request: {exc}"}
+        else:
+            live_daemon = self.server.live_daemon  # type: ignore[attr-defined]
+            if live_daemon.is_authorized(request.get("token")):
+                reply = live_daemon.handle_command(request)
+            else:
+                reply = {"status": "error", "error": "unauthorized"}
+        self.wfile.write((json.dumps(reply, ensure_ascii=True, default=str) + "\n").encode("utf-8"))
+
+
+class Model2LiveDaemon:
+    """Processo longo que agenda pipeline + live cycle no fechamento dos candles."""
+
+    def __init__(
+        self,
+        *,
+        source_db_path: str | Path,
+        model2_db_path: str | Path,
+        legacy_db_path: str | Path,
+        symbols: list[str],
+        timeframes: tuple[str, ...],
+        output_dir: str | Path,
+        execution_mode: str,
+        live_symbols: tuple[str, ...],
+        max_daily_entries: int,
+        max_margin_per_position_usd: float,
+        max_signal_age_minutes: int,
+        symbol_cooldown_minutes: int,
+        short_only: bool,
+        funding_rate_max_for_short: float,
+        leverage: int,
+        limit: int = 200,
+        run_pipeline: bool = True,
+        grace_seconds: float = DEFAULT_GRACE_SECONDS,
+        cache_provider: OhlcvCacheProvider | None = None,
+        now_ms: Callable[[], int] | None = None,
+        control_token: str | None = None,
+    ) -> None:
+        """
+        Args:
+            timeframes: Timeframes do daily_pipeline; seus fechamentos agendam os ciclos
+            run_pipeline: False roda so o live cycle nos fechamentos
+            grace_seconds: Folga apos o fechamento para a fonte publicar o candle
+            cache_provider: Cache OHLCV compartilhado entre ciclos
+            now_ms: Relogio injetavel (ms UTC)
+            control_token: Token exigido no socket de controle; vazio gera um aleatorio
+        """
+        normalized = tuple(dict.fromkeys(str(tf).upper() for tf in timeframes))
+        unknown = [tf for tf in normalized if tf not in TIMEFRAME_DURATION_MS]
+        if not normalized or unknown:
+            raise ValueError(f"timeframes invalidos para agendamento: {unknown or 'nenhum'}")
+        self.timeframes = normalized
+        self.source_db_path = source_db_path
+        self.model2_db_path = model2_db_path
+        self.legacy_db_path = legacy_db_path
+        self.symbols = list(symbols)
+        self.output_dir = _resolve_repo_path(output_dir)
+        self.execution_mode = execution_mode
+        self.live_symbols = tuple(live_symbols)
+        self.max_daily_entries = int(max_daily_entries)
+        self.max_margin_per_position_usd = float(max_margin_per_position_usd)
+        self.max_signal_age_minutes = int(max_signal_age_minutes)
+        self.symbol_cooldown_minutes = int(symbol_cooldown_minutes)
+        self.short_only = bool(short_only)
+        self.funding_rate_max_for_short = float(funding_rate_max_for_short)
+        self.leverage = int(leverage)
+        self.limit = int(limit)
+        self.run_pipeline = bool(run_pipeline)
+        self._grace_ms = int(float(grace_seconds) * 1000)
+        self._now_ms = now_ms or _utc_now_ms
+        self.cache_provider = cache_provider or OhlcvCacheProvider()
+        # Sem status de zona: o detector filtra por status e o batch so devolve FRESH/OPEN
+        self.smc_state = IncrementalSMCRegistry(track_zone_status=False)
+        self._control_token = control_token or M2_DAEMON_CONTROL_TOKEN or secrets.token_urlsafe(32)
+
+        self._exchange: Any | None = None
+        self._requests: queue.Queue[_CycleRequest | None] = queue.Queue()
+        self._state_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._worker: threading.Thread | None = None
+        self._server: _ControlServer | None = None
+        self._server_thread: threading.Thread | None = None
+        self._started_at_ms = self._now_ms()
+        self._busy_since_ms: int | None = None
+        self._cycles = 0
+        self._cycles_failed = 0
+        self._last_cycle: dict[str, Any] | None = None
+        self._last_success_ms: int | None = None
+        self._next_trigger_ms: int | None = None
+        # Ciclo mais lento tolerado antes de reportar unhealthy
+        self._stale_after_ms = 2 * min(TIMEFRAME_DURATION_MS[tf] for tf in self.timeframes) + 60_000
+
+    # ------------------------------------------------------------------
+    # Ciclo
+    # ------------------------------------------------------------------
+
+    def _build_services(self) -> tuple[Any, Any]:
+        """Servicos novos por ciclo (guardrails semeados de novo); a exchange e reutilizada."""
+        from scripts.model2.live_execute import build_live_execute_service
+        from scripts.model2.live_reconcile import build_live_reconcile_service
+
+        settings: dict[str, Any] = {
+            "model2_db_path": self.model2_db_path,
+            "execution_mode": self.execution_mode,
+            "live_symbols": self.live_symbols,
+            "max_daily_entries": self.max_daily_entries,
+            "max_margin_per_position_usd": self.max_margin_per_position_usd,
+            "max_signal_age_minutes": self.max_signal_age_minutes,
+            "symbol_cooldown_minutes": self.symbol_cooldown_minutes,
+            "short_only": self.short_only,
+            "funding_rate_max_for_short": self.funding_rate_max_for_short,
+            "leverage": self.leverage,
+        }
+        execute_service = build_live_execute_service(**settings, exchange=self._exchange)
+        # Em live o primeiro build cria o cliente da exchange (e valida o token de mainnet)
+        self._exchange = execute_service.exchange
+        reconcile_service = build_live_reconcile_service(**settings, exchange=self._exchange)
+        return execute_service, reconcile_service
+
+    def _pipeline_kwargs(self, timeframe: str) -> dict[str, Any]:
+        return {
+            "source_db_path": self.source_db_path,
+            "model2_db_path": self.model2_db_path,
+            "legacy_db_path": self.legacy_db_path,
+            "symbols": list(self.symbols),
+            "timeframe": timeframe,
+            "scan_candles_limit": 120,
+            "validation_candles_limit": 240,
+            "resolution_candles_limit": 240,
+            "limit": self.limit,
+            "dry_run": False,
+            "continue_on_error": True,
+            "retention_days": 30,
+            "output_dir": self.output_dir,
+            "cache_provider": self.cache_provider,
+            "smc_state": self.smc_state,
+        }
+
+    def _run_live_cycle(self) -> dict[str, Any]:
+        execute_service, reconcile_service = self._build_services()
+        return run_live_cycle(
+            model2_db_path=self.model2_db_path,
+            symbol=None,
+            timeframe=None,
+            limit=self.limit,
+            output_dir=self.output_dir,
+            execution_mode=self.execution_mode,
+            live_symbols=self.live_symbols,
+            max_daily_entries=self.max_daily_entries,
+            max_margin_per_position_usd=self.max_margin_per_position_usd,
+            max_signal_age_minutes=self.max_signal_age_minutes,
+            symbol_cooldown_minutes=self.symbol_cooldown_minutes,
+            short_only=self.short_only,
+            funding_rate_max_for_short=self.funding_rate_max_for_short,
+            leverage=self.leverage,
+            execute_service=execute_service,
+            reconcile_service=reconcile_service,
+        )
+
+    def run_cycle(
+        self,
+        *,
+        reason: str = "manual",
+        timeframes: tuple[str, ...] | None = None,
+        boundary_ms: int | None = None,
+    ) -> dict[str, Any]:
+        """Roda pipeline dos timeframes informados + live cycle na thread atual."""
+        pipeline_timeframes = self.timeframes if timeframes is None else tuple(timeframes)
+        started_ms = self._now_ms()
+        started = perf_counter()
+        with self._state_lock:
+            self._busy_since_ms = started_ms
+            cycle_index = self._cycles + 1
+
+        stages: dict[str, dict[str, Any]] = {}
+        stage_errors: list[dict[str, Any]] = []
+        plan: list[tuple[str, Callable[[], dict[str, Any]]]] = []
+        if self.run_pipeline:
+            for timeframe in pipeline_timeframes:
+                kwargs = self._pipeline_kwargs(timeframe)
+                plan.append((f"daily_pipeline_{timeframe}", partial(run_daily_pipeline, **kwargs)))
+        plan.append(("live_cycle", self._run_live_cycle))
+
+        for stage_name, stage_callable in plan:
+            stage_started = perf_counter()
+            try:
+                result = stage_callable()
+            except Exception as exc:
+                logger.exception("Etapa %s falhou no ciclo %s", stage_name, cycle_index)
+                elapsed_ms = int((perf_counter() - stage_started) * 1000)
+                stages[stage_name] = {"status": "error", "elapsed_ms": elapsed_ms}
+                stage_errors.append({"stage": stage_name, "error": str(exc), "elapsed_ms": elapsed_ms})
+                continue
+            stages[stage_name] = {
+                "status": str(result.get("status", "ok")),
+                "elapsed_ms": int((perf_counter() - stage_started) * 1000),
+                "output_file": result.get("output_file"),
+            }
+
+        if not stage_errors:
+            status = "ok"
+        elif "live_cycle" in {error["stage"] for error in stage_errors}:
+            status = "error"
+        else:
+            status = "partial"
+        summary: dict[str, Any] = {
+            "status": status,
+            "cycle_index": cycle_index,
+            "reason": reason,
+            "boundary_utc_ms": boundary_ms,
+            "started_at_utc_ms": started_ms,
+            "elapsed_ms": int((perf_counter() - started) * 1000),
+            "execution_mode": self.execution_mode,
+            "timeframes": list(pipeline_timeframes) if self.run_pipeline else [],
+            "stages": stages,
+            "stage_errors": stage_errors,
+        }
+        with self._state_lock:
+            self._busy_since_ms = None
+            self._cycles = cycle_index
+            self._last_cycle = summary
+            if status == "error":
+                self._cycles_failed += 1
+            else:
+                self._last_success_ms = started_ms
+        logger.info(
+            "Ciclo %s (%s) status=%s elapsed_ms=%s timeframes=%s",
+            cycle_index,
+            reason,
+            status,
+            summary["elapsed_ms"],
+            ",".join(summary["timeframes"]) or "-",
+        )
+        self._write_status()
+        return summary
+
+    # ------------------------------------------------------------------
+    # Agendamento
+    # ------------------------------------------------------------------
+
+    def next_scheduled(self, after_ms: int) -> tuple[int, tuple[str, ...]]:
+        """Proximo fechamento depois de after_ms e os timeframes que fecham nele.
+
+        Se o ciclo anterior estourou e fechamentos seguintes ja passaram, eles
+        viram um ciclo so com a uniao dos timeframes (nenhum pipeline se perde).
+        """
+        boundary = next_boundary_ms(self.timeframes, after_ms)
+        due = set(due_timeframes(self.timeframes, boundary))
+        now_ms = self._now_ms()
+        while True:
+            following = next_boundary_ms(self.timeframes, boundary)
+            if following + self._grace_ms > now_ms:
+                break
+            boundary = following
+            due.update(due_timeframes(self.timeframes, following))
+        return boundary, tuple(tf for tf in self.timeframes if tf in due)
+
+    def serve_forever(self, *, run_on_start: bool = True) -> None:
+        """Loop da thread de trabalho: fechamentos de candle e pedidos do socket."""
+        self._worker = threading.current_thread()
+        if run_on_start and not self._stopping.is_set():
+            self.run_cycle(reason="startup")
+        boundary, due = self.next_scheduled(self._now_ms())
+        while not self._stopping.is_set():
+            trigger_ms = boundary + self._grace_ms
+            with self._state_lock:
+                self._next_trigger_ms = trigger_ms
+            wait_s = max(0.0, (trigger_ms - self._now_ms()) / 1000)
+            try:
+                request = self._requests.get(timeout=wait_s)
+            except queue.Empty:
+                self.run_cycle(reason="candle_close", timeframes=due, boundary_ms=boundary)
+                boundary, due = self.next_scheduled(boundary)
+                continue
+            if request is None:
+                break
+            request.result = self.run_cycle(reason=request.reason, timeframes=request.timeframes)
+            request.done.set()
+        self._drain_requests()
+
+    def _drain_requests(self) -> None:
+        while True:
+            try:
+                request = self._requests.get_nowait()
+            except queue.Empty:
+                return
+            if request is not None:
+                request.result = {"status": "error", "error": "daemon stopping"}
+                request.done.set()
+
+    def request_cycle(
+        self,
+        *,
+        timeframes: Iterable[str] | None = None,
+        reason: str = "on_demand",
+        timeout: float | None = None,
+    ) -> dict[str, Any]:
+        """Enfileira um ciclo na thread de trabalho e espera o resultado."""
+        if self._stopping.is_set():
+            return {"status": "error", "error": "daemon stopping"}
+        selected = self.timeframes if timeframes is None else tuple(str(tf).upper() for tf in timeframes)
+        unknown = [tf for tf in selected if tf not in self.timeframes]
+        if unknown:
+            return {"status": "error", "error": f"timeframes fora do agendamento: {unknown}"}
+        request = _CycleRequest(reason=reason, timeframes=selected)
+        self._requests.put(request)
+        if not request.done.wait(timeout):
+            return {"status": "error", "error": "timeout waiting for cycle (still queued/running)"}
+        return request.result or {"status": "error", "error": "no result"}
+
+    def stop(self) -> None:
+        """Para o loop apos o ciclo em andamento e fecha o socket de controle."""
+        self._stopping.set()
+        self._requests.put(None)
+        if self._server is not None:
+            # shutdown() bloqueia ate o serve_forever sair; nao chamar da thread do servidor
+            threading.Thread(target=self._shutdown_server, daemon=True).start()
+
+    def _shutdown_server(self) -> None:
+        server = self._server
+        if server is None:
+            return
+        server.shutdown()
+        server.server_close()
+        (self.output_dir / TOKEN_FILE_NAME).unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Controle e saude
+    # ------------------------------------------------------------------
+
+    def start_control_server(self, host: str = DEFAULT_CONTROL_HOST, port: int = M2_DAEMON_CONTROL_PORT) -> tuple[str, int]:
+        """Sobe o socket de controle em background; retorna o endereco efetivo."""
+        self._write_token_file()
+        self._server = _ControlServer((host, int(port)), self)
+        self._server_thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="model2-live-daemon-control",
+            daemon=True,
+        )
+        self._server_thread.start()
+        address = self._server.server_address
+        logger.info("Socket de controle em %s:%s", address[0], address[1])
+        return str(address[0]), int(address[1])
+
+    def _write_token_file(self) -> None:
+        """Grava o token para clientes locais; legivel so pelo usuario do daemon."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        token_file = self.output_dir / TOKEN_FILE_NAME
+        fd = os.open(token_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(self._control_token)
+        os.chmod(token_file, 0o600)
+
+    def is_authorized(self, token: Any) -> bool:
+        """Compara o token do pedido em tempo constante."""
+        return isinstance(token, str) and hmac.compare_digest(token.encode("utf-8"), self._control_token.encode("utf-8"))
+
+    def status(self) -> dict[str, Any]:
+        """Estado do daemon, com veredito de saude em 'healthy'."""
+        from core.model2.model_registry import MODEL_REGISTRY
+
+        now_ms = self._now_ms()
+        with self._state_lock:
+            last_cycle = dict(self._last_cycle) if self._last_cycle else None
+            last_success_ms = self._last_success_ms
+            busy_since_ms = self._busy_since_ms
+            payload: dict[str, Any] = {
+                "status": "stopping" if self._stopping.is_set() else "running",
+                "pid": os.getpid(),
+                "started_at_utc_ms": self._started_at_ms,
+                "uptime_seconds": round((now_ms - self._started_at_ms) / 1000, 1),
+                "execution_mode": self.execution_mode,
+                "timeframes": list(self.timeframes),
+                "run_pipeline": self.run_pipeline,
+                "cycles": self._cycles,
+                "cycles_failed": self._cycles_failed,
+                "busy_since_utc_ms": busy_since_ms,
+                "queued_requests": self._requests.qsize(),
+                "next_trigger_utc_ms": self._next_trigger_ms,
+                "last_success_utc_ms": last_success_ms,
+                "last_cycle": last_cycle,
+            }
+        reference_ms = last_success_ms if last_success_ms is not None else self._started_at_ms
+        worker_alive = self._worker is None or self._worker.is_alive()
+        payload["healthy"] = bool(
+            worker_alive
+            and not self._stopping.is_set()
+            and (last_cycle is None or last_cycle["status"] != "error")
+            and now_ms - reference_ms <= self._stale_after_ms
+        )
+        payload["ohlcv_cache"] = self.cache_provider.stats()
+        payload["model_registry"] = MODEL_REGISTRY.stats()
+        return payload
+
+    def _write_status(self) -> None:
+        """Espelha status() em disco para healthchecks que nao falam com o socket."""
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            atomic_write_json(self.output_dir / STATUS_FILE_NAME, self.status(), ensure_ascii=True, indent=2)
+        except OSError:
+            logger.warning("Falha ao gravar %s", STATUS_FILE_NAME, exc_info=True)
+
+    def handle_command(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Atende um pedido do socket de controle."""
+        command = str(request.get("command") or "").strip().lower()
+        if command in {"status", "health"}:
+            return self.status()
+        if command == "run":
+            timeout = request.get("timeout_seconds")
+            return self.request_cycle(
+                timeframes=request.get("timeframes"),
+                timeout=float(timeout) if timeout is not None else None,
+            )
+        if command == "stop":
+            self.stop()
+            return {"status": "stopping"}
+        return {"status": "error", "error": f"unknown command {command!r}; expected one of {list(CONTROL_COMMANDS)}"}
+
+
+def send_control_command(
+    command: str,
+    *,
+    host: str = DEFAULT_CONTROL_HOST,
+    port: int = M2_DAEMON_CONTROL_PORT,
+    token: str | None = None,
+    timeout: float | None = 30.0,
+    **params: Any,
+) -> dict[str, Any]:
+    """Cliente do socket de controle: envia um comando e devolve a resposta JSON.
+
+    Sem token explicito, usa read_control_token() do diretorio de saida padrao.
+    """
+    request = {"command": command, "token": token if token is not None else read_control_token(), **params}
+    payload = json.dumps(request, ensure_ascii=True) + "\n"
+    with socket.create_connection((host, int(port)), timeout=timeout) as conn:
+        conn.sendall(payload.encode("utf-8"))
+        with conn.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("control socket closed without reply")
+    reply: dict[str, Any] = json.loads(line)
+    return reply
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Model 2.0 long-running live daemon")
+    parser.add_argument("--source-db-path", default=DB_PATH)
+    parser.add_argument("--model2-db-path", default=MODEL2_DB_PATH)
+    parser.add_argument("--legacy-db-path", default=DB_PATH)
+    parser.add_argument(
+        "--symbol",
+        action="append",
+        default=[],
+        help="Pipeline symbol filter. Repeat to pass multiple values. Defaults to M2_SYMBOLS.",
+    )
+    parser.add_argument(
+        "--timeframe",
+        action="append",
+        default=[],
+        choices=["D1", "H4", "H1", "M5"],
+        help="Pipeline timeframe; its candle closes schedule the cycles. Defaults to D1,H4,H1,M5.",
+    )
+    parser.add_argument("--no-pipeline", action="store_true", help="Run only the live cycle on candle closes.")
+    parser.add_argument("--grace-seconds", type=float, default=DEFAULT_GRACE_SECONDS)
+    parser.add_argument("--no-run-on-start", action="store_true", help="Wait for the first candle close.")
+    parser.add_argument("--run-once", action="store_true", help="Run a single warm cycle and exit.")
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--output-dir", default=str(DEFAULT_OUTPUT_DIR))
+    parser.add_argument("--execution-mode", default=M2_EXECUTION_MODE)
+    parser.add_argument("--live-symbol", action="append", default=[])
+    parser.add_argument("--max-daily-entries", type=int, default=M2_MAX_DAILY_ENTRIES)
+    parser.add_argument("--max-margin-per-position-usd", type=float, default=M2_MAX_MARGIN_PER_POSITION_USD)
+    parser.add_argument("--max-signal-age-minutes", type=int, default=M2_MAX_SIGNAL_AGE_MINUTES)
+    parser.add_argument("--symbol-cooldown-minutes", type=int, default=M2_SYMBOL_COOLDOWN_MINUTES)
+    parser.add_argument("--short-only", action="store_true", default=M2_SHORT_ONLY)
+    parser.add_argument("--funding-rate-max-for-short", type=float, default=M2_FUNDING_RATE_MAX_FOR_SHORT)
+    parser.add_argument("--leverage", type=int, default=M2_CANARY_LEVERAGE)
+    parser.add_argument("--control-host", default=DEFAULT_CONTROL_HOST)
+    parser.add_argument("--control-port", type=int, default=M2_DAEMON_CONTROL_PORT)
+    parser.add_argument(
+        "--control-token",
+        default=None,
+        help="Control socket token. Defaults to M2_DAEMON_CONTROL_TOKEN or the daemon's token file in --output-dir.",
+    )
+    parser.add_argument(
+        "--control",
+        choices=CONTROL_COMMANDS,
+        default=None,
+        help="Send a command to a running daemon instead of starting one.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    if args.control:
+        try:
+            reply = send_control_command(
+                args.control,
+                host=args.control_host,
+                port=args.control_port,
+                token=args.control_token or read_control_token(args.output_dir),
+                timeout=None,
+            )
+        except OSError as exc:
+            reply = {"status": "error", "error": f"daemon unreachable: {exc}"}
+        print(json.dumps(reply, indent=2, ensure_ascii=True, default=str))
+        if reply.get("status") == "error" or (args.control in {"status", "health"} and not reply.get("healthy")):
+            return 1
+        return 0
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    live_symbols = tuple(symbol.upper() for symbol in (args.live_symbol or M2_LIVE_SYMBOLS) if symbol)
+    daemon = Model2LiveDaemon(
+        source_db_path=args.source_db_path,
+        model2_db_path=args.model2_db_path,
+        legacy_db_path=args.legacy_db_path,
+        symbols=list(args.symbol or []),
+        timeframes=tuple(args.timeframe or DEFAULT_TIMEFRAMES),
+        output_dir=args.output_dir,
+        execution_mode=args.execution_mode,
+        live_symbols=live_symbols,
+        max_daily_entries=int(args.max_daily_entries),
+        max_margin_per_position_usd=float(args.max_margin_per_position_usd),
+        max_signal_age_minutes=int(args.max_signal_age_minutes),
+        symbol_cooldown_minutes=int(args.symbol_cooldown_minutes),
+        short_only=bool(args.short_only),
+        funding_rate_max_for_short=float(args.funding_rate_max_for_short),
+        leverage=int(args.leverage),
+        limit=int(args.limit),
+        run_pipeline=not args.no_pipeline,
+        grace_seconds=float(args.grace_seconds),
+        control_token=args.control_token,
+    )
+    if args.run_once:
+        summary = daemon.run_cycle(reason="run_once")
+        print(json.dumps(summary, indent=2, ensure_ascii=True, default=str))
+        return 0 if summary["status"] != "error" else 1
+
+    daemon.start_control_server(args.control_host, args.control_port)
+    try:
+        daemon.serve_forever(run_on_start=not args.no_run_on_start)
+    except KeyboardInterrupt:
+        logger.info("Interrompido; encerrando daemon")
+    finally:
+        daemon.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
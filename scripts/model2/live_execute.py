@@ -33,7 +33,6 @@ from core.model2 import (
     Model2LiveExecutionService,
     Model2ThesisRepository,
 )
-from data.binance_client import create_binance_client
 from scripts.model2.io_utils import atomic_write_json
 
 DEFAULT_OUTPUT_DIR = REPO_ROOT / "results" / "model2" / "runtime"
@@ -72,13 +71,9 @@ def _ensure_model2_live_execute_schema(conn: sqlite3.Connection) -> None:
         )
 
 
-def run_live_execute(
+def build_live_execute_service(
     *,
     model2_db_path: str | Path,
-    symbol: str | None,
-    timeframe: str | None,
-    limit: int,
-    output_dir: str | Path,
     execution_mode: str,
     live_symbols: tuple[str, ...],
     max_daily_entries: int,
@@ -91,13 +86,9 @@ def run_live_execute(
     exchange: Model2LiveExchange | None = None,
     risk_gate: Any | None = None,
     circuit_breaker: Any | None = None,
-) -> dict[str, Any]:
+) -> Model2LiveExecutionService:
+    """Monta o servico de execucao; reutilizavel entre ciclos (live_daemon)."""
     resolved_model2_db = _resolve_repo_path(model2_db_path)
-    resolved_output_dir = _resolve_repo_path(output_dir)
-
-    with sqlite3.connect(resolved_model2_db) as conn:
-        _ensure_model2_live_execute_schema(conn)
-
     config = Model2LiveExecutionService.build_config(
         execution_mode=execution_mode,
         live_symbols=live_symbols,
@@ -114,9 +105,12 @@ def run_live_execute(
             raise RuntimeError(
                 "Mainnet confirmation token missing. Set M2_MAINNET_CONFIRM_TOKEN=YES_MAINNET to execute live."
             )
+        # SDK da Binance so e carregado quando ha execucao live
+        from data.binance_client import create_binance_client
+
         exchange = Model2LiveExchange(create_binance_client(mode="live"))
 
-    service = Model2LiveExecutionService(
+    return Model2LiveExecutionService(
         repository=Model2ThesisRepository(str(resolved_model2_db)),
         config=config,
         exchange=exchange,
@@ -124,6 +118,52 @@ def run_live_execute(
         circuit_breaker=circuit_breaker,
     )
 
+
+def run_live_execute(
+    *,
+    model2_db_path: str | Path,
+    symbol: str | None,
+    timeframe: str | None,
+    limit: int,
+    output_dir: str | Path,
+    execution_mode: str,
+    live_symbols: tuple[str, ...],
+    max_daily_entries: int,
+    max_margin_per_position_usd: float,
+    max_signal_age_minutes: int,
+    symbol_cooldown_minutes: int,
+    short_only: bool = False,
+    funding_rate_max_for_short: float = 0.0005,
+    leverage: int | None = None,
+    exchange: Model2LiveExchange | None = None,
+    risk_gate: Any | None = None,
+    circuit_breaker: Any | None = None,
+    service: Model2LiveExecutionService | None = None,
+) -> dict[str, Any]:
+    resolved_model2_db = _resolve_repo_path(model2_db_path)
+    resolved_output_dir = _resolve_repo_path(output_dir)
+
+    with sqlite3.connect(resolved_model2_db) as conn:
+        _ensure_model2_live_execute_schema(conn)
+
+    if service is None:
+        service = build_live_execute_service(
+            model2_db_path=resolved_model2_db,
+            execution_mode=execution_mode,
+            live_symbols=live_symbols,
+            max_daily_entries=max_daily_entries,
+            max_margin_per_position_usd=max_margin_per_position_usd,
+            max_signal_age_minutes=max_signal_age_minutes,
+            symbol_cooldown_minutes=symbol_cooldown_minutes,
+            short_only=short_only,
+            funding_rate_max_for_short=funding_rate_max_for_short,
+            leverage=leverage,
+            exchange=exchange,
+            risk_gate=risk_gate,
+            circuit_breaker=circuit_breaker,
+        )
+    config = service.config
+
     now_ms = _utc_now_ms()
     run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     execution_result = service.run_execute(
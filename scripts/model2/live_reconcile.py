@@ -27,7 +27,6 @@ from config.settings import (
     MODEL2_DB_PATH,
 )
 from core.model2 import Model2LiveExchange, Model2LiveExecutionService, Model2ThesisRepository
-from data.binance_client import create_binance_client
 from scripts.model2.io_utils import atomic_write_json
 
 DEFAULT_OUTPUT_DIR = REPO_ROOT / "results" / "model2" / "runtime"
@@ -84,13 +83,9 @@ def _ensure_model2_live_reconcile_schema(conn: sqlite3.Connection) -> None:
         )
 
 
-def run_live_reconcile(
+def build_live_reconcile_service(
     *,
     model2_db_path: str | Path,
-    symbol: str | None,
-    timeframe: str | None,
-    limit: int,
-    output_dir: str | Path,
     execution_mode: str,
     live_symbols: tuple[str, ...],
     max_daily_entries: int,
@@ -101,13 +96,8 @@ def run_live_reconcile(
     funding_rate_max_for_short: float = 0.0005,
     leverage: int | None = None,
     exchange: Model2LiveExchange | None = None,
-) -> dict[str, Any]:
-    resolved_model2_db = _resolve_repo_path(model2_db_path)
-    resolved_output_dir = _resolve_repo_path(output_dir)
-
-    with sqlite3.connect(resolved_model2_db) as conn:
-        _ensure_model2_live_reconcile_schema(conn)
-
+) -> Model2LiveExecutionService:
+    """Monta o servico de reconciliacao; reutilizavel entre ciclos (live_daemon)."""
     config = Model2LiveExecutionService.build_config(
         execution_mode=execution_mode,
         live_symbols=live_symbols,
@@ -121,16 +111,61 @@ def run_live_reconcile(
     )
     if exchange is None:
         if config.execution_mode == "live":
+            # SDK da Binance so e carregado quando ha execucao live
+            from data.binance_client import create_binance_client
+
             exchange = Model2LiveExchange(create_binance_client(mode="live"))
         else:
             exchange = _NoopExchange()  # type: ignore[assignment]
 
-    service = Model2LiveExecutionService(
-        repository=Model2ThesisRepository(str(resolved_model2_db)),
+    return Model2LiveExecutionService(
+        repository=Model2ThesisRepository(str(_resolve_repo_path(model2_db_path))),
         config=config,
         exchange=exchange,
     )
 
+
+def run_live_reconcile(
+    *,
+    model2_db_path: str | Path,
+    symbol: str | None,
+    timeframe: str | None,
+    limit: int,
+    output_dir: str | Path,
+    execution_mode: str,
+    live_symbols: tuple[str, ...],
+    max_daily_entries: int,
+    max_margin_per_position_usd: float,
+    max_signal_age_minutes: int,
+    symbol_cooldown_minutes: int,
+    short_only: bool = False,
+    funding_rate_max_for_short: float = 0.0005,
+    leverage: int | None = None,
+    exchange: Model2LiveExchange | None = None,
+    service: Model2LiveExecutionService | None = None,
+) -> dict[str, Any]:
+    resolved_model2_db = _resolve_repo_path(model2_db_path)
+    resolved_output_dir = _resolve_repo_path(output_dir)
+
+    with sqlite3.connect(resolved_model2_db) as conn:
+        _ensure_model2_live_reconcile_schema(conn)
+
+    if service is None:
+        service = build_live_reconcile_service(
+            model2_db_path=resolved_model2_db,
+            execution_mode=execution_mode,
+            live_symbols=live_symbols,
+            max_daily_entries=max_daily_entries,
+            max_margin_per_position_usd=max_margin_per_position_usd,
+            max_signal_age_minutes=max_signal_age_minutes,
+            symbol_cooldown_minutes=symbol_cooldown_minutes,
+            short_only=short_only,
+            funding_rate_max_for_short=funding_rate_max_for_short,
+            leverage=leverage,
+            exchange=exchange,
+        )
+    config = service.config
+
     now_ms = _utc_now_ms()
     run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     reconcile_result = service.run_reconcile(
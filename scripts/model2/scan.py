@@ -22,7 +22,9 @@ if str(REPO_ROOT) not in sys.path:
 from config.settings import DB_PATH, M2_SYMBOLS, MODEL2_DB_PATH
 from core.model2 import DetectorInput, Model2ThesisRepository, detect_initial_short_failure
 from core.model2.ohlcv_cache import OhlcvCacheProvider, build_cache_key
+from data.sqlite_pool import SQLITE_POOL
 from indicators.smc import SmartMoneyConcepts
+from indicators.smc_incremental import IncrementalSMCRegistry
 from scripts.model2.io_utils import atomic_write_json
 
 DEFAULT_OUTPUT_DIR = REPO_ROOT / "results" / "model2" / "runtime"
@@ -85,6 +87,31 @@ def _load_candles_cached(
     return candles_df
 
 
+def _prefetch_candles(
+    source_db_path: Path,
+    symbols: list[str],
+    timeframe: str,
+    limit: int,
+    cache_provider: OhlcvCacheProvider,
+) -> None:
+    """Carrega as series faltantes de todos os simbolos em paralelo.
+
+    Cada thread usa sua propria conexao do pool (sqlite3.Connection nao e
+    compartilhavel entre threads).
+    """
+    def _loader(target_symbol: str, target_timeframe: str, target_limit: int) -> list[dict[str, Any]]:
+        with SQLITE_POOL.acquire(source_db_path) as conn:
+            raw_records = _load_candles(
+                conn=conn,
+                symbol=target_symbol,
+                timeframe=target_timeframe,
+                limit=target_limit,
+            ).to_dict(orient="records")
+        return cast(list[dict[str, Any]], raw_records)
+
+    cache_provider.get_many([(symbol, timeframe, limit) for symbol in symbols], _loader)
+
+
 def _load_indicators(conn: sqlite3.Connection, symbol: str, timeframe: str, limit: int) -> list[dict[str, Any]]:
     rows = conn.execute(
         """
@@ -127,7 +154,16 @@ def run_scan(
     dry_run: bool,
     output_dir: str | Path,
     cache_provider: OhlcvCacheProvider | None = None,
+    smc_state: IncrementalSMCRegistry | None = None,
 ) -> dict[str, Any]:
+    """Run the scanner over ``symbols``.
+
+    When ``smc_state`` is given (long-lived processes), SMC structures are
+    kept per (symbol, timeframe) and only candles closed since the previous
+    run are processed; otherwise the full window is recomputed. The registry
+    must be built with ``track_zone_status=False``: the detector filters zones
+    by status and the batch path only ever reports FRESH/OPEN.
+    """
     resolved_source_db = _resolve_repo_path(source_db_path)
     resolved_model2_db = _resolve_repo_path(model2_db_path)
     resolved_output_dir = _resolve_repo_path(output_dir)
@@ -148,6 +184,9 @@ def run_scan(
     items: list[dict[str, Any]] = []
 
     try:
+        if cache_provider is not None and len(symbols) > 1:
+            _prefetch_candles(resolved_source_db, symbols, timeframe, candles_limit, cache_provider)
+
         for symbol in symbols:
             scanned += 1
             entry: dict[str, Any] = {
@@ -188,7 +227,13 @@ def run_scan(
                 timeframe=timeframe,
                 limit=candles_limit,
             )
-            smc = SmartMoneyConcepts.calculate_all_smc(candles_df)
+            if smc_state is None:
+                smc = SmartMoneyConcepts.calculate_all_smc(candles_df)
+            else:
+                # Recorte do estado aos candles carregados: indices alinhados a candles
+                # e Order Blocks recalculados sobre o recorte, como no batch
+                state = smc_state.sync(symbol, timeframe, candles_df)
+                smc = state.window(len(candles_df), frame=candles_df)
             detector_input = DetectorInput(
                 symbol=symbol,
                 timeframe=timeframe,
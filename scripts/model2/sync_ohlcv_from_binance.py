@@ -16,8 +16,11 @@ if str(REPO_ROOT) not in sys.path:
 from config.settings import DB_PATH, M2_SYMBOLS, MODEL2_DB_PATH
 from data.binance_client import create_binance_client
 from data.collector import BinanceCollector
+from data.ohlcv_coverage import CoverageIndex
 
 DEFAULT_OUTPUT_DIR = REPO_ROOT / "results" / "model2" / "runtime"
+# Janela padrão da sincronização diária (mesmo lookback de antes do índice)
+DEFAULT_LOOKBACK_DAYS = 1
 
 
 def _utc_now_ms() -> int:
@@ -31,25 +34,76 @@ def _resolve_repo_path(value: str | Path) -> Path:
     return (REPO_ROOT / path).resolve()
 
 
+def _seed_coverage(
+    db: Any,
+    coverage: CoverageIndex,
+    symbol: str,
+    timeframe: str,
+    binance_tf: str,
+    interval_ms: int,
+) -> None:
+    """Na primeira execução com o índice, parte dos candles já gravados."""
+    if coverage.covered(symbol, binance_tf):
+        return
+    with db.get_connection() as conn:
+        timestamps = [
+            row[0] for row in conn.execute(
+                f"SELECT timestamp FROM ohlcv_{timeframe.lower()} WHERE symbol = ?",
+                (symbol,),
+            )
+        ]
+    coverage.seed_from_timestamps(symbol, binance_tf, timestamps, interval_ms)
+
+
+def _sync_start_ms(
+    coverage: CoverageIndex,
+    symbol: str,
+    binance_tf: str,
+    lookback_days: int | None,
+    now_ms: int,
+) -> int:
+    """
+    Início da janela a manter coberta.
+
+    Com lookback explícito, a janela é fixa. Sem ele, cobre o último dia
+    e, se já houver cobertura, recua até o fim do último trecho coberto
+    para não deixar buraco quando execuções diárias foram puladas.
+    """
+    if lookback_days is not None:
+        return now_ms - lookback_days * 86_400_000
+    start_ms = now_ms - DEFAULT_LOOKBACK_DAYS * 86_400_000
+    covered = coverage.covered(symbol, binance_tf)
+    if covered:
+        start_ms = min(start_ms, covered[-1][1])
+    return start_ms
+
+
 def sync_ohlcv_from_binance(
     *,
     source_db_path: str | Path,
     symbols: list[str],
     timeframes: list[str],
     output_dir: str | Path,
+    lookback_days: int | None = None,
+    now_ms: int | None = None,
 ) -> dict[str, Any]:
     """
     Sincroniza dados OHLCV mais recentes da Binance.
 
-    Atualiza cada timeframe com os candles mais recentes para os símbolos
-    solicitados. Usa BinanceCollector para buscar dados e insere/atualiza
-    no banco legado (crypto_agent.db).
+    Mantém cada (símbolo, timeframe) coberto na janela de lookback usando
+    o índice de cobertura (data/ohlcv_coverage.py): só as lacunas ainda
+    não baixadas são buscadas — numa execução diária, normalmente só os
+    candles novos — e uma sincronização interrompida é retomada do último
+    lote gravado. Insere/atualiza no banco legado (crypto_agent.db).
 
     Args:
         source_db_path: Banco legado (coleta via Binance)
         symbols: Lista de símbolos
         timeframes: Lista de timeframes (D1, H4, H1, M5)
         output_dir: Diretório para saída de summary
+        lookback_days: Janela a manter coberta. Default: último dia, estendido
+            até o fim da cobertura existente (backfill histórico só explícito)
+        now_ms: Relógio em ms (default: agora)
 
     Returns:
         dict com status, símbolos sincronizados, erros, etc.
@@ -74,6 +128,8 @@ def sync_ohlcv_from_binance(
         }
 
     collector = BinanceCollector(client)
+    coverage = CoverageIndex.from_path(str(resolved_source_db))
+    now_ms = now_ms if now_ms is not None else _utc_now_ms()
 
     symbols_to_use = list(symbols) if symbols else list(M2_SYMBOLS)
     timeframes_to_sync = timeframes if timeframes else ["H4"]
@@ -110,33 +166,56 @@ def sync_ohlcv_from_binance(
                 continue
 
             binance_tf = timeframe_map[timeframe]
+            interval_ms = collector.INTERVAL_MS[binance_tf]
+            latest: list[int] = []
+
+            def _fetch_page(start_ms: int, end_ms: int) -> tuple[int, int | None]:
+                data = collector.fetch_klines(
+                    symbol,
+                    binance_tf,
+                    limit=collector.MAX_KLINES_PER_REQUEST,
+                    start_time=start_ms,
+                    end_time=end_ms,
+                )
+                if data is None or data.empty:
+                    return 0, None
+                db.insert_ohlcv(timeframe.lower(), data)
+                last_open = int(data["timestamp"].max())
+                latest.append(last_open)
+                return len(data), last_open
+
             try:
-                # Buscar candles recentes (últimos 2 = ultimos ~8h para H4)
-                data = collector.fetch_historical(
+                _seed_coverage(db, coverage, symbol, timeframe, binance_tf, interval_ms)
+                stats = coverage.fill_gaps(
                     symbol,
                     binance_tf,
-                    days=1,  # Busca 1 dia de data, mas será apenas os candles recentes
+                    start_ms=_sync_start_ms(coverage, symbol, binance_tf, lookback_days, now_ms),
+                    end_ms=now_ms,
+                    interval_ms=interval_ms,
+                    fetch=_fetch_page,
+                    now_ms=now_ms,
                 )
 
-                if data is None or data.empty:
+                if stats["rows"] == 0:
                     summary["error_count"] += 1
                     summary["items"].append({
                         "symbol": symbol,
                         "timeframe": timeframe,
                         "status": "no_data",
+                        "requests": stats["requests"],
                     })
                     continue
 
-                # Inserir/atualizar no banco
-                db.insert_ohlcv(timeframe.lower(), data)
-
                 summary["synced_count"] += 1
                 summary["items"].append({
                     "symbol": symbol,
                     "timeframe": timeframe,
                     "status": "synced",
-                    "rows": len(data),
-                    "latest_timestamp": int(data.iloc[-1]["timestamp"]) if len(data) > 0 else None,
+                    "rows": stats["rows"],
+                    "gaps": stats["gaps"],
+                    "requests": stats["requests"],
+                    "resumed": bool(stats["resumed"]),
+                    "latest_timestamp": max(latest) if latest else None,
                 })
 
             except Exception as e:
@@ -148,6 +227,8 @@ def sync_ohlcv_from_binance(
                     "reason": str(e),
                 })
 
+    coverage.close()
+
     # Persistir summary
     run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     output_file = resolved_output_dir / f"sync_ohlcv_from_binance_{run_id}.json"
@@ -181,6 +262,12 @@ def _parse_args() -> argparse.Namespace:
         default=["H4"],
         help="Timeframe para sincronizar",
     )
+    parser.add_argument(
+        "--lookback-days",
+        type=int,
+        default=None,
+        help="Janela mantida coberta em dias (default: último dia desde a cobertura existente)",
+    )
     parser.add_argument(
         "--output-dir",
         default=str(DEFAULT_OUTPUT_DIR),
@@ -196,6 +283,7 @@ def main() -> int:
         symbols=list(args.symbol or []),
         timeframes=list(args.timeframe or ["H4"]),
         output_dir=args.output_dir,
+        lookback_days=args.lookback_days,
     )
     print(json.dumps(summary, indent=2, ensure_ascii=True, default=str))
     return 0 if summary["status"] in {"ok", "partial"} else 1
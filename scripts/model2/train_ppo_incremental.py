@@ -443,6 +443,7 @@ class PPOTrainer:
             model_path = self.checkpoint_dir / "ppo_model"
             model.save(str(model_path))
             logger.info(f"[PPO] Modelo salvo em {model_path}.zip")
+            policy_artifact = self._export_policy_artifact(model)
 
             result = {
                 "status": "ok",
@@ -451,6 +452,7 @@ class PPOTrainer:
                 "training_duration_seconds": elapsed,
                 "checkpoint_path": str(self.checkpoint_dir / "ppo_model.zip"),
                 "model_saved": str(model_path),
+                "policy_artifact": policy_artifact,
                 "episodes_used": len(self.obs_data),
                 "mean_reward_data": float(np.mean(self.rewards_data)),
             }
@@ -466,6 +468,24 @@ class PPOTrainer:
                 "error": str(e),
             }
 
+    def _export_policy_artifact(self, model: Any) -> Optional[str]:
+        """Reexporta o artefato NumPy do checkpoint recem-salvo.
+
+        Sem isso o runtime numpy detectaria o artefato antigo como
+        desatualizado e voltaria ao SB3. Falha na exportacao nao invalida
+        o treino.
+        """
+        from core.model2.policy_runtime import artifact_path_for, export_policy
+
+        checkpoint = self.checkpoint_dir / "ppo_model.zip"
+        try:
+            artifact = export_policy(model, artifact_path_for(checkpoint), source=checkpoint)
+        except Exception as e:
+            logger.warning(f"[PPO] Falha ao exportar politica NumPy de {checkpoint}: {e}")
+            return None
+        logger.info(f"[PPO] Politica NumPy exportada em {artifact}")
+        return str(artifact)
+
     def _train_ppo_simulated(self, timesteps: int = 10000) -> Dict[str, Any]:
         """
         Fallback: treinamento simulado quando SB3/Gymnasium não disponível.
@@ -56,6 +56,30 @@ MODEL_DRIVEN_TEST_PATTERNS = (
     "test_sub_agent_manager.py",
     "test_model2_m2_026_1_risk_gate_telemetry.py",
     "test_model2_m2_026_1_telemetry_real.py",
+    "test_model2_ohlcv_cache_provider.py",
+    "test_model2_model_registry.py",
+    "test_model2_batched_inference.py",
+    "test_model2_policy_runtime.py",
+    "test_model2_lazy_imports.py",
+    "test_model2_live_daemon.py",
+    "test_smc_vectorized_swings.py",
+    "test_smc_incremental.py",
+    "test_volume_profile_vectorized.py",
+    "test_indicators_columnar.py",
+    "test_precomputed_observations.py",
+    "test_parallel_env.py",
+    "test_concurrent_collector.py",
+    "test_ohlcv_coverage.py",
+    "test_database_bulk_insert.py",
+    "test_sqlite_pool.py",
+    "test_database_ohlcv_arrays.py",
+    "test_parquet_store.py",
+    "test_frame_cache.py",
+    "test_memmap_store.py",
+    "test_vectorized_backtester.py",
+    "test_walk_forward_parallel.py",
+    "test_batched_inference.py",
+    "test_metrics_kernel.py",
 )
 
 
@@ -84,6 +108,20 @@ def pytest_ignore_collect(collection_path, config):
     return not _is_model_driven_test(path.name)
 
 
+def pytest_collection_modifyitems(config, items):
+    """Pula testes marcados com slow (benchmarks) por padrao.
+
+    Para roda-los, exporte PYTEST_RUN_SLOW=1 ou selecione com -m slow.
+    """
+    if os.getenv("PYTEST_RUN_SLOW") == "1" or "slow" in (config.getoption("markexpr") or ""):
+        return
+
+    skip_slow = pytest.mark.skip(reason="benchmark: PYTEST_RUN_SLOW=1 ou -m slow para rodar")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
 class MockCryptoFuturesEnv:
     """Mock simplificado do CryptoFuturesEnv para testes."""
 
@@ -0,0 +1,167 @@
+"""
+Testes da inferência em lote (agent/batched_inference.py), de
+Backtester.run_batch e de EnsembleVotingPPO.predict_batch.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from stable_baselines3 import PPO
+
+from agent.batched_inference import episode_seeds, predict_batch, run_lockstep, spawn_env_copies
+from agent.environment import CryptoFuturesEnv
+from backtest.backtester import Backtester
+from indicators.smc import SmartMoneyConcepts
+from indicators.technical import TechnicalIndicators
+from scripts.model2.ensemble_voting_ppo import EnsembleVotingPPO
+
+
+def _make_data(length: int = 200, seed: int = 5) -> dict:
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 150, length))
+    open_ = close + rng.normal(0, 60, length)
+    h4 = TechnicalIndicators.calculate_all(pd.DataFrame({
+        'timestamp': 1_700_000_000_000 + np.arange(length, dtype=np.int64) * 14_400_000,
+        'open': open_,
+        'high': np.maximum(open_, close) + np.abs(rng.normal(0, 80, length)),
+        'low': np.minimum(open_, close) - np.abs(rng.normal(0, 80, length)),
+        'close': close,
+        'volume': rng.lognormal(8, 0.5, length),
+    }))
+    return {
+        'symbol': 'BTCUSDT',
+        'h4': h4,
+        'h1': h4,
+        'd1': h4.iloc[::6].reset_index(drop=True),
+        'sentiment': None,
+        'macro': None,
+        'smc': SmartMoneyConcepts.calculate_all_smc(h4),
+    }
+
+
+@pytest.fixture(scope='module')
+def data():
+    return _make_data()
+
+
+@pytest.fixture(scope='module')
+def model(data):
+    env = CryptoFuturesEnv(data, episode_length=50, precompute_observations=True)
+    return PPO("MlpPolicy", env, seed=0, device='cpu')
+
+
+def _sequential(env, model, seed):
+    obs, _ = env.reset(seed=seed)
+    total, done = 0.0, False
+    while not done:
+        action, _ = model.predict(obs, deterministic=True)
+        obs, reward, terminated, truncated, _ = env.step(action)
+        total += reward
+        done = terminated or truncated
+    return total, env.capital
+
+
+def test_lockstep_matches_sequential_episodes(data, model):
+    env = CryptoFuturesEnv(data, episode_length=50, precompute_observations=True)
+    env.reset(seed=11)
+    envs = [env] + spawn_env_copies(env, 3)
+    seeds = episode_seeds(env, len(envs))
+
+    assert len(set(seeds)) == 4
+    assert all(copy.data is env.data for copy in envs)
+    assert all(copy.market_observations is env.market_observations for copy in envs)
+
+    results = run_lockstep(envs, model, seeds=seeds, n_threads=1)
+
+    reference = CryptoFuturesEnv(data, episode_length=50, precompute_observations=True)
+    for result, batch_env, seed in zip(results, envs, seeds):
+        reward, capital = _sequential(reference, model, seed)
+        assert result['reward'] == pytest.approx(reward)
+        assert batch_env.capital == pytest.approx(capital)
+
+
+def test_predict_batch_matches_single_predictions(data, model):
+    env = CryptoFuturesEnv(data, episode_length=50, precompute_observations=True)
+    observations = env.market_observations[30:94]
+
+    batched = predict_batch(model, observations)
+
+    assert batched.shape == (64,)
+    expected = [int(model.predict(obs, deterministic=True)[0]) for obs in observations]
+    assert batched.tolist() == expected
+
+
+def test_backtester_run_batch_matches_run(model):
+    datasets = {'BTCUSDT': _make_data(120, seed=1), 'ETHUSDT': _make_data(150, seed=2)}
+    backtester = Backtester(initial_capital=10000)
+
+    batched = backtester.run_batch('2024-01-01', '2024-02-01', model, datasets)
+
+    assert list(batched) == ['BTCUSDT', 'ETHUSDT']
+    for symbol, data in datasets.items():
+        single = Backtester(initial_capital=10000).run('2024-01-01', '2024-02-01', model, data)
+        assert batched[symbol]['final_capital'] == pytest.approx(single['final_capital'])
+        assert batched[symbol]['equity_curve'] == pytest.approx(single['equity_curve'])
+        assert batched[symbol]['total_trades'] == single['total_trades']
+
+
+class _FixedModel:
+    """Membro do ensemble com ação função da observação."""
+
+    def __init__(self, offset: int):
+        self.offset = offset
+
+    def predict(self, observation, deterministic=True, state=None):
+        obs = np.asarray(observation)
+        actions = (obs[..., 0] > self.offset).astype(np.int64)
+        return actions, None
+
+
+@pytest.mark.parametrize('method', ['soft', 'hard'])
+@pytest.mark.parametrize('weights', [(0.48, 0.52), (0.6, 0.4)])
+def test_ensemble_predict_batch_matches_per_observation(method, weights):
+    ensemble = EnsembleVotingPPO.__new__(EnsembleVotingPPO)
+    ensemble.mlp_model, ensemble.lstm_model = _FixedModel(0), _FixedModel(1)
+    ensemble.mlp_weight, ensemble.lstm_weight = weights
+    ensemble.voting_method = method
+    observations = np.random.default_rng(0).normal(0, 2, (200, 4))
+
+    batched = ensemble.predict_batch(observations)
+
+    assert batched.tolist() == [ensemble.predict(obs)[0] for obs in observations]
+    assert predict_batch(ensemble, observations).tolist() == batched.tolist()
+
+
+@pytest.mark.slow
+def test_benchmark_batched_inference(data, model):
+    env = CryptoFuturesEnv(data, episode_length=50, precompute_observations=True)
+    observations = env.market_observations[30:30 + 64]
+
+    start_t = time.perf_counter()
+    for _ in range(5):
+        for obs in observations:
+            model.predict(obs, deterministic=True)
+    single_s = (time.perf_counter() - start_t) / 5
+
+    start_t = time.perf_counter()
+    for _ in range(5):
+        predict_batch(model, observations)
+    batch_s = (time.perf_counter() - start_t) / 5
+
+    envs = [env] + spawn_env_copies(env, 15)
+    seeds = episode_seeds(env, 16)
+    start_t = time.perf_counter()
+    for seed in seeds:
+        _sequential(env, model, seed)
+    sequential_s = time.perf_counter() - start_t
+    start_t = time.perf_counter()
+    run_lockstep(envs, model, seeds=seeds)
+    lockstep_s = time.perf_counter() - start_t
+
+    print(
+        f"\n64 observações: uma a uma={single_s * 1000:.1f}ms lote={batch_s * 1000:.2f}ms "
+        f"speedup={single_s / batch_s:.0f}x\n16 episódios: sequencial={sequential_s:.3f}s "
+        f"lockstep={lockstep_s:.3f}s speedup={sequential_s / lockstep_s:.1f}x"
+    )
@@ -0,0 +1,275 @@
+"""
+Testes do backfill concorrente de klines contra uma exchange fake local.
+
+O servidor HTTP imita GET /fapi/v1/klines da Binance Futures com latência
+injetada, registrando requisições simultâneas para verificar fan-out,
+orçamento de peso compartilhado e gravação em streaming no banco.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from binance_sdk_derivatives_trading_usds_futures.derivatives_trading_usds_futures import (
+    ConfigurationRestAPI,
+    DerivativesTradingUsdsFutures,
+)
+
+import data.collector as collector_module
+import data.rate_limit_manager as rate_limit_module
+from data.collector import BinanceCollector
+from data.concurrent_collector import ConcurrentKlineCollector, KlinePage
+from data.database import DatabaseManager
+from data.rate_limit_manager import RateLimitManager
+
+HOUR_MS = 3_600_000
+END_TIME = 1_700_000_000_000 - 1
+
+
+class FakeExchange:
+    """Exchange fake: klines determinísticos, latência e falhas por símbolo."""
+
+    def __init__(self, latency_s: float = 0.0, failing_symbols=()):
+        self.latency_s = latency_s
+        self.failing_symbols = set(failing_symbols)
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+
+    def _handler(self):
+        exchange = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                exchange._serve(self)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def _serve(self, handler):
+        query = {k: v[0] for k, v in parse_qs(urlparse(handler.path).query).items()}
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.requests.append((time.perf_counter(), query))
+        try:
+            time.sleep(self.latency_s)
+            if query['symbol'] in self.failing_symbols:
+                status, payload = 500, {'code': -1000, 'msg': 'fake failure'}
+            else:
+                status, payload = 200, self.klines(query)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+        body = json.dumps(payload).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    @staticmethod
+    def klines(query):
+        interval_ms = BinanceCollector.INTERVAL_MS[query['interval']]
+        start, end, limit = int(query['startTime']), int(query['endTime']), int(query['limit'])
+        first = -(-start // interval_ms) * interval_ms
+        rows = []
+        for ts in range(first, end + 1, interval_ms)[:limit]:
+            price = 100.0 + (ts // interval_ms) % 50
+            rows.append([ts, str(price), str(price + 1), str(price - 1), str(price + 0.5),
+                         "10", ts + interval_ms - 1, "1000", 7, "5", "500", "0"])
+        return rows
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _collector(exchange: FakeExchange) -> BinanceCollector:
+    client = DerivativesTradingUsdsFutures(config_rest_api=ConfigurationRestAPI(
+        api_key="test", api_secret="test", base_path=exchange.url, retries=0,
+    ))
+    return BinanceCollector(client)
+
+
+def test_plan_pages_cover_range_without_overlap():
+    concurrent = ConcurrentKlineCollector(BinanceCollector(client=None))
+
+    pages = concurrent.plan_pages('BTCUSDT', '1h', 0, 2_500 * HOUR_MS - 1)
+
+    assert [p.limit for p in pages] == [1000, 1000, 500]
+    assert pages[0].start_time == 0
+    assert all(a.end_time + 1 == b.start_time for a, b in zip(pages, pages[1:]))
+    assert pages[-1].end_time == 2_500 * HOUR_MS - 1
+    assert [RateLimitManager.kline_request_weight(p.limit) for p in pages] == [5, 5, 5]
+
+
+def test_backfill_streams_all_candles_into_database(tmp_path):
+    db = DatabaseManager(str(tmp_path / "klines.db"))
+    rows_seen_by_callback = []
+
+    def on_batch(page, df):
+        rows_seen_by_callback.append(len(db.get_ohlcv("H1", page.symbol)))
+
+    with FakeExchange(latency_s=0.02) as exchange:
+        report = ConcurrentKlineCollector(_collector(exchange), max_workers=4).backfill(
+            ['BTCUSDT', 'ETHUSDT'], ['1h', '4h'],
+            days={'1h': 100, '4h': 200}, end_time=END_TIME, db=db, on_batch=on_batch,
+        )
+
+    h1 = db.get_ohlcv("H1", 'BTCUSDT')
+    h4 = db.get_ohlcv("H4", 'ETHUSDT')
+    assert len(h1) == 100 * 24
+    assert len(h4) == 200 * 6
+    assert [r['timestamp'] for r in h1] == list(range(h1[0]['timestamp'], END_TIME, HOUR_MS))
+    assert report.candles == 2 * (100 * 24 + 200 * 6)
+    assert report.candles_by_symbol[('ETHUSDT', '1h')] == 100 * 24
+    assert not report.failed_pages
+    # Lotes gravados antes do callback: cada um já vê as próprias linhas
+    assert rows_seen_by_callback and min(rows_seen_by_callback) > 0
+
+
+def test_pages_fan_out_across_symbols():
+    pages = [
+        KlinePage(symbol, '1h', 0, 99 * HOUR_MS, 100)
+        for symbol in ('BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'XRPUSDT')
+        for _ in range(2)
+    ]
+
+    with FakeExchange(latency_s=0.2) as exchange:
+        concurrent = ConcurrentKlineCollector(_collector(exchange), max_workers=8)
+        batches = list(concurrent.iter_batches(pages))
+
+    assert len(batches) == 8
+    assert exchange.max_in_flight > 1
+
+
+def test_shared_weight_budget_throttles_workers():
+    # limit=1000 pesa 5: com orçamento 10 por 0.5s cabem 2 requisições por janela
+    limiter = RateLimitManager(max_requests_per_minute=10, window_size_seconds=0.5)
+    pages = [KlinePage('BTCUSDT', '1h', 0, 999 * HOUR_MS, 1000) for _ in range(4)]
+    waits = []
+    acquire = limiter.acquire
+    limiter.acquire = lambda weight=1: waits.append(acquire(weight)) or waits[-1]
+
+    with FakeExchange() as exchange:
+        concurrent = ConcurrentKlineCollector(_collector(exchange), rate_limiter=limiter, max_workers=4)
+        report_batches = list(concurrent.iter_batches(pages))
+
+    assert len(report_batches) == 4
+    # Só 2 requisições cabem na primeira janela: as outras 2 esperaram
+    assert len(waits) == 4
+    assert sum(1 for waited in waits if waited > 0) >= 2
+    assert all(int(q['limit']) == 1000 for _, q in exchange.requests)
+
+
+def test_failed_symbol_is_reported_without_stopping_backfill(tmp_path, monkeypatch):
+    monkeypatch.setattr(collector_module, 'API_RETRY_DELAYS', [0, 0, 0])
+    db = DatabaseManager(str(tmp_path / "klines.db"))
+
+    with FakeExchange(failing_symbols={'ETHUSDT'}) as exchange:
+        report = ConcurrentKlineCollector(_collector(exchange), max_workers=2).backfill(
+            ['BTCUSDT', 'ETHUSDT'], ['1d'], days=30, end_time=END_TIME, db=db,
+        )
+
+    assert [p.symbol for p in report.failed_pages] == ['ETHUSDT']
+    assert len(db.get_ohlcv("D1", 'BTCUSDT')) == 30
+    assert db.get_ohlcv("D1", 'ETHUSDT') == []
+
+
+def test_every_retry_reserves_weight(monkeypatch):
+    monkeypatch.setattr(collector_module, 'API_RETRY_DELAYS', [0, 0, 0])
+    acquired = []
+
+    class _CountingLimiter(RateLimitManager):
+        def acquire(self, weight=1):
+            acquired.append(weight)
+            return super().acquire(weight)
+
+    pages = [KlinePage(symbol, '1h', 0, 999 * HOUR_MS, 1000) for symbol in ('BTCUSDT', 'ETHUSDT')]
+    with FakeExchange(failing_symbols={'ETHUSDT'}) as exchange:
+        concurrent = ConcurrentKlineCollector(
+            _collector(exchange), rate_limiter=_CountingLimiter(max_requests_per_minute=2400), max_workers=2,
+        )
+        batches = list(concurrent.iter_batches(pages))
+
+    assert len(batches) == 1
+    # Uma reserva por requisição que chegou à exchange, tentativas repetidas incluídas
+    assert len(exchange.requests) == 1 + collector_module.API_MAX_RETRIES
+    assert acquired == [5] * len(exchange.requests)
+
+
+def test_store_failure_is_isolated_per_page(tmp_path):
+    db = DatabaseManager(str(tmp_path / "klines.db"))
+
+    class _FlakyDatabase:
+        def insert_ohlcv(self, timeframe, df):
+            if df['symbol'].iloc[0] == 'ETHUSDT':
+                raise RuntimeError("database is locked")
+            db.insert_ohlcv(timeframe, df)
+
+    with FakeExchange() as exchange:
+        report = ConcurrentKlineCollector(_collector(exchange), max_workers=2).backfill(
+            ['BTCUSDT', 'ETHUSDT'], ['1d'], days=30, end_time=END_TIME, db=_FlakyDatabase(),
+        )
+
+    assert [p.symbol for p in report.failed_pages] == ['ETHUSDT']
+    assert report.candles_by_symbol[('ETHUSDT', '1d')] == 0
+    assert report.candles == 30
+    assert len(db.get_ohlcv("D1", 'BTCUSDT')) == 30
+
+
+def test_backfill_rejects_interval_without_table(tmp_path):
+    concurrent = ConcurrentKlineCollector(BinanceCollector(client=None))
+
+    with pytest.raises(ValueError):
+        concurrent.backfill(['BTCUSDT'], ['15m'], db=DatabaseManager(str(tmp_path / "x.db")))
+
+
+def test_acquire_blocks_until_weight_expires(monkeypatch):
+    clock = {'now': 1_000.0}
+
+    def _sleep(seconds):
+        clock['now'] += seconds
+
+    monkeypatch.setattr(
+        rate_limit_module, 'time', SimpleNamespace(time=lambda: clock['now'], sleep=_sleep)
+    )
+    limiter = RateLimitManager(max_requests_per_minute=10, window_size_seconds=0.3)
+
+    assert limiter.acquire(6) == 0.0
+    assert limiter.get_current_minute_weight() == 6
+    assert limiter.get_requests_until_limit() == 4
+
+    waited = limiter.acquire(6)
+    assert 0.3 <= waited < 0.35
+    assert clock['now'] == pytest.approx(1_000.0 + waited)
+    assert limiter.get_current_minute_requests() == 1
+
+
+def test_acquire_is_thread_safe():
+    limiter = RateLimitManager(max_requests_per_minute=1000, window_size_seconds=60)
+
+    threads = [threading.Thread(target=lambda: [limiter.acquire(2) for _ in range(50)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert limiter.get_current_minute_weight() == 800
+    assert limiter.get_current_minute_requests() == 400
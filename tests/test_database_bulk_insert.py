@@ -0,0 +1,115 @@
+"""
+Testes da ingestão em lote de OHLCV (DatabaseManager.bulk_insert_ohlcv).
+"""
+
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.database import OHLCV_INSERT_COLUMNS, DatabaseManager
+
+
+def _make_frame(n_rows: int, symbol: str = 'BTCUSDT', seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n_rows))
+    return pd.DataFrame({
+        'timestamp': 1_700_000_000_000 + np.arange(n_rows, dtype=np.int64) * 300_000,
+        'symbol': symbol,
+        'open': close + 0.1,
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': rng.lognormal(5, 1, n_rows),
+        'quote_volume': rng.lognormal(10, 1, n_rows),
+        'trades_count': rng.integers(1, 1000, n_rows),
+        'extra': 'ignored',
+    })
+
+
+def _table(db: DatabaseManager, timeframe: str) -> pd.DataFrame:
+    with sqlite3.connect(db.db_path) as conn:
+        return pd.read_sql(f"SELECT * FROM ohlcv_{timeframe} ORDER BY symbol, timestamp", conn)
+
+
+def test_dataframe_and_records_store_same_rows(tmp_path):
+    df = _make_frame(500)
+    frame_db = DatabaseManager(str(tmp_path / "frame.db"))
+    records_db = DatabaseManager(str(tmp_path / "records.db"))
+
+    stats = frame_db.bulk_insert_ohlcv("M5", df)
+    records_db.insert_ohlcv("m5", df.to_dict('records'))
+
+    stored = _table(frame_db, "m5")
+    assert stats['rows'] == 500 and stats['rows_per_sec'] > 0
+    pd.testing.assert_frame_equal(stored, _table(records_db, "m5"))
+    pd.testing.assert_frame_equal(stored, df[list(OHLCV_INSERT_COLUMNS)], check_dtype=False)
+
+
+def test_bulk_insert_replaces_existing_candles(tmp_path):
+    db = DatabaseManager(str(tmp_path / "ohlcv.db"))
+    df = _make_frame(100)
+
+    db.bulk_insert_ohlcv("H1", df)
+    db.bulk_insert_ohlcv("H1", df.assign(close=df['close'] * 2).iloc[50:])
+
+    stored = _table(db, "h1")
+    assert len(stored) == 100
+    np.testing.assert_allclose(stored['close'].iloc[50:], df['close'].iloc[50:] * 2)
+    np.testing.assert_allclose(stored['close'].iloc[:50], df['close'].iloc[:50])
+
+
+def test_failed_batch_rolls_back_whole_transaction(tmp_path):
+    db = DatabaseManager(str(tmp_path / "ohlcv.db"))
+    df = _make_frame(1_000)
+    df.loc[700, 'close'] = np.nan  # NOT NULL
+
+    with pytest.raises(sqlite3.IntegrityError):
+        db.bulk_insert_ohlcv("H4", df)
+
+    assert _table(db, "h4").empty
+
+
+def test_missing_column_is_rejected(tmp_path):
+    db = DatabaseManager(str(tmp_path / "ohlcv.db"))
+
+    with pytest.raises(ValueError, match="quote_volume"):
+        db.bulk_insert_ohlcv("H4", _make_frame(10).drop(columns='quote_volume'))
+
+
+def test_empty_input_is_noop(tmp_path):
+    db = DatabaseManager(str(tmp_path / "ohlcv.db"))
+
+    assert db.bulk_insert_ohlcv("D1", pd.DataFrame())['rows'] == 0
+    db.insert_ohlcv("D1", [])
+
+
+@pytest.mark.slow
+def test_benchmark_bulk_vs_record_dicts(tmp_path):
+    frames = [_make_frame(50_000, symbol=f"S{i}USDT", seed=i) for i in range(4)]
+
+    legacy = DatabaseManager(str(tmp_path / "legacy.db"))
+    start = time.perf_counter()
+    for df in frames:
+        # Caminho anterior: dict por linha + parâmetros nomeados
+        with legacy.get_connection() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO ohlcv_m5 ({', '.join(OHLCV_INSERT_COLUMNS)}) "
+                f"VALUES ({', '.join(':' + c for c in OHLCV_INSERT_COLUMNS)})",
+                df.to_dict('records'),
+            )
+    legacy_s = time.perf_counter() - start
+
+    bulk = DatabaseManager(str(tmp_path / "bulk.db"))
+    start = time.perf_counter()
+    for df in frames:
+        bulk.bulk_insert_ohlcv("M5", df)
+    bulk_s = time.perf_counter() - start
+
+    n_rows = sum(len(df) for df in frames)
+    print(
+        f"\n{n_rows} rows: dicts={n_rows / legacy_s:,.0f} rows/s "
+        f"bulk={n_rows / bulk_s:,.0f} rows/s speedup={legacy_s / bulk_s:.1f}x"
+    )
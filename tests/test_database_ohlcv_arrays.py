@@ -0,0 +1,113 @@
+"""
+Testes da leitura NumPy de OHLCV (get_ohlcv_arrays / get_ohlcv_frame).
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.data_cache import ParquetCache
+from data.database import OHLCV_ARRAY_DTYPES, OHLCV_INSERT_COLUMNS, DatabaseManager
+
+H1 = 3_600_000
+START = 1_700_000_000_000 - 1_700_000_000_000 % H1
+
+
+def _make_frame(n_rows: int, symbol: str = 'BTCUSDT', seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n_rows))
+    return pd.DataFrame({
+        'timestamp': START + np.arange(n_rows, dtype=np.int64) * H1,
+        'symbol': symbol,
+        'open': close + 0.1,
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': rng.lognormal(5, 1, n_rows),
+        'quote_volume': rng.lognormal(10, 1, n_rows),
+        'trades_count': rng.integers(1, 1000, n_rows),
+    })
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "ohlcv.db"))
+    db.bulk_insert_ohlcv("H1", _make_frame(500).sample(frac=1, random_state=1))
+    db.bulk_insert_ohlcv("H1", _make_frame(300, symbol='ETHUSDT', seed=1))
+    return db
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {'limit': 120},
+    {'start_time': START + 100 * H1, 'end_time': START + 199 * H1},
+    {'start_time': START + 450 * H1, 'limit': 1_000},
+])
+def test_frame_matches_dict_rows(db, filters):
+    expected = pd.DataFrame(db.get_ohlcv("H1", 'BTCUSDT', **filters))
+    frame = db.get_ohlcv_frame("H1", 'BTCUSDT', **filters)
+
+    pd.testing.assert_frame_equal(frame, expected, check_dtype=False)
+    assert frame['timestamp'].is_monotonic_increasing
+
+
+def test_arrays_have_native_dtypes_and_selected_columns(db):
+    arrays = db.get_ohlcv_arrays("h1", 'ETHUSDT')
+    source = _make_frame(300, symbol='ETHUSDT', seed=1)
+
+    assert list(arrays) == list(OHLCV_ARRAY_DTYPES)
+    for col, dtype in OHLCV_ARRAY_DTYPES.items():
+        assert arrays[col].dtype == dtype and arrays[col].flags.c_contiguous
+        np.testing.assert_array_equal(arrays[col], source[col].to_numpy())
+
+    subset = db.get_ohlcv_arrays("h1", 'ETHUSDT', columns=('close', 'timestamp'), limit=5)
+    assert list(subset) == ['close', 'timestamp']
+    np.testing.assert_array_equal(subset['timestamp'], source['timestamp'].iloc[:5])
+
+
+def test_unknown_column_is_rejected(db):
+    with pytest.raises(ValueError, match="symbol"):
+        db.get_ohlcv_arrays("h1", 'BTCUSDT', columns=('timestamp', 'symbol'))
+
+
+def test_empty_result_keeps_columns(db):
+    frame = db.get_ohlcv_frame("h4", 'BTCUSDT')
+
+    assert frame.empty
+    assert list(frame.columns) == list(OHLCV_INSERT_COLUMNS)
+
+
+def test_parquet_cache_loads_through_arrays(db, tmp_path):
+    cache = ParquetCache(db.db_path, cache_dir=str(tmp_path / "cache"))
+
+    df = cache.load_ohlcv_for_symbol('BTCUSDT', 'h1')
+
+    assert list(df.columns) == ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+    pd.testing.assert_frame_equal(
+        df, db.get_ohlcv_frame("H1", 'BTCUSDT')[list(df.columns)], check_dtype=False,
+    )
+
+
+@pytest.mark.slow
+def test_benchmark_frame_vs_dict_rows(tmp_path):
+    db = DatabaseManager(str(tmp_path / "bench.db"))
+    symbols = [f"S{i}USDT" for i in range(20)]
+    for i, symbol in enumerate(symbols):
+        db.bulk_insert_ohlcv("H1", _make_frame(8_760, symbol=symbol, seed=i))
+
+    start = time.perf_counter()
+    for symbol in symbols:
+        pd.DataFrame(db.get_ohlcv("H1", symbol))
+    dicts_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for symbol in symbols:
+        db.get_ohlcv_frame("H1", symbol)
+    frame_s = time.perf_counter() - start
+
+    print(
+        f"\n{len(symbols)} símbolos x 1 ano H1: dicts={dicts_s:.2f}s "
+        f"frame={frame_s:.2f}s speedup={dicts_s / frame_s:.1f}x"
+    )
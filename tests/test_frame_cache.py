@@ -0,0 +1,126 @@
+"""
+Testes do LRU de DataFrames por bytes e do memory cache do ParquetCache.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.data_cache import ParquetCache
+from backtest.frame_cache import FrameLRUCache, frame_nbytes
+from data.database import DatabaseManager
+
+H4 = 4 * 3_600_000
+START = 1_704_067_200_000
+
+
+def _frame(n_rows: int, start: int = START, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n_rows))
+    return pd.DataFrame({
+        'timestamp': start + np.arange(n_rows, dtype=np.int64) * H4,
+        'open': close,
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': rng.lognormal(5, 1, n_rows),
+    })
+
+
+def test_lru_evicts_least_recently_used_within_budget():
+    frames = {key: _frame(100, seed=i) for i, key in enumerate('abcd')}
+    size = frame_nbytes(frames['a'])
+    cache = FrameLRUCache(max_bytes=3 * size)
+
+    for key in 'abc':
+        assert cache.put(key, frames[key])
+    assert cache.get('a') is frames['a']
+    cache.put('d', frames['d'])
+
+    assert 'b' not in cache and {'a', 'c', 'd'} <= {k for k in 'abcd' if k in cache}
+    assert cache.get('b') is None
+    stats = cache.stats()
+    assert stats['bytes'] == 3 * size <= stats['max_bytes']
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 1, 1)
+
+
+def test_lru_replaces_key_and_rejects_oversized_frames():
+    small, big = _frame(10), _frame(10_000)
+    cache = FrameLRUCache(max_bytes=frame_nbytes(small) * 2)
+
+    cache.put('x', small)
+    cache.put('x', small)
+    assert cache.stats()['bytes'] == frame_nbytes(small)
+
+    assert not cache.put('y', big)
+    assert 'y' not in cache and cache.stats()['rejections'] == 1
+
+    cache.pop('x')
+    assert len(cache) == 0 and cache.stats()['bytes'] == 0
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "ohlcv.db"))
+    for i in range(6):
+        df = _frame(2_000, seed=i).assign(symbol=f"S{i}USDT", quote_volume=1.0, trades_count=1)
+        db.bulk_insert_ohlcv("H4", df)
+    return db
+
+
+def test_parquet_cache_stays_within_memory_budget(db, tmp_path):
+    one_pair = frame_nbytes(_frame(2_000))
+    budget_mb = 2.5 * one_pair / (1024 * 1024)
+    cache = ParquetCache(db.db_path, cache_dir=str(tmp_path / "cache"), memory_budget_mb=budget_mb)
+
+    for _ in range(2):
+        for i in range(6):
+            assert len(cache.load_ohlcv_for_symbol(f"S{i}USDT", 'h4')) == 2_000
+
+    stats = cache.memory_cache_stats()
+    assert stats['entries'] == 2
+    assert stats['bytes'] <= stats['max_bytes']
+    assert stats['evictions'] == 10
+
+
+def test_filtered_reads_are_views_of_cached_frame(db, tmp_path):
+    cache = ParquetCache(db.db_path, cache_dir=str(tmp_path / "cache"))
+    full = cache.load_ohlcv_for_symbol('S0USDT', 'h4')
+    start, end = START + 100 * H4, START + 199 * H4
+
+    window = cache.load_ohlcv_for_symbol('S0USDT', 'h4', start_date=start, end_date=end)
+
+    assert len(window) == 100 and window['timestamp'].iloc[0] == start
+    assert list(window.index) == list(range(100))
+    assert np.shares_memory(window['close'].to_numpy(), full['close'].to_numpy())
+
+    # Copy-on-Write: alterar a janela não altera o cache
+    window.loc[0, 'close'] = -1.0
+    assert cache.load_ohlcv_for_symbol('S0USDT', 'h4')['close'].iloc[100] != -1.0
+    assert cache.memory_cache_stats()['hits'] >= 2
+
+
+@pytest.mark.slow
+def test_benchmark_slice_view_vs_mask_copy(db, tmp_path):
+    cache = ParquetCache(db.db_path, cache_dir=str(tmp_path / "cache"))
+    full = cache.load_ohlcv_for_symbol('S0USDT', 'h4')
+    windows = [(START + i * H4, START + (i + 180) * H4) for i in range(0, 1_800, 2)]
+
+    start_t = time.perf_counter()
+    for start, end in windows:
+        df = full.copy()
+        df = df[df['timestamp'] >= start]
+        df[df['timestamp'] <= end].reset_index(drop=True)
+    copy_s = time.perf_counter() - start_t
+
+    start_t = time.perf_counter()
+    for start, end in windows:
+        cache.load_ohlcv_for_symbol('S0USDT', 'h4', start_date=start, end_date=end)
+    view_s = time.perf_counter() - start_t
+
+    print(
+        f"\n{len(windows)} janelas: cópia+máscara={copy_s:.3f}s view={view_s:.3f}s "
+        f"speedup={copy_s / view_s:.1f}x"
+    )
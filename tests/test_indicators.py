@@ -92,3 +92,139 @@ def test_calculate_all():
     
     for col in expected_cols:
         assert col in result.columns
+
+
+# ---------------------------------------------------------------------------
+# OBV / EMA alignment vetorizados: equivalência com os loops originais e
+# orçamento de tempo (micro-benchmark)
+# ---------------------------------------------------------------------------
+
+import time
+
+EMA_COLUMNS = ['ema_17', 'ema_34', 'ema_72', 'ema_144', 'ema_305', 'ema_610']
+
+
+def _reference_obv(df):
+    obv = [0]
+    for i in range(1, len(df)):
+        if df['close'].iloc[i] > df['close'].iloc[i-1]:
+            obv.append(obv[-1] + df['volume'].iloc[i])
+        elif df['close'].iloc[i] < df['close'].iloc[i-1]:
+            obv.append(obv[-1] - df['volume'].iloc[i])
+        else:
+            obv.append(obv[-1])
+    return pd.Series(obv, index=df.index)
+
+
+def _reference_ema_alignment_score(df):
+    scores = []
+    for i in range(len(df)):
+        values = [df[col].iloc[i] for col in EMA_COLUMNS]
+        bullish = True
+        bearish = True
+        for j in range(len(values) - 1):
+            if pd.isna(values[j]) or pd.isna(values[j+1]):
+                bullish = False
+                bearish = False
+                break
+            if values[j] <= values[j+1]:
+                bullish = False
+            if values[j] >= values[j+1]:
+                bearish = False
+
+        if bullish:
+            scores.append(6)
+        elif bearish:
+            scores.append(-6)
+        else:
+            aligned_up = 0
+            aligned_down = 0
+            for j in range(len(values) - 1):
+                if pd.isna(values[j]) or pd.isna(values[j+1]):
+                    continue
+                if values[j] > values[j+1]:
+                    aligned_up += 1
+                elif values[j] < values[j+1]:
+                    aligned_down += 1
+            if aligned_up > aligned_down:
+                scores.append(aligned_up)
+            elif aligned_down > aligned_up:
+                scores.append(-aligned_down)
+            else:
+                scores.append(0)
+    return pd.Series(scores, index=df.index)
+
+
+def _ema_frame(length=2000):
+    df = create_sample_data(length)
+    df['close'] = df['close'].round(-1)  # força closes repetidos (OBV inalterado)
+    for col in EMA_COLUMNS:
+        df[col] = TechnicalIndicators.calculate_ema(df['close'], int(col.split('_')[1]))
+    rng = np.random.default_rng(0)
+    # Linhas totalmente alinhadas, empates e NaN isolados
+    df.loc[df.index[700:720], EMA_COLUMNS] = np.linspace(6, 1, 6)
+    df.loc[df.index[720:740], EMA_COLUMNS] = np.linspace(1, 6, 6)
+    df.loc[df.index[740:760], EMA_COLUMNS] = 1.0
+    df.loc[df.index[rng.integers(0, length, 50)], 'ema_72'] = np.nan
+    return df
+
+
+def test_obv_matches_reference_loop():
+    df = _ema_frame()
+    pd.testing.assert_series_equal(
+        TechnicalIndicators.calculate_obv(df), _reference_obv(df), check_exact=True
+    )
+
+
+def test_obv_flat_prices_returns_zeros():
+    df = create_sample_data(10)
+    df['close'] = 100.0
+    pd.testing.assert_series_equal(TechnicalIndicators.calculate_obv(df), _reference_obv(df))
+
+
+def test_ema_alignment_score_matches_reference_loop():
+    df = _ema_frame()
+    pd.testing.assert_series_equal(
+        TechnicalIndicators.calculate_ema_alignment_score(df),
+        _reference_ema_alignment_score(df),
+        check_exact=True,
+    )
+
+
+def test_ema_alignment_score_missing_columns_returns_zero():
+    df = create_sample_data(10)
+    assert TechnicalIndicators.calculate_ema_alignment_score(df).tolist() == [0] * 10
+
+
+# Orçamento por chamada em 100k candles (~10x o medido, para absorver variação
+# de máquina; um retorno ao loop Python estoura em ordens de grandeza). Opt-in:
+# PYTEST_RUN_SLOW=1 ou -m slow.
+OBV_BUDGET_S = 0.02
+EMA_ALIGNMENT_BUDGET_S = 0.15
+
+
+def _best_of(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.slow
+def test_obv_performance_budget():
+    df = create_sample_data(100_000)
+    elapsed = _best_of(lambda: TechnicalIndicators.calculate_obv(df))
+    assert elapsed < OBV_BUDGET_S, f"calculate_obv levou {elapsed:.3f}s (budget {OBV_BUDGET_S}s)"
+
+
+@pytest.mark.slow
+def test_ema_alignment_score_performance_budget():
+    df = create_sample_data(100_000)
+    for col in EMA_COLUMNS:
+        df[col] = TechnicalIndicators.calculate_ema(df['close'], int(col.split('_')[1]))
+    elapsed = _best_of(lambda: TechnicalIndicators.calculate_ema_alignment_score(df))
+    assert elapsed < EMA_ALIGNMENT_BUDGET_S, (
+        f"calculate_ema_alignment_score levou {elapsed:.3f}s (budget {EMA_ALIGNMENT_BUDGET_S}s)"
+    )
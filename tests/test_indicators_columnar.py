@@ -0,0 +1,184 @@
+"""
+Testes do motor colunar de indicadores (TechnicalIndicators.calculate_indicator_block).
+
+Os caminhos por arrays (calculate_all_arrays, calculate_all_matrix,
+calculate_all_structured) devem reproduzir exatamente os métodos
+individuais, e as entradas de FeatureEngineer/ParquetCache devem
+alimentar o motor sem conversões intermediárias.
+"""
+
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.data_cache import ParquetCache
+from indicators.features import FeatureEngineer
+from indicators.technical import INDICATOR_COLUMNS, OHLCV_COLUMNS, TechnicalIndicators
+
+
+def _make_ohlcv(length: int, seed: int = 21) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, length))
+    open_ = close + rng.normal(0, 0.4, length)
+    high = np.maximum(open_, close) + np.abs(rng.normal(0, 0.5, length))
+    low = np.minimum(open_, close) - np.abs(rng.normal(0, 0.5, length))
+    return pd.DataFrame({
+        'timestamp': np.arange(length, dtype=np.int64) * 14_400_000,
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': rng.lognormal(6, 0.8, length),
+    }, index=pd.RangeIndex(50, 50 + length))
+
+
+def _reference_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """Indicadores montados um a um pelos métodos individuais."""
+    ti = TechnicalIndicators
+    result = pd.DataFrame(index=df.index)
+    for period in (17, 34, 72, 144, 305, 610):
+        result[f'ema_{period}'] = ti.calculate_ema(df['close'], period)
+    result['rsi_14'] = ti.calculate_rsi(df['close'], 14)
+    result = pd.concat([
+        result,
+        ti.calculate_macd(df['close']),
+        ti.calculate_bollinger(df['close']),
+        ti.calculate_volume_profile(df),
+    ], axis=1)
+    result['obv'] = ti.calculate_obv(df).astype(np.float64)
+    result['atr_14'] = ti.calculate_atr(df, 14)
+    result = pd.concat([result, ti.calculate_adx(df, 14)], axis=1)
+    result['ema_alignment_score'] = ti.calculate_ema_alignment_score(result)
+    return result
+
+
+def _arrays(df: pd.DataFrame):
+    return [df[col].to_numpy(dtype=np.float64) for col in OHLCV_COLUMNS]
+
+
+@pytest.mark.parametrize("length", [2, 14, 15, 25, 27, 28, 119, 120, 700])
+def test_calculate_all_arrays_matches_individual_methods(length):
+    df = _make_ohlcv(length)
+
+    result = TechnicalIndicators.calculate_all_arrays(*_arrays(df), index=df.index)
+
+    assert list(result.columns) == list(OHLCV_COLUMNS + INDICATOR_COLUMNS)
+    pd.testing.assert_frame_equal(result[list(OHLCV_COLUMNS)], df[list(OHLCV_COLUMNS)])
+    pd.testing.assert_frame_equal(
+        result[list(INDICATOR_COLUMNS)], _reference_indicators(df), check_exact=True
+    )
+
+
+def test_calculate_all_keeps_original_columns_and_replaces_stale_indicators():
+    df = _make_ohlcv(400)
+
+    result = TechnicalIndicators.calculate_all(df)
+    again = TechnicalIndicators.calculate_all(result)
+
+    assert list(result.columns) == list(df.columns) + list(INDICATOR_COLUMNS)
+    pd.testing.assert_frame_equal(result[list(df.columns)], df)
+    pd.testing.assert_frame_equal(again, result)
+
+
+def test_frame_uses_single_float_block():
+    df = _make_ohlcv(300)
+
+    result = TechnicalIndicators.calculate_all_arrays(*_arrays(df))
+
+    dtypes = result.dtypes.value_counts()
+    assert dtypes[np.dtype(np.float64)] == len(result.columns) - 1
+    assert result['ema_alignment_score'].dtype == np.int64
+    assert len({id(block) for block in result._mgr.blocks}) == 2
+
+
+def test_calculate_all_keeps_obv_dtype_of_calculate_obv():
+    df = _make_ohlcv(300).assign(volume=lambda d: d['volume'].round().astype(np.int64))
+    flat = _make_ohlcv(50).assign(open=1.0, high=1.0, low=1.0, close=1.0)
+
+    for frame in (df, flat, _make_ohlcv(300)):
+        result = TechnicalIndicators.calculate_all(frame)
+        pd.testing.assert_series_equal(
+            result['obv'], TechnicalIndicators.calculate_obv(frame), check_names=False, check_exact=True
+        )
+    assert TechnicalIndicators.calculate_all(df)['obv'].dtype == np.int64
+    assert TechnicalIndicators.calculate_all(flat)['obv'].dtype == np.int64
+
+
+def test_structured_and_matrix_inputs_match_frame():
+    df = _make_ohlcv(500)
+    frame = TechnicalIndicators.calculate_all_arrays(*_arrays(df))
+
+    structured = TechnicalIndicators.calculate_all_structured(*_arrays(df))
+    from_matrix = TechnicalIndicators.calculate_all_matrix(df[list(OHLCV_COLUMNS)].to_numpy())
+
+    assert structured.dtype.names == tuple(frame.columns)
+    pd.testing.assert_frame_equal(pd.DataFrame(structured), frame, check_exact=True)
+    pd.testing.assert_frame_equal(from_matrix, frame, check_exact=True)
+
+
+def test_calculate_all_matrix_rejects_wrong_shape():
+    with pytest.raises(ValueError):
+        TechnicalIndicators.calculate_all_matrix(np.zeros((10, 4)))
+
+
+def test_build_observation_accepts_ohlcv_arrays():
+    df = _make_ohlcv(700)
+    matrix = df[list(OHLCV_COLUMNS)].to_numpy()
+
+    from_arrays = FeatureEngineer.build_observation(
+        'BTCUSDT', matrix, matrix, matrix, None, None, None
+    )
+    enriched = TechnicalIndicators.calculate_all(df)
+    from_frames = FeatureEngineer.build_observation(
+        'BTCUSDT', enriched, enriched, enriched, None, None, None
+    )
+
+    np.testing.assert_array_equal(from_arrays, from_frames)
+
+
+def test_parquet_cache_feeds_engine(tmp_path):
+    df = _make_ohlcv(300)
+    db_path = tmp_path / "ohlcv.db"
+    with sqlite3.connect(db_path) as conn:
+        for table in ('ohlcv_h1', 'ohlcv_h4', 'ohlcv_d1'):
+            df.assign(symbol='BTCUSDT').to_sql(table, conn, index=False)
+
+    cache = ParquetCache(str(db_path), cache_dir=str(tmp_path / "cache"))
+    arrays = cache.get_cached_data_as_arrays('BTCUSDT', dtype=np.float64)
+    frames = cache.get_indicator_frames('BTCUSDT')
+
+    expected = TechnicalIndicators.calculate_all(df.reset_index(drop=True))
+    assert arrays['h4'].dtype == np.float64
+    pd.testing.assert_frame_equal(
+        TechnicalIndicators.calculate_all_matrix(arrays['h4']),
+        expected.drop(columns='timestamp'),
+        check_exact=True,
+    )
+    pd.testing.assert_frame_equal(frames['d1'], expected, check_exact=True)
+
+
+@pytest.mark.slow
+def test_benchmark_columnar_vs_individual_methods(monkeypatch):
+    # Volume Profile domina os dois caminhos e é o mesmo código: fica de fora
+    def _no_volume_profile(high, low, close, volume, lookback=120):
+        return (np.full(len(close), np.nan),) * 3
+
+    monkeypatch.setattr(TechnicalIndicators, '_volume_profile_arrays', staticmethod(_no_volume_profile))
+    df = _make_ohlcv(100_000)
+    arrays = _arrays(df)
+
+    start = time.perf_counter()
+    TechnicalIndicators.calculate_indicator_block(*arrays[1:])
+    columnar_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _reference_indicators(df)
+    reference_s = time.perf_counter() - start
+
+    print(
+        f"\nindicators sem VP n={len(df)}: individual={reference_s * 1000:.0f}ms "
+        f"columnar={columnar_s * 1000:.0f}ms speedup={reference_s / max(columnar_s, 1e-9):.1f}x"
+    )
@@ -0,0 +1,124 @@
+"""
+Testes dos arrays colunares mapeados (backtest/memmap_store.py) e de
+ParquetCache.get_memmap_columns.
+"""
+
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.data_cache import CACHE_COLUMNS, ParquetCache
+from backtest.memmap_store import MemmapArrayStore
+from data.database import DatabaseManager
+from scripts.benchmark_array_loaders import benchmark_loaders
+
+H4 = 4 * 3_600_000
+START = 1_704_067_200_000
+
+
+def _columns(n_rows: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    return {
+        'timestamp': START + np.arange(n_rows, dtype=np.int64) * H4,
+        'close': 100 + np.cumsum(rng.normal(0, 1, n_rows)),
+    }
+
+
+def test_roundtrip_is_read_only_memmap(tmp_path):
+    store = MemmapArrayStore(str(tmp_path))
+    columns = _columns(1_000)
+
+    store.write('BTCUSDT_h4', columns, version='1')
+    opened = store.open('BTCUSDT_h4')
+
+    assert set(opened) == {'timestamp', 'close'}
+    for name, values in columns.items():
+        assert isinstance(opened[name], np.memmap)
+        np.testing.assert_array_equal(opened[name], values)
+    with pytest.raises(ValueError):
+        opened['close'][0] = 0.0
+
+
+def test_new_version_replaces_old_and_keeps_open_maps_valid(tmp_path):
+    store = MemmapArrayStore(str(tmp_path))
+    store.write('k', _columns(100), version='1')
+    old = store.open('k', version='1')
+
+    store.write('k', _columns(150, seed=1), version='2')
+
+    assert store.open('k', version='1') is None
+    assert len(store.open('k', version='2')['close']) == 150
+    assert len(list((tmp_path / 'k').glob('v-*'))) == 1
+    np.testing.assert_array_equal(old['close'], _columns(100)['close'])
+
+
+def test_empty_and_mismatched_columns(tmp_path):
+    store = MemmapArrayStore(str(tmp_path))
+
+    store.write('empty', {'close': np.array([], dtype=np.float64)}, version='0')
+    assert len(store.open('empty')['close']) == 0
+
+    with pytest.raises(ValueError):
+        store.write('bad', {'a': np.zeros(2), 'b': np.zeros(3)}, version='0')
+
+
+@pytest.fixture
+def cache(tmp_path):
+    db = DatabaseManager(str(tmp_path / "ohlcv.db"))
+    db.bulk_insert_ohlcv("H4", pd.DataFrame({
+        **_columns(3_000), 'symbol': 'BTCUSDT', 'open': 1.0, 'high': 2.0, 'low': 0.5,
+        'volume': 10.0, 'quote_volume': 0.0, 'trades_count': 0,
+    }))
+    return ParquetCache(db.db_path, cache_dir=str(tmp_path / "cache"), freshness_interval_s=0)
+
+
+def _sum_close(cache_dir: str, db_path: str, queue) -> None:
+    columns = ParquetCache(db_path, cache_dir=cache_dir).get_memmap_columns('BTCUSDT', 'h4')
+    queue.put((type(columns['close']).__name__, float(np.sum(columns['close']))))
+
+
+def test_parquet_cache_memmap_columns_follow_source(cache, monkeypatch):
+    columns = cache.get_memmap_columns('BTCUSDT', 'h4')
+
+    assert list(columns) == list(CACHE_COLUMNS)
+    frame = cache.load_ohlcv_for_symbol('BTCUSDT', 'h4')
+    for name in CACHE_COLUMNS:
+        np.testing.assert_array_equal(columns[name], frame[name].to_numpy())
+
+    # Outro processo abre os mesmos arquivos, sem regravar
+    ctx = multiprocessing.get_context('fork')
+    queue = ctx.Queue()
+    process = ctx.Process(target=_sum_close, args=(str(cache.cache_dir), cache.db_path, queue))
+    process.start()
+    kind, total = queue.get(timeout=60)
+    process.join(timeout=60)
+    assert kind == 'memmap' and total == pytest.approx(float(np.sum(frame['close'])))
+
+    # Candle novo no SQLite gera nova versão
+    DatabaseManager(cache.db_path).bulk_insert_ohlcv("H4", pd.DataFrame({
+        'timestamp': [START + 3_000 * H4], 'symbol': 'BTCUSDT', 'open': 1.0, 'high': 2.0,
+        'low': 0.5, 'close': 1.5, 'volume': 10.0, 'quote_volume': 0.0, 'trades_count': 0,
+    }))
+    assert len(cache.get_memmap_columns('BTCUSDT', 'h4')['close']) == 3_001
+
+    writes = []
+    monkeypatch.setattr(cache.arrays, 'write', lambda *a, **k: writes.append(a))
+    cache.get_memmap_columns('BTCUSDT', 'h4')
+    assert writes == []
+
+
+def test_missing_pair_returns_empty(cache):
+    assert cache.get_memmap_columns('ETHUSDT', 'h4') == {}
+
+
+@pytest.mark.slow
+def test_benchmark_loaders_cold_and_warm(cache):
+    report = benchmark_loaders(cache, 'BTCUSDT', 'h4', repeats=3)
+
+    print("\n" + "\n".join(
+        f"{name:>8}: cold={row['cold_ms']:.2f}ms warm={row['warm_ms']:.2f}ms"
+        for name, row in report.items()
+    ))
+    assert {row['rows'] for row in report.values()} == {3_000}
@@ -0,0 +1,165 @@
+"""
+Testes do kernel NumPy de métricas (backtest/metrics_kernel.py) e dos
+calculadores que passaram a usá-lo.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from backtest import metrics_kernel as mk
+from backtest.backtest_metrics import BacktestMetrics
+from backtest.backtester import Backtester
+from backtest.metrics import MetricsCalculator
+
+
+def _reference(pnls, equity):
+    """Cálculo laço a laço sobre listas, como os calculadores faziam."""
+    wins = [p for p in pnls if p > 0]
+    losses = [p for p in pnls if p < 0]
+    streak = best = 0
+    for p in pnls:
+        streak = streak + 1 if p < 0 else 0
+        best = max(best, streak)
+    peak, max_dd = equity[0], 0.0
+    for value in equity:
+        peak = max(peak, value)
+        max_dd = max(max_dd, (peak - value) / peak)
+    returns = [(b - a) / a for a, b in zip(equity[:-1], equity[1:])]
+    std = np.std(returns)
+    return {
+        'win_rate': len(wins) / len(pnls) if pnls else 0.0,
+        'gross_profit': sum(wins),
+        'gross_loss': -sum(losses),
+        'max_consecutive_losses': best,
+        'max_drawdown': max_dd,
+        'sharpe_ratio': np.mean(returns) / std if std > 0 else 0.0,
+    }
+
+
+@pytest.fixture
+def variants():
+    rng = np.random.default_rng(7)
+    returns = rng.normal(0.0005, 0.01, (40, 300))
+    equity = 10000 * np.cumprod(1 + returns, axis=1)
+    lengths = rng.integers(0, 60, 40)
+    pnl = np.full((40, 60), np.nan)
+    for row, n in enumerate(lengths):
+        pnl[row, :n] = np.round(rng.normal(5, 50, n))
+    return equity, pnl, lengths
+
+
+def test_2d_matches_reference_per_variant(variants):
+    equity, pnl, lengths = variants
+
+    batch = mk.compute_metrics(equity=equity, pnl=pnl)
+
+    for row, n in enumerate(lengths):
+        expected = _reference(list(pnl[row, :n]), list(equity[row]))
+        for name, value in expected.items():
+            assert batch[name][row] == pytest.approx(value), name
+        assert batch['total_trades'][row] == n
+
+
+def test_1d_returns_python_scalars(variants):
+    equity, pnl, lengths = variants
+
+    single = mk.compute_metrics(equity=equity[3], pnl=pnl[3, :lengths[3]])
+
+    assert isinstance(single['sharpe_ratio'], float)
+    assert isinstance(single['max_consecutive_losses'], int)
+    assert single['max_drawdown'] == pytest.approx(mk.max_drawdown(equity)[3])
+
+
+def test_edge_cases():
+    assert mk.trade_metrics([])['profit_factor'] == 0.0
+    assert mk.trade_metrics([10.0, 5.0])['profit_factor'] == float('inf')
+    assert mk.trade_metrics([-1.0, 0.0, -2.0, -3.0])['max_consecutive_losses'] == 2
+    assert mk.sharpe_ratio([0.01, 0.01, 0.01]) == 0.0
+    assert mk.equity_metrics([100.0])['sharpe_ratio'] == 0.0
+    assert mk.max_consecutive(np.zeros((3, 0), dtype=bool)).tolist() == [0, 0, 0]
+
+
+def test_drawdown_epsilon_guards_zero_peak():
+    equity = np.array([0.0, 0.0, 0.0])
+
+    with np.errstate(invalid='ignore'):
+        assert np.isnan(mk.max_drawdown(equity))
+    assert mk.max_drawdown(equity, epsilon=1e-8) == 0.0
+    assert mk.drawdown_series([100.0, 50.0], epsilon=1e-8)[-1] == pytest.approx(50.0 / (100.0 + 1e-8))
+
+    with np.errstate(invalid='ignore'):
+        metrics = BacktestMetrics.calculate_from_equity_curve([0.0, 0.0, 0.0], [])
+    assert metrics.max_drawdown_pct == 0.0
+
+
+def test_rolling_matches_windowed_loop(variants):
+    equity, pnl, _ = variants
+    returns = mk.returns_from_equity(equity[0])
+    trades = pnl[0, :20]
+
+    sharpe = mk.rolling_sharpe(returns, 30)
+    drawdown = mk.rolling_max_drawdown(equity[:2], 50)
+    win_rate = mk.rolling_win_rate(trades, 5)
+
+    assert np.isnan(sharpe[:29]).all() and drawdown.shape == (2, 300)
+    for end in (30, 120, len(returns)):
+        assert sharpe[end - 1] == pytest.approx(mk.sharpe_ratio(returns[end - 30:end]))
+    for end in (50, 300):
+        assert drawdown[1, end - 1] == pytest.approx(mk.max_drawdown(equity[1, end - 50:end]))
+    assert win_rate[4:].tolist() == pytest.approx(
+        [np.mean(trades[i - 5:i] > 0) for i in range(5, 21)]
+    )
+    assert np.isnan(mk.rolling_sharpe(returns[:10], 30)).all()
+
+
+def test_calculators_keep_their_outputs():
+    pnls = [100.0, -50.0, 150.0, -30.0, -20.0, 200.0, -60.0, 180.0]
+    equity = list(10000 + np.cumsum([0.0] + pnls))
+
+    calc = MetricsCalculator([{'pnl_abs': p} for p in pnls], np.diff(equity) / equity[:-1])
+    result = calc.calculate_all()
+    assert result['win_rate'] == pytest.approx(4 / 8)
+    assert result['profit_factor'] == pytest.approx(630 / 160)
+    assert result['consec_losses'] == 2
+
+    metrics = BacktestMetrics.calculate_from_equity_curve(
+        equity, [{'pnl_realized': p} for p in pnls]
+    )
+    assert metrics.winning_trades == 4 and metrics.consecutive_losses == 2
+    assert metrics.avg_loss_pct == pytest.approx(np.mean([-50, -30, -20, -60]) / 100)
+    expected = _reference(pnls, equity)
+    assert metrics.max_drawdown_pct == pytest.approx(expected['max_drawdown'] * 100)
+
+    backtest = Backtester(initial_capital=10000)._calculate_metrics(
+        [{'pnl': p} for p in pnls], equity[1:], 10000
+    )
+    assert backtest['profit_factor'] == pytest.approx(630 / 160)
+    assert backtest['max_drawdown_pct'] == pytest.approx(expected['max_drawdown'] * 100)
+    returns = np.diff(equity[1:]) / equity[1:-1]
+    assert backtest['sharpe_ratio'] == pytest.approx(
+        np.mean(returns) / np.std(returns) * np.sqrt(252)
+    )
+
+
+@pytest.mark.slow
+def test_benchmark_batch_scoring():
+    rng = np.random.default_rng(0)
+    n_variants, n_periods, n_trades = 2000, 1000, 100
+    equity = 10000 * np.cumprod(1 + rng.normal(0, 0.01, (n_variants, n_periods)), axis=1)
+    pnl = rng.normal(5, 50, (n_variants, n_trades))
+
+    start_t = time.perf_counter()
+    for row in range(200):
+        _reference(list(pnl[row]), list(equity[row]))
+    loop_s = (time.perf_counter() - start_t) * n_variants / 200
+
+    start_t = time.perf_counter()
+    mk.compute_metrics(equity=equity, pnl=pnl)
+    kernel_s = time.perf_counter() - start_t
+
+    print(
+        f"\n{n_variants} variantes x {n_periods} períodos: laço={loop_s:.2f}s "
+        f"kernel 2D={kernel_s * 1000:.0f}ms speedup={loop_s / kernel_s:.0f}x"
+    )
@@ -0,0 +1,246 @@
+"""Inferencia em lote no estagio de decisao do Model2."""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Mapping
+
+import numpy as np
+import pytest
+from stable_baselines3 import PPO
+
+from core.model2.latency_metrics import record_latency_samples
+from core.model2.model_decision import ModelDecisionInput
+from core.model2.model_inference_service import (
+    ModelInferenceService,
+    TechnicalSignalInferenceProvider,
+)
+from core.model2.rl_model_loader import RLModelLoader
+
+
+@pytest.fixture(scope="module")
+def ppo() -> PPO:
+    return PPO("MlpPolicy", "CartPole-v1", seed=0, device="cpu")
+
+
+class _CountingModel:
+    """Envolve o modelo e conta chamadas de predict."""
+
+    def __init__(self, model: Any) -> None:
+        self.model = model
+        self.observation_space = model.observation_space
+        self.calls = 0
+
+    def predict(self, observation: Any, deterministic: bool = True) -> Any:
+        self.calls += 1
+        return self.model.predict(observation, deterministic=deterministic)
+
+
+def _loader(model: Any) -> RLModelLoader:
+    loader = RLModelLoader.__new__(RLModelLoader)
+    loader._model = model
+    loader._fallback_mode = False
+    loader._fallback_reason = ""
+    loader._checkpoint_path = None
+    return loader
+
+
+def _inputs(n: int, seed: int = 0) -> list[ModelDecisionInput]:
+    rng = np.random.default_rng(seed)
+    inputs = []
+    for i in range(n):
+        entry = float(rng.uniform(-2, 2))
+        inputs.append(
+            ModelDecisionInput(
+                symbol=f"S{i % 7}USDT",
+                timeframe="H4",
+                decision_timestamp=1_700_001_000_000,
+                model_version="m2-inference-v1",
+                market_state={
+                    "signal_side": ("LONG", "SHORT", "")[i % 3],
+                    "entry_price": entry,
+                    "stop_loss": entry - float(rng.uniform(0.1, 1)),
+                    "take_profit": entry + float(rng.uniform(0.1, 1)),
+                },
+                position_state={},
+                risk_state={},
+            )
+        )
+    return inputs
+
+
+def _provider(loader: RLModelLoader) -> TechnicalSignalInferenceProvider:
+    provider = TechnicalSignalInferenceProvider.__new__(TechnicalSignalInferenceProvider)
+    provider._repo_root = Path("/nonexistent")
+    provider._registry = None
+    provider._default_loader = loader
+    provider._loaders_by_symbol = {}
+    return provider
+
+
+def test_loader_batch_igual_a_predicao_item_a_item(ppo: PPO) -> None:
+    counting = _CountingModel(ppo)
+    loader = _loader(counting)
+    rng = np.random.default_rng(1)
+    features = rng.normal(0, 1, (48, 9))
+    sides = ["BUY", "SELL", "", "LONG"] * 12
+
+    batched = loader.predict_confidence_batch(features, sides)
+
+    assert counting.calls == 1
+    assert batched == [loader.predict_confidence(row, side) for row, side in zip(features, sides)]
+
+
+def test_loader_batch_fallback_e_validacao() -> None:
+    loader = _loader(None)
+    assert loader.predict_confidence_batch(np.zeros((2, 5)), ["SELL", ""]) == [
+        (0.70, "SHORT"),
+        (0.70, "HOLD"),
+    ]
+    assert loader.predict_confidence_batch([], []) == []
+    with pytest.raises(ValueError):
+        loader.predict_confidence_batch(np.zeros((2, 5)), ["BUY"])
+
+    class _Broken:
+        observation_space = None
+
+        def predict(self, *_: Any, **__: Any) -> Any:
+            raise RuntimeError("falha no forward")
+
+    assert _loader(_Broken()).predict_confidence_batch(np.zeros((2, 5)), ["BUY", "SELL"]) == [
+        (0.70, "LONG"),
+        (0.70, "SHORT"),
+    ]
+
+
+def test_loader_batch_isola_linha_invalida(ppo: PPO) -> None:
+    counting = _CountingModel(ppo)
+    loader = _loader(counting)
+    rng = np.random.default_rng(4)
+    features: list[Any] = list(rng.normal(0, 1, (4, 4)))
+    features.insert(2, ["nao", "numerico", "", ""])
+    sides = ["BUY", "SELL", "BUY", "", "LONG"]
+
+    batched = loader.predict_confidence_batch(features, sides)
+
+    assert counting.calls == 1
+    assert batched[2] == (0.70, "LONG")
+    for index in (0, 1, 3, 4):
+        assert batched[index] == loader.predict_confidence(features[index], sides[index])
+
+
+def test_provider_pontua_ciclo_em_um_forward(ppo: PPO) -> None:
+    counting = _CountingModel(ppo)
+    provider = _provider(_loader(counting))
+    inputs = _inputs(45)
+
+    batched = provider.infer_batch(inputs)
+
+    assert counting.calls == 1
+    assert batched == [provider.infer(model_input) for model_input in inputs]
+
+
+def test_service_batch_igual_a_infer(ppo: PPO) -> None:
+    service = ModelInferenceService(provider=_provider(_loader(ppo)), model_version="m2-vtest")
+    inputs = _inputs(20, seed=3)
+
+    batched = service.infer_batch(inputs)
+
+    assert len(batched) == 20
+    for result, model_input in zip(batched, inputs):
+        single = service.infer(model_input)
+        assert (result.accepted, result.decision, result.reason) == (
+            single.accepted,
+            single.decision,
+            single.reason,
+        )
+        assert result.inference_latency_ms == batched[0].inference_latency_ms
+    assert service.infer_batch([]) == []
+
+
+def test_service_batch_amortiza_latencia_por_item() -> None:
+    class _SlowBatch:
+        def infer(self, model_input: ModelDecisionInput) -> Mapping[str, Any]:
+            return {"action": "HOLD", "confidence": 0.5, "size_fraction": 0.0, "reason": "hold"}
+
+        def infer_batch(self, model_inputs: Any) -> list[Mapping[str, Any]]:
+            time.sleep(0.2)
+            return [self.infer(model_input) for model_input in model_inputs]
+
+    results = ModelInferenceService(provider=_SlowBatch()).infer_batch(_inputs(4))
+
+    # 200ms de lote para 4 itens: ~50ms cada, nao o lote inteiro por item
+    latencies = [result.inference_latency_ms for result in results]
+    assert len(set(latencies)) == 1
+    assert 50 <= latencies[0] < 200
+
+
+def test_service_batch_sem_infer_batch_e_com_erro() -> None:
+    class _SingleProvider:
+        def __init__(self) -> None:
+            self.calls = 0
+
+        def infer(self, model_input: ModelDecisionInput) -> Mapping[str, Any]:
+            self.calls += 1
+            return {"action": "HOLD", "confidence": 0.5, "size_fraction": 0.0, "reason": "hold"}
+
+    single = _SingleProvider()
+    results = ModelInferenceService(provider=single).infer_batch(_inputs(3))
+    assert single.calls == 3 and len(results) == 3
+
+    class _BrokenBatch(_SingleProvider):
+        def infer_batch(self, model_inputs: Any) -> list[Mapping[str, Any]]:
+            raise RuntimeError("lote falhou")
+
+    # Lote falhou: cada item e refeito por infer() e so o item ruim e rejeitado
+    class _OneBadItem(_BrokenBatch):
+        def infer(self, model_input: ModelDecisionInput) -> Mapping[str, Any]:
+            if model_input.symbol == "S2USDT":
+                raise RuntimeError("item invalido")
+            return super().infer(model_input)
+
+    provider = _OneBadItem()
+    results = ModelInferenceService(provider=provider).infer_batch(_inputs(4))
+    assert provider.calls == 3
+    assert [r.reason == "inference_provider_error" for r in results] == [False, False, True, False]
+    assert results[2].details == {"error": "item invalido"}
+
+
+def test_record_latency_samples_persiste_uma_amostra_por_item(tmp_path: Path) -> None:
+    db_path = str(tmp_path / "latency.db")
+
+    record_latency_samples(db_path, stage="inference", samples=[3, 3, 4])
+    record_latency_samples(db_path, stage="inference", samples=[])
+
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT stage, elapsed_ms FROM m2_latency_samples ORDER BY id").fetchall()
+    assert rows == [("inference", 3), ("inference", 3), ("inference", 4)]
+
+
+@pytest.mark.slow
+def test_benchmark_estagio_de_decisao(ppo: PPO) -> None:
+    provider = _provider(_loader(ppo))
+    inputs = [i for i in _inputs(60) if i.market_state["signal_side"]]
+
+    started = time.perf_counter()
+    for model_input in inputs:
+        provider._build_payload(
+            model_input,
+            provider._resolve_action_from_signal_side(str(model_input.market_state["signal_side"])),
+            provider._default_loader,
+            provider._default_loader.predict_confidence(
+                provider._build_features(model_input), str(model_input.market_state["signal_side"])
+            ),
+        )
+    single_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    provider.infer_batch(inputs)
+    batch_s = time.perf_counter() - started
+
+    print(
+        f"\n40 candidatos: item a item={single_s * 1000:.1f}ms lote={batch_s * 1000:.1f}ms "
+        f"speedup={single_s / batch_s:.1f}x"
+    )
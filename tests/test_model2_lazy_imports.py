@@ -0,0 +1,152 @@
+"""Imports sob demanda do Model2 e --profile-imports do live cycle."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+import core.lazy_imports as lazy_imports
+import core.model2 as model2
+import scripts.model2.live_cycle as live_cycle
+from core.lazy_imports import ImportProfiler
+from core.model2.model_registry import ModelRegistry
+from core.model2.rl_model_loader import RLModelLoader
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = (
+    "torch",
+    "stable_baselines3",
+    "pandas",
+    "requests",
+    "binance_sdk_derivatives_trading_usds_futures",
+    "core.model2.live_service",
+    "core.scheduler",
+)
+
+
+def _loaded_after(code: str) -> list[str]:
+    probe = textwrap.dedent(code) + textwrap.dedent(
+        f"""
+        import sys
+        print("loaded=" + ",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+        """
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe], cwd=REPO_ROOT, check=True, capture_output=True, text=True
+    )
+    return [m for m in result.stdout.rsplit("loaded=", 1)[1].strip().split(",") if m]
+
+
+def test_importar_pacotes_nao_carrega_dependencias_pesadas() -> None:
+    assert _loaded_after("import core, data, core.model2, scripts.model2.live_cycle") == []
+    assert _loaded_after("from core.model2 import Model2ThesisRepository") == []
+
+
+def test_nomes_reexportados_resolvem_sob_demanda() -> None:
+    from core.model2.live_service import Model2LiveExecutionService
+    from core.model2.repository import Model2ThesisRepository
+
+    assert model2.Model2LiveExecutionService is Model2LiveExecutionService
+    assert model2.Model2ThesisRepository is Model2ThesisRepository
+    assert all(hasattr(model2, name) for name in model2.__all__)
+    assert set(model2.__all__) <= set(dir(model2))
+    with pytest.raises(AttributeError):
+        model2.NaoExiste  # noqa: B018
+
+
+def test_import_profiler_mede_tempo_proprio_e_acumulado(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Relogio falso avancado pelos proprios modulos: medicao sem depender de sleep
+    (tmp_path / "perfclock.py").write_text("now = 0.0\n")
+    package = tmp_path / "perfpkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("import perfclock\nperfclock.now += 0.02\nfrom . import child\n")
+    (package / "child.py").write_text("import perfclock\nperfclock.now += 0.05\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import perfclock
+
+    monkeypatch.setattr(lazy_imports, "time", SimpleNamespace(perf_counter=lambda: perfclock.now))
+
+    with ImportProfiler() as profiler:
+        import perfpkg  # noqa: F401
+
+    records = {r.module: r for r in profiler.records}
+    assert records["perfpkg.child"].self_ms == pytest.approx(50)
+    assert records["perfpkg"].self_ms == pytest.approx(20)
+    assert records["perfpkg"].cumulative_ms == pytest.approx(70)
+    assert perfpkg.child.__loader__.__class__.__name__ == "SourceFileLoader"
+    assert profiler.report(limit=1)["top_cumulative"][0]["module"] == "perfpkg"
+    assert profiler._finder not in sys.meta_path
+    for name in ("perfclock", "perfpkg", "perfpkg.child"):
+        sys.modules.pop(name, None)
+
+
+def test_loader_lazy_so_carrega_na_primeira_predicao(tmp_path: Path) -> None:
+    checkpoint = tmp_path / "ppo_model.zip"
+    checkpoint.write_text("1")
+    calls: list[Path] = []
+
+    class _Model:
+        def predict(self, observation: Any, deterministic: bool = True) -> Any:
+            import numpy as np
+
+            return np.array([1]), None
+
+    def load(path: Path) -> _Model:
+        calls.append(path)
+        return _Model()
+
+    loader = RLModelLoader(checkpoint_path=checkpoint, registry=ModelRegistry(load_fn=load, auto_watch=False))
+    assert calls == []
+    assert loader.checkpoint_timestamp == checkpoint.stat().st_mtime
+    assert calls == []
+
+    assert loader.predict_confidence([0.0] * 5, "BUY") == (0.85, "LONG")
+    assert loader.predict_confidence([0.0] * 5, "SELL") == (0.30, "LONG")
+    assert len(calls) == 1 and not loader.is_fallback
+
+
+def test_live_cycle_profile_imports_no_summary(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    (tmp_path / "estagio_fake.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    def _cycle(**_: Any) -> dict[str, Any]:
+        import estagio_fake  # noqa: F401
+
+        return {"status": "ok", "run_id": "r1", "execution_mode": "shadow"}
+
+    monkeypatch.setattr(live_cycle, "run_live_cycle", _cycle)
+    monkeypatch.setattr(live_cycle, "render_live_cycle_summary", lambda **_: "")
+    monkeypatch.setattr(sys, "argv", ["live_cycle.py", "--profile-imports"])
+
+    assert live_cycle.main() == 0
+
+    summary = json.loads(capsys.readouterr().out)
+    modules = [item["module"] for item in summary["import_profile"]["top_cumulative"]]
+    assert summary["status"] == "ok" and "estagio_fake" in modules
+    sys.modules.pop("estagio_fake", None)
+
+
+@pytest.mark.slow
+def test_benchmark_inicio_do_live_cycle() -> None:
+    def _seconds(code: str) -> float:
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, check=True, capture_output=True)
+        return time.perf_counter() - started
+
+    lazy_s = _seconds("import scripts.model2.live_cycle")
+    # Equivalente ao import ansioso anterior: todos os reexports + scheduler + SDK + SB3
+    eager_s = _seconds(
+        "import core.model2 as m; [getattr(m, n) for n in m.__all__]; "
+        "import core.scheduler, data.binance_client, stable_baselines3"
+    )
+    print(f"\nimport do live_cycle: sob demanda={lazy_s:.2f}s ansioso={eager_s:.2f}s")
@@ -0,0 +1,263 @@
+"""Daemon do live cycle: agendamento por fechamento de candle, estado quente e socket de controle."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import scripts.model2.live_daemon as live_daemon
+import scripts.model2.live_execute as live_execute
+import scripts.model2.live_reconcile as live_reconcile
+from scripts.model2.live_daemon import (
+    Model2LiveDaemon,
+    due_timeframes,
+    next_boundary_ms,
+    send_control_command,
+)
+from scripts.model2.migrate import run_up
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DAY_MS = 86_400_000
+HOUR_MS = 3_600_000
+M5_MS = 300_000
+# 2024-01-01 00:00 UTC
+MIDNIGHT_MS = 1_704_067_200_000
+
+
+class _Clock:
+    def __init__(self, now_ms: int) -> None:
+        self.now_ms = now_ms
+
+    def __call__(self) -> int:
+        return self.now_ms
+
+
+def _daemon(tmp_path: Path, **overrides: Any) -> Model2LiveDaemon:
+    kwargs: dict[str, Any] = {
+        "source_db_path": tmp_path / "source.db",
+        "model2_db_path": tmp_path / "modelo2.db",
+        "legacy_db_path": tmp_path / "source.db",
+        "symbols": ["BTCUSDT"],
+        "timeframes": ("D1", "H4", "H1", "M5"),
+        "output_dir": tmp_path / "runtime",
+        "execution_mode": "shadow",
+        "live_symbols": ("BTCUSDT",),
+        "max_daily_entries": 3,
+        "max_margin_per_position_usd": 25.0,
+        "max_signal_age_minutes": 240,
+        "symbol_cooldown_minutes": 240,
+        "short_only": False,
+        "funding_rate_max_for_short": 0.0005,
+        "leverage": 3,
+    }
+    kwargs.update(overrides)
+    return Model2LiveDaemon(**kwargs)
+
+
+@pytest.fixture
+def fake_stages(monkeypatch: pytest.MonkeyPatch) -> dict[str, list[Any]]:
+    """Substitui pipeline, live cycle e montagem dos servicos por fakes que registram chamadas."""
+    calls: dict[str, list[Any]] = {"pipeline": [], "live": [], "builds": []}
+
+    def _pipeline(**kwargs: Any) -> dict[str, Any]:
+        calls["pipeline"].append(kwargs)
+        if kwargs["timeframe"] == "H1":
+            raise RuntimeError("fonte indisponivel")
+        return {"status": "ok", "output_file": f"pipeline_{kwargs['timeframe']}.json"}
+
+    def _live(**kwargs: Any) -> dict[str, Any]:
+        calls["live"].append((kwargs["execute_service"], kwargs["reconcile_service"]))
+        return {"status": "ok"}
+
+    def _build(kind: str):  # type: ignore[no-untyped-def]
+        def build(**kwargs: Any) -> Any:
+            calls["builds"].append((kind, kwargs.get("exchange")))
+            return type("_Service", (), {"exchange": kwargs.get("exchange") or f"exchange-{kind}"})()
+
+        return build
+
+    monkeypatch.setattr(live_daemon, "run_daily_pipeline", _pipeline)
+    monkeypatch.setattr(live_daemon, "run_live_cycle", _live)
+    monkeypatch.setattr(live_execute, "build_live_execute_service", _build("execute"))
+    monkeypatch.setattr(live_reconcile, "build_live_reconcile_service", _build("reconcile"))
+    return calls
+
+
+def test_fechamentos_de_candle_por_timeframe() -> None:
+    timeframes = ("D1", "H4", "H1", "M5")
+    assert due_timeframes(timeframes, MIDNIGHT_MS) == timeframes
+    assert due_timeframes(timeframes, MIDNIGHT_MS + 4 * HOUR_MS) == ("H4", "H1", "M5")
+    assert due_timeframes(timeframes, MIDNIGHT_MS + HOUR_MS) == ("H1", "M5")
+    assert due_timeframes(timeframes, MIDNIGHT_MS + M5_MS) == ("M5",)
+    assert next_boundary_ms(timeframes, MIDNIGHT_MS) == MIDNIGHT_MS + M5_MS
+    assert next_boundary_ms(("D1", "H4"), MIDNIGHT_MS + 1) == MIDNIGHT_MS + 4 * HOUR_MS
+    with pytest.raises(ValueError):
+        _daemon(Path("."), timeframes=("M7",))
+
+
+def test_fechamentos_perdidos_viram_um_ciclo(tmp_path: Path) -> None:
+    clock = _Clock(MIDNIGHT_MS + 4 * HOUR_MS - 1)
+    daemon = _daemon(tmp_path, timeframes=("H4", "H1"), now_ms=clock, grace_seconds=5)
+
+    assert daemon.next_scheduled(clock.now_ms) == (MIDNIGHT_MS + 4 * HOUR_MS, ("H4", "H1"))
+
+    # Ciclo das 00:00 estourou ate 02:30: 01:00 e 02:00 ja passaram
+    clock.now_ms = MIDNIGHT_MS + 2 * HOUR_MS + 30 * 60_000
+    assert daemon.next_scheduled(MIDNIGHT_MS) == (MIDNIGHT_MS + 2 * HOUR_MS, ("H1",))
+    clock.now_ms = MIDNIGHT_MS + 4 * HOUR_MS + 10_000
+    assert daemon.next_scheduled(MIDNIGHT_MS) == (MIDNIGHT_MS + 4 * HOUR_MS, ("H4", "H1"))
+
+
+def test_ciclos_reutilizam_exchange_e_cache(tmp_path: Path, fake_stages: dict[str, list[Any]]) -> None:
+    daemon = _daemon(tmp_path)
+
+    first = daemon.run_cycle(reason="startup")
+    second = daemon.run_cycle(reason="candle_close", timeframes=("M5",), boundary_ms=MIDNIGHT_MS)
+
+    # Servicos novos por ciclo; a exchange criada no primeiro build e reutilizada
+    assert fake_stages["builds"] == [
+        ("execute", None),
+        ("reconcile", "exchange-execute"),
+        ("execute", "exchange-execute"),
+        ("reconcile", "exchange-execute"),
+    ]
+    assert fake_stages["live"][0][0] is not fake_stages["live"][1][0]
+    assert {id(call["cache_provider"]) for call in fake_stages["pipeline"]} == {id(daemon.cache_provider)}
+    # Estado SMC do scan persiste entre ciclos, sem status de zona (igual ao batch)
+    assert {id(call["smc_state"]) for call in fake_stages["pipeline"]} == {id(daemon.smc_state)}
+    assert daemon.smc_state.get("BTCUSDT", "H4").track_zone_status is False
+    assert [call["timeframe"] for call in fake_stages["pipeline"]] == ["D1", "H4", "H1", "M5", "M5"]
+
+    assert first["status"] == "partial"
+    assert first["stage_errors"][0]["stage"] == "daily_pipeline_H1"
+    assert first["stages"]["live_cycle"]["status"] == "ok"
+    assert second["status"] == "ok" and second["timeframes"] == ["M5"]
+    status = daemon.status()
+    assert status["cycles"] == 2 and status["healthy"]
+    assert (tmp_path / "runtime" / live_daemon.STATUS_FILE_NAME).exists()
+
+
+def test_guardrails_semeados_a_cada_ciclo(tmp_path: Path) -> None:
+    daemon = _daemon(tmp_path, execution_mode="live")
+    exchange = object()
+    daemon._exchange = exchange  # cliente ja criado: sem SDK nem token de mainnet
+
+    first, _ = daemon._build_services()
+    first._snapshot_guardrail_state(100.0)
+    assert first._snapshot_guardrail_state(96.0)["risk_gate_drawdown_pct"] == pytest.approx(-4.0)
+
+    # Ciclo seguinte: pico volta a ser o saldo atual, como no processo por ciclo
+    second, reconcile = daemon._build_services()
+    assert second is not first and second.exchange is reconcile.exchange is exchange
+    snapshot = second._snapshot_guardrail_state(96.0)
+    assert snapshot["risk_gate_drawdown_pct"] == 0.0
+    assert snapshot["risk_gate_allows_order"] and snapshot["circuit_breaker_allows_trading"]
+
+
+def test_falha_no_live_cycle_marca_unhealthy(
+    tmp_path: Path, fake_stages: dict[str, list[Any]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def _broken(**_: Any) -> dict[str, Any]:
+        raise RuntimeError("exchange fora")
+
+    monkeypatch.setattr(live_daemon, "run_live_cycle", _broken)
+    daemon = _daemon(tmp_path, run_pipeline=False)
+
+    summary = daemon.run_cycle()
+
+    assert summary["status"] == "error" and summary["timeframes"] == []
+    assert fake_stages["pipeline"] == []
+    assert daemon.status()["healthy"] is False
+
+
+def test_socket_de_controle(tmp_path: Path, fake_stages: dict[str, list[Any]]) -> None:
+    # Logo apos a meia-noite: proximo fechamento D1 so em ~24h
+    clock = _Clock(MIDNIGHT_MS + 1)
+    daemon = _daemon(tmp_path, timeframes=("D1",), now_ms=clock)
+    host, port = daemon.start_control_server(port=0)
+    token = live_daemon.read_control_token(tmp_path / "runtime")
+    worker = threading.Thread(target=daemon.serve_forever, kwargs={"run_on_start": False})
+    worker.start()
+    try:
+        assert token and (tmp_path / "runtime" / live_daemon.TOKEN_FILE_NAME).stat().st_mode & 0o077 == 0
+        # Sem o token nenhum comando e executado
+        assert send_control_command("run", host=host, port=port, token="")["error"] == "unauthorized"
+        assert send_control_command("stop", host=host, port=port, token="x" * len(token))["error"] == "unauthorized"
+        assert fake_stages["pipeline"] == []
+
+        status = send_control_command("status", host=host, port=port, token=token)
+        assert status["status"] == "running" and status["cycles"] == 0
+        assert status["next_trigger_utc_ms"] == MIDNIGHT_MS + DAY_MS + 5_000
+        assert token not in json.dumps(status)
+
+        result = send_control_command("run", host=host, port=port, token=token, timeframes=["d1"])
+        assert result["status"] == "ok" and result["reason"] == "on_demand"
+        assert fake_stages["pipeline"][0]["timeframe"] == "D1"
+        # Ciclo roda na thread de trabalho (pool SQLite e por thread)
+        assert send_control_command("health", host=host, port=port, token=token)["cycles"] == 1
+
+        assert send_control_command("run", host=host, port=port, token=token, timeframes=["H4"])["status"] == "error"
+        assert "unknown command" in send_control_command("reboot", host=host, port=port, token=token)["error"]
+        assert send_control_command("stop", host=host, port=port, token=token) == {"status": "stopping"}
+        worker.join(5)
+        assert not worker.is_alive()
+    finally:
+        daemon.stop()
+        worker.join(5)
+
+
+def _prepare_model2_db(tmp_path: Path) -> Path:
+    db_path = tmp_path / "modelo2.db"
+    run_up(db_path=db_path, output_dir=tmp_path / "runtime")
+    return db_path
+
+
+def test_ciclo_real_em_shadow(tmp_path: Path) -> None:
+    daemon = _daemon(tmp_path, model2_db_path=_prepare_model2_db(tmp_path), run_pipeline=False)
+
+    first = daemon.run_cycle()
+    second = daemon.run_cycle()
+
+    assert first["status"] == second["status"] == "ok", first["stage_errors"]
+    assert list((tmp_path / "runtime").glob("model2_live_execute_*.json"))
+
+
+@pytest.mark.slow
+def test_benchmark_ciclo_quente_vs_processo_novo(tmp_path: Path) -> None:
+    db_path = _prepare_model2_db(tmp_path)
+    output_dir = tmp_path / "runtime"
+    started = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable,
+            "scripts/model2/live_cycle.py",
+            "--model2-db-path",
+            str(db_path),
+            "--output-dir",
+            str(output_dir),
+            "--execution-mode",
+            "shadow",
+        ],
+        cwd=REPO_ROOT,
+        check=True,
+        capture_output=True,
+    )
+    cold_s = time.perf_counter() - started
+
+    daemon = _daemon(tmp_path, model2_db_path=db_path, output_dir=output_dir, run_pipeline=False)
+    daemon.run_cycle(reason="startup")
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        assert daemon.run_cycle()["status"] == "ok"
+        timings.append(time.perf_counter() - started)
+    warm_s = min(timings)
+
+    print(f"\nlive cycle shadow: processo novo={cold_s:.2f}s daemon quente={warm_s * 1000:.1f}ms")
@@ -172,6 +172,15 @@ class SequencedBalanceExchange(FakeExchange):
         return value
 
 
+def _per_item(infer):
+    """Adapta um infer forcado ao estagio de decisao em lote (infer_batch)."""
+
+    def _infer_batch(self, model_inputs):
+        return [infer(self, model_input) for model_input in model_inputs]
+
+    return _infer_batch
+
+
 def _forced_inference_result(model_input, *, action: str, reason: str) -> InferenceServiceResult:
     if action == ACTION_OPEN_LONG:
         sl_target = 95.0
@@ -303,8 +312,8 @@ def test_run_live_execute_uses_model_action_as_execution_origin(tmp_path: Path,
         )
 
     monkeypatch.setattr(
-        "core.model2.live_service.ModelInferenceService.infer",
-        _force_open_long,
+        "core.model2.live_service.ModelInferenceService.infer_batch",
+        _per_item(_force_open_long),
     )
 
     summary = run_live_execute(
@@ -354,8 +363,8 @@ def test_run_live_execute_accepts_hold_without_order(tmp_path: Path, monkeypatch
         )
 
     monkeypatch.setattr(
-        "core.model2.live_service.ModelInferenceService.infer",
-        _force_hold,
+        "core.model2.live_service.ModelInferenceService.infer_batch",
+        _per_item(_force_hold),
     )
 
     summary = run_live_execute(
@@ -1095,8 +1104,8 @@ def test_model_action_reduce_blocks_without_order_and_no_strategy_fallback(
         return _forced_action_result(ACTION_REDUCE)
 
     monkeypatch.setattr(
-        "core.model2.live_service.ModelInferenceService.infer",
-        _force_reduce,
+        "core.model2.live_service.ModelInferenceService.infer_batch",
+        _per_item(_force_reduce),
     )
 
     summary = run_live_execute(
@@ -1139,8 +1148,8 @@ def test_model_action_close_blocks_without_order_and_no_strategy_fallback(
         return _forced_action_result(ACTION_CLOSE)
 
     monkeypatch.setattr(
-        "core.model2.live_service.ModelInferenceService.infer",
-        _force_close,
+        "core.model2.live_service.ModelInferenceService.infer_batch",
+        _per_item(_force_close),
     )
 
     summary = run_live_execute(
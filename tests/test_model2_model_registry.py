@@ -0,0 +1,164 @@
+"""Registro de modelos compartilhado: carga unica, recarga a quente e fallback."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from core.model2.model_inference_service import TechnicalSignalInferenceProvider
+from core.model2.model_registry import ModelRegistry
+from core.model2.rl_model_loader import RLModelLoader
+
+
+class _FakeModel:
+    """Politica fixa: sempre a mesma acao."""
+
+    def __init__(self, action: int) -> None:
+        self.action = action
+
+    def predict(self, observation: Any, deterministic: bool = True) -> tuple[np.ndarray, None]:
+        return np.array([self.action]), None
+
+
+class _FakeLoad:
+    """load_fn que le a acao do conteudo do checkpoint."""
+
+    def __init__(self) -> None:
+        self.calls: list[Path] = []
+        self.gate: threading.Event | None = None
+
+    def __call__(self, path: Path) -> _FakeModel:
+        self.calls.append(path)
+        if self.gate is not None:
+            self.gate.wait(5)
+        return _FakeModel(int(path.read_text()))
+
+
+def _write(path: Path, action: int, mtime: float) -> None:
+    path.write_text(str(action))
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def registry() -> tuple[ModelRegistry, _FakeLoad]:
+    load = _FakeLoad()
+    return ModelRegistry(load_fn=load, auto_watch=False), load
+
+
+def test_checkpoint_carregado_uma_vez_e_compartilhado(tmp_path: Path, registry) -> None:  # type: ignore[no-untyped-def]
+    reg, load = registry
+    checkpoint = tmp_path / "ppo_model.zip"
+    _write(checkpoint, 1, 1_000)
+
+    loaders = [RLModelLoader(checkpoint_path=checkpoint, registry=reg, lazy=False) for _ in range(20)]
+
+    assert len(load.calls) == 1
+    assert len({id(loader._model) for loader in loaders}) == 1
+    assert loaders[0].checkpoint_timestamp == 1_000
+    assert reg.stats() == {"models": 1, "loads": 1, "reloads": 0}
+
+
+def test_provider_compartilha_modelo_entre_simbolos(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, registry) -> None:  # type: ignore[no-untyped-def]
+    reg, load = registry
+    checkpoint = tmp_path / "ppo_model.zip"
+    _write(checkpoint, 1, 1_000)
+    monkeypatch.setattr(RLModelLoader, "_resolve_checkpoint", lambda self: checkpoint)
+
+    provider = TechnicalSignalInferenceProvider(registry=reg)
+    loaders = [provider._resolve_loader_for_symbol(f"S{i}USDT") for i in range(30)]
+
+    # Loaders sao lazy: o modelo carrega no primeiro uso
+    assert load.calls == []
+    assert all(loader._model is loaders[0]._model for loader in loaders)
+    assert len(load.calls) == 1
+
+
+def test_recarga_quando_checkpoint_muda(tmp_path: Path, registry) -> None:  # type: ignore[no-untyped-def]
+    reg, load = registry
+    checkpoint = tmp_path / "ppo_model.zip"
+    _write(checkpoint, 1, 1_000)
+    loader = RLModelLoader(checkpoint_path=checkpoint, registry=reg, lazy=False)
+    assert loader.predict_confidence(np.zeros(5), "BUY") == (0.85, "LONG")
+
+    assert reg.refresh() == []
+    _write(checkpoint, 2, 2_000)
+    assert reg.refresh() == [checkpoint.resolve()]
+
+    assert loader.predict_confidence(np.zeros(5), "BUY") == (0.30, "SHORT")
+    assert loader.checkpoint_timestamp == 2_000
+    assert reg.stats()["reloads"] == 1
+
+
+def test_recarga_nao_bloqueia_decisao_em_andamento(tmp_path: Path, registry) -> None:  # type: ignore[no-untyped-def]
+    reg, load = registry
+    checkpoint = tmp_path / "ppo_model.zip"
+    _write(checkpoint, 1, 1_000)
+    loader = RLModelLoader(checkpoint_path=checkpoint, registry=reg, lazy=False)
+
+    _write(checkpoint, 2, 2_000)
+    load.gate = threading.Event()
+    reloader = threading.Thread(target=reg.refresh)
+    reloader.start()
+    while len(load.calls) < 2:
+        time.sleep(0.001)
+
+    # Carga do checkpoint novo em andamento: predicao segue com o modelo atual
+    assert loader.predict_confidence(np.zeros(5), "BUY") == (0.85, "LONG")
+    assert reloader.is_alive() and not load.gate.is_set()
+
+    load.gate.set()
+    reloader.join()
+    assert loader.predict_confidence(np.zeros(5), "BUY") == (0.30, "SHORT")
+
+
+def test_falha_na_recarga_mantem_modelo_atual(tmp_path: Path, registry) -> None:  # type: ignore[no-untyped-def]
+    reg, load = registry
+    checkpoint = tmp_path / "ppo_model.zip"
+    _write(checkpoint, 1, 1_000)
+    loader = RLModelLoader(checkpoint_path=checkpoint, registry=reg, lazy=False)
+
+    # Arquivo parcialmente escrito
+    checkpoint.write_text("")
+    os.utime(checkpoint, (2_000, 2_000))
+    assert reg.refresh() == []
+    assert loader.predict_confidence(np.zeros(5), "BUY") == (0.85, "LONG")
+    assert not loader.is_fallback
+
+    _write(checkpoint, 2, 3_000)
+    assert reg.refresh() == [checkpoint.resolve()]
+    assert loader.predict_confidence(np.zeros(5), "SELL") == (0.85, "SHORT")
+
+
+def test_checkpoint_que_surge_depois_sai_do_fallback(tmp_path: Path, registry) -> None:  # type: ignore[no-untyped-def]
+    reg, _ = registry
+    checkpoint = tmp_path / "ppo_model.zip"
+    loader = RLModelLoader(checkpoint_path=checkpoint, registry=reg, lazy=False)
+    assert loader.is_fallback and "nao encontrado" in loader.fallback_reason
+
+    _write(checkpoint, 1, 1_000)
+    reg.refresh()
+
+    assert not loader.is_fallback and loader.fallback_reason == ""
+    assert loader.predict_confidence(np.zeros(5), "BUY") == (0.85, "LONG")
+
+
+def test_watcher_recarrega_em_background(tmp_path: Path) -> None:
+    load = _FakeLoad()
+    reg = ModelRegistry(load_fn=load, poll_interval_seconds=0.02)
+    checkpoint = tmp_path / "ppo_model.zip"
+    _write(checkpoint, 1, 1_000)
+    loader = RLModelLoader(checkpoint_path=checkpoint, registry=reg, lazy=False)
+    try:
+        _write(checkpoint, 2, 2_000)
+        deadline = time.monotonic() + 5
+        while loader.checkpoint_timestamp != 2_000 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert loader.predict_confidence(np.zeros(5), "SELL") == (0.85, "SHORT")
+    finally:
+        reg.stop_watcher()
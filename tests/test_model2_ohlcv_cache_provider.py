@@ -0,0 +1,278 @@
+"""Comportamento do OhlcvCacheProvider: serie unica, TTL no fechamento,
+single-flight, cargas paralelas e LRU."""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import scripts.model2.daily_pipeline as daily_pipeline
+from core.model2.ohlcv_cache import (
+    CacheFallbackReason,
+    OhlcvCacheProvider,
+    build_cache_key,
+    next_candle_close_ms,
+)
+
+H4 = 14_400_000
+# 2024-01-01 08:00 UTC (abertura de candle H4) + 1h
+NOW = 1_704_096_000_000 + 3_600_000
+
+
+class _Clock:
+    def __init__(self, now_ms: int) -> None:
+        self.now_ms = now_ms
+
+    def __call__(self) -> int:
+        return self.now_ms
+
+
+class _Loader:
+    """Serie H4 com ultimo candle fechado antes de NOW.
+
+    release segura a carga ate ser setado; barrier exige que as cargas
+    estejam em andamento ao mesmo tempo.
+    """
+
+    def __init__(
+        self,
+        last_open_ms: int = NOW - 3_600_000 - H4,
+        release: threading.Event | None = None,
+        barrier: threading.Barrier | None = None,
+    ) -> None:
+        self.last_open_ms = last_open_ms
+        self.release = release
+        self.barrier = barrier
+        self.started = threading.Event()
+        self.calls: list[tuple[str, str, int]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, symbol: str, timeframe: str, limit: int) -> list[dict[str, Any]]:
+        with self._lock:
+            self.calls.append((symbol, timeframe, limit))
+        self.started.set()
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        if self.release is not None and not self.release.wait(timeout=5):
+            raise TimeoutError("carga nao liberada")
+        return [
+            {"timestamp": self.last_open_ms - i * H4, "close": float(i)}
+            for i in reversed(range(min(limit, 500)))
+        ]
+
+
+def _wait_until(condition: Callable[[], bool], timeout_s: float = 5.0) -> None:
+    """Espera a condicao sem depender de time.sleep."""
+    deadline = time.monotonic() + timeout_s
+    tick = threading.Event()
+    while not condition():
+        assert time.monotonic() < deadline, "condicao nao atingida"
+        tick.wait(0.001)
+
+
+def test_next_candle_close_alinhado_ao_timeframe() -> None:
+    assert next_candle_close_ms("H4", NOW) == NOW - 3_600_000 + H4
+    assert next_candle_close_ms("h1", NOW) == NOW + 3_600_000
+    assert next_candle_close_ms("D1", NOW) == 1_704_153_600_000
+    # Segunda-feira 2024-01-01 00:00 UTC
+    assert next_candle_close_ms("W1", NOW) == 1_704_067_200_000 + 7 * 86_400_000
+    assert next_candle_close_ms("MN", NOW) is None
+
+
+def test_limites_diferentes_servem_da_mesma_serie() -> None:
+    provider = OhlcvCacheProvider(now_ms=_Clock(NOW))
+    loader = _Loader()
+
+    big = provider.get_many([("BTCUSDT", "H4", 240)], loader)[build_cache_key("BTCUSDT", "H4", 240)]
+    small = provider.get_many([("btcusdt", "h4", 60)], loader)[build_cache_key("BTCUSDT", "H4", 60)]
+
+    assert loader.calls == [("BTCUSDT", "H4", 240)]
+    assert small.source == "cache" and small.candles == big.candles[-60:]
+
+    # Limite maior que o carregado recarrega uma vez; serie mais curta que o
+    # pedido esta completa e atende qualquer limite
+    provider.get_many([("BTCUSDT", "H4", 600)], loader)
+    result = provider.get_many([("BTCUSDT", "H4", 1000)], loader)
+    assert len(loader.calls) == 2
+    assert result[build_cache_key("BTCUSDT", "H4", 1000)].source == "cache"
+
+
+def test_expira_no_fechamento_do_proximo_candle() -> None:
+    clock = _Clock(NOW)
+    provider = OhlcvCacheProvider(default_ttl_seconds=30, now_ms=clock)
+    loader = _Loader()
+
+    provider.get_many([("BTCUSDT", "H4", 100)], loader)
+    clock.now_ms = next_candle_close_ms("H4", NOW) - 1
+    assert provider.get_many([("BTCUSDT", "H4", 100)], loader)["BTCUSDT:H4:100"].source == "cache"
+
+    clock.now_ms += 1
+    result = provider.get_many([("BTCUSDT", "H4", 100)], loader)["BTCUSDT:H4:100"]
+    assert result.source == "live"
+    assert result.fallback_reason == CacheFallbackReason.CACHE_STALE.value
+    assert len(loader.calls) == 2
+
+
+def test_serie_sem_ultimo_candle_fechado_expira_pelo_ttl() -> None:
+    clock = _Clock(NOW)
+    provider = OhlcvCacheProvider(default_ttl_seconds=30, now_ms=clock)
+    loader = _Loader(last_open_ms=NOW - 3_600_000 - 2 * H4)
+
+    provider.get_many([("BTCUSDT", "H4", 100)], loader)
+    clock.now_ms += 30_000
+    provider.get_many([("BTCUSDT", "H4", 100)], loader)
+
+    assert len(loader.calls) == 2
+
+
+def test_timeframe_desconhecido_usa_ttl_fixo() -> None:
+    clock = _Clock(NOW)
+    provider = OhlcvCacheProvider(default_ttl_seconds=30, ttl_by_timeframe={"MN": 5}, now_ms=clock)
+    loader = _Loader()
+
+    provider.get_many([("BTCUSDT", "MN", 10)], loader)
+    clock.now_ms += 4_999
+    provider.get_many([("BTCUSDT", "MN", 10)], loader)
+    clock.now_ms += 1
+    provider.get_many([("BTCUSDT", "MN", 10)], loader)
+
+    assert len(loader.calls) == 2
+
+
+def test_single_flight_deduplica_cargas_concorrentes() -> None:
+    provider = OhlcvCacheProvider(now_ms=_Clock(NOW))
+    loader = _Loader(release=threading.Event())
+    results: list[Any] = []
+
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(provider.get_many([("BTCUSDT", "H4", 100)], loader))
+        )
+        for _ in range(4)
+    ]
+    threads[0].start()
+    assert loader.started.wait(timeout=5)
+    for thread in threads[1:]:
+        thread.start()
+    # Carga segura pelo loader ate os outros tres pedidos se juntarem a ela
+    _wait_until(lambda: provider.stats()["coalesced"] == 3.0)
+    loader.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(loader.calls) == 1
+    assert provider.stats()["coalesced"] == 3.0
+    assert all(len(r["BTCUSDT:H4:100"].candles) == 100 for r in results)
+
+
+def test_chaves_faltantes_carregam_em_paralelo() -> None:
+    provider = OhlcvCacheProvider(now_ms=_Clock(NOW), max_concurrent_loads=8)
+    # As seis cargas so passam da barreira se estiverem em andamento juntas
+    loader = _Loader(barrier=threading.Barrier(6))
+    requests = [(f"S{i}USDT", "H4", 50) for i in range(6)] + [("S0USDT", "H4", 20)]
+
+    results = provider.get_many(requests, loader)
+
+    assert len(loader.calls) == 6
+    assert all(result.fallback_reason is None for result in results.values())
+    assert len(results["S0USDT:H4:20"].candles) == 20
+
+
+def test_lru_limita_series_e_erro_nao_fica_em_cache() -> None:
+    provider = OhlcvCacheProvider(now_ms=_Clock(NOW), max_series=2)
+    loader = _Loader()
+
+    for symbol in ("AUSDT", "BUSDT", "AUSDT", "CUSDT"):
+        provider.get_many([(symbol, "H4", 10)], loader)
+    provider.get_many([("AUSDT", "H4", 10)], loader)
+    provider.get_many([("BUSDT", "H4", 10)], loader)
+
+    stats = provider.stats()
+    assert stats["series"] == 2.0
+    assert [c[0] for c in loader.calls] == ["AUSDT", "BUSDT", "CUSDT", "BUSDT"]
+
+    def _failing(*_: Any) -> list[dict[str, Any]]:
+        raise RuntimeError("db indisponivel")
+
+    failed = provider.get_many([("DUSDT", "H4", 10)], _failing)["DUSDT:H4:10"]
+    assert failed.candles == []
+    assert failed.fallback_reason == CacheFallbackReason.CACHE_BACKEND_ERROR.value
+    assert provider.get_many([("DUSDT", "H4", 10)], loader)["DUSDT:H4:10"].candles
+
+
+def test_invalidate_por_simbolo() -> None:
+    provider = OhlcvCacheProvider(now_ms=_Clock(NOW))
+    loader = _Loader()
+    provider.get_many([("AUSDT", "H4", 10), ("BUSDT", "H4", 10)], loader)
+
+    provider.invalidate(symbol="ausdt")
+    provider.get_many([("AUSDT", "H4", 10), ("BUSDT", "H4", 10)], loader)
+
+    assert [c[0] for c in loader.calls].count("AUSDT") == 2
+    assert [c[0] for c in loader.calls].count("BUSDT") == 1
+
+
+def test_daily_pipeline_compartilha_provider_entre_estagios(tmp_path: Path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    calls: dict[str, dict[str, Any]] = {}
+
+    def _fake(name: str):  # type: ignore[no-untyped-def]
+        def _runner(**kwargs):  # type: ignore[no-untyped-def]
+            calls[name] = kwargs
+            return {"status": "ok"}
+        return _runner
+
+    for attr in (
+        "sync_ohlcv_from_binance", "run_up", "run_scan", "run_tracking", "run_validation",
+        "run_resolution", "run_bridge", "run_persist_training_episodes", "run_train_entry_agents",
+        "run_entry_rl_filter", "run_order_layer", "run_export_signals", "run_rl_signal_generation",
+        "run_ensemble_signal_generation", "run_export_dashboard",
+    ):
+        monkeypatch.setattr(daily_pipeline, attr, _fake(attr), raising=False)
+
+    daily_pipeline.run_daily_pipeline(
+        source_db_path=tmp_path / "source.db",
+        model2_db_path=tmp_path / "modelo2.db",
+        legacy_db_path=tmp_path / "legacy.db",
+        symbols=["BTCUSDT"],
+        timeframe="H4",
+        scan_candles_limit=120,
+        validation_candles_limit=240,
+        resolution_candles_limit=240,
+        limit=20,
+        dry_run=True,
+        continue_on_error=True,
+        retention_days=30,
+        output_dir=tmp_path / "results",
+    )
+
+    providers = {id(calls[name]["cache_provider"]) for name in ("run_scan", "run_validation", "run_resolution")}
+    assert len(providers) == 1
+    assert isinstance(calls["run_scan"]["cache_provider"], OhlcvCacheProvider)
+
+
+def test_scan_prefetch_carrega_simbolos_em_threads_e_serve_do_cache(tmp_path: Path) -> None:
+    import sqlite3
+
+    import scripts.model2.scan as scan
+
+    db_path = tmp_path / "source.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE ohlcv_h4 (timestamp INTEGER, symbol TEXT, open REAL, high REAL,"
+            " low REAL, close REAL, volume REAL)"
+        )
+        conn.executemany(
+            "INSERT INTO ohlcv_h4 VALUES (?, ?, 1, 2, 0.5, ?, 10)",
+            [(i * H4, symbol, float(i)) for symbol in ("AUSDT", "BUSDT") for i in range(50)],
+        )
+    provider = OhlcvCacheProvider(now_ms=_Clock(NOW))
+
+    scan._prefetch_candles(db_path, ["AUSDT", "BUSDT"], "H4", 30, provider)
+
+    assert provider.stats()["loads"] == 2.0
+    with sqlite3.connect(db_path) as conn:
+        df = scan._load_candles_cached(conn, "BUSDT", "H4", 20, provider)
+    assert list(df["close"]) == [float(i) for i in range(30, 50)]
+    assert provider.stats()["loads"] == 2.0
@@ -0,0 +1,254 @@
+"""Runtime NumPy de inferencia: paridade com PPO.predict e selecao por config."""
+
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+from typing import Any
+
+import gymnasium as gym
+import numpy as np
+import pytest
+import torch
+from stable_baselines3 import PPO
+
+from core.model2.model_registry import ModelRegistry
+from core.model2.policy_runtime import (
+    NumpyPolicy,
+    artifact_is_current,
+    artifact_path_for,
+    export_checkpoint,
+    export_policy,
+    resolve_runtime,
+)
+from core.model2.rl_model_loader import RLModelLoader
+from scripts.model2.train_ppo_incremental import PPOTrainer
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+N_FEATURES = 20
+
+
+class _FeaturesEnv(gym.Env):
+    """Env minimo com o formato do live: Box (N_FEATURES,) e HOLD/LONG/SHORT."""
+
+    observation_space = gym.spaces.Box(-np.inf, np.inf, (N_FEATURES,), dtype=np.float32)
+    action_space = gym.spaces.Discrete(3)
+
+    def reset(self, *, seed: int | None = None, options: Any = None) -> Any:
+        super().reset(seed=seed)
+        return np.zeros(N_FEATURES, dtype=np.float32), {}
+
+    def step(self, action: Any) -> Any:
+        return np.zeros(N_FEATURES, dtype=np.float32), 0.0, True, False, {}
+
+
+def _trained_like(model: PPO, seed: int = 0) -> PPO:
+    """Pesos em escala de modelo treinado (init ortogonal deixa logits ~0)."""
+    generator = torch.Generator().manual_seed(seed)
+    with torch.no_grad():
+        for param in model.policy.parameters():
+            param.copy_(torch.randn(param.shape, generator=generator) * 0.3)
+    return model
+
+
+@pytest.fixture(scope="module", params=["tanh_cartpole", "relu_features"])
+def ppo(request: pytest.FixtureRequest) -> PPO:
+    if request.param == "tanh_cartpole":
+        model = PPO("MlpPolicy", "CartPole-v1", seed=0, device="cpu")
+    else:
+        model = PPO(
+            "MlpPolicy",
+            _FeaturesEnv(),
+            seed=0,
+            device="cpu",
+            policy_kwargs={"net_arch": [256, 256], "activation_fn": torch.nn.ReLU},
+        )
+    return _trained_like(model)
+
+
+@pytest.fixture
+def checkpoint(tmp_path: Path) -> Path:
+    model = _trained_like(PPO("MlpPolicy", _FeaturesEnv(), seed=0, device="cpu"), seed=1)
+    path = tmp_path / "ppo_model.zip"
+    model.save(str(path))
+    return path
+
+
+def _observations(model: PPO, n: int, seed: int = 0) -> np.ndarray:
+    shape = model.observation_space.shape
+    return np.random.default_rng(seed).normal(0, 2, (n, *shape)).astype(np.float32)
+
+
+def test_paridade_de_acoes_com_ppo_predict(ppo: PPO, tmp_path: Path) -> None:
+    policy = NumpyPolicy.load(export_policy(ppo, tmp_path / "policy.policy.npz"))
+    observations = _observations(ppo, 5000)
+
+    expected, _ = ppo.predict(observations, deterministic=True)
+    actions, _ = policy.predict(observations, deterministic=True)
+
+    assert actions.shape == expected.shape
+    assert np.array_equal(actions, expected)
+    for obs in observations[:50]:
+        single, _ = policy.predict(obs)
+        reference, _ = ppo.predict(obs, deterministic=True)
+        assert single.shape == reference.shape == ()
+        assert int(single) == int(reference)
+
+
+def test_logits_iguais_aos_do_torch(ppo: PPO, tmp_path: Path) -> None:
+    policy = NumpyPolicy.load(export_policy(ppo, tmp_path / "policy.policy.npz"))
+    observations = _observations(ppo, 256, seed=1)
+
+    with torch.no_grad():
+        features = ppo.policy.extract_features(torch.as_tensor(observations), ppo.policy.pi_features_extractor)
+        logits = ppo.policy.action_net(ppo.policy.mlp_extractor.forward_actor(features)).numpy()
+
+    np.testing.assert_allclose(policy.logits(observations), logits, rtol=1e-5, atol=1e-5)
+
+
+def test_observacao_incompativel_e_modo_estocastico(ppo: PPO, tmp_path: Path) -> None:
+    policy = NumpyPolicy.load(export_policy(ppo, tmp_path / "policy.policy.npz"))
+    with pytest.raises(ValueError):
+        policy.predict(np.zeros(99))
+    with pytest.raises(ValueError):
+        policy.predict(_observations(ppo, 1)[0], deterministic=False)
+
+
+def test_export_recusa_politica_nao_suportada(tmp_path: Path) -> None:
+    continuous = PPO("MlpPolicy", "Pendulum-v1", seed=0, device="cpu")
+    with pytest.raises(ValueError, match="acoes"):
+        export_policy(continuous, tmp_path / "pendulum.policy.npz")
+
+
+def test_loader_com_runtime_numpy_usa_artefato(checkpoint: Path) -> None:
+    artifact = export_checkpoint(checkpoint)
+    assert artifact == artifact_path_for(checkpoint) == checkpoint.with_name("ppo_model.policy.npz")
+    registry = ModelRegistry(auto_watch=False)
+
+    numpy_loader = RLModelLoader(checkpoint_path=checkpoint, registry=registry, runtime="numpy")
+    sb3_loader = RLModelLoader(checkpoint_path=checkpoint, registry=registry, runtime="sb3")
+
+    assert isinstance(numpy_loader._model, NumpyPolicy)
+    assert isinstance(sb3_loader._model, PPO)
+    features = np.random.default_rng(2).normal(0, 2, (64, 12))
+    sides = ["BUY", "SELL", "", "SHORT"] * 16
+    assert numpy_loader.predict_confidence_batch(features, sides) == sb3_loader.predict_confidence_batch(
+        features, sides
+    )
+    for row, side in zip(features[:8], sides):
+        assert numpy_loader.predict_confidence(row, side) == sb3_loader.predict_confidence(row, side)
+
+
+def test_loader_numpy_sem_artefato_usa_checkpoint(checkpoint: Path) -> None:
+    loader = RLModelLoader(
+        checkpoint_path=checkpoint, registry=ModelRegistry(auto_watch=False), runtime="numpy"
+    )
+    assert isinstance(loader._model, PPO)
+    with pytest.raises(ValueError):
+        resolve_runtime("onnx")
+
+
+def test_artefato_desatualizado_volta_para_sb3(
+    checkpoint: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    artifact = export_checkpoint(checkpoint)
+    assert artifact_is_current(artifact, checkpoint)
+
+    # Checkpoint retreinado depois da exportacao
+    _trained_like(PPO("MlpPolicy", _FeaturesEnv(), seed=0, device="cpu"), seed=2).save(str(checkpoint))
+    stat = checkpoint.stat()
+    os.utime(checkpoint, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert not artifact_is_current(artifact, checkpoint)
+
+    with caplog.at_level(logging.WARNING, logger="core.model2.rl_model_loader"):
+        loader = RLModelLoader(
+            checkpoint_path=checkpoint, registry=ModelRegistry(auto_watch=False), runtime="numpy"
+        )
+        assert loader.checkpoint_timestamp == checkpoint.stat().st_mtime
+        assert isinstance(loader._model, PPO)
+    assert "desatualizado" in caplog.text
+    assert loader.checkpoint_timestamp == checkpoint.stat().st_mtime
+
+
+def test_loader_numpy_reporta_mtime_do_checkpoint(checkpoint: Path) -> None:
+    artifact = export_checkpoint(checkpoint)
+    os.utime(artifact, (1, 1))
+    loader = RLModelLoader(
+        checkpoint_path=checkpoint, registry=ModelRegistry(auto_watch=False), runtime="numpy"
+    )
+    assert isinstance(loader._model, NumpyPolicy)
+    assert loader.checkpoint_timestamp == pytest.approx(checkpoint.stat().st_mtime)
+
+
+def test_treino_incremental_reexporta_artefato(tmp_path: Path) -> None:
+    trainer = PPOTrainer(model2_db_path=tmp_path / "modelo2.db", checkpoint_dir=tmp_path / "ckpt")
+    rng = np.random.default_rng(3)
+    trainer.obs_data = rng.normal(0, 1, (40, 5)).astype(np.float32)
+    trainer.rewards_data = rng.normal(0, 1, 40).astype(np.float32)
+
+    result = trainer.train_ppo_incremental(timesteps=128)
+
+    checkpoint = Path(result["checkpoint_path"])
+    assert result["status"] == "ok"
+    assert result["policy_artifact"] == str(artifact_path_for(checkpoint))
+    assert artifact_is_current(result["policy_artifact"], checkpoint)
+
+
+def test_runtime_numpy_nao_importa_torch(checkpoint: Path) -> None:
+    export_checkpoint(checkpoint)
+    code = textwrap.dedent(
+        f"""
+        import sys
+        from core.model2.model_registry import ModelRegistry
+        from core.model2.rl_model_loader import RLModelLoader
+        loader = RLModelLoader(
+            checkpoint_path={str(checkpoint)!r},
+            registry=ModelRegistry(auto_watch=False),
+            runtime="numpy",
+        )
+        assert not loader.is_fallback
+        print(loader.predict_confidence([0.1] * 20, "BUY"))
+        assert "torch" not in sys.modules and "stable_baselines3" not in sys.modules
+        """
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, check=True, capture_output=True)
+
+
+def _startup_seconds(code: str) -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, check=True, capture_output=True)
+    return time.perf_counter() - started
+
+
+@pytest.mark.slow
+def test_benchmark_inicio_e_latencia(checkpoint: Path) -> None:
+    artifact = export_checkpoint(checkpoint)
+    sb3_start = _startup_seconds(
+        f"from stable_baselines3 import PPO; PPO.load({str(checkpoint)!r}, device='cpu')"
+    )
+    numpy_start = _startup_seconds(
+        f"from core.model2.policy_runtime import NumpyPolicy; NumpyPolicy.load({str(artifact)!r})"
+    )
+
+    model = PPO.load(str(checkpoint), device="cpu")
+    policy = NumpyPolicy.load(artifact)
+    observations = _observations(model, 500, seed=3)
+    started = time.perf_counter()
+    for obs in observations:
+        model.predict(obs, deterministic=True)
+    sb3_ms = (time.perf_counter() - started) * 1000 / len(observations)
+    started = time.perf_counter()
+    for obs in observations:
+        policy.predict(obs)
+    numpy_ms = (time.perf_counter() - started) * 1000 / len(observations)
+
+    print(
+        f"\ninicio (processo novo): PPO.load={sb3_start:.2f}s numpy={numpy_start:.2f}s | "
+        f"predict unitario: PPO={sb3_ms:.3f}ms numpy={numpy_ms:.3f}ms "
+        f"speedup={sb3_ms / numpy_ms:.1f}x"
+    )
@@ -3,14 +3,18 @@ from pathlib import Path
 import pandas as pd
 
 import scripts.model2.sync_ohlcv_from_binance as sync_module
+from data.collector import BinanceCollector
 
 
-class _FakeCollector:
+class _FakeCollector(BinanceCollector):
     def __init__(self, _client: object) -> None:
-        self.calls: list[tuple[str, str, int]] = []
+        self.calls: list[tuple[str, str, int, int]] = []
 
-    def fetch_historical(self, symbol: str, timeframe: str, days: int) -> pd.DataFrame:
-        self.calls.append((symbol, timeframe, days))
+    def fetch_klines(self, symbol: str, interval: str, limit: int = 500,
+                     start_time: int = 0, end_time: int = 0) -> pd.DataFrame:
+        self.calls.append((symbol, interval, start_time, end_time))
+        if not start_time <= 1700000000000 <= end_time:
+            return pd.DataFrame()
         return pd.DataFrame(
             [
                 {
@@ -40,6 +44,8 @@ def test_sync_ohlcv_from_binance_persists_m5_in_legacy_db(tmp_path: Path, monkey
         symbols=["BTCUSDT"],
         timeframes=["M5"],
         output_dir=output_dir,
+        lookback_days=1,
+        now_ms=1700000600000,
     )
 
     assert summary["status"] == "ok"
@@ -0,0 +1,244 @@
+"""
+Testes do índice de cobertura OHLCV e da sincronização incremental.
+
+Uma exchange fake em memória responde páginas de klines; os testes
+verificam que só as lacunas são buscadas, que o candle em formação é
+rebuscado e que uma sincronização interrompida retoma do cursor.
+"""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import scripts.model2.sync_ohlcv_from_binance as sync_module
+from data.collector import BinanceCollector
+from data.database import DatabaseManager
+from data.ohlcv_coverage import (
+    CoverageIndex,
+    merge_intervals,
+    runs_from_timestamps,
+    subtract_intervals,
+)
+
+H4 = 4 * 3_600_000
+LISTING = 1_600_000_000_000 - 1_600_000_000_000 % H4
+NOW = LISTING + 3_000 * H4 + 1_000
+
+
+class FakeExchange:
+    """Klines de 4h desde LISTING até o candle em formação em `now`."""
+
+    def __init__(self, now: int = NOW, limit: int = 1000):
+        self.now = now
+        self.limit = limit
+        self.calls = []
+
+    def open_times(self, start: int, end: int, limit=None):
+        first = max(LISTING, start + (-start) % H4)
+        last = min(end, self.now - self.now % H4)
+        return list(range(first, last + 1, H4))[:limit or self.limit]
+
+    def fetcher(self, store: list):
+        def fetch(start, end):
+            self.calls.append((start, end))
+            rows = self.open_times(start, end)
+            store.extend(rows)
+            return len(rows), (rows[-1] if rows else None)
+        return fetch
+
+
+@pytest.fixture
+def index():
+    return CoverageIndex(sqlite3.connect(":memory:"))
+
+
+def test_interval_helpers():
+    assert merge_intervals([(5, 8), (0, 3), (3, 4), (7, 10), (12, 12)]) == [(0, 4), (5, 10)]
+    assert subtract_intervals(0, 20, [(2, 4), (6, 8), (15, 30)]) == [(0, 2), (4, 6), (8, 15)]
+    assert subtract_intervals(5, 7, [(0, 10)]) == []
+    assert runs_from_timestamps([0, 10, 20, 40, 50, 20], 10) == [(0, 30), (40, 60)]
+
+
+def test_first_sync_fetches_range_then_only_new_candles(index):
+    exchange, stored = FakeExchange(), []
+    start = LISTING - 100 * H4
+
+    first = index.fill_gaps('BTCUSDT', '4h', start, NOW, H4, exchange.fetcher(stored), now_ms=NOW)
+
+    assert first['rows'] == 3_001
+    assert first['requests'] == 4
+    assert index.covered('BTCUSDT', '4h') == [(start, NOW - NOW % H4)]
+
+    exchange.calls.clear()
+    later = NOW + 3 * H4
+    exchange.now = later
+    second = index.fill_gaps('BTCUSDT', '4h', start, later, H4, exchange.fetcher(stored), now_ms=later)
+
+    # Só o trecho novo: o candle que estava em formação + 3 novos
+    assert second == {'gaps': 1, 'requests': 1, 'rows': 4, 'resumed': 0}
+    assert exchange.calls == [(NOW - NOW % H4, later - 1)]
+    assert sorted(set(stored)) == exchange.open_times(start, later, limit=10_000)
+
+
+def test_interrupted_sync_resumes_from_cursor(index):
+    exchange, stored = FakeExchange(), []
+    fetch = exchange.fetcher(stored)
+
+    def flaky(start, end):
+        if len(exchange.calls) == 2:
+            raise ConnectionError("queda simulada")
+        return fetch(start, end)
+
+    with pytest.raises(ConnectionError):
+        index.fill_gaps('BTCUSDT', '4h', LISTING, NOW, H4, flaky, now_ms=NOW)
+
+    cursor = index.get_cursor('BTCUSDT', '4h')
+    assert cursor['position_ms'] == LISTING + 2_000 * H4
+
+    exchange.calls.clear()
+    stats = index.fill_gaps('BTCUSDT', '4h', LISTING, NOW, H4, fetch, now_ms=NOW)
+
+    assert stats['resumed'] == 1
+    assert exchange.calls[0][0] == LISTING + 2_000 * H4
+    assert stats['rows'] == 1_001
+    assert index.get_cursor('BTCUSDT', '4h') is None
+    assert sorted(set(stored)) == exchange.open_times(LISTING, NOW, limit=10_000)
+
+
+def test_seed_from_stored_candles_leaves_holes_and_newest_candle(index):
+    stored = [LISTING + i * H4 for i in range(10) if i not in (4, 5)]
+
+    assert index.seed_from_timestamps('ETHUSDT', '4h', stored, H4)
+    assert not index.seed_from_timestamps('ETHUSDT', '4h', stored, H4)
+
+    assert index.missing('ETHUSDT', '4h', LISTING, LISTING + 10 * H4) == [
+        (LISTING + 4 * H4, LISTING + 6 * H4),
+        (LISTING + 9 * H4, LISTING + 10 * H4),
+    ]
+
+
+class _FakeCollector(BinanceCollector):
+    exchange = None
+
+    def __init__(self, _client):
+        pass
+
+    def fetch_klines(self, symbol, interval, limit=500, start_time=None, end_time=None):
+        self.exchange.calls.append((start_time, end_time))
+        open_times = self.exchange.open_times(start_time, end_time)
+        if not open_times:
+            return pd.DataFrame()
+        return pd.DataFrame({
+            'timestamp': open_times,
+            'symbol': symbol,
+            'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5,
+            'volume': 10.0, 'quote_volume': 15.0, 'trades_count': 3,
+        })
+
+
+def test_daily_pipeline_sync_is_incremental(tmp_path, monkeypatch):
+    exchange = FakeExchange()
+    monkeypatch.setattr(sync_module, "create_binance_client", lambda: object())
+    monkeypatch.setattr(sync_module, "BinanceCollector", _FakeCollector)
+    monkeypatch.setattr(_FakeCollector, "exchange", exchange)
+    db_path = tmp_path / "crypto_agent.db"
+
+    def run(now_ms):
+        exchange.now = now_ms
+        exchange.calls.clear()
+        return sync_module.sync_ohlcv_from_binance(
+            source_db_path=db_path, symbols=['BTCUSDT', 'ETHUSDT'], timeframes=['H4'],
+            output_dir=tmp_path / "runtime", lookback_days=250, now_ms=now_ms,
+        )
+
+    first = run(NOW)
+    first_calls = len(exchange.calls)
+    second = run(NOW + H4)
+
+    assert first['synced_count'] == second['synced_count'] == 2
+    assert first_calls == 4
+    assert len(exchange.calls) == 2
+    assert [item['rows'] for item in second['items']] == [2, 2]
+    rows = DatabaseManager(str(db_path)).get_ohlcv("H4", 'BTCUSDT')
+    assert len(rows) == 250 * 6 + 2
+
+
+def test_existing_database_is_seeded_before_first_indexed_sync(tmp_path, monkeypatch):
+    exchange = FakeExchange()
+    monkeypatch.setattr(sync_module, "create_binance_client", lambda: object())
+    monkeypatch.setattr(sync_module, "BinanceCollector", _FakeCollector)
+    monkeypatch.setattr(_FakeCollector, "exchange", exchange)
+    db_path = tmp_path / "crypto_agent.db"
+
+    start = NOW - NOW % H4 - 60 * H4
+    DatabaseManager(str(db_path)).insert_ohlcv("H4", pd.DataFrame({
+        'timestamp': exchange.open_times(start, NOW - H4), 'symbol': 'BTCUSDT',
+        'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5,
+        'volume': 10.0, 'quote_volume': 15.0, 'trades_count': 3,
+    }))
+
+    summary = sync_module.sync_ohlcv_from_binance(
+        source_db_path=db_path, symbols=['BTCUSDT'], timeframes=['H4'],
+        output_dir=tmp_path / "runtime", lookback_days=10, now_ms=NOW,
+    )
+
+    assert summary['items'][0]['requests'] == 1
+    assert summary['items'][0]['rows'] == 2
+
+
+def test_default_sync_covers_one_day_and_skips_seed_scan(tmp_path, monkeypatch):
+    exchange = FakeExchange()
+    monkeypatch.setattr(sync_module, "create_binance_client", lambda: object())
+    monkeypatch.setattr(sync_module, "BinanceCollector", _FakeCollector)
+    monkeypatch.setattr(_FakeCollector, "exchange", exchange)
+    db_path = tmp_path / "crypto_agent.db"
+    seeded = []
+    monkeypatch.setattr(
+        CoverageIndex, "seed_from_timestamps",
+        lambda self, *args: seeded.append(args[0]) or False,
+    )
+
+    def run(now_ms):
+        exchange.now = now_ms
+        return sync_module.sync_ohlcv_from_binance(
+            source_db_path=db_path, symbols=['BTCUSDT'], timeframes=['H4'],
+            output_dir=tmp_path / "runtime", now_ms=now_ms,
+        )
+
+    first = run(NOW)
+    # Execuções puladas: a janela recua até o fim da cobertura existente
+    second = run(NOW + 3 * 86_400_000)
+
+    assert first['items'][0]['rows'] == 6 + 1  # inclui o candle em formação
+    assert second['items'][0]['rows'] == 3 * 6 + 1
+    assert seeded == ['BTCUSDT']
+    assert len(DatabaseManager(str(db_path)).get_ohlcv("H4", 'BTCUSDT')) == 4 * 6 + 1
+
+
+def test_klines_orchestrator_refetches_only_gaps(tmp_path, monkeypatch):
+    from data.scripts.klines_cache_manager import KlinesOrchestrator
+
+    calls = []
+
+    def fake_fetch(symbol, interval, start_time_ms, end_time_ms, limit):
+        calls.append(start_time_ms)
+        now = int(pd.Timestamp.utcnow().timestamp() * 1000)
+        first = start_time_ms + (-start_time_ms) % H4
+        return [
+            [ts, "100", "101", "99", "100.5", "10", ts + H4 - 1, "1005", 7, "5", "502"]
+            for ts in range(first, min(end_time_ms, now) + 1, H4)
+        ][:limit]
+
+    orch = KlinesOrchestrator(db_path=str(tmp_path / "klines.db"), symbols_file=str(tmp_path / "none.json"))
+    monkeypatch.setattr(orch.fetcher, "fetch_klines", fake_fetch)
+    monkeypatch.setattr(orch, "_save_metadata", lambda: None)
+
+    first = orch.fetch_full_year(symbols=['BTCUSDT'], from_days_ago=365)
+    first_calls = len(calls)
+    second = orch.fetch_full_year(symbols=['BTCUSDT'], from_days_ago=365)
+
+    assert first['BTCUSDT'] >= 365 * 6
+    assert first_calls == 2
+    assert len(calls) - first_calls == 1
+    assert second['BTCUSDT'] <= 2
@@ -0,0 +1,147 @@
+"""
+Testes dos rollouts paralelos com dados em memória compartilhada.
+"""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from stable_baselines3.common.vec_env import DummyVecEnv
+
+from agent.environment import CryptoFuturesEnv
+from agent.parallel_env import (
+    SharedMarketData,
+    WorkerAssignment,
+    attach_dataset,
+    make_parallel_vec_env,
+)
+from tests.test_precomputed_observations import _make_data, _rollout
+
+
+@pytest.fixture(scope="module")
+def data():
+    return _make_data(length=600)
+
+
+def test_attached_frames_match_originals_and_are_read_only(data):
+    with SharedMarketData({'BTCUSDT': data}) as shared:
+        attached, observations = attach_dataset(shared.specs['BTCUSDT'])
+
+        for name in ('h1', 'h4', 'd1'):
+            pd.testing.assert_frame_equal(attached[name], data[name])
+        assert attached['smc'] is not None
+        assert not attached['h4']['close'].to_numpy().flags.writeable
+        np.testing.assert_array_equal(
+            observations, CryptoFuturesEnv.precompute_market_observations(data)
+        )
+
+
+def test_object_columns_survive_publication(data):
+    frame = data['h4'].assign(symbol='BTCUSDT')
+    with SharedMarketData({'BTCUSDT': {**data, 'h4': frame}}, precompute_observations=False) as shared:
+        attached, observations = attach_dataset(shared.specs['BTCUSDT'])
+
+        pd.testing.assert_frame_equal(attached['h4'], frame)
+        assert observations is None
+
+
+def test_assign_workers_symbol_and_time_modes(data):
+    with SharedMarketData({'BTCUSDT': data, 'ETHUSDT': data}, precompute_observations=False) as shared:
+        by_symbol = shared.assign_workers(3, 'symbol')
+        by_time = shared.assign_workers(4, 'time')
+
+        with pytest.raises(ValueError):
+            shared.assign_workers(2, 'random')
+
+    assert by_symbol == [
+        WorkerAssignment('BTCUSDT'), WorkerAssignment('ETHUSDT'), WorkerAssignment('BTCUSDT'),
+    ]
+    assert by_time == [
+        WorkerAssignment('BTCUSDT', 0, 300), WorkerAssignment('ETHUSDT', 0, 300),
+        WorkerAssignment('BTCUSDT', 300, 600), WorkerAssignment('ETHUSDT', 300, 600),
+    ]
+
+
+def test_shared_env_reproduces_regular_env(data):
+    actions = np.random.default_rng(0).choice(5, size=120, p=[0.5, 0.2, 0.2, 0.05, 0.05])
+    expected_obs, expected_rewards = _rollout(CryptoFuturesEnv(data, episode_length=120), actions)
+
+    with SharedMarketData({'BTCUSDT': data}) as shared:
+        factory = shared.env_factories(1, env_kwargs={'episode_length': 120})[0]
+        obs, rewards = _rollout(factory(), actions)
+
+        # Worker recebe só descritores: pickle muito menor que os dados
+        assert len(pickle.dumps(factory)) * 5 < len(pickle.dumps(data['h4']))
+
+    np.testing.assert_array_equal(obs, expected_obs)
+    np.testing.assert_array_equal(rewards, expected_rewards)
+
+
+def test_time_slice_env_uses_slice_rows(data):
+    with SharedMarketData({'BTCUSDT': data}) as shared:
+        factories = shared.env_factories(2, 'time', env_kwargs={'episode_length': 100})
+        env = DummyVecEnv([factories[1]]).envs[0]
+
+        assert len(env.data['h4']) == 300
+        assert env.data['h4']['timestamp'].iloc[0] == data['h4']['timestamp'].iloc[300]
+        np.testing.assert_array_equal(
+            env.market_observations, shared_observations(shared)[300:]
+        )
+
+
+def shared_observations(shared):
+    return attach_dataset(shared.specs['BTCUSDT'])[1]
+
+
+def test_subproc_vec_env_steps_in_workers(data):
+    with SharedMarketData({'BTCUSDT': data}) as shared:
+        vec_env = make_parallel_vec_env(shared, 2, 'time', {'episode_length': 100})
+        try:
+            obs = vec_env.reset()
+            for _ in range(20):
+                obs, rewards, dones, infos = vec_env.step(np.array([1, 0]))
+        finally:
+            vec_env.close()
+
+    assert obs.shape == (2, 104)
+    assert np.isfinite(obs).all()
+
+
+def test_trainer_parallel_vec_env_releases_shared_memory(data, tmp_path):
+    pytest.importorskip("mlflow")
+    from agent.trainer import Trainer
+
+    trainer = Trainer(save_dir=str(tmp_path))
+    trainer.vec_env = trainer.create_vec_env(data, n_envs=2, assignment='time', episode_length=100)
+    assert trainer.env is None
+    assert trainer.vec_env.num_envs == 2
+
+    trainer.close()
+    assert trainer.shared_data is None
+    assert trainer.vec_env is None
+
+
+@pytest.mark.parametrize("fails", [False, True])
+def test_trainer_phases_close_parallel_workers(data, tmp_path, fails):
+    pytest.importorskip("mlflow")
+    from unittest.mock import MagicMock, patch
+
+    from agent.trainer import Trainer
+
+    trainer = Trainer(save_dir=str(tmp_path))
+    model = MagicMock()
+    if fails:
+        model.learn.side_effect = RuntimeError("falha no treino")
+
+    for phase in (trainer.train_phase1_exploration, trainer.train_phase2_refinement):
+        trainer.model = None
+        with patch("agent.trainer.PPO", return_value=model), patch("agent.trainer.mlflow"):
+            if fails:
+                with pytest.raises(RuntimeError):
+                    phase(data, total_timesteps=10, n_envs=2, assignment='time', episode_length=100)
+            else:
+                phase(data, total_timesteps=10, n_envs=2, assignment='time', episode_length=100)
+
+        assert trainer.shared_data is None
+        assert trainer.vec_env is None
@@ -0,0 +1,186 @@
+"""
+Testes do store Parquet particionado e da sincronização do ParquetCache.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import parquet_store
+from backtest.data_cache import ParquetCache
+from backtest.parquet_store import PartitionedParquetStore, month_keys
+from data.database import DatabaseManager
+
+H1 = 3_600_000
+START = 1_704_067_200_000  # 2024-01-01 00:00 UTC
+
+
+def _make_frame(n_rows: int, start: int = START, symbol: str = 'BTCUSDT', seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n_rows))
+    return pd.DataFrame({
+        'timestamp': start + np.arange(n_rows, dtype=np.int64) * H1,
+        'symbol': symbol,
+        'open': close + 0.1,
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': rng.lognormal(5, 1, n_rows),
+        'quote_volume': rng.lognormal(10, 1, n_rows),
+        'trades_count': rng.integers(1, 1000, n_rows),
+    })
+
+
+CACHE_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "ohlcv.db"))
+    db.bulk_insert_ohlcv("H1", _make_frame(24 * 90))
+    return db
+
+
+@pytest.fixture
+def cache(db, tmp_path):
+    return ParquetCache(db.db_path, cache_dir=str(tmp_path / "cache"), freshness_interval_s=0)
+
+
+def test_month_keys():
+    assert list(month_keys(np.array([START - 1, START, START + 31 * 24 * H1]))) == [
+        '2023-12', '2024-01', '2024-02',
+    ]
+
+
+def test_store_partitions_by_month_and_prunes_reads(tmp_path):
+    store = PartitionedParquetStore(str(tmp_path / "store"))
+    df = _make_frame(24 * 90)[CACHE_COLUMNS]
+
+    assert store.write('BTCUSDT', 'h1', df) == 3
+    manifest = store.manifest('BTCUSDT', 'h1')
+    assert sorted(manifest['months']) == ['2024-01', '2024-02', '2024-03']
+    assert manifest['rows'] == len(df)
+
+    start, end = START + 40 * 24 * H1, START + 41 * 24 * H1
+    assert [p.stem for p in store.partitions('BTCUSDT', 'h1', start, end)] == ['2024-02']
+    window = store.read('BTCUSDT', 'h1', start, end)
+    expected = df[(df['timestamp'] >= start) & (df['timestamp'] <= end)].reset_index(drop=True)
+    pd.testing.assert_frame_equal(window, expected)
+    pd.testing.assert_frame_equal(store.read('BTCUSDT', 'h1'), df)
+
+
+def test_store_merge_keeps_latest_rows(tmp_path):
+    store = PartitionedParquetStore(str(tmp_path / "store"))
+    df = _make_frame(48)[CACHE_COLUMNS]
+    store.write('BTCUSDT', 'h1', df)
+
+    update = df.iloc[40:].assign(close=-1.0)
+    store.write('BTCUSDT', 'h1', pd.concat([update, _make_frame(5, start=START + 48 * H1)[CACHE_COLUMNS]]))
+
+    stored = store.read('BTCUSDT', 'h1')
+    assert len(stored) == 53 and stored['timestamp'].is_monotonic_increasing
+    assert (stored['close'].iloc[40:48] == -1.0).all()
+
+
+def test_cache_appends_new_candles_and_updates_forming_candle(db, cache):
+    full = cache.load_ohlcv_for_symbol('BTCUSDT', 'h1')
+    assert len(full) == 24 * 90
+    january = cache.store.partitions('BTCUSDT', 'h1')[0]
+    january_mtime = january.stat().st_mtime_ns
+
+    # Candle em formação foi atualizado e dois novos fecharam
+    tail = _make_frame(3, start=START + (24 * 90 - 1) * H1, seed=7)
+    db.bulk_insert_ohlcv("H1", tail)
+
+    assert cache.refresh('BTCUSDT', 'h1') == {'appended': 3, 'rebuilt': 0}
+    reloaded = cache.load_ohlcv_for_symbol('BTCUSDT', 'h1')
+    assert len(reloaded) == 24 * 90 + 2
+    np.testing.assert_allclose(reloaded['close'].iloc[-3:], tail['close'])
+    assert january.stat().st_mtime_ns == january_mtime
+    assert cache.refresh('BTCUSDT', 'h1') == {'appended': 0, 'rebuilt': 0}
+
+
+def test_cache_rebuilds_when_history_changes(db, cache):
+    cache.load_ohlcv_for_symbol('BTCUSDT', 'h1')
+    db.bulk_insert_ohlcv("H1", _make_frame(24, start=START - 24 * H1, seed=3))
+
+    assert cache.refresh('BTCUSDT', 'h1')['rebuilt'] == 1
+    assert cache.load_ohlcv_for_symbol('BTCUSDT', 'h1')['timestamp'].iloc[0] == START - 24 * H1
+
+
+def test_windowed_load_reads_only_window(db, cache):
+    start, end = START + 10 * 24 * H1, START + 12 * 24 * H1 - H1
+
+    window = cache.load_ohlcv_for_symbol('BTCUSDT', 'h1', start_date=start, end_date=end)
+
+    assert len(window) == 48
+    assert len(cache._memory_cache) == 0
+    full = cache.load_ohlcv_for_symbol('BTCUSDT', 'h1')
+    pd.testing.assert_frame_equal(
+        cache.load_ohlcv_for_symbol('BTCUSDT', 'h1', start_date=start, end_date=end),
+        full[(full['timestamp'] >= start) & (full['timestamp'] <= end)].reset_index(drop=True),
+    )
+    pd.testing.assert_frame_equal(window, full.iloc[240:288].reset_index(drop=True))
+
+
+def test_cache_serves_parquet_when_sqlite_is_unavailable(db, cache, tmp_path):
+    cache.load_ohlcv_for_symbol('BTCUSDT', 'h1')
+    offline = ParquetCache(str(tmp_path / "missing" / "x.db"), cache_dir=str(cache.cache_dir))
+
+    assert len(offline.load_ohlcv_for_symbol('BTCUSDT', 'h1')) == 24 * 90
+
+
+@pytest.mark.slow
+def test_benchmark_narrow_windows_vs_single_file(tmp_path):
+    df = _make_frame(24 * 365 * 3)[CACHE_COLUMNS]
+    single_path = tmp_path / "BTCUSDT_h1.parquet"
+    df.to_parquet(single_path, index=False)
+    store = PartitionedParquetStore(str(tmp_path / "store"))
+    store.write('BTCUSDT', 'h1', df)
+
+    rng = np.random.default_rng(0)
+    windows = [
+        (start, start + 7 * 24 * H1)
+        for start in START + rng.integers(0, len(df) - 200, 50) * H1
+    ]
+
+    start_t = time.perf_counter()
+    for start, end in windows:
+        full = pd.read_parquet(single_path)
+        full[(full['timestamp'] >= start) & (full['timestamp'] <= end)]
+    single_s = time.perf_counter() - start_t
+
+    start_t = time.perf_counter()
+    for start, end in windows:
+        store.read('BTCUSDT', 'h1', start, end)
+    store_s = time.perf_counter() - start_t
+
+    print(
+        f"\n{len(windows)} janelas de 7 dias em 3 anos H1: arquivo único={single_s:.3f}s "
+        f"particionado={store_s:.3f}s speedup={single_s / store_s:.1f}x"
+    )
+
+
+def test_store_writes_through_per_writer_temp_files(tmp_path, monkeypatch):
+    replaced = []
+    real_replace = os.replace
+
+    def _record(src, dst):
+        replaced.append((Path(src).name, Path(dst).name))
+        real_replace(src, dst)
+
+    monkeypatch.setattr(parquet_store.os, 'replace', _record)
+    store = PartitionedParquetStore(str(tmp_path / "store"))
+    store.write('BTCUSDT', 'h1', _make_frame(48)[CACHE_COLUMNS])
+
+    suffix = f".tmp-{os.getpid()}-{threading.get_ident()}"
+    assert replaced == [
+        ('2024-01.parquet' + suffix, '2024-01.parquet'),
+        ('_manifest.json' + suffix, '_manifest.json'),
+    ]
+    assert not list((tmp_path / "store").rglob("*.tmp*"))
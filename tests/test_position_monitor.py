@@ -1106,3 +1106,68 @@ def test_refresh_protection_skips_outside_whitelist_live(mock_client, temp_db):
     assert 'fora da whitelist' in result['reason']
     monitor_live._cancel_open_protection_orders.assert_not_called()
     monitor_live._place_protective_order.assert_not_called()
+
+
+def _smc_frames():
+    """Frames H1 deslizantes (último candle em formação); termina em mercado lateral."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, 900))
+    close = np.concatenate([close, np.full(400, close[-1])])
+    noise = np.concatenate([np.abs(rng.normal(0, 0.6, 900)), np.zeros(400)])
+    df = pd.DataFrame({
+        'timestamp': np.arange(len(close), dtype=np.int64) * HOUR_IN_MS + 1_700_000_000_000,
+        'open': close,
+        'high': close + noise,
+        'low': close - noise,
+        'close': close,
+        'volume': rng.lognormal(6, 0.6, len(close)),
+    })
+    return [df.iloc[start:start + 301].reset_index(drop=True) for start in range(0, len(df) - 300, 37)]
+
+
+def _batch_smc_indicators(frame):
+    """Indicadores SMC calculados em batch sobre os candles fechados do frame."""
+    from indicators.smc import SmartMoneyConcepts, SwingType
+
+    smc = SmartMoneyConcepts.calculate_all_smc(frame.iloc[:-1])
+    price = frame.iloc[-1]['close']
+    swings = smc['swings']
+    highs = [s.price for s in swings if s.type in (SwingType.HH, SwingType.LH)]
+    lows = [s.price for s in swings if s.type in (SwingType.LL, SwingType.HL)]
+    fvgs = smc['fvgs']
+    return {
+        'market_structure': smc['structure'].type.value if swings else 'range',
+        'bos_recent': 1 if smc['bos'] else 0,
+        'choch_recent': 1 if smc['choch'] else 0,
+        'nearest_fvg_distance_pct': min(
+            abs((f.zone_high + f.zone_low) / 2 - price) / price * 100 for f in fvgs
+        ) if fvgs else None,
+        'liquidity_above_pct': (max(highs) - price) / price * 100 if highs else None,
+        'liquidity_below_pct': (price - min(lows)) / price * 100 if lows else None,
+    }
+
+
+def test_smc_incremental_do_monitor_igual_ao_batch_no_mesmo_frame():
+    """Estado SMC incremental entre ciclos reproduz o batch sobre o frame de cada ciclo."""
+    from indicators.smc import SmartMoneyConcepts
+    from indicators.smc_incremental import IncrementalSMCRegistry
+
+    monitor = PositionMonitor.__new__(PositionMonitor)
+    monitor.smc = SmartMoneyConcepts()
+    monitor.smc_state = IncrementalSMCRegistry()
+
+    frames = _smc_frames()
+    seen_bos = []
+    for frame in frames:
+        indicators = monitor.calculate_indicators_snapshot('BTCUSDT', {'h1': frame})
+        expected = _batch_smc_indicators(frame)
+        assert {key: indicators[key] for key in expected} == pytest.approx(expected)
+        seen_bos.append(indicators['bos_recent'])
+
+    # Flags recentes voltam a 0 quando a estrutura sai da janela
+    assert seen_bos[0] == 1 and seen_bos[-1] == 0
+    assert indicators['liquidity_above_pct'] is None
+    assert indicators['market_structure'] == 'range'
@@ -0,0 +1,123 @@
+"""
+Testes das observações pré-computadas do CryptoFuturesEnv.
+
+Com precompute_observations=True o environment deve produzir exatamente
+as mesmas observações (e recompensas) do cálculo por step, para qualquer
+sequência de ações.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agent.environment import CryptoFuturesEnv
+from indicators.features import FeatureEngineer
+from indicators.smc import SmartMoneyConcepts
+from indicators.technical import TechnicalIndicators
+
+
+def _make_data(length: int = 400, seed: int = 5) -> dict:
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 150, length))
+    open_ = close + rng.normal(0, 60, length)
+    high = np.maximum(open_, close) + np.abs(rng.normal(0, 80, length))
+    low = np.minimum(open_, close) - np.abs(rng.normal(0, 80, length))
+    h4 = TechnicalIndicators.calculate_all(pd.DataFrame({
+        'timestamp': 1_700_000_000_000 + np.arange(length, dtype=np.int64) * 14_400_000,
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': rng.lognormal(8, 0.5, length),
+    }))
+    return {
+        'symbol': 'BTCUSDT',
+        'h4': h4,
+        'h1': h4,
+        'd1': h4.iloc[::6].reset_index(drop=True),
+        'sentiment': None,
+        'macro': None,
+        'smc': SmartMoneyConcepts.calculate_all_smc(h4),
+    }
+
+
+def _rollout(env: CryptoFuturesEnv, actions, seed: int = 3):
+    observations, rewards = [], []
+    obs, _ = env.reset(seed=seed)
+    observations.append(obs)
+    for action in actions:
+        obs, reward, terminated, truncated, _ = env.step(int(action))
+        observations.append(obs)
+        rewards.append(reward)
+        if terminated or truncated:
+            break
+    return np.array(observations), np.array(rewards)
+
+
+def test_market_matrix_has_zero_position_features():
+    env = CryptoFuturesEnv(_make_data(), episode_length=100, precompute_observations=True)
+
+    assert env.market_observations.shape == (400, 104)
+    assert env.market_observations.dtype == np.float32
+    assert not env.market_observations[:, FeatureEngineer.POSITION_FEATURES].any()
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_precomputed_observations_match_per_step(seed):
+    data = _make_data()
+    actions = np.random.default_rng(seed).choice(5, size=150, p=[0.5, 0.2, 0.2, 0.05, 0.05])
+
+    reference = CryptoFuturesEnv(data, episode_length=150)
+    precomputed = CryptoFuturesEnv(data, episode_length=150, precompute_observations=True)
+
+    expected_obs, expected_rewards = _rollout(reference, actions, seed=seed)
+    obs, rewards = _rollout(precomputed, actions, seed=seed)
+
+    assert (expected_obs[:, FeatureEngineer.POSITION_FEATURES] != 0).any()
+    np.testing.assert_array_equal(obs, expected_obs)
+    np.testing.assert_array_equal(rewards, expected_rewards)
+
+
+def test_position_features_match_build_observation_block():
+    state = {
+        'has_position': True,
+        'direction': 'SHORT',
+        'pnl_pct': 4.2,
+        'time_in_position_hours': 36,
+        'stop_distance_pct': 1.5,
+        'tp_distance_pct': None,
+    }
+
+    observation = FeatureEngineer.build_observation(
+        'BTCUSDT', None, None, None, None, None, None, position_state=state
+    )
+
+    np.testing.assert_array_equal(
+        observation[FeatureEngineer.POSITION_FEATURES],
+        np.array(FeatureEngineer.position_features(state), dtype=np.float32),
+    )
+
+
+@pytest.mark.slow
+def test_benchmark_precomputed_step_throughput():
+    data = _make_data(length=1_500)
+    actions = np.zeros(1_000, dtype=int)
+
+    env = CryptoFuturesEnv(data, episode_length=1_000)
+    start = time.perf_counter()
+    _rollout(env, actions)
+    per_step_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    env = CryptoFuturesEnv(data, episode_length=1_000, precompute_observations=True)
+    precompute_s = time.perf_counter() - start
+    start = time.perf_counter()
+    _rollout(env, actions)
+    precomputed_s = time.perf_counter() - start
+
+    print(
+        f"\n1000 steps: per_step={per_step_s:.2f}s precomputed={precomputed_s:.3f}s "
+        f"(precompute {precompute_s:.2f}s, speedup={per_step_s / max(precomputed_s, 1e-9):.0f}x)"
+    )
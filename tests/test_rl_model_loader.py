@@ -73,7 +73,7 @@ class TestFallbackSemSB3:
         fake_checkpoint.write_bytes(b"fake")
 
         with patch("core.model2.rl_model_loader._check_ppo_available", return_value=False):
-            loader = RLModelLoader(checkpoint_path=fake_checkpoint)
+            loader = RLModelLoader(checkpoint_path=fake_checkpoint, lazy=False)
 
         assert loader.is_fallback is True
         assert "nao disponivel" in loader.fallback_reason.lower()
@@ -83,7 +83,7 @@ class TestFallbackSemSB3:
         fake_checkpoint.write_bytes(b"fake")
 
         with patch("core.model2.rl_model_loader._check_ppo_available", return_value=False):
-            loader = RLModelLoader(checkpoint_path=fake_checkpoint)
+            loader = RLModelLoader(checkpoint_path=fake_checkpoint, lazy=False)
 
         features = np.ones(5, dtype=np.float32)
         confidence, action = loader.predict_confidence(features, signal_side="LONG")
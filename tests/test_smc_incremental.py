@@ -0,0 +1,266 @@
+"""
+Testes do SMC incremental (IncrementalSMC / IncrementalSMCRegistry).
+
+O estado incremental deve reproduzir calculate_all_smc para swings, BOS,
+CHoCH, Order Blocks, FVGs e Premium/Discount quando alimentado com o
+mesmo histórico, e window(n, frame) deve reproduzir o batch sobre o recorte.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.smc import LiquidityType, SmartMoneyConcepts, ZoneStatus
+from indicators.smc_incremental import IncrementalSMC, IncrementalSMCRegistry, SMCDelta
+
+
+def _make_ohlcv(length: int, seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, length))
+    open_ = close + rng.normal(0, 0.5, length)
+    high = np.maximum(open_, close) + np.abs(rng.normal(0, 0.6, length))
+    low = np.minimum(open_, close) - np.abs(rng.normal(0, 0.6, length))
+    volume = rng.lognormal(6, 0.6, length)
+    return pd.DataFrame({
+        'timestamp': np.arange(length, dtype=np.int64) * 3_600_000 + 1_700_000_000_000,
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume,
+    })
+
+
+def _zone_key(zone):
+    return (zone.timestamp, zone.zone_high, zone.zone_low, zone.type, zone.index)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_incremental_matches_batch_structures(seed):
+    df = _make_ohlcv(1_500, seed=seed)
+    batch = SmartMoneyConcepts.calculate_all_smc(df)
+
+    state = IncrementalSMC(track_zone_status=False)
+    state.sync(df)
+    snapshot = state.snapshot()
+
+    assert snapshot['swings'] == batch['swings']
+    assert snapshot['bos'] == batch['bos']
+    assert snapshot['choch'] == batch['choch']
+    assert snapshot['structure'].type == batch['structure'].type
+    assert snapshot['fvgs'] == batch['fvgs']
+    assert [_zone_key(ob) for ob in snapshot['order_blocks']] == \
+        [_zone_key(ob) for ob in batch['order_blocks']]
+    assert [ob.strength for ob in snapshot['order_blocks']] == \
+        pytest.approx([ob.strength for ob in batch['order_blocks']])
+    assert snapshot['premium_discount'] == batch['premium_discount']
+    assert [(lvl.price, lvl.type, lvl.touch_count) for lvl in snapshot['liquidity_levels']] == \
+        [(lvl.price, lvl.type, lvl.touch_count) for lvl in batch['liquidity_levels']]
+
+
+def test_update_per_candle_equals_bulk_sync_and_deltas_accumulate():
+    df = _make_ohlcv(600)
+    bulk = IncrementalSMC()
+    bulk.sync(df)
+
+    streaming = IncrementalSMC()
+    total = SMCDelta()
+    for candle in df.to_dict(orient="records"):
+        total.merge(streaming.update(candle))
+
+    assert streaming.snapshot() == bulk.snapshot()
+    assert total.new_swings == list(streaming.swings)
+    assert total.new_bos == list(streaming.bos)
+    assert total.new_sweeps == list(streaming.liquidity_sweeps)
+
+
+def test_sync_is_idempotent_and_only_processes_new_candles():
+    df = _make_ohlcv(400)
+    state = IncrementalSMC()
+    state.sync(df.iloc[:300])
+
+    assert state.sync(df.iloc[:300]).is_empty
+    assert state.candle_count == 300
+
+    state.sync(df.iloc[250:])  # janela sobreposta com 100 candles novos
+
+    reference = IncrementalSMC()
+    reference.sync(df)
+    assert state.candle_count == 400
+    assert state.snapshot() == reference.snapshot()
+
+
+def test_sync_skip_last_ignores_forming_candle():
+    df = _make_ohlcv(200)
+    state = IncrementalSMC()
+
+    state.sync(df, skip_last=True)
+
+    assert state.candle_count == 199
+    assert state.last_timestamp == int(df['timestamp'].iloc[-2])
+
+
+def test_sync_rebuilds_state_when_window_does_not_overlap():
+    df = _make_ohlcv(500)
+    state = IncrementalSMC()
+    state.sync(df.iloc[:100])
+
+    state.sync(df.iloc[300:])
+
+    reference = IncrementalSMC()
+    reference.sync(df.iloc[300:])
+    assert state.candle_count == 200
+    assert state.snapshot() == reference.snapshot()
+
+
+def test_snapshot_empty_below_minimum_candles():
+    state = IncrementalSMC()
+    state.sync(_make_ohlcv(9))
+    assert state.snapshot() == {}
+
+
+def test_zone_status_tracking_reports_mitigation_and_fills():
+    df = _make_ohlcv(2_000, seed=5)
+    state = IncrementalSMC(max_obs=50, max_fvgs=50)
+    total = state.sync(df)
+
+    assert total.filled_fvgs
+    assert all(fvg.status == ZoneStatus.FILLED for fvg in total.filled_fvgs)
+    assert all(ob.status == ZoneStatus.MITIGATED for ob in total.mitigated_order_blocks)
+
+
+def test_sweeps_are_causal():
+    df = _make_ohlcv(1_500, seed=8)
+    state = IncrementalSMC()
+    state.sync(df)
+
+    assert state.liquidity_sweeps
+    for sweep in state.liquidity_sweeps:
+        row = df.iloc[sweep.index]
+        if sweep.direction == "up":
+            assert row['high'] > sweep.level > row['close']
+        else:
+            assert row['low'] < sweep.level < row['close']
+    for level in state.liquidity_levels:
+        assert level.type in (LiquidityType.BSL, LiquidityType.SSL)
+
+
+def test_history_is_bounded_to_max_history():
+    df = _make_ohlcv(3_000, seed=5)
+    state = IncrementalSMC(max_history=400)
+    state.sync(df)
+
+    cutoff = state.candle_count - 400
+    for items in (state.swings, state.bos, state.choch, state.liquidity_sweeps):
+        assert items and all(item.index >= cutoff for item in items)
+    assert all(group.index >= cutoff for group in state._liquidity_groups)
+    assert sum(len(bucket) for bucket in state._liquidity_buckets.values()) == \
+        len(state._liquidity_groups)
+    assert all(level in state.liquidity_levels for level in state._active_levels)
+    assert len(state.swings) < 400
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_window_matches_batch_on_same_frame(seed):
+    df = _make_ohlcv(1_500, seed=seed)
+    state = IncrementalSMC(track_zone_status=False, max_history=400)
+    state.sync(df)
+
+    window = state.window(300)
+    batch = SmartMoneyConcepts.calculate_all_smc(df.iloc[-300:].reset_index(drop=True))
+
+    assert window['swings'] == batch['swings']
+    assert window['bos'] == batch['bos']
+    assert window['choch'] == batch['choch']
+    assert window['structure'].type == batch['structure'].type
+    assert window['fvgs'] == batch['fvgs']
+    assert window['premium_discount'] == batch['premium_discount']
+    assert [(lvl.price, lvl.type, lvl.touch_count) for lvl in window['liquidity_levels']] == \
+        [(lvl.price, lvl.type, lvl.touch_count) for lvl in batch['liquidity_levels']]
+    assert all(0 <= ob.index < 300 for ob in window['order_blocks'])
+    assert all(0 <= sweep.index < 300 for sweep in window['liquidity_sweeps'])
+    assert state.window(5) == {}
+
+    # Com o frame, os Order Blocks seguem o batch (SMA de volume do recorte)
+    framed = state.window(300, frame=df)
+    assert [_zone_key(ob) for ob in framed['order_blocks']] == \
+        [_zone_key(ob) for ob in batch['order_blocks']]
+    assert [ob.strength for ob in framed['order_blocks']] == \
+        pytest.approx([ob.strength for ob in batch['order_blocks']])
+
+
+def test_window_rejects_frame_not_aligned_with_state():
+    df = _make_ohlcv(200)
+    state = IncrementalSMC()
+    state.sync(df)
+
+    with pytest.raises(ValueError):
+        state.window(100, frame=df.iloc[:-1])
+    with pytest.raises(ValueError):
+        state.window(100, frame=df.iloc[-50:])
+
+
+def test_registry_keeps_one_state_per_series():
+    registry = IncrementalSMCRegistry(lookback=3)
+    df = _make_ohlcv(100)
+
+    state = registry.sync("btcusdt", "h1", df)
+
+    assert registry.get("BTCUSDT", "H1") is state
+    assert registry.get("BTCUSDT", "H4") is not state
+    assert state.lookback == 3
+
+    registry.reset(symbol="BTCUSDT", timeframe="H1")
+    assert registry.get("BTCUSDT", "H1") is not state
+
+
+def test_scanner_detector_accepts_incremental_snapshot():
+    from core.model2.scanner import DetectorInput, detect_initial_short_failure
+
+    df = _make_ohlcv(300, seed=4)
+    state = IncrementalSMC(track_zone_status=False)
+    state.sync(df)
+
+    def _run(smc):
+        return detect_initial_short_failure(DetectorInput(
+            symbol="BTCUSDT",
+            timeframe="H4",
+            candles=df.to_dict(orient="records"),
+            indicators=[],
+            smc=smc,
+            scan_timestamp=int(df['timestamp'].iloc[-1]),
+        ))
+
+    assert _run(state.snapshot()) == _run(SmartMoneyConcepts.calculate_all_smc(df))
+
+
+def test_scanner_detector_matches_batch_on_sliding_windows():
+    """Janelas deslizantes como as do scan do daemon: mesma deteccao do batch."""
+    from core.model2.scanner import DetectorInput, detect_initial_short_failure
+
+    df = _make_ohlcv(200, seed=5)
+    registry = IncrementalSMCRegistry(track_zone_status=False)
+    size = 120
+
+    def _run(frame, smc):
+        return detect_initial_short_failure(DetectorInput(
+            symbol="BTCUSDT",
+            timeframe="H4",
+            candles=frame.to_dict(orient="records"),
+            indicators=[],
+            smc=smc,
+            scan_timestamp=int(frame['timestamp'].iloc[-1]),
+        ))
+
+    detections = 0
+    for end in range(size, len(df) + 1):
+        frame = df.iloc[end - size:end].reset_index(drop=True)
+        window = registry.sync("BTCUSDT", "H4", frame).window(size, frame=frame)
+        batch = SmartMoneyConcepts.calculate_all_smc(frame)
+        assert [_zone_key(ob) for ob in window['order_blocks']] == \
+            [_zone_key(ob) for ob in batch['order_blocks']]
+        result = _run(frame, window)
+        assert result == _run(frame, batch)
+        detections += result is not None
+
+    assert detections > 0
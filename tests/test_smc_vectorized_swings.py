@@ -0,0 +1,189 @@
+"""
+Testes de equivalência do detector vetorizado de swing points (SMC).
+
+Compara SmartMoneyConcepts.detect_swing_points / detect_swing_point_arrays
+com a implementação de referência em loop (pré-vetorização), e mede o
+ganho de desempenho em 10k/100k candles.
+"""
+
+import time
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.smc import (
+    SmartMoneyConcepts,
+    SwingArrays,
+    SwingPoint,
+    SwingType,
+)
+
+
+def _reference_detect_swing_points(df: pd.DataFrame, lookback: int = 5) -> List[SwingPoint]:
+    """Implementação original em loop duplo (referência de equivalência)."""
+    swings = []
+    highs = df['high'].tolist()
+    lows = df['low'].tolist()
+    timestamps = df['timestamp'].tolist()
+
+    for i in range(lookback, len(df) - lookback):
+        is_swing_high = True
+        for j in range(i - lookback, i + lookback + 1):
+            if j != i and highs[j] >= highs[i]:
+                is_swing_high = False
+                break
+
+        if is_swing_high:
+            if len(swings) > 0 and swings[-1].price < highs[i]:
+                swing_type = SwingType.HH
+            elif len(swings) > 0:
+                swing_type = SwingType.LH
+            else:
+                swing_type = SwingType.HH
+            swings.append(SwingPoint(
+                timestamp=int(timestamps[i]), price=float(highs[i]),
+                type=swing_type, index=i
+            ))
+
+        is_swing_low = True
+        for j in range(i - lookback, i + lookback + 1):
+            if j != i and lows[j] <= lows[i]:
+                is_swing_low = False
+                break
+
+        if is_swing_low:
+            if len(swings) > 0 and swings[-1].price > lows[i]:
+                swing_type = SwingType.LL
+            elif len(swings) > 0:
+                swing_type = SwingType.HL
+            else:
+                swing_type = SwingType.LL
+            swings.append(SwingPoint(
+                timestamp=int(timestamps[i]), price=float(lows[i]),
+                type=swing_type, index=i
+            ))
+
+    swings.sort(key=lambda x: x.index)
+    return swings
+
+
+def _make_ohlcv(length: int, seed: int = 7, tick: float = 0.0) -> pd.DataFrame:
+    """Random walk OHLCV; tick > 0 arredonda preços para forçar empates."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, length))
+    high = close + np.abs(rng.normal(0, 0.5, length))
+    low = close - np.abs(rng.normal(0, 0.5, length))
+    if tick:
+        high = np.round(high / tick) * tick
+        low = np.round(low / tick) * tick
+    return pd.DataFrame({
+        'timestamp': np.arange(length, dtype=np.int64) * 3_600_000,
+        'open': close,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': rng.uniform(100, 1000, length),
+    })
+
+
+@pytest.mark.parametrize("lookback", [0, 1, 2, 5, 10])
+@pytest.mark.parametrize("tick", [0.0, 1.0])
+def test_swing_points_match_reference(lookback, tick):
+    df = _make_ohlcv(2_000, tick=tick)
+
+    expected = _reference_detect_swing_points(df, lookback)
+    result = SmartMoneyConcepts.detect_swing_points(df, lookback)
+
+    assert result == expected
+
+
+def test_swing_points_same_index_high_before_low():
+    """Com lookback=0 todo candle é high e low; high vem primeiro."""
+    df = _make_ohlcv(20)
+
+    result = SmartMoneyConcepts.detect_swing_points(df, lookback=0)
+
+    assert result == _reference_detect_swing_points(df, lookback=0)
+    assert [s.index for s in result[:4]] == [0, 0, 1, 1]
+
+
+def test_swing_points_short_frame_returns_empty():
+    df = _make_ohlcv(10)
+    assert SmartMoneyConcepts.detect_swing_points(df, lookback=5) == []
+    assert len(SmartMoneyConcepts.detect_swing_point_arrays(df, lookback=5)) == 0
+
+
+def test_swing_points_nan_semantics_match_reference():
+    df = _make_ohlcv(300)
+    df.loc[[20, 21, 150], 'high'] = np.nan
+    df.loc[[40, 151], 'low'] = np.nan
+
+    result = SmartMoneyConcepts.detect_swing_points(df)
+    expected = _reference_detect_swing_points(df)
+
+    # NaN != NaN: compara preços à parte
+    assert [(s.index, s.type, s.timestamp) for s in result] == \
+        [(s.index, s.type, s.timestamp) for s in expected]
+    np.testing.assert_array_equal([s.price for s in result], [s.price for s in expected])
+
+
+def test_swing_arrays_roundtrip():
+    df = _make_ohlcv(1_000)
+    arrays = SmartMoneyConcepts.detect_swing_point_arrays(df)
+    swings = arrays.to_swing_points()
+
+    rebuilt = SwingArrays.from_swing_points(swings)
+
+    np.testing.assert_array_equal(rebuilt.index, arrays.index)
+    np.testing.assert_array_equal(rebuilt.timestamp, arrays.timestamp)
+    np.testing.assert_array_equal(rebuilt.price, arrays.price)
+    np.testing.assert_array_equal(rebuilt.type, arrays.type)
+
+
+@pytest.mark.parametrize("tick", [0.0, 1.0])
+def test_bos_and_choch_accept_swing_arrays(tick):
+    df = _make_ohlcv(3_000, tick=tick)
+    arrays = SmartMoneyConcepts.detect_swing_point_arrays(df)
+    swings = arrays.to_swing_points()
+
+    assert SmartMoneyConcepts.detect_bos(df, arrays) == SmartMoneyConcepts.detect_bos(df, swings)
+    assert SmartMoneyConcepts.detect_choch(df, arrays) == SmartMoneyConcepts.detect_choch(df, swings)
+
+
+def test_calculate_all_smc_unchanged_with_reference_swings():
+    df = _make_ohlcv(500)
+
+    result = SmartMoneyConcepts.calculate_all_smc(df)
+    reference = SmartMoneyConcepts.calculate_all_smc(df, swings=_reference_detect_swing_points(df))
+
+    assert result['swings'] == reference['swings']
+    assert result['bos'] == reference['bos']
+    assert result['choch'] == reference['choch']
+    assert result['order_blocks'] == reference['order_blocks']
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("length", [10_000, 100_000])
+def test_benchmark_swing_points(length):
+    df = _make_ohlcv(length)
+
+    start = time.perf_counter()
+    arrays = SmartMoneyConcepts.detect_swing_point_arrays(df)
+    arrays_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    SmartMoneyConcepts.detect_swing_points(df)
+    vectorized_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = _reference_detect_swing_points(df)
+    reference_s = time.perf_counter() - start
+
+    print(
+        f"\nswing points n={length}: reference={reference_s * 1000:.1f}ms "
+        f"vectorized={vectorized_s * 1000:.1f}ms arrays={arrays_s * 1000:.1f}ms "
+        f"speedup={reference_s / max(vectorized_s, 1e-9):.1f}x"
+    )
+    assert len(arrays) == len(expected)
@@ -0,0 +1,183 @@
+"""
+Testes do pool de conexões SQLite por thread (data/sqlite_pool.py).
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from core.model2.observability import Model2ObservabilityService
+from core.model2.repository import Model2ExecutionRepository
+from data.database import DatabaseManager
+from data.sqlite_pool import (
+    DEFAULT_PROFILE,
+    MODEL2_PROFILE,
+    SQLITE_POOL,
+    PooledConnection,
+    SQLiteConnectionPool,
+)
+
+
+@pytest.fixture
+def pool():
+    return SQLiteConnectionPool(max_idle_per_key=2)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "pool.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT)")
+    return str(path)
+
+
+def test_close_returns_connection_for_reuse(pool, db_path):
+    first = pool.acquire(db_path)
+    first.close()
+    second = pool.acquire(db_path)
+
+    assert second is first
+    assert isinstance(second, PooledConnection)
+    second.execute("SELECT 1").fetchone()
+    stats = pool.stats()[f"{db_path}|default"]
+    assert (stats['acquires'], stats['connects'], stats['reuses']) == (2, 1, 1)
+    assert stats['wait_ms_max'] >= stats['wait_ms_avg'] > 0
+
+
+def test_with_block_commits_and_nested_blocks_get_distinct_connections(pool, db_path):
+    with pool.acquire(db_path) as outer:
+        outer.execute("INSERT INTO items (value) VALUES ('a')")
+        with pool.acquire(db_path) as inner:
+            assert inner is not outer
+            # Conexão distinta: não enxerga a escrita ainda não confirmada
+            assert inner.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+    with pool.acquire(db_path) as conn:
+        assert conn in (outer, inner)
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+
+
+def test_close_discards_uncommitted_transaction(pool, db_path):
+    conn = pool.acquire(db_path)
+    conn.execute("INSERT INTO items (value) VALUES ('lost')")
+    conn.close()
+
+    again = pool.acquire(db_path)
+    assert again is conn
+    assert not again.in_transaction
+    assert again.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+
+def test_profile_pragmas_and_row_factory(pool, db_path):
+    conn = pool.acquire(db_path, MODEL2_PROFILE)
+
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    assert isinstance(conn.execute("SELECT 1 AS one").fetchone(), sqlite3.Row)
+    conn.close()
+
+    # Perfis diferentes não compartilham conexões
+    assert pool.acquire(db_path, DEFAULT_PROFILE) is not conn
+
+
+def test_threads_never_share_connections(pool, db_path):
+    main_conn = pool.acquire(db_path)
+    main_conn.close()
+    seen = []
+
+    def worker():
+        conn = pool.acquire(db_path)
+        conn.execute("SELECT 1").fetchone()
+        seen.append(conn)
+        conn.close()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert seen and seen[0] is not main_conn
+    assert pool.acquire(db_path) is main_conn
+
+
+def test_idle_connections_are_bounded(pool, db_path):
+    conns = [pool.acquire(db_path) for _ in range(4)]
+    for conn in conns:
+        conn.close()
+
+    assert pool.close_idle() == 2
+    with pytest.raises(sqlite3.ProgrammingError):
+        conns[-1].execute("SELECT 1")
+
+
+def test_replaced_file_gets_fresh_connection(pool, tmp_path):
+    path = tmp_path / "swap.db"
+    with pool.acquire(path) as conn:
+        conn.execute("CREATE TABLE old (id INTEGER)")
+
+    path.unlink()
+    with sqlite3.connect(path) as fresh:
+        fresh.execute("CREATE TABLE new (id INTEGER)")
+
+    with pool.acquire(path) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    assert tables == {"new"}
+
+
+def test_memory_database_is_not_pooled(pool):
+    first = pool.acquire(":memory:")
+    first.execute("CREATE TABLE t (id INTEGER)")
+    first.close()
+
+    second = pool.acquire(":memory:")
+    assert second is not first
+    assert second.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0
+
+
+def test_repositories_reuse_pooled_connections(tmp_path):
+    db_path = str(tmp_path / "agent.db")
+    db = DatabaseManager(db_path)
+    for i in range(20):
+        db.insert_event({'timestamp': i, 'event_type': 'TEST', 'symbol': 'BTCUSDT', 'details': '{}', 'acao_tomada': None})
+    assert len(db.get_ohlcv("H4", "BTCUSDT")) == 0
+    stats = SQLITE_POOL.stats()[f"{db_path}|default"]
+    assert stats['acquires'] >= 22 and stats['connects'] == 1
+
+    model2_db = tmp_path / "modelo2.db"
+    observability = Model2ObservabilityService(str(model2_db))
+    execution = Model2ExecutionRepository(str(model2_db))
+    with observability._connect() as conn, execution._connect() as other:
+        assert conn is not other
+    with execution._connect() as conn:
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+
+@pytest.mark.slow
+def test_benchmark_pooled_vs_fresh_connections(db_path):
+    n_queries = 2_000
+    pool = SQLiteConnectionPool()
+
+    start = time.perf_counter()
+    for i in range(n_queries):
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        for pragma in MODEL2_PROFILE.pragmas:
+            conn.execute(pragma)
+        conn.execute("SELECT value FROM items WHERE id = ?", (i,)).fetchone()
+        conn.close()
+    fresh_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(n_queries):
+        with pool.acquire(db_path, MODEL2_PROFILE) as conn:
+            conn.execute("SELECT value FROM items WHERE id = ?", (i,)).fetchone()
+    pooled_s = time.perf_counter() - start
+
+    stats = next(iter(pool.stats().values()))
+    print(
+        f"\n{n_queries} queries: fresh={fresh_s * 1e6 / n_queries:.0f}us/q "
+        f"pooled={pooled_s * 1e6 / n_queries:.0f}us/q speedup={fresh_s / pooled_s:.1f}x "
+        f"(acquire avg {stats['wait_ms_avg'] * 1000:.1f}us)"
+    )
@@ -0,0 +1,173 @@
+"""
+Testes do backtest vetorizado (backtest/vectorized.py) contra
+TradeStateMachine dirigida candle a candle.
+"""
+
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.trade_state_machine import TradeStateMachine
+from backtest.vectorized import VectorizedBacktester
+
+H4 = 4 * 3_600_000
+START = 1_704_067_200_000
+
+
+def _ohlc(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 120, n_rows))
+    spread = rng.uniform(20, 250, (2, n_rows))
+    return pd.DataFrame({
+        'timestamp': START + np.arange(n_rows, dtype=np.int64) * H4,
+        'high': close + spread[0],
+        'low': close - spread[1],
+        'close': close,
+    })
+
+
+def _crossover_signals(df: pd.DataFrame, fast: int, slow: int, stop_pct: float, rr: float):
+    close = df['close'].to_numpy()
+    fast_ma = pd.Series(close).rolling(fast).mean().to_numpy()
+    slow_ma = pd.Series(close).rolling(slow).mean().to_numpy()
+    above = fast_ma > slow_ma
+    cross = np.diff(above.astype(np.int8), prepend=0)
+    cross[:slow] = 0
+    entries = cross.astype(np.int8)
+    stops = close * (1 - entries * stop_pct)
+    takes = close * (1 + entries * stop_pct * rr)
+    exits = np.abs(cross) == 1
+    return entries, stops, takes, exits
+
+
+def _reference(df: pd.DataFrame, entries, stops, takes, exits, size: float = 0.5):
+    """Dirige TradeStateMachine candle a candle com a mesma semântica."""
+    sm = TradeStateMachine(symbol='BTCUSDT', initial_capital=10000)
+    equity = []
+    realized = 0.0
+    rows = df.to_dict('records')
+    for i, row in enumerate(rows):
+        trade = sm.current_trade
+        if trade is not None:
+            reason = sm.check_exit_conditions(row['close'], row)
+            if reason == 'SL_HIT':
+                realized += sm.close_position(trade.initial_stop, row['timestamp'], reason).net_pnl
+            elif reason == 'TP_HIT':
+                realized += sm.close_position(trade.take_profit, row['timestamp'], reason).net_pnl
+            elif exits[i]:
+                realized += sm.close_position(row['close'], row['timestamp'], 'SIGNAL').net_pnl
+        if sm.current_trade is None and entries[i] != 0:
+            sm.open_position('LONG' if entries[i] > 0 else 'SHORT', row['close'], size,
+                             stops[i], takes[i], row['timestamp'])
+        if i == len(rows) - 1 and sm.current_trade is not None:
+            realized += sm.close_position(row['close'], row['timestamp'], 'END').net_pnl
+
+        open_pnl = 0.0
+        if sm.current_trade is not None:
+            open_pnl = sm._calculate_pnl(sm.current_trade.direction, sm.current_trade.entry_price,
+                                         row['close'], sm.current_trade.entry_size)
+        equity.append(10000 + realized + open_pnl)
+    return sm.get_trade_history(), np.array(equity)
+
+
+@pytest.mark.parametrize('params', [
+    dict(fast=5, slow=20, stop_pct=0.01, rr=2.0),
+    dict(fast=10, slow=50, stop_pct=0.03, rr=1.5),
+    dict(fast=3, slow=8, stop_pct=0.002, rr=1.0),
+])
+def test_trades_match_state_machine(params):
+    df = _ohlc(3_000)
+    signals = _crossover_signals(df, **params)
+    expected, expected_equity = _reference(df, *signals)
+
+    result = VectorizedBacktester(df).run(*signals, size=0.5)
+    trades = result.to_trades()
+
+    assert len(trades) == len(expected) > 10
+    assert {'SL_HIT', 'TP_HIT'} <= {t.exit_reason for t in trades}
+    for got, want in zip(trades, expected):
+        assert (got.direction, got.entry_time, got.exit_time, got.exit_reason) == \
+            (want.direction, want.entry_time, want.exit_time, want.exit_reason)
+        for field in ('entry_price', 'exit_price', 'entry_size', 'initial_stop', 'take_profit',
+                      'gross_pnl', 'fees', 'net_pnl', 'pnl_pct', 'r_multiple'):
+            assert getattr(got, field) == pytest.approx(getattr(want, field), rel=1e-12, abs=1e-9), field
+    np.testing.assert_allclose(result.equity_curve, expected_equity, rtol=1e-10)
+
+
+def test_same_candle_priority_nan_levels_and_end_of_data():
+    df = pd.DataFrame({
+        'timestamp': np.arange(6),
+        'high':  [101, 112, 101, 101, 101, 101],
+        'low':   [99, 90, 99, 99, 99, 99],
+        'close': [100, 100, 100, 100, 100, 103],
+    }, dtype=float)
+    entries = np.array([1, 0, -1, 0, 1, 0])
+    stops = np.array([95, 0, np.nan, 0, 95, 0], dtype=float)
+    takes = np.array([110, 0, 99.5, 0, np.nan, 0], dtype=float)
+    exits = np.array([0, 0, 1, 0, 0, 0], dtype=bool)
+
+    result = VectorizedBacktester(df).run(entries, stops, takes, exits)
+    trades = result.to_trades()
+
+    # SL e TP no mesmo candle: SL primeiro; SHORT sem stop sai no TP (low=99)
+    # antes do sinal; LONG sem TP fecha no fim dos dados
+    assert [(t.entry_time, t.exit_time, t.exit_reason) for t in trades] == [
+        (0, 1, 'SL_HIT'), (2, 3, 'TP_HIT'), (4, 5, 'END'),
+    ]
+    assert trades[0].exit_price == 95 and trades[1].exit_price == 99.5
+    assert trades[0].r_multiple == pytest.approx(-1.0)
+    assert result.equity_curve[-1] == pytest.approx(10000 + result.net_pnl.sum())
+    assert result.summary()['max_consecutive_losses'] == 1
+
+
+def test_rejects_misaligned_inputs():
+    engine = VectorizedBacktester(_ohlc(10))
+    with pytest.raises(ValueError):
+        engine.run(np.zeros(9), 0.0, 0.0)
+    with pytest.raises(ValueError):
+        engine.run(np.zeros(10), np.zeros(3), 0.0)
+
+
+def test_sweep_and_summary():
+    df = _ohlc(2_000)
+    engine = VectorizedBacktester(df)
+    grid = [dict(fast=f, slow=s, stop_pct=0.01, rr=2.0) for f, s in [(5, 20), (10, 40)]]
+
+    rows = engine.sweep(lambda **p: _crossover_signals(df, **p), grid)
+
+    assert [row['params'] for row in rows] == grid
+    single = engine.run(*_crossover_signals(df, **grid[0]))
+    assert rows[0]['total_trades'] == len(single)
+    assert rows[0]['net_pnl'] == pytest.approx(single.net_pnl.sum())
+    assert rows[0]['max_drawdown_pct'] > 0
+
+
+@pytest.mark.slow
+def test_benchmark_parameter_sweep():
+    df = _ohlc(20_000)
+    engine = VectorizedBacktester(df)
+    grid = [
+        dict(fast=f, slow=s, stop_pct=sp, rr=rr)
+        for f, s, sp, rr in itertools.product([5, 10, 20], [50, 100], [0.005, 0.01, 0.02, 0.04],
+                                              [1.0, 1.5, 2.0, 3.0, 4.0])
+    ]
+    signals = {tuple(p.values()): _crossover_signals(df, **p) for p in grid}
+
+    start_t = time.perf_counter()
+    for params in grid:
+        engine.run(*signals[tuple(params.values())])
+    vector_s = time.perf_counter() - start_t
+
+    start_t = time.perf_counter()
+    _reference(df, *signals[tuple(grid[0].values())])
+    loop_s = time.perf_counter() - start_t
+
+    per_minute = len(grid) / vector_s * 60
+    print(
+        f"\n{len(grid)} combinações em {len(df)} candles: {vector_s:.3f}s "
+        f"({per_minute:,.0f}/min); loop TradeStateMachine={loop_s:.3f}s/combinação "
+        f"speedup={loop_s / (vector_s / len(grid)):.0f}x"
+    )
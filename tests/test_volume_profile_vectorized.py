@@ -0,0 +1,148 @@
+"""
+Testes de equivalência do Volume Profile vetorizado.
+
+Compara TechnicalIndicators.calculate_volume_profile com a implementação
+original janela a janela (iterrows) e mede o ganho em um ano de H1.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.technical import TechnicalIndicators
+
+
+def _reference_volume_profile(df: pd.DataFrame, lookback: int = 120) -> pd.DataFrame:
+    """Implementação original (janela a janela com iterrows)."""
+    if len(df) < lookback:
+        return pd.DataFrame({
+            'vp_poc': [np.nan] * len(df),
+            'vp_vah': [np.nan] * len(df),
+            'vp_val': [np.nan] * len(df)
+        }, index=df.index)
+
+    poc_list, vah_list, val_list = [], [], []
+
+    for i in range(len(df)):
+        if i < lookback - 1:
+            poc_list.append(np.nan)
+            vah_list.append(np.nan)
+            val_list.append(np.nan)
+            continue
+
+        window = df.iloc[i-lookback+1:i+1]
+        price_min = window['low'].min()
+        price_max = window['high'].max()
+
+        if price_max == price_min:
+            poc_list.append(window['close'].iloc[-1])
+            vah_list.append(price_max)
+            val_list.append(price_min)
+            continue
+
+        bins = np.linspace(price_min, price_max, 50)
+        volume_at_price = np.zeros(len(bins) - 1)
+
+        for _, row in window.iterrows():
+            low_idx = np.digitize(row['low'], bins) - 1
+            high_idx = np.digitize(row['high'], bins) - 1
+
+            if low_idx == high_idx:
+                if 0 <= low_idx < len(volume_at_price):
+                    volume_at_price[low_idx] += row['volume']
+            else:
+                for j in range(max(0, low_idx), min(len(volume_at_price), high_idx + 1)):
+                    volume_at_price[j] += row['volume'] / (high_idx - low_idx + 1)
+
+        poc_idx = np.argmax(volume_at_price)
+        poc = (bins[poc_idx] + bins[poc_idx + 1]) / 2
+
+        total_volume = volume_at_price.sum()
+        target_volume = total_volume * 0.7
+
+        accumulated = 0
+        val_idx = poc_idx
+        vah_idx = poc_idx
+        while accumulated < target_volume:
+            if val_idx > 0:
+                accumulated += volume_at_price[val_idx - 1]
+                val_idx -= 1
+            if accumulated < target_volume and vah_idx < len(volume_at_price) - 1:
+                accumulated += volume_at_price[vah_idx + 1]
+                vah_idx += 1
+            if val_idx == 0 and vah_idx == len(volume_at_price) - 1:
+                break
+
+        poc_list.append(poc)
+        vah_list.append((bins[vah_idx] + bins[vah_idx + 1]) / 2)
+        val_list.append((bins[val_idx] + bins[val_idx + 1]) / 2)
+
+    return pd.DataFrame({'vp_poc': poc_list, 'vp_vah': vah_list, 'vp_val': val_list}, index=df.index)
+
+
+def _make_ohlcv(length: int, seed: int = 3, tick: float = 0.0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 50, length))
+    open_ = close + rng.normal(0, 20, length)
+    high = np.maximum(open_, close) + np.abs(rng.normal(0, 30, length))
+    low = np.minimum(open_, close) - np.abs(rng.normal(0, 30, length))
+    if tick:
+        open_, high, low, close = (np.round(a / tick) * tick for a in (open_, high, low, close))
+    return pd.DataFrame({
+        'timestamp': np.arange(length, dtype=np.int64) * 3_600_000,
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': rng.lognormal(5, 1, length),
+    }, index=pd.RangeIndex(100, 100 + length))
+
+
+@pytest.mark.parametrize("lookback", [5, 30, 120])
+@pytest.mark.parametrize("tick", [0.0, 25.0])
+def test_volume_profile_matches_reference(lookback, tick):
+    df = _make_ohlcv(400, tick=tick)
+
+    expected = _reference_volume_profile(df, lookback)
+    result = TechnicalIndicators.calculate_volume_profile(df, lookback)
+
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+def test_volume_profile_flat_windows_use_close():
+    df = _make_ohlcv(40)
+    df.loc[df.index[:25], ['open', 'high', 'low', 'close']] = 100.0
+
+    expected = _reference_volume_profile(df, lookback=10)
+    result = TechnicalIndicators.calculate_volume_profile(df, lookback=10)
+
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+    assert result['vp_poc'].iloc[9] == 100.0
+
+
+def test_volume_profile_short_frame_is_nan():
+    df = _make_ohlcv(50)
+    result = TechnicalIndicators.calculate_volume_profile(df, lookback=120)
+    assert result.isna().all().all()
+    assert list(result.index) == list(df.index)
+
+
+@pytest.mark.slow
+def test_benchmark_volume_profile_one_year_h1():
+    df = _make_ohlcv(24 * 365)
+
+    start = time.perf_counter()
+    result = TechnicalIndicators.calculate_volume_profile(df)
+    vectorized_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = _reference_volume_profile(df)
+    reference_s = time.perf_counter() - start
+
+    print(
+        f"\nvolume profile 1y H1 ({len(df)} candles): reference={reference_s:.2f}s "
+        f"vectorized={vectorized_s:.3f}s speedup={reference_s / max(vectorized_s, 1e-9):.0f}x"
+    )
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
@@ -0,0 +1,126 @@
+"""
+Testes do WalkForward com janelas em processos paralelos e checkpoint.
+"""
+
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.walk_forward import WalkForward
+
+
+class FakeTrainer:
+    """Trainer picklable: métricas dependem só dos dados e da semente."""
+
+    def __init__(self, save_dir: str = "", fail_windows=(), sleep_s: float = 0.0):
+        self.save_dir = save_dir
+        self.fail_windows = set(fail_windows)
+        self.sleep_s = sleep_s
+        self.trained = []
+
+    def train_phase1_exploration(self, train_data, total_timesteps, episode_length):
+        start = int(train_data['h4']['timestamp'].iloc[0])
+        if start in self.fail_windows:
+            raise RuntimeError(f"falha simulada em {start}")
+        self.trained.append(start)
+        self._bias = float(train_data['h4']['close'].mean()) + np.random.normal()
+        time.sleep(self.sleep_s)
+
+    def create_env(self, data, episode_length):
+        return data
+
+    def evaluate(self, env, n_episodes, deterministic):
+        noise = np.random.normal(size=3)
+        return {
+            'sharpe_ratio': float(env['h4']['close'].std() / self._bias + noise[0]),
+            'win_rate': float(abs(noise[1]) % 1),
+            'avg_return': np.float64(noise[2]),
+        }
+
+
+def _data(n_windows: int) -> dict:
+    n_rows = 60 + 30 * n_windows
+    rng = np.random.default_rng(0)
+    return {'h4': pd.DataFrame({
+        'timestamp': np.arange(n_rows),
+        'close': 100 + np.cumsum(rng.normal(0, 1, n_rows)),
+    })}
+
+
+def _wf(**kwargs) -> WalkForward:
+    return WalkForward(train_window=10, test_window=5, **kwargs)
+
+
+def test_parallel_matches_sequential():
+    data = _data(5)
+
+    sequential = _wf().run(data, FakeTrainer())
+    parallel = _wf(n_workers=3, start_method='fork').run(data, FakeTrainer())
+
+    assert [w['window'] for w in parallel['windows']] == [1, 2, 3, 4, 5]
+    assert parallel == sequential
+
+
+def test_plan_windows():
+    windows = _wf().plan_windows(60 + 30 * 3 + 10)
+
+    assert [(w['train_start'], w['test_start'], w['test_end']) for w in windows] == [
+        (0, 60, 90), (30, 90, 120), (60, 120, 150),
+    ]
+
+
+def test_checkpoint_resumes_unfinished_windows(tmp_path):
+    data = _data(4)
+    checkpoint = tmp_path / "wf.json"
+    expected = _wf().run(data, FakeTrainer())
+
+    # Janela 3 (treino começa no candle 60) falha na primeira execução
+    crashed = _wf(checkpoint_path=str(checkpoint)).run(data, FakeTrainer(fail_windows={60}))
+    assert [w['window'] for w in crashed['windows']] == [1, 2, 4]
+    assert sorted(json.loads(checkpoint.read_text())['windows']) == ['1', '2', '4']
+
+    trainer = FakeTrainer()
+    resumed = _wf(checkpoint_path=str(checkpoint)).run(data, trainer)
+
+    assert trainer.trained == [60]
+    assert [w['window'] for w in resumed['windows']] == [1, 2, 3, 4]
+    for got, want in zip(resumed['windows'], expected['windows']):
+        assert got['metrics'] == pytest.approx(want['metrics'])
+    assert resumed['avg_metrics'] == pytest.approx(expected['avg_metrics'])
+
+
+def test_checkpoint_from_other_configuration_is_ignored(tmp_path):
+    checkpoint = tmp_path / "wf.json"
+    _wf(checkpoint_path=str(checkpoint), seed=1).run(_data(2), FakeTrainer())
+
+    trainer = FakeTrainer()
+    _wf(checkpoint_path=str(checkpoint), seed=2).run(_data(2), trainer)
+
+    assert trainer.trained == [0, 30]
+
+
+def test_invalid_worker_count():
+    with pytest.raises(ValueError):
+        _wf(n_workers=0)
+
+
+@pytest.mark.slow
+def test_benchmark_parallel_wall_time():
+    data = _data(8)
+    trainer = FakeTrainer(sleep_s=0.5)
+
+    start_t = time.perf_counter()
+    _wf().run(data, trainer)
+    sequential_s = time.perf_counter() - start_t
+
+    start_t = time.perf_counter()
+    _wf(n_workers=4, start_method='fork').run(data, trainer)
+    parallel_s = time.perf_counter() - start_t
+
+    print(
+        f"\n8 janelas de 0.5s: sequencial={sequential_s:.2f}s 4 workers={parallel_s:.2f}s "
+        f"(ideal={0.5 * 2:.2f}s)"
+    )